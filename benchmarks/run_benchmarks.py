@@ -0,0 +1,587 @@
+"""Benchmark the transport pipeline hot paths on synthetic inputs.
+
+Usage (from the repo root):
+
+    python benchmarks/run_benchmarks.py --size small
+    python benchmarks/run_benchmarks.py --size small --save-baseline
+    python benchmarks/run_benchmarks.py --size small --compare
+
+Inputs are generated by `synthetic_data` into a temporary folder, so no real
+data files (or network access) are needed. Baselines are stored per size in
+benchmarks/baselines/<size>.json. `--compare` reports the ratio of each
+benchmark's median to the baseline median and exits with status 1 when a
+benchmark is slower than the baseline by more than `--tolerance`.
+
+Branch processing is the slowest part of a real run, so the smaller sizes only
+process the LEAP branches needed by a subset of ESTO keys (see
+`select_reconciliation_keys`). That keeps every benchmark self-consistent:
+reconciliation runs on the same branches that were processed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import synthetic_data as sd
+from synthetic_data import SyntheticConfig
+
+import functions.transport_workflow_pipeline as pipeline
+import sales_curve_estimate
+import sales_workflow
+from configurations.branch_mappings import (
+    ALL_LEAP_BRANCHES_TRANSPORT,
+    LEAP_BRANCH_TO_SOURCE_MAP,
+    LEAP_MEASURE_CONFIG,
+    NINTH_SOURCE_TO_LEAP_BRANCH_MAP,
+    SHORTNAME_TO_LEAP_BRANCHES,
+    UNMAPPABLE_BRANCHES_NO_ESTO_EQUIVALENT,
+)
+from configurations.measure_catalog import LEAP_BRANCH_TO_ANALYSIS_TYPE_MAP
+from functions.energy_use_reconciliation_road import (
+    build_transport_esto_energy_totals,
+    transport_adjustment_fn,
+    transport_energy_fn,
+)
+from functions.leap_utilities_functions import build_branch_rules_from_mapping, reconcile_energy_use
+from functions.measure_processing import process_measures_for_leap
+from functions.merged_energy_io import load_transport_energy_dataset
+from functions.transport_branch_paths import build_transport_branch_path, is_non_road_branch_tuple
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+REGION = "Region 1"
+
+
+@dataclass(frozen=True)
+class BenchmarkSize:
+    """One benchmark preset."""
+
+    config: SyntheticConfig
+    apec_economies: int
+    max_branches: int | None
+    stock_series: int
+    max_age: int = 30
+
+
+SIZES = {
+    "small": BenchmarkSize(
+        config=SyntheticConfig(final_year=2030, drive_breadth="medium"),
+        apec_economies=4,
+        max_branches=10,
+        stock_series=20,
+    ),
+    "medium": BenchmarkSize(
+        config=SyntheticConfig(final_year=2040),
+        apec_economies=8,
+        max_branches=40,
+        stock_series=100,
+    ),
+    "large": BenchmarkSize(
+        config=SyntheticConfig(final_year=2060),
+        apec_economies=21,
+        max_branches=None,
+        stock_series=400,
+    ),
+}
+
+
+def _normalize_transport_branch_rules(branch_rules: dict) -> dict:
+    """Same root/branch_path normalisation as run_transport_reconciliation."""
+    normalized = {}
+    for esto_key, rules in branch_rules.items():
+        normalized_rules = []
+        for rule in rules:
+            updated_rule = dict(rule)
+            branch_tuple = tuple(updated_rule.get("branch_tuple", ()))
+            root = str(updated_rule.get("root", "Demand")).strip() or "Demand"
+            if is_non_road_branch_tuple(branch_tuple):
+                root = r"Demand\Transport non road"
+            updated_rule["root"] = root
+            updated_rule["branch_path"] = build_transport_branch_path(branch_tuple, root=root)
+            normalized_rules.append(updated_rule)
+        normalized[esto_key] = normalized_rules
+    return normalized
+
+
+def _branches_for_rules(rules: list[dict]) -> list[tuple]:
+    """LEAP mapping keys needed to compute energy for `rules` (the branches and their parents)."""
+    branch_tuples = [tuple(rule["branch_tuple"]) for rule in rules]
+    return [
+        leap_tuple
+        for leap_tuple in LEAP_BRANCH_TO_SOURCE_MAP
+        if any(branch[: len(leap_tuple)] == leap_tuple for branch in branch_tuples)
+    ]
+
+
+def select_reconciliation_keys(branch_rules: dict, max_branches: int | None) -> list[tuple]:
+    """
+    Pick ESTO keys, round-robin across transport sub-sectors, while the LEAP
+    branches they need stay within `max_branches` (None keeps every key).
+    """
+    if max_branches is None:
+        return list(branch_rules)
+    by_sector: dict[str, list[tuple]] = {}
+    for esto_key in branch_rules:
+        by_sector.setdefault(esto_key[0], []).append(esto_key)
+    round_robin = [
+        key for group in itertools.zip_longest(*by_sector.values()) for key in group if key is not None
+    ]
+    selected, branches = [], set()
+    for esto_key in round_robin:
+        needed = branches | set(_branches_for_rules(branch_rules[esto_key]))
+        if len(needed) <= max_branches:
+            selected.append(esto_key)
+            branches = needed
+    return selected
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence the pipeline's print/warning output while timing."""
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        yield
+
+
+class SyntheticWorkspace:
+    """Lazily builds (and caches) the inputs each benchmark needs."""
+
+    def __init__(self, size: BenchmarkSize, folder: Path) -> None:
+        self.size = size
+        self.config = size.config
+        self.economy = self.config.economies[0]
+        self.scenario = self.config.scenarios[0]
+        self.paths = sd.write_synthetic_files(self.config, folder)
+
+    @cached_property
+    def prepared_input(self) -> pd.DataFrame:
+        with _quiet():
+            return sd.prepare_synthetic_input(self.config, self.paths, self.economy, self.scenario)
+
+    @cached_property
+    def branch_rules(self) -> dict:
+        with _quiet():
+            rules = build_branch_rules_from_mapping(
+                esto_to_leap_mapping=NINTH_SOURCE_TO_LEAP_BRANCH_MAP,
+                unmappable_branches=UNMAPPABLE_BRANCHES_NO_ESTO_EQUIVALENT,
+                all_leap_branches=ALL_LEAP_BRANCHES_TRANSPORT,
+                analysis_type_lookup=LEAP_BRANCH_TO_ANALYSIS_TYPE_MAP.get,
+                root="Demand",
+            )
+        rules = _normalize_transport_branch_rules(rules)
+        keys = select_reconciliation_keys(rules, self.size.max_branches)
+        return {key: rules[key] for key in keys}
+
+    @cached_property
+    def branch_mappings(self) -> list[tuple[tuple, tuple]]:
+        needed = set()
+        for rules in self.branch_rules.values():
+            needed.update(_branches_for_rules(rules))
+        return [(leap, src) for leap, src in LEAP_BRANCH_TO_SOURCE_MAP.items() if leap in needed]
+
+    def measure_calls(self) -> list[tuple[tuple, dict]]:
+        """(args, kwargs) for each process_measures_for_leap call of the branch loop."""
+        calls = []
+        for leap_tuple, src_tuple in self.branch_mappings:
+            ttype, medium, vtype, drive, fuel, _, grouping = pipeline.process_transport_branch_mapping(
+                leap_tuple, src_tuple
+            )
+            (shortname,) = {k for k, v in SHORTNAME_TO_LEAP_BRANCHES.items() if leap_tuple in v}
+            args = (
+                self.prepared_input,
+                LEAP_MEASURE_CONFIG[shortname],
+                shortname,
+                grouping,
+                ttype,
+                medium,
+                vtype,
+                drive,
+                fuel,
+                src_tuple,
+            )
+            calls.append((args, {"leap_tuple": leap_tuple}))
+        return calls
+
+    @cached_property
+    def long_export(self) -> pd.DataFrame:
+        """Branch-loop output after share validation and Current Accounts split."""
+        export_df = pipeline.create_transport_export_df()
+        with _quiet():
+            for leap_tuple, src_tuple in self.branch_mappings:
+                export_df = pipeline.process_single_leap_transport_mapping(
+                    L=None,
+                    df=self.prepared_input,
+                    leap_tuple=leap_tuple,
+                    src_tuple=src_tuple,
+                    diagnose_method="all",
+                    first_branch_diagnosed=False,
+                    first_of_each_length_diagnosed=set(),
+                    SHORTNAME_TO_LEAP_BRANCHES=SHORTNAME_TO_LEAP_BRANCHES,
+                    LEAP_MEASURE_CONFIG=LEAP_MEASURE_CONFIG,
+                    leap_export_df=export_df,
+                    TRANSPORT_ROOT="Demand",
+                    CHECK_BRANCHES_IN_LEAP_USING_COM=False,
+                    AUTO_SET_MISSING_BRANCHES=False,
+                )
+            export_df = pipeline.validate_and_fix_shares_normalise_to_one(export_df, EXAMPLE_SAMPLE_SIZE=5)
+            return pipeline.separate_current_accounts_from_scenario(
+                export_df, base_year=self.config.base_year, scenario=self.scenario
+            )
+
+    def finalise(self) -> pd.DataFrame:
+        return pipeline.finalise_export_df(
+            self.long_export,
+            scenario=self.scenario,
+            region=REGION,
+            base_year=self.config.base_year,
+            final_year=self.config.final_year,
+        )
+
+    @cached_property
+    def finalised_export(self) -> pd.DataFrame:
+        with _quiet():
+            export_df, _ = pipeline.normalize_share_columns_wide(self.finalise())
+        return export_df
+
+    @cached_property
+    def viewing_export(self) -> pd.DataFrame:
+        with _quiet():
+            _, viewing_df = pipeline.convert_values_to_expressions(self.finalised_export)
+        return viewing_df
+
+    @cached_property
+    def esto_energy_totals(self) -> dict:
+        with _quiet():
+            esto_df = load_transport_energy_dataset(self.paths["esto"], economy=self.economy)
+            totals = build_transport_esto_energy_totals(
+                esto_df=esto_df,
+                economy=self.economy,
+                original_scenario=self.scenario,
+                base_year=self.config.base_year,
+                final_year=self.config.final_year,
+            )
+        return {key: totals[key] for key in self.branch_rules}
+
+    @cached_property
+    def apec_source(self) -> pd.DataFrame:
+        economies = tuple(f"{idx:02d}_SYN" for idx in range(1, self.size.apec_economies + 1))
+        return sd.clone_prepared_input(self.prepared_input, economies, seed=self.config.seed)
+
+    @cached_property
+    def stock_series(self) -> list[tuple[pd.Series, pd.Series, pd.Series]]:
+        return sd.build_stock_series(self.config, self.size.stock_series, max_age=self.size.max_age)
+
+    @cached_property
+    def sales_batch_esto_path(self) -> str:
+        """ESTO balances for the `apec_source` economies, next to the other synthetic files."""
+        economies = tuple(self.apec_source["Economy"].unique())
+        path = Path(self.paths["esto"]).with_name("synthetic_esto_balances_batch.csv")
+        sd.build_esto_balances(replace(self.config, economies=economies)).to_csv(path, index=False)
+        return str(path)
+
+    @cached_property
+    def turnover_policy(self) -> dict:
+        years = self.config.years
+        return {
+            "additional_retirement_rate": {year: 0.02 for year in years[len(years) // 3 :]},
+            "age_multipliers": {age: 1.5 for age in range(15, self.size.max_age + 1)},
+        }
+
+
+# name -> setup(workspace) returning (callable to time, rows processed per call)
+BENCHMARKS: dict[str, Callable[[SyntheticWorkspace], tuple[Callable[[], object], int]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@benchmark("process_measures_for_leap")
+def _bench_process_measures(ws: SyntheticWorkspace):
+    calls = ws.measure_calls()
+
+    def run():
+        for args, kwargs in calls:
+            process_measures_for_leap(*args, **kwargs)
+
+    return run, len(ws.prepared_input) * len(calls)
+
+
+@benchmark("finalise_export_df")
+def _bench_finalise(ws: SyntheticWorkspace):
+    return ws.finalise, len(ws.long_export)
+
+
+@benchmark("convert_values_to_expressions")
+def _bench_convert(ws: SyntheticWorkspace):
+    export_df = ws.finalised_export
+    return (lambda: pipeline.convert_values_to_expressions(export_df)), len(export_df)
+
+
+@benchmark("reconcile_energy_use")
+def _bench_reconcile(ws: SyntheticWorkspace):
+    viewing_df = ws.viewing_export
+    current_accounts = viewing_df[viewing_df["Scenario"] == "Current Accounts"].copy()
+    rules, totals = ws.branch_rules, ws.esto_energy_totals
+
+    def run():
+        return reconcile_energy_use(
+            export_df=current_accounts,
+            base_year=ws.config.base_year,
+            branch_mapping_rules=rules,
+            esto_energy_totals=totals,
+            energy_fn=transport_energy_fn,
+            adjustment_fn=transport_adjustment_fn,
+        )
+
+    return run, len(current_accounts)
+
+
+@benchmark("compute_sales_from_stock_targets")
+def _bench_sales_legacy(ws: SyntheticWorkspace):
+    series = ws.stock_series
+
+    def run():
+        for target_stock, survival, vintage in series:
+            sales_curve_estimate.compute_sales_from_stock_targets(
+                target_stock, survival, vintage, return_retirements=True
+            )
+
+    return run, len(series) * len(ws.config.years)
+
+
+@benchmark("compute_sales_from_stock_target_matrix")
+def _bench_sales_matrix(ws: SyntheticWorkspace):
+    series = ws.stock_series
+    vehicles = [f"vehicle_{idx}" for idx in range(len(series))]
+    targets = pd.DataFrame({vehicle: target for vehicle, (target, _, _) in zip(vehicles, series)}).T
+    survival = {vehicle: surv for vehicle, (_, surv, _) in zip(vehicles, series)}
+    vintage = {vehicle: vint for vehicle, (_, _, vint) in zip(vehicles, series)}
+
+    def run():
+        return sales_curve_estimate.compute_sales_from_stock_target_matrix(targets, survival, vintage)
+
+    return run, len(series) * len(ws.config.years)
+
+
+@benchmark("compute_sales_from_stock_targets[policy]")
+def _bench_sales_policy(ws: SyntheticWorkspace):
+    series, policy = ws.stock_series, ws.turnover_policy
+
+    def run():
+        for target_stock, survival, vintage in series:
+            sales_workflow.compute_sales_from_stock_targets(
+                target_stock, survival, vintage, turnover_policy=policy, return_retirements=True
+            )
+
+    return run, len(series) * len(ws.config.years)
+
+
+@benchmark("estimate_sales_for_economies")
+def _bench_sales_batch(ws: SyntheticWorkspace):
+    df, esto_path = ws.apec_source, ws.sales_batch_esto_path
+    profiles = ws.stock_series
+    vehicles = {"passenger": ("LPV", "MC", "Bus"), "freight": ("Trucks", "LCVs")}
+    requests = {
+        transport_type: {
+            economy: {
+                "df": df,
+                "survival_curves": {vehicle: profiles[idx][1] for idx, vehicle in enumerate(keys)},
+                "vintage_profiles": {vehicle: profiles[idx][2] for idx, vehicle in enumerate(keys)},
+                "economy": economy,
+                "scenario": ws.scenario,
+                "base_year": ws.config.base_year,
+                "final_year": ws.config.final_year,
+                "esto_energy_path": esto_path,
+            }
+            for economy in df["Economy"].unique()
+        }
+        for transport_type, keys in vehicles.items()
+    }
+
+    def run():
+        with _quiet():
+            for transport_type, economy_requests in requests.items():
+                sales_workflow.estimate_sales_for_economies(transport_type, economy_requests)
+
+    return run, len(df)
+
+
+@benchmark("derive_vehicle_turnover_policies_from_drive_policy")
+def _bench_drive_policy(ws: SyntheticWorkspace):
+    df = ws.prepared_input
+    years = pd.Index(ws.config.years, dtype=int)
+    drive_policy = {"ICE": {years[0]: 0.0, years[-1]: 0.05}, "phev": 0.01}
+
+    def run():
+        for transport_type in ("passenger", "freight"):
+            sales_workflow.derive_vehicle_turnover_policies_from_drive_policy(
+                df,
+                years,
+                drive_turnover_policy=drive_policy,
+                transport_type=transport_type,
+                economy=ws.economy,
+                scenario=ws.scenario,
+            )
+
+    return run, len(df)
+
+
+@benchmark("aggregate_economies_to_apec")
+def _bench_apec(ws: SyntheticWorkspace):
+    source_df = ws.apec_source
+    return (lambda: pipeline.aggregate_economies_to_apec(source_df, scenario=ws.scenario)), len(source_df)
+
+
+def time_benchmark(run: Callable[[], object], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        with _quiet():
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(size_name: str, names: list[str], repeat: int) -> dict[str, dict]:
+    size = SIZES[size_name]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="transport_bench_") as folder:
+        workspace = SyntheticWorkspace(size, Path(folder))
+        for name in names:
+            setup_start = time.perf_counter()
+            run, rows = BENCHMARKS[name](workspace)
+            setup_seconds = time.perf_counter() - setup_start
+            timings = time_benchmark(run, repeat)
+            results[name] = {
+                "median_seconds": round(statistics.median(timings), 4),
+                "min_seconds": round(min(timings), 4),
+                "repeat": repeat,
+                "rows": int(rows),
+            }
+            print(
+                f"[TIMING] {name}: median {results[name]['median_seconds']:.4f}s, "
+                f"min {results[name]['min_seconds']:.4f}s over {repeat} run(s), {rows} rows "
+                f"(setup {setup_seconds:.1f}s)"
+            )
+    return results
+
+
+def environment_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def baseline_path(size_name: str) -> Path:
+    return BASELINE_DIR / f"{size_name}.json"
+
+
+def save_baseline(size_name: str, results: dict[str, dict]) -> Path:
+    path = baseline_path(size_name)
+    existing = load_baseline(size_name)
+    payload = {
+        "size": size_name,
+        "config": asdict(SIZES[size_name]),
+        "environment": environment_info(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        # Keep baselines of benchmarks that were not part of this run.
+        "results": {**(existing or {}).get("results", {}), **results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_baseline(size_name: str) -> dict | None:
+    path = baseline_path(size_name)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_to_baseline(size_name: str, results: dict[str, dict], tolerance: float) -> list[str]:
+    """Print median ratios against the stored baseline; return the names that regressed."""
+    baseline = load_baseline(size_name)
+    if baseline is None:
+        print(f"[WARN] No baseline for size '{size_name}' at {baseline_path(size_name)}; run with --save-baseline.")
+        return []
+    if baseline.get("environment", {}).get("platform") != environment_info()["platform"]:
+        print("[WARN] Baseline was recorded on a different platform; ratios are only indicative.")
+    regressions = []
+    print(f"\n{'benchmark':<42} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<42} {'-':>10} {result['median_seconds']:>10.4f} {'-':>7}")
+            continue
+        ratio = result["median_seconds"] / max(base["median_seconds"], 1e-9)
+        flag = ""
+        if ratio > 1.0 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<42} {base['median_seconds']:>10.4f} {result['median_seconds']:>10.4f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument(
+        "--only",
+        default="",
+        help=f"Comma-separated benchmarks to run (default: all). Available: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the size's baseline.")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the stored baseline.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown before a benchmark counts as a regression (0.25 = 25%%).",
+    )
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(",") if name.strip()] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {unknown}. Use one of: {', '.join(BENCHMARKS)}.")
+
+    results = run_benchmarks(args.size, names, max(1, args.repeat))
+    regressions = compare_to_baseline(args.size, results, args.tolerance) if args.compare else []
+    if args.save_baseline:
+        print(f"[INFO] Saved baseline: {save_baseline(args.size, results)}")
+    if regressions:
+        print(f"[WARN] {len(regressions)} benchmark(s) slower than baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
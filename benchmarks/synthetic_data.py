@@ -0,0 +1,314 @@
+"""Synthetic 9th-edition-shaped inputs for the benchmark suite.
+
+Everything here is generated in memory (or written to a caller-supplied
+temporary folder), so the benchmarks run offline without any files from
+data/. The generated tables follow the layouts the pipeline reads:
+
+- the 9th transport model output (one row per economy/scenario/year/leaf of
+  SOURCE_CSV_TREE, with every measure column),
+- the per-fuel energy file used to split out biofuel/efuel rows,
+- a merged-energy ESTO balance table covering every NINTH_SOURCE_TO_LEAP_BRANCH_MAP key,
+- a LEAP import template built from a finalised export,
+- stock/survival/vintage series for the sales turnover kernels.
+
+`prepare_synthetic_input` runs the same preprocessing steps as
+prepare_input_data (without the checkpoint), so the result has the shape of a
+real prepared input frame.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+for path in (CODE_DIR / "functions", CODE_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from config.basic_mappings import (
+    EXPECTED_COLS_IN_SOURCE,
+    SOURCE_CSV_TREE,
+    SOURCE_MEASURE_COLS,
+    add_fuel_column,
+)
+from configurations.branch_mappings import (
+    NINTH_SOURCE_TO_LEAP_BRANCH_MAP,
+    create_new_source_rows_based_on_combinations,
+    create_new_source_rows_based_on_proxies_with_no_activity,
+)
+from functions.esto_data import extract_other_type_rows_from_esto_and_insert_into_transport_df
+from functions.preprocessing import (
+    allocate_fuel_alternatives_energy_and_activity,
+    apply_source_dtypes,
+    calculate_sales,
+    normalize_and_calculate_shares,
+)
+
+# Drive breadth presets: "full" keeps every drive in SOURCE_CSV_TREE.
+ROAD_DRIVES_BY_BREADTH = {
+    "narrow": ("bev", "ice_d", "ice_g"),
+    "medium": ("bev", "ice_d", "ice_g", "phev_d", "phev_g", "cng"),
+    "full": None,
+}
+
+# Per-fuel codes written to the fuels file, keyed by the fuel names add_fuel_column assigns.
+_FUEL_FILE_CODES = {
+    "Gas and diesel oil": ("07_07_gas_diesel_oil", ("16_06_biodiesel", "16_x_efuel")),
+    "Motor gasoline": ("07_01_motor_gasoline", ("16_05_biogasoline", "16_x_efuel")),
+    "Kerosene type jet fuel": ("07_x_jet_fuel", ("16_07_bio_jet_kerosene", "16_x_efuel")),
+    "Natural gas": ("08_01_natural_gas", ("16_01_biogas",)),
+}
+
+_ESTO_YEAR_START = 2000
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """Size knobs for the generated inputs."""
+
+    economies: tuple[str, ...] = ("01_AUS",)
+    scenarios: tuple[str, ...] = ("Reference",)
+    base_year: int = 2022
+    final_year: int = 2060
+    drive_breadth: str = "full"
+    seed: int = 0
+
+    @property
+    def years(self) -> list[int]:
+        return list(range(self.base_year, self.final_year + 1))
+
+
+def _tree_leaves(drive_breadth: str) -> list[tuple[str, str, str, str]]:
+    if drive_breadth not in ROAD_DRIVES_BY_BREADTH:
+        raise ValueError(
+            f"Unknown drive_breadth '{drive_breadth}'. Use one of: {', '.join(ROAD_DRIVES_BY_BREADTH)}."
+        )
+    road_drives = ROAD_DRIVES_BY_BREADTH[drive_breadth]
+    leaves = []
+    for transport_type, mediums in SOURCE_CSV_TREE.items():
+        for medium, vehicle_types in mediums.items():
+            for vehicle_type, drives in vehicle_types.items():
+                for drive in drives:
+                    if medium == "road" and road_drives is not None and drive not in road_drives:
+                        continue
+                    leaves.append((transport_type, medium, vehicle_type, drive))
+    return leaves
+
+
+def build_source_frame(config: SyntheticConfig) -> pd.DataFrame:
+    """Return a 9th transport model output table (EXPECTED_COLS_IN_SOURCE layout)."""
+    rng = np.random.default_rng(config.seed)
+    leaves = _tree_leaves(config.drive_breadth)
+    index = pd.MultiIndex.from_product(
+        [config.economies, config.scenarios, config.years, range(len(leaves))],
+        names=["Economy", "Scenario", "Date", "_leaf"],
+    )
+    df = index.to_frame(index=False)
+    leaf_frame = pd.DataFrame(leaves, columns=["Transport Type", "Medium", "Vehicle Type", "Drive"])
+    df = df.join(leaf_frame, on="_leaf").drop(columns="_leaf")
+
+    rows = len(df)
+    years_since_base = (df["Date"] - config.base_year).to_numpy(dtype=float)
+    growth = np.power(1.01 + rng.uniform(0.0, 0.02, rows), years_since_base)
+    is_road = (df["Medium"] == "road").to_numpy()
+
+    stocks = rng.uniform(0.5, 50.0, rows) * growth
+    mileage = rng.uniform(8_000.0, 20_000.0, rows)
+    occupancy = rng.uniform(1.0, 20.0, rows)
+    efficiency = rng.uniform(5.0, 20.0, rows)
+    travel_km = stocks * mileage / 1e3
+    activity = np.where(is_road, travel_km * occupancy / 1e3, rng.uniform(1.0, 500.0, rows) * growth)
+    intensity = rng.uniform(0.5, 3.0, rows)
+    energy = np.where(is_road, travel_km / efficiency, activity * intensity)
+
+    measures = {
+        "Efficiency": efficiency,
+        "Energy": energy,
+        "Mileage": mileage,
+        "Stocks_old": stocks * 0.95,
+        "Activity": activity,
+        "Occupancy_or_load": occupancy,
+        "Intensity": intensity,
+        "Activity_per_Stock": activity / stocks,
+        "Travel_km": travel_km,
+        "Stocks": np.where(is_road, stocks, 0.0),
+        "Activity_efficiency_improvement": rng.uniform(0.99, 1.01, rows),
+        "Average_age": rng.uniform(5.0, 15.0, rows),
+        "Gdp": rng.uniform(1e3, 2e3, rows) * growth,
+        "Gdp_per_capita": rng.uniform(20.0, 60.0, rows),
+        "New_vehicle_efficiency": efficiency * 1.05,
+        "Population": rng.uniform(10.0, 100.0, rows),
+        "Surplus_stocks": np.zeros(rows),
+        "Stocks_per_thousand_capita": rng.uniform(100.0, 800.0, rows),
+        "Turnover_rate": rng.uniform(0.03, 0.1, rows),
+        "Vehicle_sales_share": rng.uniform(0.0, 1.0, rows),
+        "Stock_turnover": stocks * 0.05,
+        "New_stocks_needed": stocks * 0.08,
+        "Non_road_intensity_improvement": rng.uniform(0.99, 1.01, rows),
+        "Activity_growth": rng.uniform(0.0, 0.03, rows),
+    }
+    for col in SOURCE_MEASURE_COLS:
+        df[col] = measures.get(col, 0.0)
+    df["Age_distribution"] = ""
+    df["Unit"] = ""
+    df["Data_available"] = "data_available"
+    df["Measure"] = ""
+    return df[EXPECTED_COLS_IN_SOURCE]
+
+
+def build_fuels_frame(source_df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """Return the per-fuel energy table read by allocate_fuel_alternatives_energy_and_activity."""
+    rng = np.random.default_rng(seed)
+    with_fuels = add_fuel_column(source_df)
+    frames = []
+    key_cols = ["Date", "Economy", "Scenario", "Transport Type", "Vehicle Type", "Drive", "Medium"]
+    for fuel_name, (fossil_code, alternative_codes) in _FUEL_FILE_CODES.items():
+        rows = with_fuels.loc[with_fuels["Fuel"] == fuel_name, key_cols + ["Energy"]]
+        if rows.empty:
+            continue
+        frames.append(rows.assign(Fuel=fossil_code))
+        for code in alternative_codes:
+            frames.append(
+                rows.assign(Fuel=code, Energy=rows["Energy"] * rng.uniform(0.0, 0.1, len(rows)))
+            )
+    return pd.concat(frames, ignore_index=True)[key_cols + ["Fuel", "Energy"]]
+
+
+def build_esto_balances(config: SyntheticConfig) -> pd.DataFrame:
+    """Return a merged-energy ESTO table with one row per mapped ESTO key, economy and scenario."""
+    rng = np.random.default_rng(config.seed + 1)
+    years = list(range(_ESTO_YEAR_START, config.final_year + 1))
+    rows = []
+    for economy in config.economies:
+        for scenario in config.scenarios:
+            for esto_key in NINTH_SOURCE_TO_LEAP_BRANCH_MAP:
+                if len(esto_key) == 3:
+                    sub1sector, fuel, subfuel = esto_key
+                    sub2sector = "x"
+                else:
+                    sub1sector, sub2sector, fuel, subfuel = esto_key
+                rows.append(
+                    {
+                        "scenarios": scenario.lower(),
+                        "economy": economy,
+                        "sectors": "15_transport_sector",
+                        "sub1sectors": sub1sector,
+                        "sub2sectors": sub2sector,
+                        "sub3sectors": "x",
+                        "sub4sectors": "x",
+                        "fuels": fuel,
+                        "subfuels": subfuel,
+                        "subtotal_layout": False,
+                        "subtotal_results": False,
+                    }
+                )
+    df = pd.DataFrame(rows)
+    values = rng.uniform(1.0, 200.0, (len(df), len(years)))
+    return pd.concat([df, pd.DataFrame(values, columns=years)], axis=1)
+
+
+def write_synthetic_files(config: SyntheticConfig, folder: str | Path) -> dict[str, str]:
+    """Write the source, fuels and ESTO files into `folder`; return their paths."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    source_df = build_source_frame(config)
+    paths = {
+        "source": folder / "synthetic_transport_model.csv",
+        "fuels": folder / "synthetic_transport_fuels.csv",
+        "esto": folder / "synthetic_esto_balances.csv",
+    }
+    source_df.to_csv(paths["source"], index=False)
+    build_fuels_frame(source_df, seed=config.seed).to_csv(paths["fuels"], index=False)
+    build_esto_balances(config).to_csv(paths["esto"], index=False)
+    return {name: str(path) for name, path in paths.items()}
+
+
+def prepare_synthetic_input(
+    config: SyntheticConfig,
+    paths: dict[str, str],
+    economy: str,
+    scenario: str,
+) -> pd.DataFrame:
+    """Run prepare_input_data's preprocessing steps on the synthetic files for one economy."""
+    source_df = pd.read_csv(paths["source"])
+    df = source_df[(source_df["Economy"] == economy) & (source_df["Scenario"] == scenario)]
+    df = df.drop(columns=["Unit", "Data_available", "Measure"])
+    df = apply_source_dtypes(add_fuel_column(apply_source_dtypes(df)))
+    df.loc[df["Medium"] != "road", ["Stocks", "Vehicle_sales_share"]] = 0
+    df = allocate_fuel_alternatives_energy_and_activity(df, economy, scenario, paths["fuels"])
+    df = pd.concat([df, create_new_source_rows_based_on_combinations(df)], ignore_index=True)
+    df = pd.concat(
+        [df, create_new_source_rows_based_on_proxies_with_no_activity(df, strict_missing=False)],
+        ignore_index=True,
+    )
+    df = apply_source_dtypes(df)
+    df = calculate_sales(df)
+    df = normalize_and_calculate_shares(df)
+    df = extract_other_type_rows_from_esto_and_insert_into_transport_df(
+        df, config.base_year, config.final_year, economy, scenario, paths["esto"]
+    )
+    return apply_source_dtypes(df)
+
+
+def build_import_template(export_df: pd.DataFrame) -> pd.DataFrame:
+    """Return a LEAP import template (ID columns plus the export keys) for a finalised export."""
+    key_cols = ["Branch Path", "Variable", "Scenario", "Region"]
+    template = export_df[key_cols].drop_duplicates().reset_index(drop=True)
+    template.insert(0, "BranchID", range(1, len(template) + 1))
+    template.insert(1, "VariableID", template["Variable"].astype("category").cat.codes + 1)
+    template.insert(2, "ScenarioID", template["Scenario"].astype("category").cat.codes + 1)
+    template.insert(3, "RegionID", template["Region"].astype("category").cat.codes + 1)
+    return template
+
+
+def clone_prepared_input(prepared_df: pd.DataFrame, economies: tuple[str, ...], seed: int = 0) -> pd.DataFrame:
+    """
+    Return one prepared frame per economy (concatenated) by relabelling and
+    rescaling `prepared_df`. Much cheaper than preparing each economy.
+    """
+    rng = np.random.default_rng(seed)
+    numeric_cols = prepared_df.select_dtypes("number").columns.drop("Date", errors="ignore")
+    frames = []
+    for economy in economies:
+        frame = prepared_df.copy()
+        frame["Economy"] = economy
+        frame[numeric_cols] = frame[numeric_cols] * rng.uniform(0.5, 1.5, (len(frame), len(numeric_cols)))
+        frames.append(frame)
+    return apply_source_dtypes(pd.concat(frames, ignore_index=True))
+
+
+def build_stock_series(
+    config: SyntheticConfig,
+    count: int,
+    max_age: int = 30,
+) -> list[tuple[pd.Series, pd.Series, pd.Series]]:
+    """Return `count` (target_stock, survival_curve, vintage_profile) triples."""
+    rng = np.random.default_rng(config.seed + 2)
+    years = pd.Index(config.years, dtype=int)
+    ages = pd.Index(range(max_age + 1), dtype=int)
+    series = []
+    for _ in range(count):
+        growth = rng.uniform(-0.01, 0.04)
+        target_stock = pd.Series(
+            rng.uniform(50.0, 5_000.0) * np.power(1.0 + growth, np.arange(len(years))),
+            index=years,
+        )
+        median_life = rng.uniform(10.0, 20.0)
+        survival = np.exp(-np.power(np.arange(max_age + 1) / median_life, 3.0) * np.log(2.0))
+        survival[-1] = 0.0
+        vintage = np.exp(-np.arange(max_age + 1) / rng.uniform(5.0, 12.0))
+        vintage[0] = 0.0
+        series.append(
+            (
+                target_stock,
+                pd.Series(survival, index=ages),
+                pd.Series(vintage / vintage.sum(), index=ages),
+            )
+        )
+    return series
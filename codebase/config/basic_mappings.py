@@ -4,6 +4,20 @@ import pandas as pd
 EXPECTED_COLS_IN_SOURCE = [
     "Economy", "Date", "Medium", "Vehicle Type", "Transport Type", "Drive", "Scenario", "Efficiency", "Energy", "Mileage", "Stocks_old", "Activity", "Occupancy_or_load", "Intensity", "Activity_per_Stock", "Travel_km", "Stocks", "Activity_efficiency_improvement", "Average_age", "Gdp", "Gdp_per_capita", "New_vehicle_efficiency", "Population", "Surplus_stocks", "Stocks_per_thousand_capita", "Turnover_rate", "Age_distribution", "Unit", "Data_available", "Measure", "Vehicle_sales_share", "Stock_turnover", "New_stocks_needed", "Non_road_intensity_improvement", "Activity_growth"
 ]
+# Column schema for the 9th transport model output. Dimension columns are read
+# as categoricals, Date as a compact integer and measures as float64; the
+# unused columns are never loaded.
+SOURCE_CATEGORICAL_COLS = ["Economy", "Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"]
+SOURCE_DATE_DTYPE = "int16"
+SOURCE_UNUSED_COLS = ["Unit", "Data_available", "Measure"]
+SOURCE_NON_NUMERIC_MEASURE_COLS = ["Age_distribution"]
+SOURCE_MEASURE_COLS = [
+    col for col in EXPECTED_COLS_IN_SOURCE
+    if col not in SOURCE_CATEGORICAL_COLS
+    and col != "Date"
+    and col not in SOURCE_UNUSED_COLS
+    and col not in SOURCE_NON_NUMERIC_MEASURE_COLS
+]
 SOURCE_CSV_TREE = {#this is the structure of the source csv file. Note that the fuels are not final fuels but rather the source fuel categories implied by each drive type. There are added fuels for low carobon fuels where applicable, such as efuels in most combustion engines, biofuels where applicable etc.
     "freight": {
         "air": {
@@ -182,27 +196,35 @@ def add_fuel_column(df):
     Returns:
     pandas.DataFrame: DataFrame with an additional 'Fuel' column and duplicate rows for multiple fuels
     """
-    result_rows = []
+    key_cols = ['Transport Type', 'Medium', 'Vehicle Type', 'Drive']
+    fuel_map = pd.DataFrame(
+        [
+            (transport_type, medium, vehicle_type, drive, fuel)
+            for transport_type, mediums in SOURCE_CSV_TREE.items()
+            for medium, vehicle_types in mediums.items()
+            for vehicle_type, drives in vehicle_types.items()
+            for drive, fuels in drives.items()
+            for fuel in fuels
+        ],
+        columns=key_cols + ['Fuel'],
+    )
     
-    for _, row in df.iterrows():
-        transport_type = row['Transport Type']
-        medium = row['Medium']
-        vehicle_type = row['Vehicle Type']
-        drive = row['Drive']
-        
-        try:
-            # Navigate the nested dictionary to find the fuels for this combination
-            fuels = SOURCE_CSV_TREE[transport_type][medium][vehicle_type][drive]
-            
-            for fuel in fuels:
-                new_row = row.copy()
-                new_row['Fuel'] = fuel
-                result_rows.append(new_row)
-        except KeyError:
-            # Handle the case where the combination doesn't exist in the tree
-            raise ValueError(f"Combination not found in SOURCE_CSV_TREE: {transport_type}, {medium}, {vehicle_type}, {drive}")
+    # Merge on plain labels so categorical inputs match the tree; dtypes are
+    # restored afterwards so the caller's schema is kept.
+    keys = df[key_cols].astype(object)
+    keys['_row'] = range(len(df))
+    expanded = keys.merge(fuel_map, on=key_cols, how='left', sort=False)
+    missing = expanded['Fuel'].isna()
+    if missing.any():
+        # Handle the case where the combination doesn't exist in the tree
+        transport_type, medium, vehicle_type, drive = expanded.loc[missing, key_cols].iloc[0]
+        raise ValueError(f"Combination not found in SOURCE_CSV_TREE: {transport_type}, {medium}, {vehicle_type}, {drive}")
     
-    return pd.DataFrame(result_rows)
+    row_positions = expanded['_row'].to_numpy()
+    result = df.drop(columns=['Fuel'], errors='ignore').iloc[row_positions].copy()
+    fuel_position = list(df.columns).index('Fuel') if 'Fuel' in df.columns else len(result.columns)
+    result.insert(fuel_position, 'Fuel', expanded['Fuel'].to_numpy(dtype=object))
+    return result
 def convert_dict_tree_to_set_of_tuples(tree, path=()):
     """Convert nested dictionary tree to a set of tuples representing all paths, including intermediate branches."""
     tuples_set = set()
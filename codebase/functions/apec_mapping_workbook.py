@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 from pathlib import Path
 
 import pandas as pd
 
 from configurations.transport_economy_config import APEC_ESTO_BALANCES_PATH
+from functions.atomic_io import write_csv_atomic, write_pickle_atomic
 from functions.path_utils import resolve_str
 
 MAPPING_WORKBOOK_SHEETS: tuple[str, ...] = (
@@ -18,6 +22,20 @@ MAPPING_WORKBOOK_SHEETS: tuple[str, ...] = (
     "fuel_ninth_final_proposed",
 )
 
+# Parsed workbooks are cached per process and on disk, keyed by the SHA-256 of
+# the workbook bytes, so repeated economy runs do not re-read every sheet.
+MAPPING_WORKBOOK_CACHE_DIR = (
+    Path(__file__).resolve().parents[2] / "intermediate_data" / "mapping_workbook_cache"
+)
+USE_MAPPING_WORKBOOK_DISK_CACHE = True
+
+_WORKBOOK_DIGESTS: dict[tuple[str, int, int], str] = {}
+_MAPPING_WORKBOOK_CACHE: dict[str, dict[str, pd.DataFrame]] = {}
+_DERIVED_MAPPING_CACHE: dict[tuple, dict] = {}
+# Workbook rows that matched no LEAP branch, per derived ESTO-to-LEAP mapping,
+# so cached lookups repeat the warning the first build printed.
+_UNMATCHED_MAPPING_ROWS: dict[tuple, list[dict[str, object]]] = {}
+
 
 def _normalize_year_columns(df: pd.DataFrame) -> pd.DataFrame:
     rename_map: dict[str, int] = {}
@@ -120,12 +138,68 @@ def _branches_for_workbook_row(
     return []
 
 
-def load_mapping_workbook(mapping_workbook_path: str | Path) -> dict[str, pd.DataFrame]:
-    """Load the transport mapping workbook into a sheet-name keyed dict."""
+def clear_mapping_workbook_cache() -> None:
+    """Drop in-process parsed workbooks and memoized mapping dictionaries."""
+    _WORKBOOK_DIGESTS.clear()
+    _MAPPING_WORKBOOK_CACHE.clear()
+    _DERIVED_MAPPING_CACHE.clear()
+    _UNMATCHED_MAPPING_ROWS.clear()
+
+
+def _resolve_workbook_path(mapping_workbook_path: str | Path) -> str:
     resolved = resolve_str(mapping_workbook_path)
     if resolved is None:
         raise ValueError("Mapping workbook path cannot be None.")
-
+    return resolved
+
+
+def _mapping_workbook_digest(resolved: str) -> str:
+    """Return the workbook SHA-256, re-hashing only when mtime/size change."""
+    stat = os.stat(resolved)
+    stamp = (str(Path(resolved).resolve()), int(stat.st_mtime_ns), int(stat.st_size))
+    digest = _WORKBOOK_DIGESTS.get(stamp)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(resolved, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _WORKBOOK_DIGESTS[stamp] = digest
+    return digest
+
+
+def _mapping_workbook_cache_path(digest: str) -> Path:
+    return MAPPING_WORKBOOK_CACHE_DIR / f"mapping_workbook_{digest[:16]}.pkl"
+
+
+def _read_cached_mapping_workbook(digest: str) -> dict[str, pd.DataFrame] | None:
+    cache_path = _mapping_workbook_cache_path(digest)
+    if not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, "rb") as handle:
+            payload = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as exc:
+        print(f"[WARN] Ignoring unreadable mapping workbook cache {cache_path}: {exc}")
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("digest") != digest
+        or tuple(payload.get("sheets", {})) != MAPPING_WORKBOOK_SHEETS
+    ):
+        return None
+    return payload["sheets"]
+
+
+def _write_cached_mapping_workbook(digest: str, workbook: dict[str, pd.DataFrame]) -> None:
+    cache_path = _mapping_workbook_cache_path(digest)
+    try:
+        write_pickle_atomic({"digest": digest, "sheets": workbook}, cache_path)
+    except OSError as exc:
+        print(f"[WARN] Could not write mapping workbook cache {cache_path}: {exc}")
+
+
+def _parse_mapping_workbook(resolved: str) -> dict[str, pd.DataFrame]:
     workbook: dict[str, pd.DataFrame] = {}
     for sheet_name in MAPPING_WORKBOOK_SHEETS:
         frame = pd.read_excel(resolved, sheet_name=sheet_name)
@@ -136,6 +210,41 @@ def load_mapping_workbook(mapping_workbook_path: str | Path) -> dict[str, pd.Dat
     return workbook
 
 
+def _load_mapping_workbook_cached(mapping_workbook_path: str | Path) -> tuple[str, dict[str, pd.DataFrame]]:
+    """Return (digest, shared parsed sheets); callers must not mutate the frames."""
+    resolved = _resolve_workbook_path(mapping_workbook_path)
+    digest = _mapping_workbook_digest(resolved)
+    workbook = _MAPPING_WORKBOOK_CACHE.get(digest)
+    if workbook is None:
+        workbook = _read_cached_mapping_workbook(digest) if USE_MAPPING_WORKBOOK_DISK_CACHE else None
+        if workbook is None:
+            workbook = _parse_mapping_workbook(resolved)
+            if USE_MAPPING_WORKBOOK_DISK_CACHE:
+                _write_cached_mapping_workbook(digest, workbook)
+        _MAPPING_WORKBOOK_CACHE[digest] = workbook
+    return digest, workbook
+
+
+def load_mapping_workbook(mapping_workbook_path: str | Path) -> dict[str, pd.DataFrame]:
+    """Load the transport mapping workbook into a sheet-name keyed dict."""
+    _, workbook = _load_mapping_workbook_cached(mapping_workbook_path)
+    return {sheet_name: frame.copy() for sheet_name, frame in workbook.items()}
+
+
+def _copy_mapping(mapping: dict) -> dict:
+    return {key: list(values) for key, values in mapping.items()}
+
+
+def _transport_mapping_rows(workbook: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    esto_map = workbook["leap_combined_esto"]
+    transport_rows = esto_map[esto_map.apply(_is_transport_esto_row, axis=1)].copy()
+    if "leap_is_subtotal" in transport_rows.columns:
+        transport_rows = transport_rows[~transport_rows["leap_is_subtotal"].map(_to_bool)].copy()
+    if "esto_pair_is_subtotal" in transport_rows.columns:
+        transport_rows = transport_rows[~transport_rows["esto_pair_is_subtotal"].map(_to_bool)].copy()
+    return transport_rows
+
+
 def load_apec_esto_balances(
     apec_esto_path: str | Path = APEC_ESTO_BALANCES_PATH,
     *,
@@ -203,7 +312,7 @@ def build_transport_mapping_audit(
     The `leap_combined_esto` sheet is merged against the aggregated ESTO
     balance surface for the requested economy when provided.
     """
-    workbook = load_mapping_workbook(mapping_workbook_path)
+    _, workbook = _load_mapping_workbook_cached(mapping_workbook_path)
     esto_df = load_apec_esto_balances(esto_path, economy=economy)
     esto_agg = _agg_balance_surface(esto_df)
 
@@ -225,21 +334,33 @@ def build_transport_mapping_audit(
     return tables
 
 
+def _warn_unmatched_mapping_rows(matched_keys: int, unmatched_rows: list[dict[str, object]]) -> None:
+    if not unmatched_rows:
+        return
+    preview = pd.DataFrame(unmatched_rows).head(10).to_string(index=False)
+    print(
+        "[WARN] Some workbook transport mapping rows did not match LEAP branches; "
+        f"matched_keys={matched_keys}, unmatched_rows={len(unmatched_rows)}.\n{preview}"
+    )
+
+
 def build_workbook_esto_to_leap_mapping(
     mapping_workbook_path: str | Path,
     all_leap_branches: list[tuple[str, ...]] | tuple[tuple[str, ...], ...],
 ) -> dict[tuple[str, str], list[tuple[str, ...]]]:
     """Build raw ESTO (flow, product) to detailed LEAP branch mapping from workbook rows."""
-    workbook = load_mapping_workbook(mapping_workbook_path)
-    esto_map = workbook["leap_combined_esto"].copy()
-    transport_rows = esto_map[esto_map.apply(_is_transport_esto_row, axis=1)].copy()
-    if "leap_is_subtotal" in transport_rows.columns:
-        transport_rows = transport_rows[~transport_rows["leap_is_subtotal"].map(_to_bool)].copy()
-    if "esto_pair_is_subtotal" in transport_rows.columns:
-        transport_rows = transport_rows[~transport_rows["esto_pair_is_subtotal"].map(_to_bool)].copy()
+    digest, workbook = _load_mapping_workbook_cached(mapping_workbook_path)
+    branches_key = tuple(tuple(branch) for branch in all_leap_branches)
+    cache_key = ("esto_to_leap", digest, branches_key)
+    cached = _DERIVED_MAPPING_CACHE.get(cache_key)
+    if cached is not None:
+        _warn_unmatched_mapping_rows(len(cached), _UNMATCHED_MAPPING_ROWS.get(cache_key, []))
+        return _copy_mapping(cached)
+
+    transport_rows = _transport_mapping_rows(workbook)
 
     mapping: dict[tuple[str, str], list[tuple[str, ...]]] = {}
-    unmatched_rows = []
+    unmatched_rows: list[dict[str, object]] = []
     for _, row in transport_rows.iterrows():
         flow = str(row.get("esto_flow", "")).strip()
         product = str(row.get("esto_product", "")).strip()
@@ -270,12 +391,9 @@ def build_workbook_esto_to_leap_mapping(
         raise ValueError(
             "No workbook ESTO-to-LEAP transport mapping rows matched LEAP branches."
         )
-    if unmatched_rows:
-        preview = pd.DataFrame(unmatched_rows).head(10).to_string(index=False)
-        print(
-            "[WARN] Some workbook transport mapping rows did not match LEAP branches; "
-            f"matched_keys={len(mapping)}, unmatched_rows={len(unmatched_rows)}.\n{preview}"
-        )
+    _warn_unmatched_mapping_rows(len(mapping), unmatched_rows)
+    _DERIVED_MAPPING_CACHE[cache_key] = _copy_mapping(mapping)
+    _UNMATCHED_MAPPING_ROWS[cache_key] = unmatched_rows
     return mapping
 
 
@@ -283,13 +401,13 @@ def build_workbook_international_esto_to_leaf_mapping(
     mapping_workbook_path: str | Path,
 ) -> dict[tuple[str, str], list[tuple[str, str]]]:
     """Build raw ESTO bunker (flow, product) to international (medium, fuel) mapping."""
-    workbook = load_mapping_workbook(mapping_workbook_path)
-    esto_map = workbook["leap_combined_esto"].copy()
-    transport_rows = esto_map[esto_map.apply(_is_transport_esto_row, axis=1)].copy()
-    if "leap_is_subtotal" in transport_rows.columns:
-        transport_rows = transport_rows[~transport_rows["leap_is_subtotal"].map(_to_bool)].copy()
-    if "esto_pair_is_subtotal" in transport_rows.columns:
-        transport_rows = transport_rows[~transport_rows["esto_pair_is_subtotal"].map(_to_bool)].copy()
+    digest, workbook = _load_mapping_workbook_cached(mapping_workbook_path)
+    cache_key = ("international_esto_to_leaf", digest)
+    cached = _DERIVED_MAPPING_CACHE.get(cache_key)
+    if cached is not None:
+        return _copy_mapping(cached)
+
+    transport_rows = _transport_mapping_rows(workbook)
 
     mapping: dict[tuple[str, str], list[tuple[str, str]]] = {}
     for _, row in transport_rows.iterrows():
@@ -314,6 +432,7 @@ def build_workbook_international_esto_to_leaf_mapping(
         raise ValueError(
             "No workbook ESTO-to-international transport rows were found."
         )
+    _DERIVED_MAPPING_CACHE[cache_key] = _copy_mapping(mapping)
     return mapping
 
 
@@ -400,7 +519,7 @@ def write_transport_mapping_audit(
     for sheet_name, frame in audit_tables.items():
         economy_tag = str(economy).strip() if economy else "all"
         output_path = resolved_output_dir / f"transport_{sheet_name}_{economy_tag}_{scenario}.csv"
-        frame.to_csv(output_path, index=False)
+        write_csv_atomic(frame, output_path, index=False)
         output_paths[sheet_name] = output_path
 
     return output_paths
@@ -0,0 +1,268 @@
+"""Atomic output writes and race-free archive naming.
+
+Writers produce their output in a temporary file next to the target and then
+`os.replace` it into place, so readers (and concurrent runs) only ever see a
+complete previous file or a complete new file, never a half-written one. The
+temporary name keeps the target's extension, so writers that infer a format
+or engine from the suffix (Excel, pickle compression, savefig) still work.
+
+Archive and snapshot names are claimed with exclusive creates (`O_EXCL` /
+`mkdir`), so two processes archiving at the same moment never pick the same
+name or overwrite each other's archive.
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import os
+import time
+import uuid
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+_MAX_UNIQUE_SUFFIX = 9999
+
+
+def _claim_temporary_path(target: Path) -> str:
+    """Create an empty, uniquely named hidden file beside `target` and return its path."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        token = f"{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        tmp_name = str(target.with_name(f".{target.stem}.{token}.tmp{target.suffix}"))
+        try:
+            # Unlike tempfile.mkstemp this honours the umask, so the final file
+            # gets the same permissions as a plain open().
+            fd = os.open(tmp_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return tmp_name
+
+
+def _remove_if_present(path: str | os.PathLike) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_output_path(path: str | os.PathLike) -> Iterator[str]:
+    """
+    Yield a temporary path in the target's folder; when the block finishes
+    without error the temporary file replaces `path` atomically. On error the
+    temporary file is removed and `path` is left untouched.
+    """
+    target = Path(path)
+    tmp_name = _claim_temporary_path(target)
+    try:
+        yield tmp_name
+        os.replace(tmp_name, target)
+    except BaseException:
+        _remove_if_present(tmp_name)
+        raise
+
+
+@contextmanager
+def atomic_output_paths(
+    paths: Sequence[str | os.PathLike],
+    *,
+    keep_previous: Callable[[Path, Path], None] | None = None,
+) -> Iterator[list[str]]:
+    """
+    `atomic_output_path` for a batch of targets that should change together.
+
+    Yields one temporary path per target. Once the block finishes, existing
+    targets are moved aside and every temporary file is moved into place. If a
+    write or any move fails, the previous files are put back, new files are
+    removed and the error is re-raised, so the targets are left as they were.
+
+    After a successful swap each previous file is deleted, or handed to
+    `keep_previous(target, previous_path)` (e.g. to archive it) when given.
+    """
+    targets = [Path(path) for path in paths]
+    tmp_names: list[str] = []
+    set_aside: list[tuple[Path, str]] = []
+    replaced: list[Path] = []
+    try:
+        for target in targets:
+            tmp_names.append(_claim_temporary_path(target))
+        yield list(tmp_names)
+        for target in targets:
+            if not target.exists():
+                continue
+            previous_name = _claim_temporary_path(target)
+            try:
+                os.replace(target, previous_name)
+            except BaseException:
+                _remove_if_present(previous_name)
+                raise
+            set_aside.append((target, previous_name))
+        for tmp_name, target in zip(tmp_names, targets):
+            os.replace(tmp_name, target)
+            replaced.append(target)
+    except BaseException:
+        restored = {target for target, _ in set_aside}
+        for target in replaced:
+            if target not in restored:
+                _remove_if_present(target)
+        for target, previous_name in set_aside:
+            os.replace(previous_name, target)
+        for tmp_name in tmp_names:
+            _remove_if_present(tmp_name)
+        raise
+    for target, previous_name in set_aside:
+        if keep_previous is None:
+            _remove_if_present(previous_name)
+        else:
+            keep_previous(target, Path(previous_name))
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str | os.PathLike, **to_csv_kwargs: Any) -> None:
+    """`df.to_csv(path, ...)` through a temporary file."""
+    with atomic_output_path(path) as tmp_path:
+        df.to_csv(tmp_path, **to_csv_kwargs)
+
+
+def write_excel_atomic(df: pd.DataFrame, path: str | os.PathLike, **to_excel_kwargs: Any) -> None:
+    """`df.to_excel(path, ...)` through a temporary file."""
+    with atomic_output_path(path) as tmp_path:
+        df.to_excel(tmp_path, **to_excel_kwargs)
+
+
+def write_pickle_atomic(obj: Any, path: str | os.PathLike) -> None:
+    """`pd.to_pickle(obj, path)` through a temporary file."""
+    with atomic_output_path(path) as tmp_path:
+        pd.to_pickle(obj, tmp_path)
+
+
+def write_text_atomic(path: str | os.PathLike, text: str, encoding: str = "utf-8") -> None:
+    with atomic_output_path(path) as tmp_path:
+        with open(tmp_path, "w", encoding=encoding) as handle:
+            handle.write(text)
+
+
+def write_json_atomic(path: str | os.PathLike, payload: Any, **json_kwargs: Any) -> None:
+    write_text_atomic(path, json.dumps(payload, **json_kwargs) + "\n")
+
+
+def _unique_candidates(path: Path) -> Iterator[Path]:
+    yield path
+    for counter in range(1, _MAX_UNIQUE_SUFFIX + 1):
+        yield path.with_name(f"{path.stem}_{counter:02d}{path.suffix}")
+
+
+def reserve_unique_path(path: str | os.PathLike) -> Path:
+    """
+    Claim `path`, or `path` with an `_NN` suffix, by creating it exclusively.
+    The returned (empty) file belongs to the caller, who normally replaces it.
+    """
+    for candidate in _unique_candidates(Path(path)):
+        try:
+            fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return candidate
+    raise FileExistsError(errno.EEXIST, "No free name left for", str(path))
+
+
+def create_unique_directory(path: str | os.PathLike) -> Path:
+    """Create and return `path`, or `path` with an `_NN` suffix when it already exists."""
+    base = Path(path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    for counter in range(0, _MAX_UNIQUE_SUFFIX + 1):
+        candidate = base if counter == 0 else base.with_name(f"{base.name}_{counter:02d}")
+        try:
+            candidate.mkdir()
+        except FileExistsError:
+            continue
+        return candidate
+    raise FileExistsError(errno.EEXIST, "No free name left for", str(base))
+
+
+def claim_lock_file(lock_path: str | os.PathLike) -> bool:
+    """
+    Create `lock_path` exclusively (holding this process's id) and return
+    True, or return False when another run already holds it. The caller
+    removes the file to release the lock.
+    """
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(str(os.getpid()))
+    return True
+
+
+@contextmanager
+def locked_file(
+    lock_path: str | os.PathLike,
+    *,
+    stale_seconds: float,
+    poll_seconds: float = 0.02,
+    description: str = "file",
+) -> Iterator[None]:
+    """
+    Hold `lock_path` (see `claim_lock_file`) for the duration of the block,
+    waiting while another run holds it. A lock older than `stale_seconds` is
+    treated as left behind by a crashed run and removed.
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    while not claim_lock_file(lock_path):
+        try:
+            lock_age = time.time() - lock_path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if lock_age > stale_seconds:
+            print(f"[WARN] Removing stale {description} lock: {lock_path}")
+            lock_path.unlink(missing_ok=True)
+            continue
+        time.sleep(poll_seconds)
+    try:
+        yield
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+def move_to_unique_path(source: str | os.PathLike, destination: str | os.PathLike) -> Path | None:
+    """
+    Move `source` to `destination` (or a suffixed free name next to it).
+
+    Returns the new path, or None when `source` disappeared first (for example
+    because another run archived it already). The destination must be on the
+    same filesystem as `source` (e.g. a sibling archive folder).
+    """
+    reserved = reserve_unique_path(destination)
+    try:
+        os.replace(source, reserved)
+    except FileNotFoundError:
+        os.remove(reserved)
+        return None
+    except BaseException:
+        os.remove(reserved)
+        raise
+    return reserved
+
+
+__all__ = [
+    "atomic_output_path",
+    "atomic_output_paths",
+    "claim_lock_file",
+    "create_unique_directory",
+    "locked_file",
+    "move_to_unique_path",
+    "reserve_unique_path",
+    "write_csv_atomic",
+    "write_excel_atomic",
+    "write_json_atomic",
+    "write_pickle_atomic",
+    "write_text_atomic",
+]
@@ -0,0 +1,99 @@
+"""Shared Current Accounts reconciliation between scenarios.
+
+Every scenario export of an economy carries the same Current Accounts
+(base-year) block, and reconciliation fits that block to the ESTO base-year
+totals before scaling the scenario rows. When scenarios share the block, the
+iterative base-year fit only needs to run once per economy.
+
+Results are stored in a content-addressed pickle: the file name carries a
+digest of the Current Accounts block, the ESTO totals and the settings that
+shape the fit, so a result is only reused for identical inputs. A lock file
+makes concurrent scenario runs (threads or processes) wait for the first one
+to finish the fit instead of repeating it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from functions.atomic_io import claim_lock_file, write_pickle_atomic
+from functions.run_manifest import settings_digest
+
+# Bump when the cached result layout or the reconciliation fit changes.
+CURRENT_ACCOUNTS_CACHE_VERSION = 1
+
+
+def current_accounts_cache_key(
+    current_accounts_df: pd.DataFrame,
+    *,
+    esto_energy_totals: Mapping[Any, Any],
+    settings: Mapping[str, Any],
+) -> str:
+    """Digest of everything the Current Accounts fit depends on."""
+    digest = hashlib.sha256()
+    digest.update(str(CURRENT_ACCOUNTS_CACHE_VERSION).encode("utf-8"))
+    digest.update("|".join(f"{col}:{dtype}" for col, dtype in current_accounts_df.dtypes.items()).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(current_accounts_df, index=False).to_numpy().tobytes())
+    digest.update(settings_digest({"esto": esto_energy_totals, "settings": settings}).encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def load_or_build_current_accounts(
+    cache_path: str | os.PathLike,
+    build: Callable[[], dict],
+    *,
+    wait_seconds: float = 1800.0,
+    poll_seconds: float = 0.5,
+) -> tuple[dict, bool]:
+    """
+    Return `(result, reused)`. The result is loaded from `cache_path` when
+    another scenario already built it; otherwise `build()` runs and its result
+    is saved there. While another run holds the lock this waits (up to
+    `wait_seconds`) for that run's result. A lock older than `wait_seconds`
+    is treated as left behind by a crashed run and removed.
+    """
+    path = Path(cache_path)
+    lock_path = path.with_name(path.name + ".lock")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        if path.exists():
+            return pd.read_pickle(path), True
+        if claim_lock_file(lock_path):
+            break
+        try:
+            lock_age = time.time() - lock_path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if lock_age > wait_seconds:
+            print(f"[WARN] Removing stale Current Accounts lock: {lock_path}")
+            lock_path.unlink(missing_ok=True)
+            continue
+        if time.monotonic() > deadline:
+            print(f"[WARN] Timed out waiting for {lock_path}; fitting Current Accounts here.")
+            return build(), False
+        time.sleep(poll_seconds)
+
+    try:
+        # The result may have landed between the existence check and the claim.
+        if path.exists():
+            return pd.read_pickle(path), True
+        result = build()
+        write_pickle_atomic(result, path)
+        return result, False
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+__all__ = [
+    "CURRENT_ACCOUNTS_CACHE_VERSION",
+    "current_accounts_cache_key",
+    "load_or_build_current_accounts",
+]
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Dict, Iterable, Sequence
 
 import pandas as pd
+from functions.atomic_io import write_excel_atomic
 from functions.path_utils import ROOT_DIR, resolve_path
 
 DEFAULT_MERGED_DATA = ROOT_DIR / "data/merged_file_energy_ALL_20250814_pretrump.csv"
@@ -62,7 +63,7 @@ def export_apec_historical_sector_fuels(
     ].drop_duplicates()
 
     output_path = resolve_path(output_path)
-    unique_rows.to_excel(output_path, index=False)
+    write_excel_atomic(unique_rows, output_path, index=False)
     return unique_rows
 
 
@@ -93,7 +94,7 @@ def export_non_apec_historical_energy_use(
         export_df = pd.DataFrame(columns=merged_energy.columns)
 
     output_path = resolve_path(output_path)
-    export_df.to_excel(output_path, index=False)
+    write_excel_atomic(export_df, output_path, index=False)
     return export_df
 
 
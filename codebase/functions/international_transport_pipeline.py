@@ -10,7 +10,6 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 import re
-import shutil
 import sys
 
 import pandas as pd
@@ -20,6 +19,7 @@ from functions.apec_mapping_workbook import (
     build_workbook_international_esto_energy_totals,
     build_workbook_international_esto_to_leaf_mapping,
 )
+from functions.atomic_io import move_to_unique_path, write_csv_atomic
 from functions.path_utils import resolve_str
 from functions.transport_branch_paths import (
     TRANSPORT_ROOT,
@@ -1327,21 +1327,6 @@ def _sanitize_filename_token(value: str) -> str:
     return token or "scenario"
 
 
-def _build_unique_archive_path(path: Path) -> Path:
-    """Return a non-existing archive path by suffixing an increment if needed."""
-    if not path.exists():
-        return path
-
-    stem = path.stem
-    suffix = path.suffix
-    counter = 1
-    while True:
-        candidate = path.with_name(f"{stem}_{counter:02d}{suffix}")
-        if not candidate.exists():
-            return candidate
-        counter += 1
-
-
 def _archive_existing_output_file(path: Path, *, stamp: str | None = None) -> Path | None:
     """
     Move an existing output into a sibling `archive/` directory.
@@ -1354,10 +1339,8 @@ def _archive_existing_output_file(path: Path, *, stamp: str | None = None) -> Pa
     archive_dir = path.parent / "archive"
     archive_dir.mkdir(parents=True, exist_ok=True)
     safe_stamp = str(stamp).strip() if stamp is not None and str(stamp).strip() else datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    archived = archive_dir / f"{path.stem}_{safe_stamp}{path.suffix}"
-    archived = _build_unique_archive_path(archived)
-    shutil.move(str(path), str(archived))
-    return archived
+    # None when a concurrent run archived the same file first.
+    return move_to_unique_path(path, archive_dir / f"{path.stem}_{safe_stamp}{path.suffix}")
 
 
 def _drop_all_zero_rows_across_scenarios(export_long_df: pd.DataFrame) -> pd.DataFrame:
@@ -1505,7 +1488,7 @@ def run_international_export_workflow(
         archived_reconciliation = _archive_existing_output_file(reconciliation_path, stamp=archive_stamp)
         if archived_reconciliation is not None:
             print(f"[INFO] Archived previous reconciliation report to {archived_reconciliation}")
-        reconciliation_report_df.to_csv(reconciliation_path, index=False)
+        write_csv_atomic(reconciliation_report_df, reconciliation_path, index=False)
         output_paths["esto_reconciliation"] = str(reconciliation_path)
 
     if config.emit_medium_summary:
@@ -1517,7 +1500,7 @@ def run_international_export_workflow(
         archived_medium_summary = _archive_existing_output_file(medium_summary_path, stamp=archive_stamp)
         if archived_medium_summary is not None:
             print(f"[INFO] Archived previous medium summary to {archived_medium_summary}")
-        medium_summary_df.to_csv(medium_summary_path, index=False)
+        write_csv_atomic(medium_summary_df, medium_summary_path, index=False)
         output_paths["medium_summary"] = str(medium_summary_path)
 
     if config.emit_quality_report:
@@ -1529,7 +1512,7 @@ def run_international_export_workflow(
         archived_quality = _archive_existing_output_file(quality_path, stamp=archive_stamp)
         if archived_quality is not None:
             print(f"[INFO] Archived previous quality report to {archived_quality}")
-        quality_df.to_csv(quality_path, index=False)
+        write_csv_atomic(quality_df, quality_path, index=False)
         output_paths["quality"] = str(quality_path)
 
     print(
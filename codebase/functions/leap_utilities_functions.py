@@ -16,11 +16,14 @@ workflow; the COM helper names are kept here only so existing imports resolve.
 from __future__ import annotations
 
 import math
+import numbers
 from pathlib import Path
 from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import pandas as pd
 
+from functions.atomic_io import atomic_output_path
+
 
 # Branch type constants copied from leap_utilities/codebase/configuration/config.py.
 BRANCH_DEMAND_CATEGORY = 1
@@ -28,6 +31,16 @@ BRANCH_DEMAND_TECHNOLOGY = 4
 BRANCH_DEMAND_FUEL = 36
 
 
+# Workbook writer used by save_export_files. "streaming" writes rows through a
+# constant-memory engine; "pandas" keeps the original pd.ExcelWriter path.
+EXPORT_WRITER_MODES = ("streaming", "pandas")
+DEFAULT_EXPORT_WRITER_MODE = "streaming"
+EXPORT_WRITE_CHUNK_ROWS = 5000
+# Parquet copies of each written sheet, read back by read_export_sheets.
+WRITE_EXPORT_SIDECARS = True
+EXPORT_SIDECAR_SHEETS = ("LEAP", "FOR_VIEWING")
+
+
 # These globals are patched by transport_workflow_pipeline when structure checks
 # need all transport economy regions.
 scenario_dict = {
@@ -407,6 +420,116 @@ def finalise_export_df(log_df, scenario, region, base_year, final_year):
     return export_df
 
 
+def _resolve_export_writer_mode(writer_mode: Optional[str]) -> str:
+    mode = str(writer_mode or DEFAULT_EXPORT_WRITER_MODE).strip().lower()
+    if mode not in EXPORT_WRITER_MODES:
+        raise ValueError(
+            f"Invalid export writer mode '{writer_mode}'. Use one of: {', '.join(EXPORT_WRITER_MODES)}."
+        )
+    return mode
+
+
+def _build_export_header_rows(columns: Sequence[object], model_name: str) -> List[List[object]]:
+    """Return the three LEAP header rows (area/version row, blank row, column names)."""
+
+    labels = {
+        "Branch Path": "Area:",
+        "Variable": model_name,
+        "Scenario": "Ver:",
+        "Region": "2",
+    }
+    first_row = [labels.get(col) for col in columns]
+    blank_row: List[object] = [None] * len(columns)
+    return [first_row, blank_row, list(columns)]
+
+
+def _iter_export_row_chunks(df: pd.DataFrame, chunk_rows: int):
+    """Yield lists of plain Python row values, with missing values as None."""
+
+    chunk_rows = max(1, int(chunk_rows))
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        block = chunk.astype(object).where(chunk.notna(), None)
+        yield block.to_numpy(dtype=object).tolist()
+
+
+def _write_export_workbook_pandas(
+    out_path: Path,
+    sheets: Sequence[Tuple[str, pd.DataFrame]],
+    *,
+    model_name: str,
+) -> None:
+    """Write export sheets through ``pd.ExcelWriter`` (materializes each sheet)."""
+
+    with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
+        for sheet_name, df in sheets:
+            header_data_0 = {col: "" for col in df.columns}
+            header_data_0["Branch Path"] = "Area:"
+            header_data_0["Variable"] = model_name
+            header_data_0["Scenario"] = "Ver:"
+            header_data_0["Region"] = "2"
+            header_row_0 = pd.DataFrame([header_data_0])
+            nas = pd.DataFrame([{col: pd.NA for col in df.columns}])
+            header_row_2 = pd.DataFrame([df.columns], columns=df.columns)
+            sheet_df = pd.concat([header_row_0, nas, header_row_2, df], ignore_index=True)
+            sheet_df.to_excel(
+                writer, sheet_name=sheet_name, index=False, header=False, startrow=0
+            )
+
+
+def _write_export_workbook_streaming(
+    out_path: Path,
+    sheets: Sequence[Tuple[str, pd.DataFrame]],
+    *,
+    model_name: str,
+    chunk_rows: int = EXPORT_WRITE_CHUNK_ROWS,
+) -> None:
+    """
+    Write export sheets row by row with a constant-memory workbook engine.
+
+    Uses xlsxwriter in ``constant_memory`` mode when it is installed and falls
+    back to openpyxl's write-only workbook otherwise. Both engines flush each
+    row as it is written, so the whole workbook is never held in memory.
+    """
+
+    try:
+        import xlsxwriter
+    except ModuleNotFoundError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(
+            str(out_path),
+            {"constant_memory": True, "strings_to_urls": False, "nan_inf_to_errors": True},
+        )
+        try:
+            for sheet_name, df in sheets:
+                worksheet = workbook.add_worksheet(sheet_name)
+                row_idx = 0
+                for row in _build_export_header_rows(list(df.columns), model_name):
+                    worksheet.write_row(row_idx, 0, row)
+                    row_idx += 1
+                for rows in _iter_export_row_chunks(df, chunk_rows):
+                    for row in rows:
+                        worksheet.write_row(row_idx, 0, row)
+                        row_idx += 1
+        finally:
+            workbook.close()
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, df in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in _build_export_header_rows(list(df.columns), model_name):
+            worksheet.append(row)
+        for rows in _iter_export_row_chunks(df, chunk_rows):
+            for row in rows:
+                worksheet.append(row)
+    workbook.save(str(out_path))
+
+
 def save_export_files(
     leap_export_df,
     export_df_for_viewing,
@@ -414,14 +537,26 @@ def save_export_files(
     base_year,
     final_year,
     model_name,
+    *,
+    writer_mode: Optional[str] = None,
+    write_sidecars: bool = WRITE_EXPORT_SIDECARS,
 ):
-    """Save LEAP and FOR_VIEWING sheets to the workbook import file."""
+    """
+    Save LEAP and FOR_VIEWING sheets to the workbook import file.
+
+    ``writer_mode="streaming"`` (the default) writes rows in chunks through a
+    constant-memory engine. ``writer_mode="pandas"`` keeps the original
+    ``pd.ExcelWriter`` path, which materializes both sheets in memory.
+    When ``write_sidecars`` is True, each sheet frame is also written as a
+    Parquet sidecar (see ``write_export_sidecars``).
+    """
 
+    mode = _resolve_export_writer_mode(writer_mode)
     out_path = Path(leap_export_filename)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    leap_export_df2 = leap_export_df.copy()
-    export_df_for_viewing2 = export_df_for_viewing.copy()
+    leap_export_df2 = leap_export_df
+    export_df_for_viewing2 = export_df_for_viewing
 
     id_cols = ["BranchID", "VariableID", "ScenarioID", "RegionID"]
 
@@ -502,42 +637,19 @@ def save_export_files(
     _warn_missing_ids(leap_export_df2, label="LEAP sheet")
     _warn_missing_ids(export_df_for_viewing2, label="FOR_VIEWING sheet")
 
-    header_data_0 = {col: "" for col in leap_export_df2.columns}
-    header_data_0["Branch Path"] = "Area:"
-    header_data_0["Variable"] = model_name
-    header_data_0["Scenario"] = "Ver:"
-    header_data_0["Region"] = "2"
-    header_row_0 = pd.DataFrame([header_data_0])
-    nas = pd.DataFrame([{col: pd.NA for col in leap_export_df2.columns}])
-    header_row_2 = pd.DataFrame(
-        [leap_export_df2.columns], columns=leap_export_df2.columns
-    )
-    leap_export_df2 = pd.concat(
-        [header_row_0, nas, header_row_2, leap_export_df2], ignore_index=True
-    )
-
-    header_data_0_view = {col: "" for col in export_df_for_viewing2.columns}
-    header_data_0_view["Branch Path"] = "Area:"
-    header_data_0_view["Variable"] = model_name
-    header_data_0_view["Scenario"] = "Ver:"
-    header_data_0_view["Region"] = "2"
-    header_row_0_view = pd.DataFrame([header_data_0_view])
-    nas = pd.DataFrame([{col: pd.NA for col in export_df_for_viewing2.columns}])
-    header_row_2_view = pd.DataFrame(
-        [export_df_for_viewing2.columns], columns=export_df_for_viewing2.columns
-    )
-    export_df_for_viewing2 = pd.concat(
-        [header_row_0_view, nas, header_row_2_view, export_df_for_viewing2],
-        ignore_index=True,
-    )
+    sheets = [("FOR_VIEWING", export_df_for_viewing2), ("LEAP", leap_export_df2)]
+    # Write next to the target and rename, so a crash or a concurrent run
+    # never leaves a half-written workbook behind.
+    with atomic_output_path(out_path) as tmp_path:
+        if mode == "streaming":
+            _write_export_workbook_streaming(Path(tmp_path), sheets, model_name=model_name)
+        else:
+            _write_export_workbook_pandas(Path(tmp_path), sheets, model_name=model_name)
+    if write_sidecars:
+        write_export_sidecars(out_path, sheets)
+    else:
+        remove_export_sidecars(out_path)
 
-    with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
-        export_df_for_viewing2.to_excel(
-            writer, sheet_name="FOR_VIEWING", index=False, header=False, startrow=0
-        )
-        leap_export_df2.to_excel(
-            writer, sheet_name="LEAP", index=False, header=False, startrow=0
-        )
     print(
         "[OK] Created file for importing into leap, and viewing at "
         f"{leap_export_filename}, with {len(export_df_for_viewing)} entries."
@@ -548,6 +660,161 @@ def save_export_files(
     print("=" * 60)
 
 
+def export_sidecar_paths(workbook_path) -> Dict[str, Path]:
+    """Return the Parquet sidecar path for each sheet of an export workbook."""
+
+    path = Path(workbook_path)
+    return {
+        sheet_name: path.with_name(f"{path.stem}.{sheet_name}.parquet")
+        for sheet_name in EXPORT_SIDECAR_SHEETS
+    }
+
+
+def remove_export_sidecars(workbook_path) -> None:
+    for sidecar_path in export_sidecar_paths(workbook_path).values():
+        try:
+            sidecar_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# Companion columns holding the numbers of an object column that mixes text
+# and numbers (for example "Interp(...)" expressions next to plain values).
+_SIDECAR_INT_PREFIX = "__sidecar_int__:"
+_SIDECAR_FLOAT_PREFIX = "__sidecar_float__:"
+
+
+def _is_plain_number(value) -> bool:
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _frame_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make an export sheet Parquet-safe: string column names, and object columns
+    that pyarrow rejects split up. In a column mixing text and numbers the text
+    stays in the column and the ints/floats move to companion columns, which
+    ``_frame_from_parquet`` merges back. Values that are neither text nor
+    numbers (bools, dates) in such a column are stored as text.
+    """
+
+    out = df.copy()
+    out.columns = [str(col) for col in out.columns]
+    for col in list(out.columns):
+        series = out[col]
+        if series.dtype != object:
+            continue
+        values = series.dropna()
+        if values.empty:
+            continue
+        if values.map(_is_plain_number).all():
+            out[col] = pd.to_numeric(series, errors="coerce")
+            continue
+        if values.map(lambda v: isinstance(v, str)).all():
+            continue
+        is_number = series.map(_is_plain_number) & series.notna()
+        is_int = is_number & series.map(lambda v: isinstance(v, numbers.Integral))
+        is_float = is_number & ~is_int
+        if is_int.any():
+            out[_SIDECAR_INT_PREFIX + col] = pd.array(series.where(is_int, None).tolist(), dtype="Int64")
+        if is_float.any():
+            out[_SIDECAR_FLOAT_PREFIX + col] = pd.to_numeric(series.where(is_float), errors="coerce")
+        text = series.where(~is_number)
+        out[col] = text.where(text.isna(), text.astype(str))
+    return out
+
+
+def _frame_from_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Undo ``_frame_for_parquet``: merge companion number columns back into their
+    mixed object columns and restore 4-digit year column names to ints,
+    matching ``pd.read_excel`` output.
+    """
+
+    companions = [
+        col for col in df.columns if str(col).startswith((_SIDECAR_INT_PREFIX, _SIDECAR_FLOAT_PREFIX))
+    ]
+    if companions:
+        df = df.copy()
+        for companion in companions:
+            col = companion.split(":", 1)[1]
+            numbers_part = df[companion]
+            mask = numbers_part.notna().to_numpy()
+            merged = df[col].astype(object)
+            merged[mask] = [
+                int(value) if companion.startswith(_SIDECAR_INT_PREFIX) else float(value)
+                for value in numbers_part[mask]
+            ]
+            df[col] = merged
+        df = df.drop(columns=companions)
+    return df.rename(
+        columns=lambda col: int(col) if str(col).isdigit() and len(str(col)) == 4 else col
+    )
+
+
+def write_export_sidecars(workbook_path, sheets: Sequence[Tuple[str, pd.DataFrame]]) -> Dict[str, Path]:
+    """
+    Write a Parquet copy of each sheet frame next to an export workbook.
+
+    Sidecars let later stages (for example the combined workbook) reload the
+    frames without parsing the workbook again. Values round-trip unchanged
+    (see ``_frame_for_parquet``); object columns holding only numbers come back
+    as numeric columns, as they would from the workbook. Parquet support is
+    optional: when no engine is installed the sidecars are skipped and readers
+    fall back to the workbook.
+    """
+
+    paths = export_sidecar_paths(workbook_path)
+    written: Dict[str, Path] = {}
+    try:
+        for sheet_name, df in sheets:
+            if sheet_name not in paths:
+                continue
+            with atomic_output_path(paths[sheet_name]) as tmp_path:
+                _frame_for_parquet(df).to_parquet(tmp_path, index=False)
+            written[sheet_name] = paths[sheet_name]
+    except ImportError as exc:
+        remove_export_sidecars(workbook_path)
+        print(f"[INFO] Skipping Parquet export sidecars (no Parquet engine available: {exc}).")
+        return {}
+    except (ValueError, TypeError, OSError) as exc:
+        remove_export_sidecars(workbook_path)
+        print(f"[WARN] Could not write Parquet export sidecars for {workbook_path}: {exc}")
+        return {}
+    return written
+
+
+def read_export_sheets(workbook_path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Return ``(LEAP, FOR_VIEWING)`` frames for an export workbook.
+
+    Parquet sidecars are used when both exist and are at least as new as the
+    workbook; otherwise both sheets are parsed from the workbook itself.
+    """
+
+    path = Path(workbook_path)
+    sidecars = export_sidecar_paths(path)
+    try:
+        workbook_mtime = path.stat().st_mtime
+        sidecars_fresh = all(
+            sidecar.stat().st_mtime >= workbook_mtime for sidecar in sidecars.values()
+        )
+    except OSError:
+        sidecars_fresh = False
+
+    if sidecars_fresh:
+        try:
+            return (
+                _frame_from_parquet(pd.read_parquet(sidecars["LEAP"])),
+                _frame_from_parquet(pd.read_parquet(sidecars["FOR_VIEWING"])),
+            )
+        except (ImportError, ValueError, OSError) as exc:
+            print(f"[WARN] Could not read Parquet sidecars for {path}; reading workbook instead: {exc}")
+
+    leap_df = pd.read_excel(path, sheet_name="LEAP", header=2)
+    viewing_df = pd.read_excel(path, sheet_name="FOR_VIEWING", header=2)
+    return leap_df, viewing_df
+
+
 def merge_template_ids_into_export_df(
     export_df: pd.DataFrame,
     import_filename,
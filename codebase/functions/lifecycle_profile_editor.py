@@ -14,6 +14,7 @@ try:
 except ModuleNotFoundError:  # optional dependency for plotting utilities only
     plt = None
 import pandas as pd
+from functions.atomic_io import atomic_output_path, atomic_output_paths, move_to_unique_path
 from functions.path_utils import resolve_str
 
 
@@ -54,18 +55,8 @@ def load_lifecycle_profile_excel(path, sheet_name="Lifecycle Profiles"):
     return area_name, profile_name, profile
 
 
-def save_lifecycle_profile_excel(new_path, area_name, profile_name, profile, sheet_name="Lifecycle Profiles"):
-    """
-    Save a lifecycle profile dict {year: value} to Excel in the same
-    LEAP export format (Area/Profile/Year/Value).
-
-    If a file already exists at `new_path`, it is moved into an `archive/`
-    subfolder beside it with a timestamp suffix.
-    If a timestamped archive name already exists, an incrementing suffix
-    (_01, _02, ...) is applied in the archive only.
-    The new file is always written to `new_path` itself.
-    """
-    target_path = Path(new_path)
+def _lifecycle_profile_frame(area_name, profile_name, profile) -> pd.DataFrame:
+    """Rows of the LEAP lifecycle profile layout (Area/Profile/Year/Value)."""
     years = sorted(profile.keys())
     values = [profile[y] for y in years]
 
@@ -77,40 +68,97 @@ def save_lifecycle_profile_excel(new_path, area_name, profile_name, profile, she
     for y, v in zip(years, values):
         rows.append([y, v])
 
-    out_df = pd.DataFrame(rows)
+    return pd.DataFrame(rows)
 
-    # Move any existing file into archive with de-duplication there.
-    if target_path.exists():
-        archive_dir = target_path.parent / "archive"
-        archive_dir.mkdir(parents=True, exist_ok=True)
-        date_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        base_str = target_path.stem
-        ext = target_path.suffix
-        archived_candidate = archive_dir / f"{base_str}_{date_id}{ext}"
-        counter = 1
-        while archived_candidate.exists():
-            archived_candidate = archive_dir / f"{base_str}_{date_id}_{counter:02d}{ext}"
-            counter += 1
-        try:
-            target_path.rename(archived_candidate)
-            print(f"[INFO] Archived existing file to {archived_candidate}")
-        except PermissionError as e:
-            raise PermissionError(
-                f"Could not archive existing file (is it open?): {target_path}"
-            ) from e
 
-    # Write new file to the desired path (no numbering in the main folder).
+def _write_lifecycle_profile_frame(out_df: pd.DataFrame, path, sheet_name: str) -> None:
     try:
-        with pd.ExcelWriter(target_path, engine="xlsxwriter") as writer:
+        with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
             out_df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
     except ModuleNotFoundError as exc:
         if "xlsxwriter" not in str(exc).lower():
             raise
-        with pd.ExcelWriter(target_path, engine="openpyxl") as writer:
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
             out_df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
+
+
+def _archive_existing_lifecycle_profile(target_path: Path, existing_path: Path | None = None) -> Path | None:
+    """
+    Move an existing file at `target_path` (or the previous copy of it already
+    set aside at `existing_path`) into an `archive/` subfolder beside it and
+    return the archived path (None when there was nothing to archive).
+    """
+    existing_path = target_path if existing_path is None else existing_path
+    if not existing_path.exists():
+        return None
+    date_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    archive_dir = target_path.parent / "archive"
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        archived_path = move_to_unique_path(
+            existing_path, archive_dir / f"{target_path.stem}_{date_id}{target_path.suffix}"
+        )
+    except PermissionError as e:
+        raise PermissionError(
+            f"Could not archive existing file (is it open?): {target_path}"
+        ) from e
+    if archived_path is not None:
+        print(f"[INFO] Archived existing file to {archived_path}")
+    return archived_path
+
+
+def save_lifecycle_profile_excel(new_path, area_name, profile_name, profile, sheet_name="Lifecycle Profiles"):
+    """
+    Save a lifecycle profile dict {year: value} to Excel in the same
+    LEAP export format (Area/Profile/Year/Value).
+
+    If a file already exists at `new_path`, it is moved into an `archive/`
+    subfolder beside it with a timestamp suffix.
+    If a timestamped archive name already exists, an incrementing suffix
+    (_01, _02, ...) is applied in the archive only.
+    The new file is always written to `new_path` itself.
+    """
+    target_path = Path(new_path)
+    out_df = _lifecycle_profile_frame(area_name, profile_name, profile)
+
+    # Move any existing file into archive with de-duplication there.
+    _archive_existing_lifecycle_profile(target_path)
+
+    # Write new file to the desired path (no numbering in the main folder).
+    with atomic_output_path(target_path) as tmp_path:
+        _write_lifecycle_profile_frame(out_df, tmp_path, sheet_name)
     return target_path
 
 
+def save_lifecycle_profile_excels(profiles, sheet_name="Lifecycle Profiles") -> list[Path]:
+    """
+    Save several lifecycle profiles as one batch. `profiles` is a list of
+    (new_path, area_name, profile_name, profile).
+
+    Every workbook is first written to a temporary file beside its target;
+    only when all of them are written are the new ones moved into place, and
+    the files they replace are then archived as in
+    `save_lifecycle_profile_excel`. If a write or a replacement fails, the
+    previous files are put back, new files are removed and the error is
+    re-raised, so the targets are left as they were.
+    """
+    profiles = list(profiles)
+    target_paths = [Path(new_path) for new_path, *_ in profiles]
+
+    def _archive_previous(target_path: Path, previous_path: Path) -> None:
+        try:
+            _archive_existing_lifecycle_profile(target_path, previous_path)
+        except PermissionError as e:
+            print(f"[WARN] {e}; the previous copy was left at {previous_path}.")
+
+    with atomic_output_paths(target_paths, keep_previous=_archive_previous) as tmp_paths:
+        for tmp_path, (_, area_name, profile_name, profile) in zip(tmp_paths, profiles):
+            _write_lifecycle_profile_frame(
+                _lifecycle_profile_frame(area_name, profile_name, profile), tmp_path, sheet_name
+            )
+    return target_paths
+
+
 def open_file_cross_platform(path: Path):
     """
     Open a file using the default application on the current OS.
@@ -314,22 +362,24 @@ def apply_lifecycle_type_rules(profile: dict, lifecycle_type: str, base_year: Op
 
 
 #%% WORKFLOW EXAMPLE: VINTAGE / MILEAGE / SURVIVAL FROM SPREADSHEETS
-def main(
-    lifecycle_type="vintage",
-    base_year=None,
-    original_path="data/lifecycle_profiles/vintage_original.xlsx",
-    new_path="data/lifecycle_profiles/vintage_modified.xlsx",
-    scale_age_band_age_min=5,
-    scale_age_band_age_max=12,
-    scale_age_band_factor=0.95,
-    smoothing_dict: Optional[dict[int, int]] = None,
-    auto_open=False,
-    verbose_explanations: bool = True,
-    plot_profiles: bool = True,
-):
-    original_path = resolve_str(original_path)
-    new_path = resolve_str(new_path)
-    area, profile_name, profile_original = load_lifecycle_profile_excel(original_path)
+def _modify_lifecycle_profile(
+    area,
+    profile_name,
+    profile_original: dict,
+    *,
+    lifecycle_type,
+    base_year,
+    scale_age_band_age_min,
+    scale_age_band_age_max,
+    scale_age_band_factor,
+    smoothing_dict: Optional[dict[int, int]],
+    verbose_explanations: bool,
+    plot_profiles: bool,
+) -> dict:
+    """
+    The profile edits of `main` (scaling, smoothing, lifecycle rules,
+    renormalisation) on an already loaded profile; returns the modified profile.
+    """
     lifecycle_type_norm = (lifecycle_type or "").lower().strip().replace(" ", "_").replace("-", "_")
     requires_sum_100 = lifecycle_type_norm == "vintage"
 
@@ -401,6 +451,39 @@ def main(
             note=modified_profile_note if verbose_explanations else None,
         )
 
+    return profile_mod
+
+
+def main(
+    lifecycle_type="vintage",
+    base_year=None,
+    original_path="data/lifecycle_profiles/vintage_original.xlsx",
+    new_path="data/lifecycle_profiles/vintage_modified.xlsx",
+    scale_age_band_age_min=5,
+    scale_age_band_age_max=12,
+    scale_age_band_factor=0.95,
+    smoothing_dict: Optional[dict[int, int]] = None,
+    auto_open=False,
+    verbose_explanations: bool = True,
+    plot_profiles: bool = True,
+):
+    original_path = resolve_str(original_path)
+    new_path = resolve_str(new_path)
+    area, profile_name, profile_original = load_lifecycle_profile_excel(original_path)
+    profile_mod = _modify_lifecycle_profile(
+        area,
+        profile_name,
+        profile_original,
+        lifecycle_type=lifecycle_type,
+        base_year=base_year,
+        scale_age_band_age_min=scale_age_band_age_min,
+        scale_age_band_age_max=scale_age_band_age_max,
+        scale_age_band_factor=scale_age_band_factor,
+        smoothing_dict=smoothing_dict,
+        verbose_explanations=verbose_explanations,
+        plot_profiles=plot_profiles,
+    )
+
     saved_path = save_lifecycle_profile_excel(
         new_path=new_path,
         area_name=area,
@@ -499,60 +582,27 @@ def survival_profile_to_vintage_profile(
     # survival_profile_to_vintage_profile.last_profile_df = profile_df
     return vintage_profile, float(constant_sales)
 
-def build_vintage_from_survival_excel(
-    survival_excel_path: str,
-    vintage_excel_path: str,
-    sheet_name: str = "Lifecycle Profiles",
-    total_stock: float = 1000,
-    profile_name_suffix: str = " (steady-state vintage from survival)",
-    auto_open: bool = False,
-    annual_survival_output_path: str | None = None,
-    run_simulation: bool = True,
-    simulation_years: int = 60,
-    turnover_rate_bounds: tuple[float, float] | None = None,
-    verbose_explanations: bool = True,
-    plot_profiles: bool = True,
-):
-    """
-    Read a survival lifecycle profile (vehicle_survival_*), compute the
-    steady-state vintage profile, renormalise to 100%, and save as a new
-    LEAP-style lifecycle profile Excel.
+_VINTAGE_DERIVATION_NOTE = (
+    "Why derive a vintage profile from survival: the stock-turnover model needs an initial age mix. "
+    "We compute the age mix that is internally consistent with the survival curve under steady-state assumptions."
+)
 
-    Uses existing helpers:
-      - load_lifecycle_profile_excel
-      - save_lifecycle_profile_excel
-      - renormalize_to_100
-      - open_file_cross_platform
-      - plot_survival_and_vintage
 
-    turnover_rate_bounds : (min_rate, max_rate), optional
-        If provided, checks whether the implied average turnover rate
-        (constant_sales / total_stock) lies within the bounds and prints
-        a warning if outside.
+def _derive_vintage_from_survival(
+    survival_profile: dict[int, float],
+    *,
+    total_stock: float,
+    run_simulation: bool,
+    simulation_years: int,
+    turnover_rate_bounds: tuple[float, float] | None,
+    verbose_explanations: bool,
+    plot_profiles: bool,
+) -> tuple[dict[int, float], float]:
+    """
+    The derivation step of `build_vintage_from_survival_excel` on an already
+    loaded survival profile: steady-state vintage (renormalised to 100) and
+    implied constant sales, with the optional turnover check, simulation and plots.
     """
-    area, surv_profile_name, survival_profile = load_lifecycle_profile_excel(
-        survival_excel_path, sheet_name=sheet_name
-    )
-
-    print(f"Loaded survival profile from area='{area}', name='{surv_profile_name}'")
-    vintage_derivation_note = (
-        "Why derive a vintage profile from survival: the stock-turnover model needs an initial age mix. "
-        "We compute the age mix that is internally consistent with the survival curve under steady-state assumptions."
-    )
-    if verbose_explanations:
-        print(vintage_derivation_note)
-
-    if annual_survival_output_path:
-        annual_profile = convert_cumulative_survival_to_annual(survival_profile)
-        save_lifecycle_profile_excel(
-            new_path=annual_survival_output_path,
-            area_name=area,
-            profile_name=surv_profile_name + " (annual survival)",
-            profile=annual_profile,
-            sheet_name=sheet_name,
-        )
-        print(f"Saved annual survival profile to {annual_survival_output_path}")
-
     # Convert survival profile (likely in %) to steady-state vintage profile (%)
     vintage_profile, constant_sales = survival_profile_to_vintage_profile_dynamic(
         survival_profile=survival_profile,
@@ -618,11 +668,74 @@ def build_vintage_from_survival_excel(
             survival_profile,
             vintage_profile,
             title="Survival profile vs steady-state vintage (from survival)",
-            context_note=vintage_derivation_note if verbose_explanations else None,
+            context_note=_VINTAGE_DERIVATION_NOTE if verbose_explanations else None,
         )
     
     # ===================
 
+    return vintage_profile, constant_sales
+
+
+def build_vintage_from_survival_excel(
+    survival_excel_path: str,
+    vintage_excel_path: str,
+    sheet_name: str = "Lifecycle Profiles",
+    total_stock: float = 1000,
+    profile_name_suffix: str = " (steady-state vintage from survival)",
+    auto_open: bool = False,
+    annual_survival_output_path: str | None = None,
+    run_simulation: bool = True,
+    simulation_years: int = 60,
+    turnover_rate_bounds: tuple[float, float] | None = None,
+    verbose_explanations: bool = True,
+    plot_profiles: bool = True,
+):
+    """
+    Read a survival lifecycle profile (vehicle_survival_*), compute the
+    steady-state vintage profile, renormalise to 100%, and save as a new
+    LEAP-style lifecycle profile Excel.
+
+    Uses existing helpers:
+      - load_lifecycle_profile_excel
+      - save_lifecycle_profile_excel
+      - renormalize_to_100
+      - open_file_cross_platform
+      - plot_survival_and_vintage
+
+    turnover_rate_bounds : (min_rate, max_rate), optional
+        If provided, checks whether the implied average turnover rate
+        (constant_sales / total_stock) lies within the bounds and prints
+        a warning if outside.
+    """
+    area, surv_profile_name, survival_profile = load_lifecycle_profile_excel(
+        survival_excel_path, sheet_name=sheet_name
+    )
+
+    print(f"Loaded survival profile from area='{area}', name='{surv_profile_name}'")
+    if verbose_explanations:
+        print(_VINTAGE_DERIVATION_NOTE)
+
+    if annual_survival_output_path:
+        annual_profile = convert_cumulative_survival_to_annual(survival_profile)
+        save_lifecycle_profile_excel(
+            new_path=annual_survival_output_path,
+            area_name=area,
+            profile_name=surv_profile_name + " (annual survival)",
+            profile=annual_profile,
+            sheet_name=sheet_name,
+        )
+        print(f"Saved annual survival profile to {annual_survival_output_path}")
+
+    vintage_profile, constant_sales = _derive_vintage_from_survival(
+        survival_profile,
+        total_stock=total_stock,
+        run_simulation=run_simulation,
+        simulation_years=simulation_years,
+        turnover_rate_bounds=turnover_rate_bounds,
+        verbose_explanations=verbose_explanations,
+        plot_profiles=plot_profiles,
+    )
+
     # Compose new profile name
     vintage_profile_name = surv_profile_name + profile_name_suffix
 
@@ -707,51 +820,61 @@ def generate_economy_specific_lifecycle_profiles(
     For each economy, writes:
     - vehicle_survival_modified_<economy>.xlsx
     - vintage_modelled_from_survival_<economy>.xlsx
+
+    Every economy gets the same original profile and settings, so the modified
+    survival profile and its vintage are derived once and written for each
+    economy; all workbooks are written as one batch (see
+    `save_lifecycle_profile_excels`).
     """
-    economies = _resolve_economy_list(economy_selection)
+    economies = [str(economy).strip() for economy in _resolve_economy_list(economy_selection)]
     if not economies:
         raise ValueError("No economies resolved for economy-specific lifecycle profile generation.")
 
-    results: list[dict[str, object]] = []
-    for economy in economies:
-        economy_token = str(economy).strip()
-        survival_output = _append_token_to_filename(survival_output_template, economy_token)
-        vintage_output = _append_token_to_filename(vintage_output_template, economy_token)
-
-        print(f"\n=== Generating lifecycle profiles for {economy_token} ===")
-        main(
-            lifecycle_type=lifecycle_type,
-            base_year=base_year,
-            original_path=original_survival_path,
-            new_path=survival_output,
-            scale_age_band_age_min=scale_age_band_age_min,
-            scale_age_band_age_max=scale_age_band_age_max,
-            scale_age_band_factor=scale_age_band_factor,
-            smoothing_dict=smoothing_dict,
-            auto_open=False,
-            verbose_explanations=verbose_explanations,
-            plot_profiles=plot_profiles,
-        )
-
-        saved_path, const_sales = build_vintage_from_survival_excel(
-            survival_excel_path=resolve_str(survival_output),
-            vintage_excel_path=resolve_str(vintage_output),
-            turnover_rate_bounds=turnover_rate_bounds,
-            run_simulation=run_simulation,
-            simulation_years=simulation_years,
-            verbose_explanations=verbose_explanations,
-            plot_profiles=plot_profiles,
-        )
+    area, profile_name, profile_original = load_lifecycle_profile_excel(resolve_str(original_survival_path))
+    survival_profile = _modify_lifecycle_profile(
+        area,
+        profile_name,
+        profile_original,
+        lifecycle_type=lifecycle_type,
+        base_year=base_year,
+        scale_age_band_age_min=scale_age_band_age_min,
+        scale_age_band_age_max=scale_age_band_age_max,
+        scale_age_band_factor=scale_age_band_factor,
+        smoothing_dict=smoothing_dict,
+        verbose_explanations=verbose_explanations,
+        plot_profiles=plot_profiles,
+    )
+    vintage_profile, constant_sales = _derive_vintage_from_survival(
+        survival_profile,
+        total_stock=1000,
+        run_simulation=run_simulation,
+        simulation_years=simulation_years,
+        turnover_rate_bounds=turnover_rate_bounds,
+        verbose_explanations=verbose_explanations,
+        plot_profiles=plot_profiles,
+    )
 
+    survival_profile_name = profile_name + " (modified)"
+    vintage_profile_name = survival_profile_name + " (steady-state vintage from survival)"
+    results: list[dict[str, object]] = []
+    workbooks = []
+    for economy_token in economies:
+        survival_output = resolve_str(_append_token_to_filename(survival_output_template, economy_token))
+        vintage_output = resolve_str(_append_token_to_filename(vintage_output_template, economy_token))
+        workbooks.append((survival_output, area, survival_profile_name, survival_profile))
+        workbooks.append((vintage_output, area, vintage_profile_name, vintage_profile))
         results.append(
             {
                 "economy": economy_token,
-                "survival_output": resolve_str(survival_output),
-                "vintage_output": str(saved_path),
-                "constant_sales": float(const_sales),
+                "survival_output": survival_output,
+                "vintage_output": str(Path(vintage_output)),
+                "constant_sales": float(constant_sales),
             }
         )
 
+    for saved_path in save_lifecycle_profile_excels(workbooks):
+        print(f"Saved lifecycle profile to {saved_path}")
+
     if auto_open and results:
         try:
             open_file_cross_platform(Path(results[-1]["vintage_output"]))
@@ -798,6 +921,15 @@ def _cumulative_to_annual_survival_profile(survival_profile: dict[int, float]) -
       - annual[age] = S(age+1) / S(age) for all ages except the last.
       - annual[max_age] = 0.0  (no survival beyond max modelled age).
     """
+    ages, annual = _annual_survival_array(survival_profile)
+    return {age: float(p) for age, p in zip(ages, annual)}
+
+
+def _annual_survival_array(survival_profile: dict[int, float]) -> tuple[list[int], np.ndarray]:
+    """
+    Array form of `_cumulative_to_annual_survival_profile`: the sorted ages and
+    the annual survival probability p(age) at each of them.
+    """
     ages = _validate_contiguous_integer_ages(survival_profile, "survival_profile")
     vals = np.array([float(survival_profile[a]) for a in ages], dtype=float)
 
@@ -807,17 +939,30 @@ def _cumulative_to_annual_survival_profile(survival_profile: dict[int, float]) -
     S = np.clip(S, 1e-9, 1.0)
 
     annual = np.zeros_like(S)
-    for i, age in enumerate(ages):
-        if i == len(ages) - 1:
-            annual[i] = 0.0
-        else:
-            if S[i] <= 0:
-                annual[i] = 0.0
-            else:
-                annual[i] = S[i + 1] / S[i]
-        annual[i] = min(max(annual[i], 0.0), 1.0)
+    annual[:-1] = np.clip(S[1:] / S[:-1], 0.0, 1.0)
+    return ages, annual
 
-    return {age: float(p) for age, p in zip(ages, annual)}
+
+def _age_stock_one_year(stock: np.ndarray, annual_surv: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Advance stock by age (last axis; any leading axes, e.g. one row per
+    economy) by one year of cohort turnover: survivors age by one year,
+    everything at the maximum age retires, and retirements are replaced by
+    age-0 sales. Returns (new_stock, retirements).
+
+    Retirements are accumulated age by age with a running sum, so each row
+    matches the age-by-age loop this replaced.
+    """
+    survivors = stock[..., :-1] * annual_surv[..., :-1]
+    leaving = np.empty_like(stock)
+    leaving[..., :-1] = stock[..., :-1] - survivors
+    leaving[..., -1] = stock[..., -1]
+    retirements = np.cumsum(leaving, axis=-1)[..., -1]
+
+    new_stock = np.empty_like(stock)
+    new_stock[..., 1:] = survivors
+    new_stock[..., 0] = retirements
+    return new_stock, retirements
 
 
 def survival_profile_to_vintage_profile_dynamic(
@@ -842,39 +987,17 @@ def survival_profile_to_vintage_profile_dynamic(
         vintage_profile: {age: share}  (sums to 1.0 or 100.0)
         constant_sales:  annual steady-state sales (≈ retirements per year)
     """
-    ages = _validate_contiguous_integer_ages(survival_profile, "survival_profile")
-    max_age = ages[-1]
-
     # Annual survival p(age) consistent with our cohort logic.
-    annual_surv = _cumulative_to_annual_survival_profile(survival_profile)
-    surv_probs = np.array([annual_surv[a] for a in ages], dtype=float)
+    ages, surv_probs = _annual_survival_array(survival_profile)
 
     # Initial stock: put everything at age 0 (it will converge anyway).
     stock = np.zeros(len(ages), dtype=float)
     stock[0] = total_stock
 
-    retirements_history: list[float] = []
-
+    retirements = 0.0
     for _ in range(n_years):
-        new_stock = np.zeros_like(stock)
-        retirements = 0.0
-
-        for i, age in enumerate(ages):
-            current = stock[i]
-            if age == max_age:
-                # Everything at max_age retires
-                retirements += current
-            else:
-                p_survive = surv_probs[i]
-                survivors = current * p_survive
-                retirements += current - survivors
-                new_stock[i + 1] += survivors
-
-        # Replace retirements with new age-0 sales to keep total_stock ~ constant
-        new_stock[0] += retirements
-
-        stock = new_stock
-        retirements_history.append(retirements)
+        # Retirements are replaced with new age-0 sales to keep total_stock ~ constant.
+        stock, retirements = _age_stock_one_year(stock, surv_probs)
 
     final_total = stock.sum() or 1.0
     vintage_profile = {age: float(stock[i] / final_total) for i, age in enumerate(ages)}
@@ -882,19 +1005,45 @@ def survival_profile_to_vintage_profile_dynamic(
     if output_in_percent:
         vintage_profile = {age: v * 100.0 for age, v in vintage_profile.items()}
 
-    constant_sales = float(retirements_history[-1])  # last-year retirements ≈ steady-state sales
+    constant_sales = float(retirements)  # last-year retirements ≈ steady-state sales
 
     return vintage_profile, constant_sales
 
 
+def solve_steady_state_vintage_profile(
+    survival_profile: dict[int, float],
+    total_stock: float = 1_000.0,
+    output_in_percent: bool = True,
+) -> tuple[dict[int, float], float]:
+    """
+    Closed-form counterpart of `survival_profile_to_vintage_profile_dynamic`.
 
+    In steady state every year sells the same number of vehicles, so the
+    stock at each age is those sales times the share of a cohort still on
+    the road at that age, i.e. the cumulative product of the annual survival
+    probabilities (the normalised cumulative survival curve):
 
+        stock(age) = constant_sales * L(age),  L(0) = 1,  L(a + 1) = L(a) * p(a)
+        constant_sales = total_stock / sum(L)
 
+    This is the fixed point the dynamic simulation converges to, without
+    simulating hundreds of years.
 
+    Returns:
+        vintage_profile: {age: share}  (sums to 1.0 or 100.0)
+        constant_sales:  annual steady-state sales
+    """
+    ages, surv_probs = _annual_survival_array(survival_profile)
+    surviving = np.ones(len(ages), dtype=float)
+    surviving[1:] = np.cumprod(surv_probs[:-1])
 
-
-
-
+    surviving_total = surviving.sum()
+    constant_sales = total_stock / surviving_total
+    share = surviving / surviving_total
+    if output_in_percent:
+        share = share * 100.0
+    vintage_profile = {age: float(v) for age, v in zip(ages, share)}
+    return vintage_profile, float(constant_sales)
 
 
 #%% EXTRA PLOTTING HELPERS
@@ -958,6 +1107,26 @@ def plot_survival_and_vintage(
         fig_vint.tight_layout()
     plt.show()
 
+def _simulate_turnover_arrays(
+    stock: np.ndarray,
+    annual_surv: np.ndarray,
+    n_years: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run `n_years` of `_age_stock_one_year` on (..., age) stock arrays.
+
+    Returns (sales, total_stock, final_stock) with the year as the last axis
+    of sales and total_stock; totals are running sums over age, as in the
+    dict-based simulation.
+    """
+    sales = np.empty(stock.shape[:-1] + (n_years,), dtype=float)
+    totals = np.empty_like(sales)
+    for year in range(n_years):
+        stock, sales[..., year] = _age_stock_one_year(stock, annual_surv)
+        totals[..., year] = np.cumsum(stock, axis=-1)[..., -1]
+    return sales, totals, stock
+
+
 def simulate_steady_state_turnover(
     survival_profile: dict[int, float],
     vintage_profile_percent: dict[int, float],
@@ -990,54 +1159,25 @@ def simulate_steady_state_turnover(
     if ages != vintage_ages:
         raise ValueError("survival_profile and vintage_profile_percent must use the same age index.")
 
-    # Ages and annual survival probabilities
-    max_age = max(ages)
-
+    # Annual survival probabilities (fractions of the percent form)
     annual_surv_pct = convert_cumulative_survival_to_annual(survival_profile)
-    annual_surv_frac = {age: annual_surv_pct[age] / 100.0 for age in ages}
+    annual_surv_frac = np.array([annual_surv_pct[age] / 100.0 for age in ages], dtype=float)
 
     # Initial absolute stock by age (starting from steady-state vintage %)
-    stock_by_age = {
-        age: (vintage_profile_percent.get(age, 0.0) / 100.0) * total_stock
-        for age in ages
-    }
+    stock = np.array(
+        [(vintage_profile_percent.get(age, 0.0) / 100.0) * total_stock for age in ages],
+        dtype=float,
+    )
 
     years = list(range(n_years))
-    sales_history: list[float] = []
-    total_stock_history: list[float] = []
-
-    for _ in years:
-        # Compute survivors and retirements
-        new_stock = {age: 0.0 for age in ages}
-        retirements = 0.0
-
-        for age in ages:
-            current = stock_by_age.get(age, 0.0)
-            surv_prob = annual_surv_frac.get(age, 0.0)
-
-            if age == max_age:
-                # Everything at max_age is considered retired in this simple scheme
-                retirements += current
-            else:
-                survivors = current * surv_prob
-                retirements += current - survivors
-                next_age = age + 1
-                new_stock[next_age] += survivors
-
-        # New sales = retirements, all go into age 0
-        sales_t = retirements
-        new_stock[ages[0]] += sales_t
-
-        stock_by_age = new_stock
-        total_stock_t = sum(stock_by_age.values())
-
-        sales_history.append(sales_t)
-        total_stock_history.append(total_stock_t)
+    sales, totals, stock = _simulate_turnover_arrays(stock, annual_surv_frac, n_years)
+    sales_history = sales.tolist()
+    total_stock_history = totals.tolist()
 
     # Vintage distribution at the end of the simulation (as % of total stock)
-    final_total = sum(stock_by_age.values()) or 1.0
+    final_total = float(np.cumsum(stock)[-1]) or 1.0
     vintage_end_percent = {
-        age: (stock_by_age[age] / final_total) * 100.0 for age in ages
+        age: float(stock[i] / final_total) * 100.0 for i, age in enumerate(ages)
     }
 
     return {
@@ -1047,7 +1187,72 @@ def simulate_steady_state_turnover(
         "vintage_start": vintage_profile_percent,
         "vintage_end": vintage_end_percent,
     }
-    
+
+
+def simulate_steady_state_turnover_for_profiles(
+    profiles: dict,
+    total_stock: float,
+    n_years: int = 60,
+) -> dict:
+    """
+    `simulate_steady_state_turnover` for many profile pairs at once, e.g. one
+    per economy: `profiles` maps a key to (survival_profile,
+    vintage_profile_percent). All pairs whose ages start at the same age are
+    simulated together as one (profile x age) array; shorter age grids are
+    padded with empty ages that never hold stock, which leaves their results
+    unchanged.
+
+    Returns {key: simulation result}, each identical to the single-profile call.
+    """
+    groups: dict[int, list] = {}
+    profile_ages: dict = {}
+    annual: dict = {}
+    initial: dict = {}
+    for key, (survival_profile, vintage_profile_percent) in profiles.items():
+        if not survival_profile or not vintage_profile_percent:
+            raise ValueError(
+                f"Both survival_profile and vintage_profile_percent must be non-empty ({key})."
+            )
+        ages = _validate_contiguous_integer_ages(survival_profile, "survival_profile")
+        vintage_ages = _validate_contiguous_integer_ages(vintage_profile_percent, "vintage_profile_percent")
+        if ages != vintage_ages:
+            raise ValueError(
+                f"survival_profile and vintage_profile_percent must use the same age index ({key})."
+            )
+        annual_surv_pct = convert_cumulative_survival_to_annual(survival_profile)
+        profile_ages[key] = ages
+        annual[key] = [annual_surv_pct[age] / 100.0 for age in ages]
+        initial[key] = [(vintage_profile_percent.get(age, 0.0) / 100.0) * total_stock for age in ages]
+        groups.setdefault(ages[0], []).append(key)
+
+    results: dict = {}
+    years = list(range(n_years))
+    for keys in groups.values():
+        width = max(len(profile_ages[key]) for key in keys)
+        # Padded ages get zero survival and zero stock: the last real age still
+        # retires everything and the running sums only add zeros.
+        annual_rows = np.zeros((len(keys), width), dtype=float)
+        stock_rows = np.zeros((len(keys), width), dtype=float)
+        for row, key in enumerate(keys):
+            annual_rows[row, : len(annual[key])] = annual[key]
+            stock_rows[row, : len(initial[key])] = initial[key]
+        sales, totals, stock = _simulate_turnover_arrays(stock_rows, annual_rows, n_years)
+        final_totals = np.cumsum(stock, axis=-1)[:, -1]
+        for row, key in enumerate(keys):
+            final_total = float(final_totals[row]) or 1.0
+            results[key] = {
+                "years": list(years),
+                "sales": sales[row].tolist(),
+                "total_stock": totals[row].tolist(),
+                "vintage_start": profiles[key][1],
+                "vintage_end": {
+                    age: float(stock[row, i] / final_total) * 100.0
+                    for i, age in enumerate(profile_ages[key])
+                },
+            }
+    return {key: results[key] for key in profiles}
+
+
 def plot_steady_state_simulation(
     sim_result: dict,
     verbose_explanations: bool = True,
@@ -8,6 +8,7 @@ import pandas as pd
 from configurations.measure_metadata import SHARE_MEASURES
 from configurations.measure_catalog import LEAP_BRANCH_TO_ANALYSIS_TYPE_MAP
 from configurations.branch_mappings import NINTH_SOURCE_TO_LEAP_BRANCH_MAP, LEAP_MEASURE_CONFIG, DEFAULT_BRANCH_SHARE_SETTINGS_DICT
+from functions.atomic_io import write_excel_atomic
 from functions.esto_data import extract_esto_energy_use_for_leap_branches
 from functions.transport_branch_paths import (
     branch_tuple_depth,
@@ -636,7 +637,7 @@ def validate_final_energy_use_for_base_year_equals_esto_totals(
     if WRITE_TRANSPORT_ENERGY_USE_STATS_COLLECTOR:
         output_path = resolve_str(TRANSPORT_ENERGY_USE_STATS_COLLECTOR_PATH)
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        stats_collector.to_excel(output_path, index=False)
+        write_excel_atomic(stats_collector, output_path, index=False)
         print(f"[INFO] Wrote transport energy use stats collector to {output_path}")
 
     validate_non_specified_energy_use_for_base_year_equals_esto_totals(BASE_YEAR, export_df, esto_energy_use_filtered, TRANSPORT_ROOT)
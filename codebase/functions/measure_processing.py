@@ -85,7 +85,7 @@ def aggregate_weighted(df, measure, group_cols, weight_col=None):
     )
     df_copy.loc[:, '_weight'] = df_copy[weight_col].fillna(0).infer_objects(copy=False)
     # manual groupby with weighted calculation on the copy (easier to debug and safe)
-    grouped = df_copy.groupby(group_cols)
+    grouped = df_copy.groupby(group_cols, observed=True)
     result = []
     
     for name, group in grouped:
@@ -148,7 +148,7 @@ def calculate_measures(df: pd.DataFrame, measure: str) -> pd.DataFrame:
 
     if 'stock_share' in measure.lower():
         # Calculate stock share
-        df_out[measure] = df_out.groupby(group_cols)["Stocks"].transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
+        df_out[measure] = df_out.groupby(group_cols, observed=True)["Stocks"].transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
     elif 'activity_share' in measure.lower():
         # Calculate activity share - similar to stock share but using Activity.
         # Non-road fuel shares should be calculated across fuels within a
@@ -162,20 +162,20 @@ def calculate_measures(df: pd.DataFrame, measure: str) -> pd.DataFrame:
             if road_mask.any():
                 df_out.loc[road_mask, measure] = (
                     df_out.loc[road_mask]
-                    .groupby(group_cols)["Activity"]
+                    .groupby(group_cols, observed=True)["Activity"]
                     .transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
                 )
             if non_road_mask.any():
                 non_road_group_cols = ['Date', 'Transport Type', 'Medium', 'Vehicle Type']
                 df_out.loc[non_road_mask, measure] = (
                     df_out.loc[non_road_mask]
-                    .groupby(non_road_group_cols)["Activity"]
+                    .groupby(non_road_group_cols, observed=True)["Activity"]
                     .transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
                 )
         else:
             # Note that passenger and freight km are measured differently, so
             # activity shares are not comparable between them.
-            df_out[measure] = df_out.groupby(group_cols)["Activity"].transform(
+            df_out[measure] = df_out.groupby(group_cols, observed=True)["Activity"].transform(
                 lambda x: x / x.sum() * 100 if x.sum() != 0 else 0
             )
 
@@ -194,7 +194,7 @@ def calculate_measures(df: pd.DataFrame, measure: str) -> pd.DataFrame:
         if 'Sales' not in df_out.columns:
             raise ValueError(f"Measure '{measure}' requires Sales to be calculated first.")
 
-        df_out[measure] = df_out.groupby(group_cols)['Sales'].transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
+        df_out[measure] = df_out.groupby(group_cols, observed=True)['Sales'].transform(lambda x: x / x.sum() * 100 if x.sum() != 0 else 0)
     # elif 'vehicle_sales_share' in measure.lower():
     #     # Calculate vehicle sales share - similar to stock share but using Sales column.
     #     df_out[measure] = df_out.groupby(group_cols)["Sales"].transform(lambda
@@ -379,7 +379,7 @@ def aggregate_measures(df_out, src, source_cols_for_grouping, ttype, medium, vty
         # Simple sum aggregation
         #drop the latest col from source_cols_for_grouping in case we have multiple categories within it and want to sum over them. e.g. where LPV corresponds to car,suv,lt.
         df_filtered_copy = df_filtered.copy()  # Ensure we have a clean copy
-        df_filtered.loc[:, src] = df_filtered.groupby(source_cols_for_grouping)[src].transform('sum')
+        df_filtered.loc[:, src] = df_filtered.groupby(source_cols_for_grouping, observed=True)[src].transform('sum')
 
     elif agg_type == "share":
         #TEMP
@@ -389,7 +389,7 @@ def aggregate_measures(df_out, src, source_cols_for_grouping, ttype, medium, vty
             #ignore the warning for the setting with copy since we are working on a filtered df anyway and the alternative results in FutureWarning: Setting an item of incompatible dtype is deprecated and will raise in a future error of pandas.
             df_filtered[src] = df_filtered[base_measure]
             #group and sum
-            df_filtered = df_filtered.groupby(source_cols_for_grouping)[src].sum().reset_index()
+            df_filtered = df_filtered.groupby(source_cols_for_grouping, observed=True)[src].sum().reset_index()
             #now calculate share
         else:
             raise ValueError(
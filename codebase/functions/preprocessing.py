@@ -3,6 +3,14 @@
 import pandas as pd
 import warnings
 
+from configurations.basic_mappings import (
+    EXPECTED_COLS_IN_SOURCE,
+    SOURCE_CATEGORICAL_COLS,
+    SOURCE_DATE_DTYPE,
+    SOURCE_MEASURE_COLS,
+    SOURCE_UNUSED_COLS,
+)
+
 # Suppress the specific FutureWarning about downcasting behavior
 warnings.filterwarnings("ignore", message="Downcasting object dtype arrays on .fillna, .ffill, .bfill is deprecated")
 
@@ -12,12 +20,72 @@ def calculate_sales(df):
     #that this means that sales_calc measures should be calculated before vehicle_sales_share measures.
     group_cols = ["Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"]
     df = df.sort_values(by=group_cols + ["Date", 'Scenario','Economy'])
-    df['Sales'] = df.groupby(group_cols)["Stocks"].diff().fillna(0).infer_objects(copy=False)
+    df['Sales'] = df.groupby(group_cols, observed=True)["Stocks"].diff().fillna(0).infer_objects(copy=False)
     # Convert negative sales to 0 (can happen due to vehicle retirement or data anomalies)
     df['Sales'] = df['Sales'].clip(lower=0)
     return df
 
 
+def apply_source_dtypes(df):
+    """
+    Apply the source schema: categorical dimensions, compact integer Date and
+    float64 measures. Categories are kept sorted and limited to the values
+    present, so groupby ordering matches plain string columns.
+    """
+    df = df.copy()
+    for col in SOURCE_CATEGORICAL_COLS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.remove_unused_categories()
+            categories = values.cat.categories
+            if not categories.is_monotonic_increasing:
+                values = values.cat.reorder_categories(categories.sort_values())
+        else:
+            values = values.astype("category")
+        df[col] = values
+    if (
+        "Date" in df.columns
+        and pd.api.types.is_numeric_dtype(df["Date"])
+        and not df["Date"].isna().any()
+    ):
+        df["Date"] = df["Date"].astype(SOURCE_DATE_DTYPE)
+    for col in SOURCE_MEASURE_COLS:
+        if col in df.columns and df[col].dtype != "float64":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    return df
+
+
+def read_transport_source_data(path, economy, scenario, base_year, final_year):
+    """
+    Load the detailed model output for one economy/scenario using the
+    EXPECTED_COLS_IN_SOURCE schema. Unused columns are skipped at read time;
+    non-numeric measure cells are read as NaN.
+    """
+    if str(path).endswith('.csv'):
+        header = pd.read_csv(path, nrows=0).columns
+    else:
+        header = pd.read_excel(path, nrows=0).columns
+    missing_cols = [col for col in EXPECTED_COLS_IN_SOURCE if col not in header]
+    if missing_cols:
+        raise ValueError(f"Missing expected columns in source data: {missing_cols}")
+
+    usecols = [col for col in EXPECTED_COLS_IN_SOURCE if col not in SOURCE_UNUSED_COLS]
+    if str(path).endswith('.csv'):
+        # Measures are not given a dtype here: a stray non-numeric cell would
+        # make read_csv fail without naming the column. apply_source_dtypes
+        # coerces them to float64 (such cells become NaN) after filtering.
+        dtypes = {col: "category" for col in SOURCE_CATEGORICAL_COLS if col in usecols}
+        df = pd.read_csv(path, usecols=usecols, dtype=dtypes, low_memory=False)
+    else:
+        df = pd.read_excel(path, usecols=usecols)
+
+    df = df[(df["Economy"] == economy) & (df["Scenario"] == scenario)]
+    df = df[(df["Date"] >= base_year) & (df["Date"] <= final_year)]
+    return apply_source_dtypes(df)
+
+
 def allocate_fuel_alternatives_energy_and_activity(df, economy, scenario, TRANSPORT_FUELS_DATA_FILE_PATH):
     #note that when biofuel is referred to here it includes other low carbon fuels such as efuels
     #since this system assumes that vehicles that use biofuels (and other alternatives such as efuels) have a separate amount of
@@ -161,9 +229,8 @@ def allocate_fuel_alternatives_energy_and_activity(df, economy, scenario, TRANSP
         df = df.drop(columns=[f'{biofuel}_share'], errors='ignore')
     
     
-    df.loc[df['Fuel'] == 'Efuel-g', 'Fuel'] = 'Efuel'
-    df.loc[df['Fuel'] == 'Efuel-d', 'Fuel'] = 'Efuel'
-    df.loc[df['Fuel'] == 'Efuel-j', 'Fuel'] = 'Efuel'
+    # Relabel through plain values so a categorical Fuel column can gain 'Efuel'.
+    df['Fuel'] = df['Fuel'].astype(object).replace({'Efuel-g': 'Efuel', 'Efuel-d': 'Efuel', 'Efuel-j': 'Efuel'})
         
     return df
 
@@ -209,7 +276,7 @@ def normalize_and_calculate_shares(df, share_columns_to_source_dict=None, road_o
         source_col = share_columns_to_source_dict[col]
             
         # Group by hierarchy and normalize within each group
-        grouped = df.groupby(group_levels)
+        grouped = df.groupby(group_levels, observed=True)
         for key, group in grouped:
             total = group[source_col].sum(skipna=True)
             if total > 0 and not pd.isna(total):
@@ -223,7 +290,7 @@ def normalize_and_calculate_shares(df, share_columns_to_source_dict=None, road_o
     
     #quick double check that all shares sum to 1.0 now at each level
     for col in share_columns_to_source_dict.keys():
-        grouped = df.groupby(group_levels)
+        grouped = df.groupby(group_levels, observed=True)
         for key, group in grouped:
             total = group[col].sum(skipna=True)
             if abs(total - 1.0) > 1e-6:
@@ -240,6 +307,8 @@ def normalize_and_calculate_shares(df, share_columns_to_source_dict=None, road_o
     return df
 
 __all__ = [
+    "apply_source_dtypes",
+    "read_transport_source_data",
     "calculate_sales",
     "allocate_fuel_alternatives_energy_and_activity",
 ]
@@ -0,0 +1,209 @@
+"""Run manifest for resumable batch runs.
+
+The manifest is a JSON file with one entry per economy/scenario/stage
+("input_creation" or "reconciliation"). Each entry records the stage's input
+file fingerprints (size and modification time), a digest of the settings that
+shape its outputs, the output paths it wrote and whether it succeeded.
+
+A stage is up to date when its last run succeeded, its settings digest and
+input fingerprints are unchanged, and every output still exists and is at
+least as new as every input. Batch runs with RESUME_BATCH_RUNS skip
+up-to-date stages, so a failed batch restarts at its first failed (or
+changed) target instead of from the beginning.
+
+Saves merge into the file under a lock file (`<manifest>.lock`), so runs
+saving at the same time (e.g. concurrent scenario processes) keep each
+other's entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from functions.atomic_io import locked_file, write_json_atomic
+
+MANIFEST_VERSION = 1
+STAGE_INPUT_CREATION = "input_creation"
+STAGE_RECONCILIATION = "reconciliation"
+# Order in which stages run inside one target; a stale stage makes every later stage stale too.
+STAGE_ORDER = (STAGE_INPUT_CREATION, STAGE_RECONCILIATION)
+# A save holds the lock for milliseconds; an older lock was left by a crashed run.
+MANIFEST_LOCK_STALE_SECONDS = 60.0
+
+
+def _canonical(value: Any) -> Any:
+    """Return a JSON-stable form of `value` (string keys, lists for tuples/sets)."""
+    if isinstance(value, Mapping):
+        return {str(key): _canonical(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=repr)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def settings_digest(settings: Mapping[str, Any]) -> str:
+    """Short, order-independent hash of a settings mapping."""
+    payload = json.dumps(_canonical(settings), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_fingerprint(path: str | os.PathLike | None) -> dict | None:
+    """Return {"path", "size", "mtime_ns"} for an existing file, else None."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """What one stage of one target reads, writes and is configured with."""
+
+    stage: str
+    inputs: Mapping[str, str | None] = field(default_factory=dict)
+    outputs: Mapping[str, str | None] = field(default_factory=dict)
+    settings: Mapping[str, Any] = field(default_factory=dict)
+
+
+class RunManifest:
+    """Load, query and update the run manifest stored at `path`."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = self._load_entries()
+        self._updated: set[str] = set()
+
+    def _load_entries(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"[WARN] Ignoring unreadable run manifest {self.path}: {exc}")
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+            return {}
+        entries = payload.get("entries")
+        return dict(entries) if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def entry_key(economy: str, scenario: str, stage: str) -> str:
+        return f"{economy}|{scenario}|{stage}"
+
+    def get(self, economy: str, scenario: str, stage: str) -> dict | None:
+        return self.entries.get(self.entry_key(economy, scenario, stage))
+
+    def stale_reason(self, economy: str, scenario: str, spec: StageSpec) -> str | None:
+        """Return why `spec` must run again, or None when its recorded outputs are up to date."""
+        entry = self.get(economy, scenario, spec.stage)
+        if entry is None:
+            return "no previous run recorded"
+        if entry.get("status") != "success":
+            return f"previous run {entry.get('status') or 'did not finish'}"
+        if entry.get("settings_digest") != settings_digest(spec.settings):
+            return "settings changed"
+
+        recorded_inputs = entry.get("inputs") or {}
+        newest_input_ns = 0
+        for name, path in spec.inputs.items():
+            current = file_fingerprint(path)
+            if current != recorded_inputs.get(name):
+                return f"input changed: {name}"
+            if current is not None:
+                newest_input_ns = max(newest_input_ns, current["mtime_ns"])
+
+        recorded_outputs = entry.get("outputs") or {}
+        for name, path in spec.outputs.items():
+            if not path:
+                continue
+            if recorded_outputs.get(name) != os.path.abspath(path):
+                return f"output path changed: {name}"
+            current = file_fingerprint(path)
+            if current is None:
+                return f"output missing: {name}"
+            if current["mtime_ns"] < newest_input_ns:
+                return f"output older than inputs: {name}"
+        return None
+
+    def record_stage(
+        self,
+        economy: str,
+        scenario: str,
+        spec: StageSpec,
+        *,
+        status: str,
+        error: str = "",
+    ) -> None:
+        """Record the outcome of one stage. Inputs are fingerprinted as they are now."""
+        key = self.entry_key(economy, scenario, spec.stage)
+        self.entries[key] = {
+            "economy": economy,
+            "scenario": scenario,
+            "stage": spec.stage,
+            "status": status,
+            "error": error,
+            "completed_at": datetime.now().isoformat(timespec="seconds"),
+            "settings_digest": settings_digest(spec.settings),
+            "inputs": {name: file_fingerprint(path) for name, path in spec.inputs.items()},
+            "outputs": {
+                name: os.path.abspath(path) for name, path in spec.outputs.items() if path
+            },
+        }
+        self._updated.add(key)
+
+    @contextmanager
+    def _locked(self, poll_seconds: float = 0.02) -> Iterator[None]:
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with locked_file(
+            lock_path,
+            stale_seconds=MANIFEST_LOCK_STALE_SECONDS,
+            poll_seconds=poll_seconds,
+            description="run manifest",
+        ):
+            yield
+
+    def save(self) -> None:
+        """
+        Write the manifest atomically. Entries updated through this instance
+        are merged into the file as it is now, under the manifest lock, so
+        entries written by another run since this one loaded the manifest
+        (or while it saves) are kept.
+        """
+        with self._locked():
+            merged = self._load_entries()
+            merged.update({key: self.entries[key] for key in self._updated})
+            write_json_atomic(
+                self.path,
+                {"version": MANIFEST_VERSION, "entries": dict(sorted(merged.items()))},
+                indent=2,
+            )
+        self.entries = merged
+        self._updated.clear()
+
+
+__all__ = [
+    "MANIFEST_LOCK_STALE_SECONDS",
+    "MANIFEST_VERSION",
+    "STAGE_INPUT_CREATION",
+    "STAGE_ORDER",
+    "STAGE_RECONCILIATION",
+    "RunManifest",
+    "StageSpec",
+    "file_fingerprint",
+    "settings_digest",
+]
@@ -1,11 +1,15 @@
 #%% imports
+import hashlib
 import os
+import warnings
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from functions.atomic_io import atomic_output_path
 from functions.merged_energy_io import load_transport_energy_dataset
 from functions.path_utils import resolve_str
+from functions.stage_telemetry import timed_stage
 from functions.lifecycle_profile_editor import (
     build_vintage_from_survival_excel,
     load_lifecycle_profile_excel,
@@ -18,16 +22,21 @@ __all__ = [
     "load_survival_curve",
     "load_vintage_profile",
     "load_survival_and_vintage_profiles",
+    "LifecycleProfileRegistry",
+    "LIFECYCLE_PROFILE_REGISTRY",
     "extract_energy_use_from_esto",
+    "extract_energy_use_for_economies",
     "aggregate_base_stocks",
     "compute_base_capacity_index",
     "envelope_to_target_stocks",
     "initialise_cohorts",
     "compute_sales_from_stock_targets",
+    "compute_sales_from_stock_target_matrix",
     "build_passenger_sales_for_economy",
     "estimate_passenger_sales_from_dataframe",
     "estimate_passenger_sales_from_files",
     "build_freight_sales_for_economy",
+    "build_target_stocks_for_economies",
     "estimate_freight_sales_from_dataframe",
     "estimate_freight_sales_from_files",
     "plot_passenger_sales_result",
@@ -186,9 +195,17 @@ def estimate_k_from_energy_trend(
 #%% data loaders: lifecycle profiles, energy, and base stocks
 
 
-def _read_profile_excel(path: str | os.PathLike[str], value_scale: float = 1.0) -> pd.Series:
+LIFECYCLE_PROFILE_BUNDLE_DIR = (
+    Path(__file__).resolve().parents[2] / "intermediate_data" / "lifecycle_profile_bundles"
+).resolve()
+# If True, aligned survival/vintage pairs are also saved as small .npz bundles
+# so other processes (or later runs) can skip the Excel parse entirely.
+PERSIST_LIFECYCLE_PROFILE_BUNDLES = True
+
+
+def _parse_profile_excel(path: str | os.PathLike[str]) -> pd.Series:
     """
-    Load a lifecycle profile from Excel.
+    Parse a lifecycle profile from Excel.
 
     Expects a sheet 'Lifecycle Profiles' with columns [Year, Value] after a
     short header block. Returns a Series indexed by year.
@@ -201,13 +218,180 @@ def _read_profile_excel(path: str | os.PathLike[str], value_scale: float = 1.0)
     )
     df = df.dropna(subset=["Year"])
     df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
-    df["Value"] = pd.to_numeric(df["Value"], errors="coerce") * value_scale
+    df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
     df = df.dropna(subset=["Year", "Value"])
     df = df[df["Year"].astype(int) == df["Year"]]
     df["Year"] = df["Year"].astype(int)
     return pd.Series(df["Value"].values, index=pd.Index(df["Year"].values, dtype=int))
 
 
+def _profile_file_stamp(path: str | os.PathLike[str]) -> tuple[str, int, int]:
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), int(stat.st_mtime_ns), int(stat.st_size)
+
+
+def _read_only_profile(values, ages) -> pd.Series:
+    """Wrap profile values in a Series backed by a read-only float array."""
+    array = np.array(values, dtype=float)
+    array.setflags(write=False)
+    return pd.Series(array, index=pd.Index(np.asarray(ages, dtype=int), dtype=int), copy=False)
+
+
+class LifecycleProfileRegistry:
+    """
+    Process-wide cache of parsed lifecycle profile workbooks.
+
+    Each workbook is parsed once per (path, mtime, size). Survival/vintage
+    pairs are converted, validated and aligned once with
+    `_validate_and_align_age_profiles` and handed out as read-only Series, so
+    every economy/scenario/vehicle run shares the same arrays. When
+    `bundle_dir` is set, aligned pairs are also persisted as `.npz` bundles.
+    """
+
+    def __init__(self, bundle_dir: str | os.PathLike[str] | None = None) -> None:
+        self.bundle_dir = Path(bundle_dir) if bundle_dir is not None else None
+        self._sheets: dict[tuple[str, int, int], pd.Series] = {}
+        self._pairs: dict[tuple, tuple[pd.Series, pd.Series]] = {}
+        self._misaligned: dict[tuple, str] = {}
+
+    def clear(self) -> None:
+        self._sheets.clear()
+        self._pairs.clear()
+        self._misaligned.clear()
+
+    def read_sheet(self, path: str | os.PathLike[str]) -> pd.Series:
+        """Return the raw (unscaled) profile for one workbook as a read-only Series."""
+        stamp = _profile_file_stamp(path)
+        cached = self._sheets.get(stamp)
+        if cached is None:
+            # Drop entries for older versions of the same file.
+            for key in [key for key in self._sheets if key[0] == stamp[0]]:
+                del self._sheets[key]
+            parsed = _parse_profile_excel(path)
+            cached = _read_only_profile(parsed.to_numpy(dtype=float), parsed.index)
+            self._sheets[stamp] = cached
+        return cached
+
+    def get_pair(
+        self,
+        survival_path: str | os.PathLike[str],
+        vintage_path: str | os.PathLike[str],
+        *,
+        survival_is_cumulative: bool = True,
+        context: str | None = None,
+    ) -> tuple[pd.Series, pd.Series]:
+        """
+        Return aligned, read-only (annual or cumulative survival, vintage) profiles.
+
+        Profiles that cannot be aligned are returned sorted by age instead, and
+        every call for them warns (naming `context`, e.g. the economy and
+        vehicle types) so the sales engine's later error can be traced back.
+        """
+        survival_stamp = _profile_file_stamp(survival_path)
+        vintage_stamp = _profile_file_stamp(vintage_path)
+        key = (survival_stamp, vintage_stamp, bool(survival_is_cumulative))
+        pair = self._pairs.get(key)
+        if pair is None:
+            pair = self._load_bundle(key)
+            if pair is None:
+                survival = load_survival_curve(survival_path)
+                if survival_is_cumulative:
+                    survival = _convert_cumulative_survival_to_annual(survival)
+                vintage = load_vintage_profile(vintage_path)
+                try:
+                    survival, vintage = _validate_and_align_age_profiles(survival, vintage)
+                except ValueError:
+                    # Leave mismatched grids for the sales engine to report against
+                    # the vehicle that uses them.
+                    survival, vintage = survival.sort_index(), vintage.sort_index()
+                pair = (
+                    _read_only_profile(survival.to_numpy(dtype=float), survival.index),
+                    _read_only_profile(vintage.to_numpy(dtype=float), vintage.index),
+                )
+                self._save_bundle(key, pair)
+
+            for stale_key in [
+                k for k in self._pairs
+                if (k[0][0], k[1][0], k[2]) == (survival_stamp[0], vintage_stamp[0], key[2])
+            ]:
+                del self._pairs[stale_key]
+                self._misaligned.pop(stale_key, None)
+            self._pairs[key] = pair
+            try:
+                _validate_and_align_age_profiles(*pair)
+            except ValueError as exc:
+                self._misaligned[key] = str(exc)
+
+        problem = self._misaligned.get(key)
+        if problem is not None:
+            warnings.warn(
+                f"Lifecycle profiles {survival_path} and {vintage_path} could not be aligned "
+                f"({problem}); using them sorted by age instead"
+                + (f" for {context}." if context else "."),
+                stacklevel=2,
+            )
+        return pair
+
+    def _bundle_path(self, key: tuple) -> Path | None:
+        if self.bundle_dir is None:
+            return None
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        return self.bundle_dir / f"lifecycle_profiles_{digest}.npz"
+
+    def _load_bundle(self, key: tuple) -> tuple[pd.Series, pd.Series] | None:
+        bundle_path = self._bundle_path(key)
+        if bundle_path is None or not bundle_path.exists():
+            return None
+        try:
+            with np.load(bundle_path, allow_pickle=False) as bundle:
+                if str(bundle["key"]) != repr(key):
+                    return None
+                ages = bundle["ages"]
+                return (
+                    _read_only_profile(bundle["survival"], ages),
+                    _read_only_profile(bundle["vintage"], ages),
+                )
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"[WARN] Ignoring unreadable lifecycle profile bundle {bundle_path}: {exc}")
+            return None
+
+    def _save_bundle(self, key: tuple, pair: tuple[pd.Series, pd.Series]) -> None:
+        bundle_path = self._bundle_path(key)
+        if bundle_path is None:
+            return
+        survival, vintage = pair
+        try:
+            with atomic_output_path(bundle_path) as tmp_path:
+                np.savez(
+                    tmp_path,
+                    key=np.array(repr(key)),
+                    ages=survival.index.to_numpy(dtype=int),
+                    survival=survival.to_numpy(dtype=float),
+                    vintage=vintage.to_numpy(dtype=float),
+                )
+        except OSError as exc:
+            print(f"[WARN] Could not persist lifecycle profile bundle {bundle_path}: {exc}")
+
+
+LIFECYCLE_PROFILE_REGISTRY = LifecycleProfileRegistry(
+    bundle_dir=LIFECYCLE_PROFILE_BUNDLE_DIR if PERSIST_LIFECYCLE_PROFILE_BUNDLES else None,
+)
+
+
+def _read_profile_excel(path: str | os.PathLike[str], value_scale: float = 1.0) -> pd.Series:
+    """
+    Load a lifecycle profile from Excel.
+
+    Expects a sheet 'Lifecycle Profiles' with columns [Year, Value] after a
+    short header block. Returns a (writable) Series indexed by year. The
+    workbook itself is parsed once per file version via
+    LIFECYCLE_PROFILE_REGISTRY.
+    """
+    raw = LIFECYCLE_PROFILE_REGISTRY.read_sheet(path)
+    return pd.Series(raw.to_numpy(dtype=float) * value_scale, index=raw.index.copy())
+
+
 def load_survival_curve(path: str | os.PathLike[str]) -> pd.Series:
     """
     Load a survival curve and return probabilities (0-1) by age.
@@ -239,17 +423,27 @@ def load_survival_and_vintage_profiles(
     vintage_path: str | os.PathLike[str],
     vehicle_keys: tuple[str, ...] = ("LPV", "MC", "Bus"),
     survival_is_cumulative: bool = True,
+    economy: str | None = None,
 ) -> tuple[dict, dict]:
     """
     Convenience to load the same survival/vintage profile for each vehicle key.
 
     If survival_is_cumulative is True, converts the loaded survival curve
     (% remaining by age) into annual survival probabilities.
+
+    Profiles come from LIFECYCLE_PROFILE_REGISTRY: they are aligned to a
+    shared age grid and are read-only, so callers must copy before editing.
+    `economy` is only used to name the run if the profiles cannot be aligned.
     """
-    survival_curve = load_survival_curve(survival_path)
-    if survival_is_cumulative:
-        survival_curve = _convert_cumulative_survival_to_annual(survival_curve)
-    vintage_profile = load_vintage_profile(vintage_path)
+    context = f"vehicle types {', '.join(vehicle_keys)}"
+    if economy:
+        context = f"economy {economy}, {context}"
+    survival_curve, vintage_profile = LIFECYCLE_PROFILE_REGISTRY.get_pair(
+        survival_path,
+        vintage_path,
+        survival_is_cumulative=survival_is_cumulative,
+        context=context,
+    )
     survival_curves = {k: survival_curve for k in vehicle_keys}
     vintage_profiles = {k: vintage_profile for k in vehicle_keys}
     return survival_curves, vintage_profiles
@@ -287,6 +481,11 @@ def extract_energy_use_from_esto(
         & ((df["sub1sectors"] == sub1sector) if sub1sector is not None else True)
     ) 
     df = df.loc[mask]
+    return _energy_use_from_esto_rows(df, base_year, final_year)
+
+
+def _energy_use_from_esto_rows(df: pd.DataFrame, base_year: int, final_year: int) -> pd.Series:
+    """Sum one economy/scenario's ESTO rows into an energy-use series by year."""
     #drop any ciols with Unnamed in them
     column_labels = pd.Index(df.columns.map(str))
     df = df.loc[:, ~column_labels.str.contains(r"^Unnamed", na=False)]
@@ -336,6 +535,49 @@ def extract_energy_use_from_esto(
     return energy
 
 
+def extract_energy_use_for_economies(
+    esto_path: str | os.PathLike[str],
+    economies,
+    scenario: str,
+    base_year: int,
+    final_year: int,
+    sector: str = "15_transport_sector",
+    sub1sector: str | None = None,
+    sheet_name: str = "all econs",
+) -> dict[str, pd.Series]:
+    """
+    `extract_energy_use_from_esto` for several economies of one scenario:
+    the balances are loaded and filtered once and then split by economy.
+    """
+    esto_path = resolve_str(esto_path)
+    if esto_path is None:
+        raise ValueError("esto_path cannot be None.")
+
+    economies = list(dict.fromkeys(economies))
+    energy: dict[str, pd.Series] = {}
+    # 00_APEC may read its own balances file (see load_transport_energy_dataset).
+    for economy in [e for e in economies if e == "00_APEC"]:
+        energy[economy] = extract_energy_use_from_esto(
+            esto_path, economy, scenario, base_year, final_year, sector, sub1sector, sheet_name
+        )
+    economies = [e for e in economies if e != "00_APEC"]
+    if not economies:
+        return energy
+
+    df = load_transport_energy_dataset(esto_path, sector=sector, sheet_name=sheet_name)
+    mask = (
+        df["economy"].isin(economies)
+        & (df["scenarios"] == scenario.lower())
+        & ((df["sub1sectors"] == sub1sector) if sub1sector is not None else True)
+    )
+    df = df.loc[mask]
+    rows_by_economy = dict(iter(df.groupby("economy", sort=False, observed=True)))
+    for economy in economies:
+        rows = rows_by_economy.get(economy, df.iloc[0:0])
+        energy[economy] = _energy_use_from_esto_rows(rows, base_year, final_year)
+    return energy
+
+
 def aggregate_base_stocks(
     df: pd.DataFrame,
     base_year: int,
@@ -364,12 +606,23 @@ def aggregate_base_stocks(
     if df_base.empty:
         raise ValueError(f"No base-year stock values found for year {base_year}.")
 
-    stocks: dict[str, float] = {}
-    for _, row in df_base.iterrows():
-        bucket = vehicle_type_map.get(str(row["Vehicle Type"]).lower())
-        if bucket is None:
-            continue
-        stocks[bucket] = stocks.get(bucket, 0.0) + float(row["Stocks"])
+    # Map each distinct vehicle type once (factorize keeps first-appearance
+    # order, so buckets do too); np.bincount adds the rows in order, as a
+    # row-by-row sum would.
+    codes, vehicle_types = pd.factorize(df_base["Vehicle Type"], use_na_sentinel=False)
+    buckets = [vehicle_type_map.get(str(vehicle_type).lower()) for vehicle_type in vehicle_types]
+    bucket_names = list(dict.fromkeys(bucket for bucket in buckets if bucket is not None))
+    bucket_ids = np.array(
+        [bucket_names.index(bucket) if bucket is not None else -1 for bucket in buckets],
+        dtype=np.int64,
+    )[codes]
+    mapped = bucket_ids >= 0
+    totals = np.bincount(
+        bucket_ids[mapped],
+        weights=df_base["Stocks"].to_numpy(dtype=float)[mapped],
+        minlength=len(bucket_names),
+    )
+    stocks: dict[str, float] = {name: float(total) for name, total in zip(bucket_names, totals)}
 
     if not stocks:
         raise ValueError("No base-year stocks mapped into LPV/MC/Bus buckets.")
@@ -524,7 +777,7 @@ def _vehicle_shares_from_sales(
     )
     df_use = df_use.dropna(subset=["vehicle_bucket"])
     cols_to_keep = ["Date", "vehicle_bucket", "Sales"]
-    df_use = df_use[cols_to_keep].groupby(["Date", "vehicle_bucket"])["Sales"].sum().reset_index()
+    df_use = df_use[cols_to_keep].groupby(["Date", "vehicle_bucket"], observed=True)["Sales"].sum().reset_index()
 
     pivot = df_use.pivot(index="Date", columns="vehicle_bucket", values="Sales")
     pivot = pivot.reindex(years).interpolate().ffill().bfill().fillna(0.0)
@@ -636,37 +889,22 @@ def compute_sales_from_stock_targets(
 
     years = target_stock.index
     cohorts = initialise_cohorts(target_stock, vintage_profile)
-    sales = pd.Series(0.0, index=years, dtype=float)
-    retirements = pd.Series(0.0, index=years, dtype=float) if return_retirements else None
 
-    survival_probs = survival_curve.values
+    # Cohorts live in a preallocated (years x ages) array and are aged with a
+    # shifted multiply; pandas objects are only built once the loop is done.
+    cohort_values = cohorts.to_numpy(dtype=float, copy=True)
+    target_values = target_stock.to_numpy(dtype=float)
+    sales_values = np.zeros(len(years), dtype=float)
+    retirement_values = np.zeros(len(years), dtype=float)
+    ageing_survival = survival_curve.to_numpy(dtype=float)[: max_age - 1]
 
     for i in range(1, len(years)):
-        year_prev = years[i - 1]
-        year = years[i]
-
-        prev_cohorts = cohorts.loc[year_prev].values
-
-        new_cohorts = np.zeros_like(prev_cohorts)
-        for age in range(1, max_age):
-            survive_prob = survival_probs[age - 1]
-            new_cohorts[age] = prev_cohorts[age - 1] * survive_prob
+        prev_cohorts = cohort_values[i - 1]
+        new_cohorts = cohort_values[i]
+        np.multiply(prev_cohorts[:-1], ageing_survival, out=new_cohorts[1:])
 
         survivors_total = new_cohorts.sum()
-        target_total = target_stock.loc[year]
-        
-        # if i == 1:  # first dynamic year after base
-        #     breakpoint()
-        #     base_total = prev_cohorts.sum()
-        #     growth = target_total - base_total
-        #     print(
-        #         f"[DEBUG] {year}: base_total={base_total:,.0f}, "
-        #         f"survivors_total={survivors_total:,.0f}, "
-        #         f"target_total={target_total:,.0f}, "
-        #         f"growth={growth:,.0f}, "
-        #         f"replacement≈{base_total - survivors_total:,.0f}, "
-        #         f"required_sales={target_total - survivors_total:,.0f}"
-        #     )
+        target_total = target_values[i]
         if survivors_total <= target_total:
             required_sales = target_total - survivors_total
             new_cohorts[0] = required_sales
@@ -676,16 +914,103 @@ def compute_sales_from_stock_targets(
             required_sales = 0.0
 
         # Natural retirements from survival (pre any scaling)
-        if retirements is not None:
-            retirements.loc[year] = max(0.0, prev_cohorts.sum() - survivors_total)
-
-        cohorts.loc[year, :] = new_cohorts
-        sales.loc[year] = required_sales
+        retirement_values[i] = max(0.0, prev_cohorts.sum() - survivors_total)
+        sales_values[i] = required_sales
 
+    sales = pd.Series(sales_values, index=years, dtype=float)
+    cohorts = pd.DataFrame(cohort_values, index=cohorts.index, columns=cohorts.columns)
     if return_retirements:
+        retirements = pd.Series(retirement_values, index=years, dtype=float)
         return sales, cohorts, retirements
     return sales, cohorts
 
+def compute_sales_from_stock_target_matrix(
+    target_stocks: pd.DataFrame,
+    survival_curves: dict,
+    vintage_profiles: dict,
+) -> tuple[pd.DataFrame, dict, pd.DataFrame]:
+    """
+    Batched turnover for several vehicle types.
+
+    `target_stocks` is a (vehicle x year) matrix. Each row is turned into sales
+    with that vehicle's survival and vintage profile, with the same results as
+    calling `compute_sales_from_stock_targets` per vehicle, but vehicle types
+    on the same age grid advance together in one (vehicle x age) state array
+    per year.
+
+    Returns (sales, cohorts, retirements): sales and retirements are
+    (vehicle x year) frames and cohorts maps each vehicle to its (year x age)
+    frame.
+    """
+    vehicles = list(target_stocks.index)
+    years = target_stocks.columns
+    target_values = target_stocks.to_numpy(dtype=float)
+    sales_values = np.zeros(target_values.shape, dtype=float)
+    retirement_values = np.zeros(target_values.shape, dtype=float)
+    cohorts = {}
+
+    profiles_by_age_count: dict[int, list[tuple[int, pd.Series, pd.Series]]] = {}
+    for row, vehicle in enumerate(vehicles):
+        surv, vint = _validate_and_align_age_profiles(
+            survival_curves[vehicle],
+            vintage_profiles[vehicle],
+        )
+        profiles_by_age_count.setdefault(len(vint), []).append((row, surv, vint))
+
+    for max_age, group in profiles_by_age_count.items():
+        rows = np.array([row for row, _, _ in group], dtype=int)
+        targets = target_values[rows]
+        ageing_survival = np.vstack(
+            [surv.to_numpy(dtype=float)[: max_age - 1] for _, surv, _ in group]
+        )
+
+        # (years x vehicles x ages): each year's state is one contiguous block.
+        cohort_values = np.zeros((len(years), len(group), max_age), dtype=float)
+        for k, (_, _, vint) in enumerate(group):
+            total_vintage = float(vint.sum())
+            if total_vintage <= 0:
+                raise ValueError("vintage_profile must sum to a positive value.")
+            cohort_values[0, k] = targets[k, 0] * (vint / total_vintage).to_numpy()
+
+        group_sales = np.zeros(targets.shape, dtype=float)
+        group_retirements = np.zeros(targets.shape, dtype=float)
+        for i in range(1, len(years)):
+            prev_cohorts = cohort_values[i - 1]
+            new_cohorts = cohort_values[i]
+            np.multiply(prev_cohorts[:, :-1], ageing_survival, out=new_cohorts[:, 1:])
+
+            survivors_total = new_cohorts.sum(axis=1)
+            target_total = targets[:, i]
+            grows = survivors_total <= target_total
+            group_sales[:, i] = np.where(grows, target_total - survivors_total, 0.0)
+            new_cohorts[grows, 0] = group_sales[grows, i]
+            shrinks = ~grows
+            if shrinks.any():
+                scale = np.divide(
+                    target_total,
+                    survivors_total,
+                    out=np.zeros_like(target_total),
+                    where=survivors_total > 0,
+                )
+                new_cohorts[shrinks] *= scale[shrinks, None]
+
+            # Natural retirements from survival (pre any scaling)
+            natural_retirements = prev_cohorts.sum(axis=1) - survivors_total
+            group_retirements[:, i] = np.where(natural_retirements > 0.0, natural_retirements, 0.0)
+
+        sales_values[rows] = group_sales
+        retirement_values[rows] = group_retirements
+        for k, row in enumerate(rows):
+            cohorts[vehicles[row]] = pd.DataFrame(
+                cohort_values[:, k, :],
+                index=years,
+                columns=range(max_age),
+            )
+
+    sales = pd.DataFrame(sales_values, index=target_stocks.index, columns=years)
+    retirements = pd.DataFrame(retirement_values, index=target_stocks.index, columns=years)
+    return sales, {vehicle: cohorts[vehicle] for vehicle in vehicles}, retirements
+
 #%% wrapper: passenger-only workflow using energy trend to set k
 
 
@@ -791,17 +1116,17 @@ def build_passenger_sales_for_economy(
         M_series, population, vehicle_shares, weights
     )
     
-    # 6) Turn each stock series into sales via turnover
+    # 6) Turn the stock series into sales with one batched turnover call
     sales_by_type = {}
     retirements_by_type = {}
-    for v, S_v in target_stocks.items():
-        surv = survival_curves[v]
-        vint = vintage_profiles[v]
-        sales_v, _cohorts_v, retirements_v = compute_sales_from_stock_targets(
-            S_v, surv, vint, return_retirements=True
-        )
-        sales_by_type[v] = sales_v
-        retirements_by_type[v] = retirements_v
+    sales_matrix, _cohorts, retirements_matrix = compute_sales_from_stock_target_matrix(
+        pd.DataFrame(target_stocks).T,
+        survival_curves,
+        vintage_profiles,
+    )
+    for v in target_stocks:
+        sales_by_type[v] = sales_matrix.loc[v].rename(None)
+        retirements_by_type[v] = retirements_matrix.loc[v].rename(None)
     # 7) Aggregate passenger total and shares (for LEAP parent/children)
     passenger_types = list(target_stocks.keys())
     passenger_total_sales = sum(sales_by_type[v] for v in passenger_types)
@@ -927,17 +1252,17 @@ def build_freight_sales_for_economy(
         M_series, population, vehicle_shares, weights
     )
 
-    # Turn each stock series into sales via turnover
+    # Turn the stock series into sales with one batched turnover call
     sales_by_type = {}
     retirements_by_type = {}
-    for v, S_v in target_stocks.items():
-        surv = survival_curves[v]
-        vint = vintage_profiles[v]
-        sales_v, _cohorts_v, retirements_v = compute_sales_from_stock_targets(
-            S_v, surv, vint, return_retirements=True
-        )
-        sales_by_type[v] = sales_v
-        retirements_by_type[v] = retirements_v
+    sales_matrix, _cohorts, retirements_matrix = compute_sales_from_stock_target_matrix(
+        pd.DataFrame(target_stocks).T,
+        survival_curves,
+        vintage_profiles,
+    )
+    for v in target_stocks:
+        sales_by_type[v] = sales_matrix.loc[v].rename(None)
+        retirements_by_type[v] = retirements_matrix.loc[v].rename(None)
 
     freight_types = list(target_stocks.keys())
     freight_total_sales = sum(sales_by_type[v] for v in freight_types)
@@ -980,13 +1305,174 @@ def build_freight_sales_for_economy(
             _raise_plot_failure("Freight dashboard plotting", e)
 
     return result
+#%% batch front half: envelopes and target stocks for many economies
+
+
+def _normalise_build_series(series, years: pd.Index) -> pd.Series:
+    return pd.Series(series).reindex(years).interpolate().ffill().bfill().astype(float)
+
+
+def build_target_stocks_for_economies(
+    transport_type: str,
+    inputs: dict,
+    *,
+    errors: dict | None = None,
+) -> dict:
+    """
+    Batched front half of `build_passenger_sales_for_economy` /
+    `build_freight_sales_for_economy` for many economies at once.
+
+    `inputs` maps a key (for example the economy code) to that economy's build
+    arguments: `years`, `population`, `energy_use`, `base_stocks`,
+    `survival_curves`, `vintage_profiles` and optionally `weights`,
+    `vehicle_shares`, `M_sat`, `saturated` (passenger only), `window_years`,
+    `k_min`, `k_max`, `economy` and `scenario`.
+
+    Per-economy inputs (base capacity index, vehicle share frames) are
+    prepared first; then every group of economies on the same year grid gets
+    its M_sat as one array, its k and envelopes from the per-economy helpers
+    (`estimate_k_from_energy_trend`, `logistic_envelope_from_base`), and its
+    target stocks as one (economy x vehicle x year) array.
+
+    Returns, per key, the fields of the per-economy build result up to but
+    not including the cohort turnover (`sales`, `retirements` and totals),
+    with identical values. When `errors` is given, an economy whose inputs
+    are invalid is recorded there and skipped instead of raising.
+    """
+    freight = transport_type == "freight"
+    default_weights = DEFAULT_FREIGHT_WEIGHTS if freight else DEFAULT_PASSENGER_WEIGHTS
+
+    prepared: dict = {}
+    for key, entry in inputs.items():
+        try:
+            weights = entry.get("weights")
+            if weights is None:
+                weights = default_weights
+            years = pd.Index(entry["years"])
+            population = _normalise_build_series(entry["population"], years)
+            energy_use = _normalise_build_series(entry["energy_use"], years)
+            base_stocks = entry["base_stocks"]
+            M_base, alpha = compute_base_capacity_index(base_stocks, population.loc[years[0]], weights)
+            vehicle_shares = entry.get("vehicle_shares")
+            if vehicle_shares is None:
+                vehicle_shares = compute_base_vehicle_shares(base_stocks)
+            share_df = _prepare_vehicle_share_dataframe(vehicle_shares, years, weights)
+            denom = (share_df * pd.Series(weights, dtype=float)).sum(axis=1)
+            if (denom <= 0).any():
+                raise ValueError("Weighted vehicle shares must sum to >0 each year.")
+            M_sat = entry.get("M_sat")
+            if M_sat is None and freight:
+                M_sat = _get_manual_M_sat("freight", entry.get("economy"), entry.get("scenario"))
+        except (KeyError, TypeError, ValueError) as exc:
+            if errors is None:
+                raise
+            errors[key] = exc
+            continue
+        prepared[key] = {
+            "weights": weights,
+            "years": years,
+            "population": population,
+            "energy_use": energy_use,
+            "M_base": M_base,
+            "alpha": alpha,
+            "share_df": share_df,
+            "denom": denom,
+            "M_sat": np.nan if M_sat is None else float(M_sat),
+            "saturated": bool(entry.get("saturated", False)) and not freight,
+            "window_years": int(entry.get("window_years", 10)),
+            "k_min": float(entry.get("k_min", 0.0)),
+            "k_max": float(entry.get("k_max", 0.15)),
+        }
+
+    groups: dict[tuple, list] = {}
+    for key, item in prepared.items():
+        group_key = (tuple(item["years"].tolist()), tuple(item["share_df"].columns), item["window_years"])
+        groups.setdefault(group_key, []).append(key)
+
+    results: dict = {}
+    for (_, vehicles, window_years), keys in groups.items():
+        items = [prepared[key] for key in keys]
+        years = items[0]["years"]
+        base_year = years[0]
+        population = np.vstack([item["population"].to_numpy() for item in items])
+        M_base = np.array([item["M_base"] for item in items], dtype=float)
+        M_sat_in = np.array([item["M_sat"] for item in items], dtype=float)
+        saturated = np.array([item["saturated"] for item in items], dtype=bool)
+
+        # Saturation level (manual overrides were resolved above).
+        if freight:
+            M_sat_default = DEFAULT_FREIGHT_M_SAT_MULTIPLIER * M_base
+        else:
+            M_sat_default = np.where(
+                saturated,
+                M_base,
+                np.minimum(DEFAULT_PASSENGER_M_SAT_MULTIPLIER * M_base, DEFAULT_PASSENGER_M_SAT_CAP),
+            )
+        M_sat = np.where(np.isnan(M_sat_in), M_sat_default, M_sat_in)
+        saturated_now = (saturated | (M_base >= 0.999 * M_sat)) & (not freight)
+
+        # k and envelope per economy with the same helpers as the single-economy
+        # builds; saturated passenger fleets stay flat at max(M_base, M_sat).
+        k = np.zeros(len(items), dtype=float)
+        envelope = np.empty((len(items), len(years)), dtype=float)
+        for row, item in enumerate(items):
+            if saturated_now[row]:
+                envelope[row] = max(item["M_base"], float(M_sat[row]))
+                continue
+            k[row] = estimate_k_from_energy_trend(
+                M_base=item["M_base"],
+                M_sat=float(M_sat[row]),
+                energy_use=item["energy_use"],
+                base_year=base_year,
+                window_years=window_years,
+                k_min=item["k_min"],
+                k_max=item["k_max"],
+            )
+            envelope[row] = logistic_envelope_from_base(
+                years, item["M_base"], float(M_sat[row]), k[row], base_year
+            ).to_numpy()
+
+        # Target stocks: share_v * capacity / sum_v(share_v * w_v).
+        shares = np.stack([item["share_df"].to_numpy(dtype=float).T for item in items])
+        denom = np.vstack([item["denom"].to_numpy(dtype=float) for item in items])
+        capacity = envelope * population
+        targets = shares * capacity[:, None, :] / denom[:, None, :]
+        targets = np.where((shares == 0.0).all(axis=2, keepdims=True), 0.0, targets)
+
+        for row, (key, item) in enumerate(zip(keys, items)):
+            # Each series gets its own index object, as in the per-economy build,
+            # so renaming one index later (e.g. in convert_result_to_dataframe)
+            # cannot leak into the others.
+            M_series = pd.Series(envelope[row], index=item["years"].copy(), dtype=float)
+            result = {
+                "M_envelope": M_series,
+                "adjusted_vehicle_ownership": M_series * 1000.0,
+                "target_stocks": {
+                    v: pd.Series(targets[row, col], index=item["years"].copy(), dtype=float)
+                    for col, v in enumerate(vehicles)
+                },
+                "k_used": float(k[row]),
+                "M_sat": float(M_sat[row]),
+                "M_base": item["M_base"],
+                "alpha_capacity_shares": item["alpha"],
+                "vehicle_shares": item["share_df"],
+            }
+            if freight:
+                result["transport_type"] = "freight"
+            else:
+                result["saturated"] = bool(saturated_now[row])
+            result["survival_curves"] = inputs[key]["survival_curves"]
+            result["vintage_profiles"] = inputs[key]["vintage_profiles"]
+            results[key] = result
+    return {key: results[key] for key in inputs if key in results}
+
+
 #%% dataframe convenience wrapper for MAIN integration
 
 
-def estimate_passenger_sales_from_dataframe(
+def _collect_sales_inputs(
+    transport_type: str,
     df: pd.DataFrame,
-    survival_curves: dict,
-    vintage_profiles: dict,
     *,
     economy: str | None = None,
     scenario: str | None = None,
@@ -994,47 +1480,23 @@ def estimate_passenger_sales_from_dataframe(
     final_year: int | None = None,
     vehicle_type_map: dict | None = None,
     population_col: str = "Population",
-    energy_col: str = "Energy",
     stocks_col: str = "Stocks",
     base_stocks_df: pd.DataFrame | None = None,
     esto_energy_path: str | os.PathLike | None = None,
     esto_sector: str = "15_transport_sector",
     esto_sheet: str = "all econs",
-    weights: dict | None = None,
     vehicle_shares: dict | None = None,
-    M_sat: float | None = None,
-    saturated: bool = False,
-    window_years: int = 10,
-    k_min: float = 0.0,
-    k_max: float = 0.15,
-    plot: bool = True,
-    use_9th_vehicle_type_sales_shares: bool = True,
+    use_9th_vehicle_type_sales_shares: bool | None = None,
+    energy_use: pd.Series | None = None,
 ) -> dict:
     """
-    Run the passenger S-curve workflow directly from the transport source
-    dataframe used by MAIN_transport_leap_import.py.
-
-    Only passenger road rows are used to infer:
-      - population series (mean across rows per year)
-      - passenger energy use (sum per year)
-      - base-year stocks aggregated into LPV/MC/Bus buckets
-
-    Base-year stocks can be taken from `base_stocks_df` (e.g. an output data
-    sheet) if provided; otherwise the filtered `df` is used.
-
-    Energy can be sourced from the ESTO balances if `esto_energy_path` is set,
-    using sector == 15_transport_sector by default.
-
-    vehicle_shares can be passed as constants or Series (by vehicle count) to
-    reflect scenario shifts; if omitted, base-year vehicle shares are used.
-    Set saturated=True to keep ownership flat at the base level (for already
-    saturated economies).
+    Gather one economy's sales-model inputs from the transport source dataframe:
+    the modelling years, population, ESTO energy use, base-year stocks by
+    vehicle bucket and (optionally derived) vehicle shares.
 
-    Returns the same dict as build_passenger_sales_for_economy, plus:
-      - 'years': pd.Index of the modelling horizon
-      - 'sales_table': pd.DataFrame with columns [Date, LPV, MC, Bus]
-      - 'base_stocks': aggregated base-year stocks used as inputs
-      - 'energy_use_passenger': passenger energy series used
+    Shared by the passenger/freight dataframe workflows and the batch engine
+    in `sales_workflow.estimate_sales_for_economies`, which passes `energy_use`
+    already extracted for all economies (see `extract_energy_use_for_economies`).
     """
     df_use = df.copy()
 
@@ -1044,16 +1506,10 @@ def estimate_passenger_sales_from_dataframe(
         df_use = df_use[df_use["Scenario"] == scenario]
 
     if vehicle_type_map is None:
-        vehicle_type_map = {
-            "car": "LPV",
-            "suv": "LPV",
-            "lt": "LPV",
-            "lpv": "LPV",
-            "2w": "MC",
-            "mc": "MC",
-            "bus": "Bus",
-        }
-    
+        vehicle_type_map = (
+            DEFAULT_FREIGHT_VEHICLE_TYPE_MAP if transport_type == "freight" else DEFAULT_PASSENGER_VEHICLE_TYPE_MAP
+        )
+
     if "Date" not in df_use.columns:
         raise KeyError("Expected a 'Date' column in the transport dataframe.")
 
@@ -1070,7 +1526,7 @@ def estimate_passenger_sales_from_dataframe(
         raise KeyError(f"Missing '{population_col}' column for population series.")
     #mean of population is necessary and most simple option since there are multiple rows per year with the same population
     population = (
-        df_use.groupby("Date")[population_col]
+        df_use.groupby("Date", observed=True)[population_col]
         .mean(numeric_only=True)
         .reindex(years)
         .interpolate()
@@ -1079,33 +1535,37 @@ def estimate_passenger_sales_from_dataframe(
         .astype(float)
     )
 
-    passenger_mask = (
-        df_use["Transport Type"].astype(str).str.lower() == "passenger"
-    ) & (df_use["Medium"].astype(str).str.lower() == "road")
-    if esto_energy_path:
-        if economy is None or scenario is None:
-            raise ValueError("economy and scenario are required when using ESTO energy.")
-        energy_use_passenger = extract_energy_use_from_esto(
-            esto_path=esto_energy_path,
-            economy=economy,
-            scenario=scenario,
-            base_year=base_year,
-            final_year=final_year,
-            sector=esto_sector,
-            sheet_name=esto_sheet,
-        )
-    else:
-        raise NotImplementedError(
-            "Direct extraction of passenger energy from another dataframe is not implemented since source dataframe doesnt have historical energy data.")
+    if energy_use is None:
+        if esto_energy_path:
+            if economy is None or scenario is None:
+                raise ValueError("economy and scenario are required when using ESTO energy.")
+            energy_use = extract_energy_use_from_esto(
+                esto_path=esto_energy_path,
+                economy=economy,
+                scenario=scenario,
+                base_year=base_year,
+                final_year=final_year,
+                sector=esto_sector,
+                sheet_name=esto_sheet,
+            )
+        else:
+            raise NotImplementedError(
+                f"Direct extraction of {transport_type} energy from another dataframe is not implemented since source dataframe doesnt have historical energy data.")
+
     stocks_source_df = base_stocks_df.copy() if base_stocks_df is not None else df_use
+    if transport_type == "freight":
+        stocks_source_df = stocks_source_df[
+            (stocks_source_df["Transport Type"].astype(str).str.lower() == "freight")
+            & (stocks_source_df["Medium"].astype(str).str.lower() == "road")
+        ]
     if stocks_col not in stocks_source_df.columns:
         raise KeyError(f"Missing '{stocks_col}' column for stock levels.")
-    
+
     base_stocks = aggregate_base_stocks(
         df=stocks_source_df.rename(columns={stocks_col: "Stocks"}),
         base_year=base_year,
         vehicle_type_map=vehicle_type_map,
-        passenger_only=True,
+        passenger_only=transport_type != "freight",
     )
 
     # Optional: derive vehicle shares from Vehicle_sales_share if requested and not provided
@@ -1117,21 +1577,104 @@ def estimate_passenger_sales_from_dataframe(
         )
         if use_sales_shares:
             derived_shares = _vehicle_shares_from_sales(
-                df_use, years, vehicle_type_map, transport_type="passenger"
+                df_use, years, vehicle_type_map, transport_type=transport_type
             )
             if derived_shares:
                 vehicle_shares = derived_shares
 
+    return {
+        "years": years,
+        "population": population,
+        "energy_use": energy_use,
+        "base_stocks": base_stocks,
+        "vehicle_shares": vehicle_shares,
+    }
+
+
+def estimate_passenger_sales_from_dataframe(
+    df: pd.DataFrame,
+    survival_curves: dict,
+    vintage_profiles: dict,
+    *,
+    economy: str | None = None,
+    scenario: str | None = None,
+    base_year: int | None = None,
+    final_year: int | None = None,
+    vehicle_type_map: dict | None = None,
+    population_col: str = "Population",
+    energy_col: str = "Energy",
+    stocks_col: str = "Stocks",
+    base_stocks_df: pd.DataFrame | None = None,
+    esto_energy_path: str | os.PathLike | None = None,
+    esto_sector: str = "15_transport_sector",
+    esto_sheet: str = "all econs",
+    weights: dict | None = None,
+    vehicle_shares: dict | None = None,
+    M_sat: float | None = None,
+    saturated: bool = False,
+    window_years: int = 10,
+    k_min: float = 0.0,
+    k_max: float = 0.15,
+    plot: bool = True,
+    use_9th_vehicle_type_sales_shares: bool = True,
+) -> dict:
+    """
+    Run the passenger S-curve workflow directly from the transport source
+    dataframe used by MAIN_transport_leap_import.py.
+
+    Only passenger road rows are used to infer:
+      - population series (mean across rows per year)
+      - passenger energy use (sum per year)
+      - base-year stocks aggregated into LPV/MC/Bus buckets
+
+    Base-year stocks can be taken from `base_stocks_df` (e.g. an output data
+    sheet) if provided; otherwise the filtered `df` is used.
+
+    Energy can be sourced from the ESTO balances if `esto_energy_path` is set,
+    using sector == 15_transport_sector by default.
+
+    vehicle_shares can be passed as constants or Series (by vehicle count) to
+    reflect scenario shifts; if omitted, base-year vehicle shares are used.
+    Set saturated=True to keep ownership flat at the base level (for already
+    saturated economies).
+
+    Returns the same dict as build_passenger_sales_for_economy, plus:
+      - 'years': pd.Index of the modelling horizon
+      - 'sales_table': pd.DataFrame with columns [Date, LPV, MC, Bus]
+      - 'base_stocks': aggregated base-year stocks used as inputs
+      - 'energy_use_passenger': passenger energy series used
+    """
+    inputs = _collect_sales_inputs(
+        "passenger",
+        df,
+        economy=economy,
+        scenario=scenario,
+        base_year=base_year,
+        final_year=final_year,
+        vehicle_type_map=vehicle_type_map,
+        population_col=population_col,
+        stocks_col=stocks_col,
+        base_stocks_df=base_stocks_df,
+        esto_energy_path=esto_energy_path,
+        esto_sector=esto_sector,
+        esto_sheet=esto_sheet,
+        vehicle_shares=vehicle_shares,
+        use_9th_vehicle_type_sales_shares=use_9th_vehicle_type_sales_shares,
+    )
+    years = inputs["years"]
+    base_stocks = inputs["base_stocks"]
+    energy_use_passenger = inputs["energy_use"]
+
     result = build_passenger_sales_for_economy(
         years=years,
-        population=population,
+        population=inputs["population"],
         energy_use_passenger=energy_use_passenger,
         base_stocks=base_stocks,
         survival_curves=survival_curves,
         vintage_profiles=vintage_profiles,
         weights=weights,
         M_sat=M_sat,
-        vehicle_shares=vehicle_shares,
+        vehicle_shares=inputs["vehicle_shares"],
         saturated=saturated,
         window_years=window_years,
         k_min=k_min,
@@ -1180,99 +1723,36 @@ def estimate_freight_sales_from_dataframe(
     """
     Freight road workflow (separate from passenger) using energy trend only.
     """
-    df_use = df.copy()
-
-    if economy is not None and "Economy" in df_use.columns:
-        df_use = df_use[df_use["Economy"] == economy]
-    if scenario is not None and "Scenario" in df_use.columns:
-        df_use = df_use[df_use["Scenario"] == scenario]
-
-    if vehicle_type_map is None:
-        vehicle_type_map = DEFAULT_FREIGHT_VEHICLE_TYPE_MAP
-
-    if "Date" not in df_use.columns:
-        raise KeyError("Expected a 'Date' column in the transport dataframe.")
-
-    if base_year is None:
-        base_year = int(df_use["Date"].min())
-    if final_year is None:
-        final_year = int(df_use["Date"].max())
-
-    years = pd.Index(range(base_year, final_year + 1))
-    if len(years) == 0:
-        raise ValueError("No years available after applying base_year/final_year.")
-
-    if population_col not in df_use.columns:
-        raise KeyError(f"Missing '{population_col}' column for population series.")
-
-    population = (
-        df_use.groupby("Date")[population_col]
-        .mean(numeric_only=True)
-        .reindex(years)
-        .interpolate()
-        .ffill()
-        .bfill()
-        .astype(float)
-    )
-
-    freight_mask = (
-        df_use["Transport Type"].astype(str).str.lower() == "freight"
-    ) & (df_use["Medium"].astype(str).str.lower() == "road")
-
-    if esto_energy_path:
-        if economy is None or scenario is None:
-            raise ValueError("economy and scenario are required when using ESTO energy.")
-        energy_use_freight = extract_energy_use_from_esto(
-            esto_path=esto_energy_path,
-            economy=economy,
-            scenario=scenario,
-            base_year=base_year,
-            final_year=final_year,
-            sector=esto_sector,
-            sheet_name=esto_sheet,
-        )
-    else:
-        raise NotImplementedError(
-            "Direct extraction of freight energy from another dataframe is not implemented since source dataframe doesnt have historical energy data.")
-
-    stocks_source_df = base_stocks_df.copy() if base_stocks_df is not None else df_use
-    stocks_source_df = stocks_source_df[
-        (stocks_source_df["Transport Type"].astype(str).str.lower() == "freight")
-        & (stocks_source_df["Medium"].astype(str).str.lower() == "road")
-    ]
-    if stocks_col not in stocks_source_df.columns:
-        raise KeyError(f"Missing '{stocks_col}' column for stock levels.")
-
-    base_stocks = aggregate_base_stocks(
-        df=stocks_source_df.rename(columns={stocks_col: "Stocks"}),
+    inputs = _collect_sales_inputs(
+        "freight",
+        df,
+        economy=economy,
+        scenario=scenario,
         base_year=base_year,
+        final_year=final_year,
         vehicle_type_map=vehicle_type_map,
-        passenger_only=False,
+        population_col=population_col,
+        stocks_col=stocks_col,
+        base_stocks_df=base_stocks_df,
+        esto_energy_path=esto_energy_path,
+        esto_sector=esto_sector,
+        esto_sheet=esto_sheet,
+        vehicle_shares=vehicle_shares,
+        use_9th_vehicle_type_sales_shares=use_9th_vehicle_type_sales_shares,
     )
-
-    # Optional: derive vehicle shares from Vehicle_sales_share if requested and not provided
-    if vehicle_shares is None:
-        use_sales_shares = (
-            USE_9TH_VEHICLE_TYPE_SALES_SHARES
-            if use_9th_vehicle_type_sales_shares is None
-            else use_9th_vehicle_type_sales_shares
-        )
-        if use_sales_shares:
-            derived_shares = _vehicle_shares_from_sales(
-                df_use, years, vehicle_type_map, transport_type="freight"
-            )
-            if derived_shares:
-                vehicle_shares = derived_shares
+    years = inputs["years"]
+    base_stocks = inputs["base_stocks"]
+    energy_use_freight = inputs["energy_use"]
 
     result = build_freight_sales_for_economy(
         years=years,
-        population=population,
+        population=inputs["population"],
         energy_use_freight=energy_use_freight,
         base_stocks=base_stocks,
         survival_curves=survival_curves,
         vintage_profiles=vintage_profiles,
         weights=weights,
-        vehicle_shares=vehicle_shares,
+        vehicle_shares=inputs["vehicle_shares"],
         M_sat=M_sat,
         economy=economy,
         scenario=scenario,
@@ -1428,6 +1908,7 @@ def estimate_passenger_sales_from_files(
         survival_path,
         vintage_path,
         survival_is_cumulative=survival_is_cumulative,
+        economy=economy,
     )
 
     result = estimate_passenger_sales_from_dataframe(
@@ -1495,6 +1976,7 @@ def estimate_freight_sales_from_files(
         vintage_path,
         survival_is_cumulative=survival_is_cumulative,
         vehicle_keys=("Trucks", "LCVs"),
+        economy=economy,
     )
 
     result = estimate_freight_sales_from_dataframe(
@@ -1559,7 +2041,8 @@ def _save_dashboard_figures(
             continue
         panel_token = _sanitize_plot_filename_token(str(name))
         save_path = (out_dir / f"{timestamp}_{dashboard_token}_{panel_token}.png").resolve()
-        fig.savefig(save_path, dpi=200, bbox_inches="tight")
+        with atomic_output_path(save_path) as tmp_path:
+            fig.savefig(tmp_path, dpi=200, bbox_inches="tight")
         saved_paths.append(str(save_path))
         saved_ids.add(fig_id)
 
@@ -1662,6 +2145,7 @@ def _aggregate_drive_frame_by_family(df: pd.DataFrame) -> pd.DataFrame:
     return pd.DataFrame(grouped, index=df.index).astype(float)
 
 
+@timed_stage("sales_dashboard")
 def plot_passenger_sales_result(
     result: dict,
     economy: str | None = None,
@@ -1672,6 +2156,7 @@ def plot_passenger_sales_result(
     transport_label: str = "Passenger road",
     n_cols: int = 3,
     show_guide: bool = False,
+    output_dir: str | os.PathLike | None = None,
 ) -> dict:
     """
     Build simple matplotlib charts from a transport sales result dict.
@@ -1684,6 +2169,7 @@ def plot_passenger_sales_result(
     (commonly zero for sales), which can be visually misleading.
 
     share_key controls which share dictionary to plot (e.g. passenger or freight).
+    output_dir overrides the folder the figures are saved to (default: plotting_output).
     """
     
     try:
@@ -1891,7 +2377,7 @@ def plot_passenger_sales_result(
                         errors="coerce",
                     ).fillna(0.0)
                     drives_with_effect = (
-                        contrib_df.groupby("drive")["rate_contribution"]
+                        contrib_df.groupby("drive", observed=True)["rate_contribution"]
                         .apply(lambda x: float(np.max(np.abs(x.to_numpy(dtype=float)))))
                         .sort_index()
                     )
@@ -1996,7 +2482,7 @@ def plot_passenger_sales_result(
                     errors="coerce",
                 ).fillna(0.0)
                 drive_stock_all_df = (
-                    share_source_df.groupby(["Date", "drive"])["drive_stock"]
+                    share_source_df.groupby(["Date", "drive"], observed=True)["drive_stock"]
                     .sum()
                     .unstack(fill_value=0.0)
                     .reindex(years)
@@ -2027,7 +2513,7 @@ def plot_passenger_sales_result(
                         .sum()
                     )
                     drive_stock = (
-                        changed_share_df.groupby(["Date", "drive"])["drive_stock"]
+                        changed_share_df.groupby(["Date", "drive"], observed=True)["drive_stock"]
                         .sum()
                         .unstack(fill_value=0.0)
                     )
@@ -2070,7 +2556,7 @@ def plot_passenger_sales_result(
                 merged_sales["drive_stock_share"] * merged_sales["vehicle_total"].fillna(0.0)
             )
             drive_sales_all_df = (
-                merged_sales.groupby(["Date", "drive"])["attributed"]
+                merged_sales.groupby(["Date", "drive"], observed=True)["attributed"]
                 .sum()
                 .unstack(fill_value=0.0)
                 .reindex(years)
@@ -2129,7 +2615,7 @@ def plot_passenger_sales_result(
                     merged_baseline_sales["drive_stock_share"] * merged_baseline_sales["vehicle_total"].fillna(0.0)
                 )
                 drive_baseline_sales_df = (
-                    merged_baseline_sales.groupby(["Date", "drive"])["attributed"]
+                    merged_baseline_sales.groupby(["Date", "drive"], observed=True)["attributed"]
                     .sum()
                     .unstack(fill_value=0.0)
                     .reindex(years)
@@ -2185,7 +2671,7 @@ def plot_passenger_sales_result(
                     merged_baseline_retire["drive_stock_share"] * merged_baseline_retire["vehicle_total"].fillna(0.0)
                 )
                 drive_baseline_retire_df = (
-                    merged_baseline_retire.groupby(["Date", "drive"])["attributed"]
+                    merged_baseline_retire.groupby(["Date", "drive"], observed=True)["attributed"]
                     .sum()
                     .unstack(fill_value=0.0)
                     .reindex(years)
@@ -2247,7 +2733,7 @@ def plot_passenger_sales_result(
                         merged_extra_retire["allocation_share"] * merged_extra_retire["vehicle_total"].fillna(0.0)
                     )
                     drive_extra_retire_df = (
-                        merged_extra_retire.groupby(["Date", "drive"])["attributed"]
+                        merged_extra_retire.groupby(["Date", "drive"], observed=True)["attributed"]
                         .sum()
                         .unstack(fill_value=0.0)
                         .reindex(years)
@@ -2783,6 +3269,7 @@ def plot_passenger_sales_result(
     saved_plot_paths = _save_dashboard_figures(
         figs,
         dashboard_name=f"{transport_label}_dashboard",
+        output_dir=output_dir,
     )
     if saved_plot_paths:
         figs["saved_plot_paths"] = saved_plot_paths
@@ -2798,6 +3285,7 @@ def plot_freight_sales_result(
     *,
     n_cols: int = 3,
     show_guide: bool = False,
+    output_dir: str | os.PathLike | None = None,
 ) -> dict:
     """
     Freight-specific dashboard with freight share labels.
@@ -2811,9 +3299,11 @@ def plot_freight_sales_result(
         transport_label="Freight road",
         n_cols=n_cols,
         show_guide=show_guide,
+        output_dir=output_dir,
     )
 
 
+@timed_stage("sales_dashboard")
 def plot_transport_sales_dashboard(
     passenger_result: dict,
     freight_result: dict,
@@ -0,0 +1,185 @@
+"""Deferred rendering of passenger/freight sales dashboards.
+
+Building the sales dashboards takes longer than the sales estimate itself and
+used to run inline in the sales builders, holding up the export pipeline. In
+deferred mode the builders only store their result (the plotting inputs) in a
+queue folder, one pickle per transport type/economy/scenario, and carry on.
+The queued dashboards are rendered later in separate worker processes, off
+the pipeline's critical path, and saved through the dashboards' usual
+`_save_dashboard_figures` call.
+
+Workers use the non-interactive "Agg" backend and skip breakpoint() calls, so
+rendering never waits on a window or a debugger. The queue holds one run's
+dashboards: clear a scenario's jobs (`clear_sales_dashboards`) before the run
+that queues them, so jobs left over from an earlier run are not rendered.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from functions.atomic_io import write_pickle_atomic
+
+SALES_DASHBOARD_TRANSPORT_TYPES = ("passenger", "freight")
+
+
+def _job_token(value: str) -> str:
+    token = "".join(ch if (ch.isalnum() or ch in {"_", "-"}) else "_" for ch in str(value).strip())
+    return token or "unknown"
+
+
+def queue_sales_dashboard(
+    result: dict,
+    *,
+    transport_type: str,
+    economy: str,
+    scenario: str,
+    queue_dir: str | os.PathLike,
+) -> Path:
+    """
+    Store the plotting inputs of one sales result for a later render and
+    return the job path. A newer result for the same target replaces the
+    queued one.
+    """
+    if transport_type not in SALES_DASHBOARD_TRANSPORT_TYPES:
+        raise ValueError(
+            f"Unknown transport_type '{transport_type}'. "
+            f"Use one of: {', '.join(SALES_DASHBOARD_TRANSPORT_TYPES)}."
+        )
+    job_path = Path(queue_dir) / _job_token(scenario) / f"{transport_type}__{_job_token(economy)}.pkl"
+    plot_inputs = {key: value for key, value in result.items() if key != "figures"}
+    write_pickle_atomic(
+        {
+            "transport_type": transport_type,
+            "economy": economy,
+            "scenario": scenario,
+            "result": plot_inputs,
+        },
+        job_path,
+    )
+    return job_path
+
+
+def pending_sales_dashboards(
+    queue_dir: str | os.PathLike,
+    *,
+    scenario: str | None = None,
+) -> list[Path]:
+    """Queued dashboard jobs, optionally only those of one scenario."""
+    root = Path(queue_dir)
+    if scenario is not None:
+        root = root / _job_token(scenario)
+    if not root.exists():
+        return []
+    pattern = "*.pkl" if scenario is not None else "*/*.pkl"
+    # Skip the temporary files of writes still in progress.
+    return sorted(path for path in root.glob(pattern) if not path.name.startswith("."))
+
+
+def clear_sales_dashboards(
+    queue_dir: str | os.PathLike,
+    *,
+    scenario: str | None = None,
+) -> int:
+    """Remove the queued dashboard jobs (optionally only one scenario's) and return how many."""
+    jobs = pending_sales_dashboards(queue_dir, scenario=scenario)
+    for job_path in jobs:
+        job_path.unlink(missing_ok=True)
+    return len(jobs)
+
+
+def _init_render_worker() -> None:
+    """Worker initializer: non-interactive backend, breakpoint() disabled."""
+    os.environ["PYTHONBREAKPOINT"] = "0"
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def render_sales_dashboard_job(
+    job_path: str | os.PathLike,
+    output_dir: str | os.PathLike | None = None,
+) -> list[str]:
+    """
+    Render one queued dashboard and return the saved figure paths. Figures go
+    to `<output_dir>/<economy>_<scenario>/` (default: the plotting_output
+    folder). The job file is removed once its figures are saved.
+    """
+    import matplotlib.pyplot as plt
+
+    from functions.sales_curve_estimate import (
+        DEFAULT_PLOTTING_OUTPUT_DIR,
+        plot_freight_sales_result,
+        plot_passenger_sales_result,
+    )
+
+    path = Path(job_path)
+    job = pd.read_pickle(path)
+    plot = plot_freight_sales_result if job["transport_type"] == "freight" else plot_passenger_sales_result
+    target_dir = Path(output_dir) if output_dir is not None else DEFAULT_PLOTTING_OUTPUT_DIR
+    try:
+        figs = plot(
+            job["result"],
+            economy=job["economy"],
+            show=False,
+            output_dir=target_dir / f"{_job_token(job['economy'])}_{_job_token(job['scenario'])}",
+        )
+    finally:
+        plt.close("all")
+    path.unlink(missing_ok=True)
+    return list(figs.get("saved_plot_paths", []))
+
+
+def render_queued_sales_dashboards(
+    queue_dir: str | os.PathLike,
+    *,
+    scenario: str | None = None,
+    max_workers: int = 2,
+    output_dir: str | os.PathLike | None = None,
+) -> list[str]:
+    """
+    Render every queued dashboard (optionally of one scenario) across
+    `max_workers` worker processes and return the saved figure paths.
+
+    A job that fails to render is reported and left in the queue for the next
+    call; it never fails the caller.
+    """
+    jobs = pending_sales_dashboards(queue_dir, scenario=scenario)
+    if not jobs:
+        return []
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = max(1, min(int(max_workers), len(jobs)))
+    print(f"[INFO] Rendering {len(jobs)} queued sales dashboard(s) across {workers} worker process(es).")
+    saved_paths: list[str] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_render_worker,
+    ) as executor:
+        futures = {
+            executor.submit(render_sales_dashboard_job, str(job_path), output_dir): job_path
+            for job_path in jobs
+        }
+        for future in as_completed(futures):
+            job_path = futures[future]
+            try:
+                saved_paths.extend(future.result())
+            except Exception as exc:
+                print(f"[WARN] Could not render queued sales dashboard {job_path}: {exc}")
+    return sorted(saved_paths)
+
+
+__all__ = [
+    "SALES_DASHBOARD_TRANSPORT_TYPES",
+    "clear_sales_dashboards",
+    "pending_sales_dashboards",
+    "queue_sales_dashboard",
+    "render_queued_sales_dashboards",
+    "render_sales_dashboard_job",
+]
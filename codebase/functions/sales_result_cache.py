@@ -0,0 +1,107 @@
+"""Cached passenger/freight sales results.
+
+Sales estimation only depends on the economy/scenario slice of the prepared
+input frame, the lifecycle profiles, the ESTO energy file, the vehicle
+weights and the sales policy settings. Runs that only change export or
+reconciliation settings can therefore reuse the previous result instead of
+re-estimating the envelope, k and the cohort turnover.
+
+Results are stored in content-addressed pickles: the file name carries a
+digest of everything listed above, so a result is only reused for identical
+inputs. Code changes are not tracked; bump SALES_RESULT_CACHE_VERSION when the
+sales estimation changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from functions.atomic_io import write_pickle_atomic
+from functions.run_manifest import file_fingerprint, settings_digest
+
+# Bump when the cached result layout or the sales estimation changes.
+SALES_RESULT_CACHE_VERSION = 1
+
+
+def pandas_digest(obj: pd.DataFrame | pd.Series, *, index: bool = True) -> str:
+    """Digest of a frame's (or series') dtypes and values, optionally with its index."""
+    digest = hashlib.sha256()
+    dtypes = obj.dtypes.items() if isinstance(obj, pd.DataFrame) else [(obj.name, obj.dtype)]
+    digest.update("|".join(f"{col}:{dtype}" for col, dtype in dtypes).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(obj, index=index).to_numpy().tobytes())
+    return digest.hexdigest()[:20]
+
+
+def _fingerprint_value(value: Any) -> Any:
+    """Replace pandas/numpy objects with digests so settings_digest sees every value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return {"__pandas__": pandas_digest(value)}
+    if isinstance(value, np.ndarray):
+        return {"__array__": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()[:20]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Mapping):
+        return {key: _fingerprint_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value)(_fingerprint_value(item) for item in value)
+    return value
+
+
+def sales_result_cache_key(
+    df_slice: pd.DataFrame,
+    *,
+    survival_curves: Mapping[str, pd.Series],
+    vintage_profiles: Mapping[str, pd.Series],
+    esto_energy_path: str | None,
+    settings: Mapping[str, Any],
+) -> str:
+    """Digest of everything a sales estimate depends on."""
+    payload = {
+        "version": SALES_RESULT_CACHE_VERSION,
+        "input_slice": pandas_digest(df_slice, index=False),
+        "survival_curves": _fingerprint_value(dict(survival_curves)),
+        "vintage_profiles": _fingerprint_value(dict(vintage_profiles)),
+        "esto_energy": file_fingerprint(esto_energy_path),
+        "settings": _fingerprint_value(dict(settings)),
+    }
+    return settings_digest(payload)
+
+
+def load_cached_sales_result(cache_path: str | os.PathLike) -> dict | None:
+    """Return the stored result at `cache_path`, or None when absent or unreadable."""
+    path = Path(cache_path)
+    if not path.exists():
+        return None
+    try:
+        result = pd.read_pickle(path)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as exc:
+        print(f"[WARN] Ignoring unreadable sales result cache {path}: {exc}")
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def save_sales_result(result: dict, cache_path: str | os.PathLike) -> None:
+    """Store `result` at `cache_path`; failures only cost the next run a recompute."""
+    path = Path(cache_path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_pickle_atomic(result, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as exc:
+        print(f"[WARN] Could not store sales result cache {path}: {exc}")
+
+
+__all__ = [
+    "SALES_RESULT_CACHE_VERSION",
+    "load_cached_sales_result",
+    "pandas_digest",
+    "sales_result_cache_key",
+    "save_sales_result",
+]
@@ -0,0 +1,174 @@
+"""Small dependency-aware scheduler for workflow stages.
+
+Stages declare the stages whose outputs they consume. The scheduler runs
+them in dependency order, runs independent stages concurrently when more
+than one worker is allowed, and can restrict a run to selected stages plus
+everything downstream of them (targeted reruns). Results of stages that are
+not rerun are supplied from a previous run via a JSON results file.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from functions.atomic_io import write_json_atomic
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One workflow stage.
+
+    `run` receives a mapping of dependency name -> dependency result and
+    returns this stage's result. Names may carry a qualifier after a colon
+    (e.g. "domestic:Reference"); selection by the base name ("domestic")
+    matches every qualified stage.
+    """
+
+    name: str
+    run: Callable[[Mapping[str, Any]], Any]
+    depends_on: tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def base_name(self) -> str:
+        return self.name.split(":", 1)[0]
+
+
+class StageScheduler:
+    """Run a fixed set of stages as a DAG."""
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name '{stage.name}'.")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        """Return stage names in dependency order, keeping declaration order for ties."""
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order: list[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage dependencies contain a cycle among: {sorted(remaining)}")
+            name = ready[0]
+            order.append(name)
+            del remaining[name]
+            for deps in remaining.values():
+                deps.discard(name)
+        return order
+
+    def resolve_selection(self, names: Iterable[str]) -> list[str]:
+        """Expand stage names (or base names) to the matching stage names."""
+        selected: set[str] = set()
+        for raw_name in names:
+            key = str(raw_name).strip()
+            matches = [
+                name
+                for name, stage in self.stages.items()
+                if name == key or stage.base_name == key
+            ]
+            if not matches:
+                valid = sorted({stage.base_name for stage in self.stages.values()} | set(self.stages))
+                raise ValueError(f"Unknown stage '{raw_name}'. Use one of: {', '.join(valid)}.")
+            selected.update(matches)
+        return [name for name in self.order if name in selected]
+
+    def downstream_of(self, names: Iterable[str]) -> list[str]:
+        """Return the given stages plus every stage that depends on them."""
+        closure = set(self.resolve_selection(names))
+        for name in self.order:
+            if any(dep in closure for dep in self.stages[name].depends_on):
+                closure.add(name)
+        return [name for name in self.order if name in closure]
+
+    def run(
+        self,
+        *,
+        only: Iterable[str] | None = None,
+        max_workers: int = 1,
+        results: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run stages and return a name -> result mapping.
+
+        When `only` is given, just those stages and their downstream dependents
+        run; other dependencies must already be present in `results`. The first
+        stage failure stops new stages from starting and is re-raised once the
+        stages already running have finished.
+        """
+        to_run = self.order if only is None else self.downstream_of(only)
+        stage_results: dict[str, Any] = dict(results or {})
+        pending = list(to_run)
+        for name in pending:
+            missing = [
+                dep
+                for dep in self.stages[name].depends_on
+                if dep not in pending and dep not in stage_results
+            ]
+            if missing:
+                raise ValueError(
+                    f"Cannot run stage '{name}' without results for {missing}; "
+                    "run those stages first or include them in the selection."
+                )
+
+        def is_ready(name: str) -> bool:
+            return all(dep in stage_results for dep in self.stages[name].depends_on)
+
+        def call(name: str) -> Any:
+            stage = self.stages[name]
+            return stage.run({dep: stage_results[dep] for dep in stage.depends_on})
+
+        if max_workers <= 1:
+            for name in pending:
+                stage_results[name] = call(name)
+            return stage_results
+
+        first_error: BaseException | None = None
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                if first_error is None:
+                    for name in [name for name in pending if is_ready(name)]:
+                        if len(running) >= max_workers:
+                            break
+                        pending.remove(name)
+                        running[executor.submit(call, name)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        stage_results[name] = future.result()
+                    except BaseException as exc:
+                        if first_error is None:
+                            first_error = exc
+        if first_error is not None:
+            raise first_error
+        return stage_results
+
+
+def load_stage_results(path: str | Path) -> dict[str, Any]:
+    """Read stage results saved by `save_stage_results` (empty if missing)."""
+    results_path = Path(path)
+    if not results_path.exists():
+        return {}
+    with open(results_path, encoding="utf-8") as handle:
+        payload = json.load(handle)
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_stage_results(path: str | Path, results: Mapping[str, Any]) -> None:
+    """Write stage results as JSON (atomically) for later targeted reruns."""
+    write_json_atomic(path, dict(results), indent=2, default=str)
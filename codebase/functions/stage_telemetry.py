@@ -0,0 +1,287 @@
+"""Stage-level run telemetry.
+
+Pipeline stages are wrapped with `timed_stage` (decorator) or `track_stage`
+(context manager). While a run is collecting telemetry (see
+`begin_stage_telemetry` / `collect_stage_telemetry`) each stage appends one
+entry with its wall time, CPU time, peak RSS and the number of rows it
+produced. Outside a collecting run the wrappers only call through.
+
+Collection is per thread/process context, so concurrent runs (scheduler
+threads or economy worker processes) keep separate stage lists.
+
+A collecting run can also profile selected stages (`profile_stages`). Each
+profiled stage call writes a cProfile `.prof` file (or a pyinstrument
+`.pyisession` for the sampling profiler) plus a top-N text summary into the
+run's profile directory. File names carry the process id and a call counter,
+so parallel workers and repeated calls never overwrite each other.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import io
+import itertools
+import os
+import pstats
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:
+    SamplingProfiler = None
+
+STAGE_TELEMETRY_FIELDS = ("stage", "wall_seconds", "cpu_seconds", "peak_rss_mb", "rows")
+
+# "cprofile" always works; "sampling" uses pyinstrument; "auto" prefers sampling when installed.
+PROFILER_CHOICES = ("cprofile", "sampling", "auto")
+
+
+@dataclass
+class _Collection:
+    stages: list[dict] = field(default_factory=list)
+    profile_dir: Path | None = None
+    profile_stages: frozenset[str] | None = frozenset()
+    profiler: str = "cprofile"
+    top_n: int = 30
+    profiling: bool = False
+
+    def should_profile(self, name: str) -> bool:
+        if self.profile_dir is None or self.profiling:
+            return False
+        return self.profile_stages is None or name in self.profile_stages
+
+
+_ACTIVE_COLLECTION: contextvars.ContextVar[_Collection | None] = contextvars.ContextVar(
+    "transport_active_stage_telemetry", default=None
+)
+_PROFILE_COUNTER = itertools.count(1)
+
+
+def peak_rss_mb() -> float | None:
+    """Return the process peak resident set size in MB, or None if unavailable."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(peak / divisor, 1)
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        peak = getattr(memory, "peak_wset", None) or memory.rss
+        return round(peak / (1024 * 1024), 1)
+    return None
+
+
+def count_rows(value: Any) -> int | None:
+    """Best-effort row count for a stage result (frame, tuple of frames or result dict)."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            if isinstance(item, (pd.DataFrame, pd.Series)):
+                return len(item)
+        return None
+    if isinstance(value, Mapping):
+        for item in value.values():
+            if isinstance(item, pd.DataFrame):
+                return len(item)
+    return None
+
+
+def resolve_profile_stages(stages: str | Iterable[str] | None) -> frozenset[str] | None:
+    """
+    Normalise a PROFILE_STAGES setting: None/"" disables profiling, "all"
+    profiles every stage (returned as None), otherwise a set of stage names.
+    """
+    if stages is None:
+        return frozenset()
+    if isinstance(stages, str):
+        key = stages.strip()
+        if not key:
+            return frozenset()
+        if key.lower() == "all":
+            return None
+        stages = [part for part in key.split(",")]
+    return frozenset(str(stage).strip() for stage in stages if str(stage).strip())
+
+
+def resolve_profiler(profiler: str | None) -> str:
+    """Return the profiler to use ("cprofile" or "sampling") for a PROFILER setting."""
+    key = str(profiler or "cprofile").strip().lower()
+    if key not in PROFILER_CHOICES:
+        raise ValueError(f"Invalid PROFILER '{profiler}'. Use one of: {', '.join(PROFILER_CHOICES)}.")
+    if key == "cprofile":
+        return key
+    if SamplingProfiler is None:
+        if key == "sampling":
+            print("[WARN] pyinstrument is not installed; profiling stages with cProfile instead.")
+        return "cprofile"
+    return "sampling"
+
+
+def begin_stage_telemetry(
+    *,
+    profile_dir: str | Path | None = None,
+    profile_stages: str | Iterable[str] | None = None,
+    profiler: str | None = "cprofile",
+    top_n: int = 30,
+) -> contextvars.Token:
+    """
+    Start collecting stage entries in the current context. Stages named in
+    `profile_stages` are also profiled into `profile_dir`.
+    """
+    selected = resolve_profile_stages(profile_stages)
+    enabled = profile_dir is not None and (selected is None or bool(selected))
+    return _ACTIVE_COLLECTION.set(
+        _Collection(
+            profile_dir=Path(profile_dir) if enabled else None,
+            profile_stages=selected,
+            profiler=resolve_profiler(profiler) if enabled else "cprofile",
+            top_n=max(1, int(top_n)),
+        )
+    )
+
+
+def end_stage_telemetry(token: contextvars.Token) -> list[dict]:
+    """Stop collecting and return the entries recorded since `begin_stage_telemetry`."""
+    collection = _ACTIVE_COLLECTION.get()
+    _ACTIVE_COLLECTION.reset(token)
+    return collection.stages if collection is not None else []
+
+
+@contextmanager
+def collect_stage_telemetry(**profile_kwargs) -> Iterator[list[dict]]:
+    """Collect stage entries for the duration of the block (see `begin_stage_telemetry`)."""
+    token = begin_stage_telemetry(**profile_kwargs)
+    try:
+        yield _ACTIVE_COLLECTION.get().stages
+    finally:
+        _ACTIVE_COLLECTION.reset(token)
+
+
+def _profile_output_stem(collection: _Collection, name: str) -> Path:
+    collection.profile_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return collection.profile_dir / f"{safe_name}_{timestamp}_pid{os.getpid()}_{next(_PROFILE_COUNTER):03d}"
+
+
+@contextmanager
+def _profile_stage(collection: _Collection, name: str) -> Iterator[None]:
+    """Profile the block and write the profile plus a top-N text summary."""
+    if collection.profiler == "sampling":
+        profiler = SamplingProfiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # Only one cProfile can be active per interpreter on newer Pythons.
+            print(f"[WARN] Could not profile stage '{name}': {exc}")
+            yield
+            return
+    collection.profiling = True
+    try:
+        yield
+    finally:
+        collection.profiling = False
+        stem = _profile_output_stem(collection, name)
+        if collection.profiler == "sampling":
+            profiler.stop()
+            profiler.last_session.save(str(stem.with_suffix(".pyisession")))
+            summary = profiler.output_text(unicode=False, color=False)
+        else:
+            profiler.disable()
+            profiler.dump_stats(str(stem.with_suffix(".prof")))
+            buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=buffer)
+            stats.sort_stats("cumulative").print_stats(collection.top_n)
+            summary = buffer.getvalue()
+        stem.with_suffix(".txt").write_text(summary, encoding="utf-8")
+        print(f"[INFO] Saved profile for stage '{name}': {stem}.txt")
+
+
+@contextmanager
+def track_stage(name: str, rows: int | None = None) -> Iterator[dict]:
+    """
+    Time one stage. The yielded entry can be updated (e.g. `entry["rows"] = n`)
+    before the block ends. The entry is recorded even when the stage raises.
+    """
+    entry: dict[str, Any] = {"stage": name, "rows": rows}
+    collection = _ACTIVE_COLLECTION.get()
+    if collection is None:
+        yield entry
+        return
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if collection.should_profile(name):
+            with _profile_stage(collection, name):
+                yield entry
+        else:
+            yield entry
+    finally:
+        entry["wall_seconds"] = round(time.perf_counter() - wall_start, 3)
+        entry["cpu_seconds"] = round(time.process_time() - cpu_start, 3)
+        entry["peak_rss_mb"] = peak_rss_mb()
+        collection.stages.append({key: entry.get(key) for key in STAGE_TELEMETRY_FIELDS})
+
+
+def timed_stage(name: str, rows: Callable[[Any], int | None] = count_rows):
+    """
+    Decorator form of `track_stage`. `rows` derives the row count from the
+    result; when it gives None the first positional frame argument is counted.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE_COLLECTION.get() is None:
+                return func(*args, **kwargs)
+            with track_stage(name) as entry:
+                result = func(*args, **kwargs)
+                row_count = rows(result)
+                # Stages that only write files report the rows they were given.
+                entry["rows"] = row_count if row_count is not None else count_rows(args)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "PROFILER_CHOICES",
+    "STAGE_TELEMETRY_FIELDS",
+    "begin_stage_telemetry",
+    "collect_stage_telemetry",
+    "count_rows",
+    "end_stage_telemetry",
+    "peak_rss_mb",
+    "resolve_profile_stages",
+    "resolve_profiler",
+    "timed_stage",
+    "track_stage",
+]
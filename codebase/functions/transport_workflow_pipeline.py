@@ -8,8 +8,8 @@
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import shutil
 from datetime import datetime
 from enum import Enum
 from collections.abc import Mapping
@@ -59,10 +59,13 @@ from configurations.measure_metadata import SOURCE_WEIGHT_PRIORITY
 from functions.measure_processing import process_measures_for_leap
 from functions.preprocessing import (
     allocate_fuel_alternatives_energy_and_activity,
+    apply_source_dtypes,
+    read_transport_source_data,
     calculate_sales,
     normalize_and_calculate_shares)
 from functions.leap_utilities_functions import (
     finalise_export_df,
+    read_export_sheets,
     save_export_files,
     join_and_check_import_structure_matches_export_structure,
     separate_current_accounts_from_scenario,
@@ -76,7 +79,6 @@ from configurations.basic_mappings import (
     ESTO_TRANSPORT_SECTOR_TUPLES,
     LEAP_STRUCTURE,
     add_fuel_column,
-    EXPECTED_COLS_IN_SOURCE,
 )
 
 from functions.mappings_validation import (
@@ -86,15 +88,54 @@ from functions.mappings_validation import (
     validate_final_energy_use_for_base_year_equals_esto_totals,
 )
 from functions.sales_curve_estimate import (
+    DEFAULT_FREIGHT_WEIGHTS,
+    DEFAULT_PASSENGER_WEIGHTS,
+    M_SAT_OVERRIDES,
     load_survival_and_vintage_profiles,
 )
 from sales_workflow import (
     estimate_passenger_sales_from_dataframe,
     estimate_freight_sales_from_dataframe,
+    estimate_sales_for_economies,
+)
+from functions.atomic_io import (
+    move_to_unique_path,
+    write_csv_atomic,
+    write_pickle_atomic,
+    write_text_atomic,
+)
+from functions.stage_telemetry import (
+    begin_stage_telemetry,
+    end_stage_telemetry,
+    peak_rss_mb,
+    timed_stage,
+    track_stage,
+)
+from functions.current_accounts_cache import (
+    current_accounts_cache_key,
+    load_or_build_current_accounts,
+)
+from functions.run_manifest import (
+    STAGE_INPUT_CREATION,
+    STAGE_ORDER,
+    STAGE_RECONCILIATION,
+    RunManifest,
+    StageSpec,
+    file_fingerprint,
+)
+from functions.sales_dashboard_queue import queue_sales_dashboard
+from functions.sales_result_cache import (
+    load_cached_sales_result,
+    sales_result_cache_key,
+    save_sales_result,
 )
 import os
 import time
 
+# Shared LEAP export helpers are timed where this pipeline calls them.
+finalise_export_df = timed_stage("finalise_export_df")(finalise_export_df)
+save_export_files = timed_stage("save_export_files")(save_export_files)
+
 LEAP_API_DISABLED_ERROR = (
     "[ERROR] LEAP API usage is disabled because the LEAP API is currently buggy. "
     "Disable LEAP COM flags to continue (CHECK_BRANCHES_IN_LEAP_USING_COM=False, "
@@ -153,6 +194,24 @@ from configurations.transport_economy_config import (
 # Modular process functions
 # ------------------------------------------------------------
 
+# Passenger/freight sales estimated for every economy of a batch at once (see
+# run_batch_sales_prepass), keyed by (transport_type, economy, scenario) and
+# holding (input fingerprint, result). A run takes its entry only when its own
+# inputs have the same fingerprint; the keys it used are kept in
+# _BATCH_SALES_USED, and their sales tables feed the combined sales CSVs.
+_BATCH_SALES_RESULTS: dict[tuple[str, str, str], tuple[str, dict]] = {}
+_BATCH_SALES_USED: set[tuple[str, str, str]] = set()
+_BATCH_SALES_TABLES: dict[tuple[str, str, str], pd.DataFrame] = {}
+
+
+def input_checkpoint_path(economy, scenario, base_year, final_year) -> str:
+    """Return the prepare_input_data checkpoint path for one economy/scenario/year window."""
+    return resolve_str(
+        f"intermediate_data/transport_data_{economy}_{scenario}_{base_year}_{final_year}.pkl"
+    )
+
+
+@timed_stage("prepare_input_data")
 def prepare_input_data(transport_model_excel_path, economy, scenario, base_year, final_year, TRANSPORT_ESTO_BALANCES_PATH = 'data/merged_file_energy_ALL_20250814_pretrump.csv', LOAD_CHECKPOINT=False, TRANSPORT_FUELS_DATA_FILE_PATH = None):
     """Load and preprocess transport data for a specific economy."""    
     print(f"\n=== Loading Transport Data for {economy} ===")
@@ -162,27 +221,13 @@ def prepare_input_data(transport_model_excel_path, economy, scenario, base_year,
         TRANSPORT_FUELS_DATA_FILE_PATH = resolve_str(TRANSPORT_FUELS_DATA_FILE_PATH)
     
     # Check for checkpoint file
-    checkpoint_filename = resolve_str(
-        f"intermediate_data/transport_data_{economy}_{scenario}_{base_year}_{final_year}.pkl"
-    )
+    checkpoint_filename = input_checkpoint_path(economy, scenario, base_year, final_year)
     if LOAD_CHECKPOINT and os.path.exists(checkpoint_filename):
         print(f"Loading data from checkpoint: {checkpoint_filename}")
-        df = pd.read_pickle(checkpoint_filename)
-        return df
-    if transport_model_excel_path.endswith('.csv'):
-        df = pd.read_csv(transport_model_excel_path, low_memory=False)
-    else:
-        df = pd.read_excel(transport_model_excel_path)
-    df = df[(df["Economy"] == economy) & (df["Scenario"] == scenario)]
-    df = df[(df["Date"] >= base_year) & (df["Date"] <= final_year)]
-    #check EXPECTED_COLS_IN_SOURCE are all in df
-    missing_cols = [col for col in EXPECTED_COLS_IN_SOURCE if col not in df.columns]
-    if missing_cols:
-        raise ValueError(f"Missing expected columns in source data: {missing_cols}")
-    unnecessary_cols = ['Unit', 'Data_available', 'Measure']
-    df = df.drop(columns=unnecessary_cols, errors='ignore')
+        return pd.read_pickle(checkpoint_filename)
+    df = read_transport_source_data(transport_model_excel_path, economy, scenario, base_year, final_year)
     
-    df = add_fuel_column(df)
+    df = apply_source_dtypes(add_fuel_column(df))
     df.loc[df["Medium"] != "road", ["Stocks", 'Vehicle_sales_share']] = 0
     
     df = allocate_fuel_alternatives_energy_and_activity(df, economy, scenario, TRANSPORT_FUELS_DATA_FILE_PATH)
@@ -201,73 +246,28 @@ def prepare_input_data(transport_model_excel_path, economy, scenario, base_year,
     if duplicates.any():
         errors_path = resolve_str("data/errors/duplicate_source_rows.csv")
         os.makedirs(Path(errors_path).parent, exist_ok=True)
-        df[duplicates].to_csv(errors_path, index=False)
+        write_csv_atomic(df[duplicates], errors_path, index=False)
         raise ValueError(
             "Duplicates found in source data after adding new rows based on combinations and proxies; "
             f"see {errors_path} for details."
         )
-     
+    
+    # Row-building steps above fall back to plain strings; restore the schema
+    # before the groupby-heavy stages.
+    df = apply_source_dtypes(df)
     df = calculate_sales(df)
     df = normalize_and_calculate_shares(df)
     
     df = extract_other_type_rows_from_esto_and_insert_into_transport_df(df, base_year, final_year, economy, scenario, TRANSPORT_ESTO_BALANCES_PATH)
+    df = apply_source_dtypes(df)
     
     # Save checkpoint file
     os.makedirs(Path(checkpoint_filename).parent, exist_ok=True)
-    df.to_pickle(checkpoint_filename)
+    write_pickle_atomic(df, checkpoint_filename)
     print(f"Saved checkpoint: {checkpoint_filename}")
     return df
 
 
-def _first_non_null(series: pd.Series):
-    non_null = series.dropna()
-    if non_null.empty:
-        return pd.NA
-    return non_null.iloc[0]
-
-
-def _aggregate_weighted_column(
-    df: pd.DataFrame,
-    group_cols: list[str],
-    value_col: str,
-    weight_candidates: list[str | None],
-) -> pd.DataFrame:
-    value_series = pd.to_numeric(df[value_col], errors="coerce")
-
-    selected_weight = None
-    for candidate in weight_candidates:
-        if candidate and candidate in df.columns:
-            selected_weight = candidate
-            break
-
-    if selected_weight is None:
-        return (
-            df.assign(_value=value_series)
-            .groupby(group_cols, dropna=False)["_value"]
-            .mean()
-            .reset_index(name=value_col)
-        )
-
-    tmp = df[group_cols].copy()
-    tmp["_value"] = value_series
-    tmp["_weight"] = pd.to_numeric(df[selected_weight], errors="coerce").fillna(0.0)
-    tmp["_weighted"] = tmp["_value"].fillna(0.0) * tmp["_weight"]
-
-    grouped = (
-        tmp.groupby(group_cols, dropna=False)
-        .agg(
-            weighted_sum=("_weighted", "sum"),
-            weight_sum=("_weight", "sum"),
-            mean_value=("_value", "mean"),
-        )
-        .reset_index()
-    )
-
-    weighted = grouped["weighted_sum"] / grouped["weight_sum"].replace(0, pd.NA)
-    grouped[value_col] = weighted.fillna(grouped["mean_value"])
-    return grouped[group_cols + [value_col]]
-
-
 def _collect_fuels_from_tree(tree: dict) -> list[str]:
     fuels: set[str] = set()
 
@@ -293,101 +293,290 @@ def ensure_transport_fuels_in_leap(L) -> None:
         ensure_fuel_exists(L, fuel)
 
 
-def aggregate_economies_to_apec(
-    source_df: pd.DataFrame,
-    *,
-    scenario: str,
-    economy_code: str = "00_APEC",
-) -> pd.DataFrame:
-    """Aggregate preprocessed economy-level transport inputs into a single 00_APEC input dataframe."""
-    df = source_df[source_df["Scenario"].astype(str).str.lower() == scenario.lower()].copy()
-    if df.empty:
-        raise ValueError(f"No rows found while aggregating economies for scenario '{scenario}'.")
-
-    group_cols = ["Date", "Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"]
-    grouped_index = (
-        df.groupby(group_cols, dropna=False)
-        .size()
-        .reset_index(name="_rows")
-        .drop(columns="_rows")
-    )
+_APEC_GROUP_COLS = ["Date", "Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"]
+_APEC_SUM_COLS = [
+    "Energy",
+    "Stocks",
+    "Activity",
+    "Travel_km",
+    "Gdp",
+    "Population",
+    "Stocks_old",
+    "Surplus_stocks",
+    "Stock_turnover",
+    "New_stocks_needed",
+    "Sales",
+]
+_APEC_WEIGHTED_COLS = {
+    "Efficiency": SOURCE_WEIGHT_PRIORITY.get("Efficiency", ["Activity", "Stocks", None]),
+    "Mileage": SOURCE_WEIGHT_PRIORITY.get("Mileage", ["Stocks", "Activity", None]),
+    "Intensity": SOURCE_WEIGHT_PRIORITY.get("Intensity", ["Activity", "Stocks", None]),
+    "Occupancy_or_load": ["Activity", "Stocks", None],
+    "New_vehicle_efficiency": ["New_stocks_needed", "Stocks", "Activity", None],
+    "Turnover_rate": ["Stocks", "Activity", None],
+    "Activity_per_Stock": ["Stocks", "Activity", None],
+    "Average_age": ["Stocks", None],
+    "Activity_efficiency_improvement": ["Activity", None],
+    "Non_road_intensity_improvement": ["Activity", None],
+    "Activity_growth": ["Activity", None],
+    "Gdp_per_capita": ["Population", None],
+    "Stocks_per_thousand_capita": ["Population", "Stocks", None],
+    "Vehicle_sales_share": ["Sales", "Stocks", None],
+}
+_APEC_DERIVED_COLS = {"Sales", "Vehicle_sales_share", "Stock Share"}
 
-    non_group_cols = [col for col in df.columns if col not in group_cols + ["Economy"]]
-
-    sum_cols = [
-        "Energy",
-        "Stocks",
-        "Activity",
-        "Travel_km",
-        "Gdp",
-        "Population",
-        "Stocks_old",
-        "Surplus_stocks",
-        "Stock_turnover",
-        "New_stocks_needed",
-        "Sales",
-    ]
-    sum_cols = [col for col in sum_cols if col in non_group_cols]
-
-    weighted_cols = {
-        "Efficiency": SOURCE_WEIGHT_PRIORITY.get("Efficiency", ["Activity", "Stocks", None]),
-        "Mileage": SOURCE_WEIGHT_PRIORITY.get("Mileage", ["Stocks", "Activity", None]),
-        "Intensity": SOURCE_WEIGHT_PRIORITY.get("Intensity", ["Activity", "Stocks", None]),
-        "Occupancy_or_load": ["Activity", "Stocks", None],
-        "New_vehicle_efficiency": ["New_stocks_needed", "Stocks", "Activity", None],
-        "Turnover_rate": ["Stocks", "Activity", None],
-        "Activity_per_Stock": ["Stocks", "Activity", None],
-        "Average_age": ["Stocks", None],
-        "Activity_efficiency_improvement": ["Activity", None],
-        "Non_road_intensity_improvement": ["Activity", None],
-        "Activity_growth": ["Activity", None],
-        "Gdp_per_capita": ["Population", None],
-        "Stocks_per_thousand_capita": ["Population", "Stocks", None],
-        "Vehicle_sales_share": ["Sales", "Stocks", None],
-    }
-    weighted_cols = {col: weights for col, weights in weighted_cols.items() if col in non_group_cols}
 
-    derived_cols_to_recalculate = {"Sales", "Vehicle_sales_share", "Stock Share"}
-    first_cols = [
-        col
-        for col in non_group_cols
-        if col not in set(sum_cols) and col not in set(weighted_cols) and col not in derived_cols_to_recalculate
-    ]
+def _first_non_null(series: pd.Series):
+    non_null = series.dropna()
+    if non_null.empty:
+        return pd.NA
+    return non_null.iloc[0]
 
-    aggregated = grouped_index.copy()
-    if sum_cols:
-        aggregated = aggregated.merge(
-            df.groupby(group_cols, dropna=False)[sum_cols].sum(min_count=1).reset_index(),
-            on=group_cols,
-            how="left",
-        )
 
-    for col, weights in weighted_cols.items():
-        weighted_df = _aggregate_weighted_column(df, group_cols, col, weights)
-        aggregated = aggregated.merge(weighted_df, on=group_cols, how="left")
+def _fill_missing(values: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(values), 0.0, values)
+
+
+class _KahanSum:
+    """
+    Per-group running sum and non-null count.
+
+    Uses the same compensated summation as pandas' groupby sum/mean, so
+    folding rows in one at a time reproduces the groupby result bit for bit.
+    """
+
+    def __init__(self) -> None:
+        self.total = np.zeros(0)
+        self.compensation = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+
+    def grow(self, size: int) -> None:
+        extra = size - len(self.total)
+        if extra > 0:
+            self.total = np.concatenate([self.total, np.zeros(extra)])
+            self.compensation = np.concatenate([self.compensation, np.zeros(extra)])
+            self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+
+    def add(self, slots: np.ndarray, values: np.ndarray) -> None:
+        """Add one value per slot; `slots` must not repeat within a call."""
+        present = ~np.isnan(values)
+        slots = slots[present]
+        values = values[present]
+        self.count[slots] += 1
+        total = self.total[slots]
+        y = values - self.compensation[slots]
+        t = total + y
+        compensation = t - total - y
+        # An infinite value leaves a NaN compensation; pandas resets it to 0.
+        compensation[np.isnan(compensation)] = 0.0
+        self.compensation[slots] = compensation
+        self.total[slots] = t
+
+    def sum(self, min_count: int = 0) -> np.ndarray:
+        return np.where(self.count >= min_count, self.total, np.nan)
+
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / self.count, np.nan)
+
+
+class IncrementalApecAggregator:
+    """
+    Fold economy input frames into a 00_APEC aggregate one economy at a time.
+
+    Additive columns are summed, weighted columns keep running numerators and
+    weight denominators for every candidate weight, and the remaining columns
+    keep their first non-null value. Only these per-group accumulators are
+    held between economies, so peak memory stays near one economy's frame.
+    `finalize` gives the same result as aggregating the concatenated frames.
+    """
 
-    if first_cols:
-        first_df = (
-            df.groupby(group_cols, dropna=False)[first_cols]
-            .agg(_first_non_null)
-            .reset_index()
+    def __init__(self, *, scenario: str, economy_code: str = "00_APEC") -> None:
+        self.scenario = scenario
+        self.economy_code = economy_code
+        self._slots: dict[tuple, int] = {}
+        self._keys: list[tuple] = []
+        self._schema_frames: list[pd.DataFrame] = []
+        self._sums = {col: _KahanSum() for col in _APEC_SUM_COLS}
+        self._values = {col: _KahanSum() for col in _APEC_WEIGHTED_COLS}
+        self._weights = {
+            weight: _KahanSum()
+            for weights in _APEC_WEIGHTED_COLS.values()
+            for weight in weights
+            if weight
+        }
+        self._weighted = {
+            (col, weight): _KahanSum()
+            for col, weights in _APEC_WEIGHTED_COLS.items()
+            for weight in weights
+            if weight
+        }
+        self._first_values: dict[str, list] = {}
+        self.row_count = 0
+
+    def _assign_slots(self, keys: pd.DataFrame) -> np.ndarray:
+        key_columns = []
+        for col in _APEC_GROUP_COLS:
+            values = keys[col].astype(object)
+            key_columns.append(values.where(values.notna(), None).tolist())
+        slots = np.fromiter(
+            (self._slots.setdefault(key, len(self._slots)) for key in zip(*key_columns)),
+            dtype=np.intp,
+            count=len(keys),
         )
-        aggregated = aggregated.merge(first_df, on=group_cols, how="left")
+        if len(self._slots) > len(self._keys):
+            self._keys.extend(list(self._slots)[len(self._keys):])
+            size = len(self._keys)
+            for accumulator in (
+                *self._sums.values(),
+                *self._values.values(),
+                *self._weights.values(),
+                *self._weighted.values(),
+            ):
+                accumulator.grow(size)
+            for values in self._first_values.values():
+                values.extend([None] * (size - len(values)))
+        return slots
+
+    def add(self, economy_df: pd.DataFrame) -> None:
+        """Fold one economy's prepared input rows into the running aggregate."""
+        df = economy_df[economy_df["Scenario"].astype(str).str.lower() == self.scenario.lower()]
+        self._schema_frames.append(df.iloc[:0])
+        if df.empty:
+            return
+        self.row_count += len(df)
+        slots = self._assign_slots(df[_APEC_GROUP_COLS])
+
+        def numeric(col: str) -> np.ndarray:
+            if col not in df.columns:
+                return np.full(len(df), np.nan)
+            return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+        sum_values = {col: numeric(col) for col in self._sums}
+        weight_values = {weight: _fill_missing(numeric(weight)) for weight in self._weights}
+        value_values = {col: numeric(col) for col in self._values}
+        first_cols = [
+            col
+            for col in df.columns
+            if col not in _APEC_GROUP_COLS
+            and col != "Economy"
+            and col not in _APEC_SUM_COLS
+            and col not in _APEC_WEIGHTED_COLS
+            and col not in _APEC_DERIVED_COLS
+        ]
+        for col in first_cols:
+            self._first_values.setdefault(col, [None] * len(self._keys))
+
+        # Rows sharing a group within this frame are added in layers (first
+        # occurrence, second occurrence, ...) so row order is preserved.
+        layers = pd.Series(slots).groupby(slots).cumcount().to_numpy()
+        for layer in range(int(layers.max()) + 1):
+            rows = np.flatnonzero(layers == layer)
+            layer_slots = slots[rows]
+            for col, accumulator in self._sums.items():
+                accumulator.add(layer_slots, sum_values[col][rows])
+            for weight, accumulator in self._weights.items():
+                accumulator.add(layer_slots, weight_values[weight][rows])
+            for col, accumulator in self._values.items():
+                values = value_values[col][rows]
+                accumulator.add(layer_slots, values)
+                for weight in _APEC_WEIGHTED_COLS[col]:
+                    if weight:
+                        self._weighted[(col, weight)].add(
+                            layer_slots,
+                            _fill_missing(values) * weight_values[weight][rows],
+                        )
+
+        for col in first_cols:
+            first = self._first_values[col]
+            column = df[col]
+            present = column.notna().to_numpy()
+            for slot, value in zip(slots[present].tolist(), column[present].tolist()):
+                if first[slot] is None:
+                    first[slot] = value
+
+    def finalize(self) -> pd.DataFrame:
+        """Return the 00_APEC frame with sales and shares recalculated."""
+        if not self.row_count:
+            raise ValueError(f"No rows found while aggregating economies for scenario '{self.scenario}'.")
+
+        schema = pd.concat(self._schema_frames, ignore_index=True)
+        non_group_cols = [col for col in schema.columns if col not in _APEC_GROUP_COLS + ["Economy"]]
+        keys = pd.DataFrame(self._keys, columns=_APEC_GROUP_COLS, dtype=object)
+        for col in _APEC_GROUP_COLS:
+            if schema[col].dtype == object:
+                # groupby infers its key dtypes (e.g. str for string keys).
+                keys[col] = keys[col].infer_objects()
+            else:
+                keys[col] = keys[col].astype(schema[col].dtype)
+        # groupby(sort=True, dropna=False) ordering: sorted keys, missing last.
+        order = keys.sort_values(_APEC_GROUP_COLS, na_position="last", kind="stable").index.to_numpy()
+        aggregated = keys.iloc[order].reset_index(drop=True)
 
-    aggregated["Economy"] = economy_code
+        for col in _APEC_SUM_COLS:
+            if col in non_group_cols:
+                aggregated[col] = self._sums[col].sum(min_count=1)[order]
 
-    if "Stocks" in aggregated.columns:
-        aggregated = calculate_sales(aggregated)
-    if "Scenario" in aggregated.columns and "Date" in aggregated.columns:
-        aggregated = normalize_and_calculate_shares(aggregated)
+        for col, weights in _APEC_WEIGHTED_COLS.items():
+            if col not in non_group_cols:
+                continue
+            mean_value = pd.Series(self._values[col].mean()[order])
+            selected_weight = next((weight for weight in weights if weight and weight in schema.columns), None)
+            if selected_weight is None:
+                aggregated[col] = mean_value
+                continue
+            weighted_sum = pd.Series(self._weighted[(col, selected_weight)].sum()[order])
+            weight_sum = pd.Series(self._weights[selected_weight].sum()[order])
+            weighted = weighted_sum / weight_sum.replace(0, pd.NA)
+            aggregated[col] = weighted.fillna(mean_value)
 
-    duplicates = aggregated.duplicated(subset=["Date", "Economy", "Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"])
-    if duplicates.any():
-        raise ValueError("Duplicates detected after 00_APEC aggregation.")
+        first_cols = [
+            col
+            for col in non_group_cols
+            if col not in _APEC_SUM_COLS and col not in _APEC_WEIGHTED_COLS and col not in _APEC_DERIVED_COLS
+        ]
+        if first_cols:
+            # One row per group: this only settles the dtypes the way the
+            # per-row aggregation did.
+            firsts = aggregated[_APEC_GROUP_COLS].copy()
+            for col in first_cols:
+                values = self._first_values.get(col, [None] * len(self._keys))
+                firsts[col] = pd.Series([values[slot] for slot in order], dtype=object).astype(
+                    schema[col].dtype
+                )
+            first_df = (
+                firsts.groupby(_APEC_GROUP_COLS, dropna=False, observed=True)[first_cols]
+                .agg(_first_non_null)
+                .reset_index()
+            )
+            aggregated = aggregated.merge(first_df, on=_APEC_GROUP_COLS, how="left")
+
+        aggregated["Economy"] = self.economy_code
+
+        if "Stocks" in aggregated.columns:
+            aggregated = calculate_sales(aggregated)
+        if "Scenario" in aggregated.columns and "Date" in aggregated.columns:
+            aggregated = normalize_and_calculate_shares(aggregated)
+
+        duplicates = aggregated.duplicated(subset=["Date", "Economy", "Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"])
+        if duplicates.any():
+            raise ValueError("Duplicates detected after 00_APEC aggregation.")
 
-    ordered_cols = [col for col in source_df.columns if col in aggregated.columns]
-    extra_cols = [col for col in aggregated.columns if col not in ordered_cols]
-    return aggregated[ordered_cols + extra_cols].reset_index(drop=True)
+        ordered_cols = [col for col in schema.columns if col in aggregated.columns]
+        extra_cols = [col for col in aggregated.columns if col not in ordered_cols]
+        return aggregated[ordered_cols + extra_cols].reset_index(drop=True)
+
+
+def aggregate_economies_to_apec(
+    source_df: pd.DataFrame,
+    *,
+    scenario: str,
+    economy_code: str = "00_APEC",
+) -> pd.DataFrame:
+    """Aggregate preprocessed economy-level transport inputs into a single 00_APEC input dataframe."""
+    aggregator = IncrementalApecAggregator(scenario=scenario, economy_code=economy_code)
+    aggregator.add(source_df)
+    return aggregator.finalize()
 
 
 def prepare_apec_input_data(
@@ -396,8 +585,16 @@ def prepare_apec_input_data(
     base_year: int,
     final_year: int,
     load_checkpoint: bool,
+    prepared_input_paths: Mapping[tuple[str, str], str] | None = None,
 ) -> pd.DataFrame:
-    """Build (or load) a synthetic 00_APEC input dataframe by aggregating all configured economies."""
+    """
+    Build (or load) a synthetic 00_APEC input dataframe by aggregating all configured economies.
+
+    Economy inputs already prepared in this run are reloaded one at a time
+    from the input checkpoints listed in `prepared_input_paths`, so memory
+    does not grow with the number of economies. Only the remaining economies
+    are prepared from the raw source files.
+    """
     checkpoint_filename = resolve_str(
         f"intermediate_data/transport_data_00_APEC_{scenario}_{base_year}_{final_year}.pkl"
     )
@@ -405,30 +602,52 @@ def prepare_apec_input_data(
         print(f"Loading APEC data from checkpoint: {checkpoint_filename}")
         return pd.read_pickle(checkpoint_filename)
 
-    economy_frames = []
+    prepared_input_paths = dict(prepared_input_paths or {})
+    aggregator = IncrementalApecAggregator(scenario=scenario, economy_code="00_APEC")
+    economy_count = 0
+    reused_count = 0
     for economy_code, economy_scenario in list_transport_run_configs(scenario):
         _, _, cfg = load_transport_run_config(economy_code, economy_scenario)
         economy_base_year = min(base_year, cfg.transport_base_year)
         economy_final_year = max(final_year, cfg.transport_base_year)
-        df_i = prepare_input_data(
-            transport_model_excel_path=cfg.transport_model_path,
-            economy=economy_code,
-            scenario=economy_scenario,
-            base_year=economy_base_year,
-            final_year=economy_final_year,
-            TRANSPORT_ESTO_BALANCES_PATH=cfg.transport_esto_balances_path,
-            LOAD_CHECKPOINT=load_checkpoint,
-            TRANSPORT_FUELS_DATA_FILE_PATH=cfg.transport_fuels_path,
-        )
-        economy_frames.append(df_i)
-
-    combined = pd.concat(economy_frames, ignore_index=True)
-    combined = combined[(combined["Date"] >= base_year) & (combined["Date"] <= final_year)].copy()
-    apec_df = aggregate_economies_to_apec(combined, scenario=scenario, economy_code="00_APEC")
+        expected_checkpoint = input_checkpoint_path(
+            economy_code, economy_scenario, economy_base_year, economy_final_year
+        )
+        published_checkpoint = prepared_input_paths.get((economy_code, economy_scenario))
+        if (
+            published_checkpoint
+            and os.path.abspath(published_checkpoint) == os.path.abspath(expected_checkpoint)
+            and os.path.exists(published_checkpoint)
+        ):
+            df_i = pd.read_pickle(published_checkpoint)
+            reused_count += 1
+        else:
+            df_i = prepare_input_data(
+                transport_model_excel_path=cfg.transport_model_path,
+                economy=economy_code,
+                scenario=economy_scenario,
+                base_year=economy_base_year,
+                final_year=economy_final_year,
+                TRANSPORT_ESTO_BALANCES_PATH=cfg.transport_esto_balances_path,
+                LOAD_CHECKPOINT=load_checkpoint,
+                TRANSPORT_FUELS_DATA_FILE_PATH=cfg.transport_fuels_path,
+            )
+        # Fold each economy in as it is loaded so only one economy's frame is
+        # held alongside the running aggregate.
+        aggregator.add(df_i[(df_i["Date"] >= base_year) & (df_i["Date"] <= final_year)])
+        economy_count += 1
+        del df_i
+    if reused_count:
+        print(
+            f"[INFO] Reused {reused_count}/{economy_count} prepared economy inputs "
+            "for the 00_APEC aggregation."
+        )
+
+    apec_df = aggregator.finalize()
 
     if checkpoint_filename:
         os.makedirs(Path(checkpoint_filename).parent, exist_ok=True)
-        apec_df.to_pickle(checkpoint_filename)
+        write_pickle_atomic(apec_df, checkpoint_filename)
         print(f"Saved APEC checkpoint: {checkpoint_filename}")
     return apec_df
 
@@ -478,20 +697,6 @@ def _normalise_sales_policy_settings(
     return compact_settings
 
 
-def _build_unique_archive_path(path: str) -> str:
-    """Return a non-existing path by suffixing an increment when needed."""
-    if not os.path.exists(path):
-        return path
-
-    stem, ext = os.path.splitext(path)
-    counter = 1
-    while True:
-        candidate = f"{stem}_{counter:02d}{ext}"
-        if not os.path.exists(candidate):
-            return candidate
-        counter += 1
-
-
 def _archive_existing_output_file(
     output_path: str | None,
     *,
@@ -519,13 +724,159 @@ def _archive_existing_output_file(
         if date_id is not None and str(date_id).strip()
         else datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     )
-    archive_path = os.path.join(archive_dir, f"{stem}_{stamp}{ext}")
-    archive_path = _build_unique_archive_path(archive_path)
+    archive_path = move_to_unique_path(
+        resolved_output, os.path.join(archive_dir, f"{stem}_{stamp}{ext}")
+    )
+    # None when a concurrent run archived the same file first.
+    return str(archive_path) if archive_path is not None else None
+
+
+def _sales_inputs_fingerprint(
+    transport_type: str,
+    *,
+    df: pd.DataFrame,
+    economy: str,
+    scenario: str,
+    survival_curves: Mapping[str, pd.Series],
+    vintage_profiles: Mapping[str, pd.Series],
+    esto_energy_path: str | None,
+    estimate_kwargs: Mapping[str, Any],
+) -> str | None:
+    """
+    Fingerprint of everything one sales estimate depends on (see
+    `sales_result_cache_key`), or None when the inputs cannot be fingerprinted.
+    """
+    df_slice = df
+    if "Economy" in df_slice.columns:
+        df_slice = df_slice[df_slice["Economy"] == economy]
+    if "Scenario" in df_slice.columns:
+        df_slice = df_slice[df_slice["Scenario"] == scenario]
+    default_weights = DEFAULT_FREIGHT_WEIGHTS if transport_type == "freight" else DEFAULT_PASSENGER_WEIGHTS
+    try:
+        return sales_result_cache_key(
+            df_slice,
+            survival_curves=survival_curves,
+            vintage_profiles=vintage_profiles,
+            esto_energy_path=esto_energy_path,
+            settings={
+                "transport_type": transport_type,
+                "economy": economy,
+                "scenario": scenario,
+                "estimate_kwargs": dict(estimate_kwargs),
+                "weights": estimate_kwargs.get("weights") or default_weights,
+                "m_sat_overrides": M_SAT_OVERRIDES,
+                "drive_policy_checkpoint": file_fingerprint(
+                    resolve_str(estimate_kwargs["drive_policy_checkpoint_path"])
+                    if estimate_kwargs.get("drive_policy_checkpoint_path")
+                    else None
+                ),
+            },
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"[WARN] Could not fingerprint {transport_type} sales inputs; recomputing: {exc}")
+        return None
+
 
-    shutil.move(resolved_output, archive_path)
-    return archive_path
+def _estimate_sales_with_cache(
+    transport_type: str,
+    estimate,
+    *,
+    df: pd.DataFrame,
+    economy: str,
+    scenario: str,
+    survival_curves: Mapping[str, pd.Series],
+    vintage_profiles: Mapping[str, pd.Series],
+    esto_energy_path: str | None,
+    plot: bool,
+    estimate_kwargs: Mapping[str, Any],
+) -> dict:
+    """
+    Run `estimate(df=df, ...)`, reusing a result from the batch sales engine
+    (see `run_batch_sales_prepass`) or from SALES_RESULT_CACHE_DIR when the
+    economy/scenario input slice, lifecycle profiles, ESTO file, weights and
+    policy settings match.
+
+    With DEFER_SALES_PLOTS, a plotting run estimates without plotting and
+    queues the result for a later dashboard render instead.
+    """
+    if plot and DEFER_SALES_PLOTS:
+        result = _estimate_sales_with_cache(
+            transport_type,
+            estimate,
+            df=df,
+            economy=economy,
+            scenario=scenario,
+            survival_curves=survival_curves,
+            vintage_profiles=vintage_profiles,
+            esto_energy_path=esto_energy_path,
+            plot=False,
+            estimate_kwargs=estimate_kwargs,
+        )
+        job_path = queue_sales_dashboard(
+            result,
+            transport_type=transport_type,
+            economy=economy,
+            scenario=scenario,
+            queue_dir=resolve_str(SALES_PLOT_QUEUE_DIR),
+        )
+        print(f"[INFO] Queued {transport_type} sales dashboard for deferred rendering: {job_path}")
+        return result
+
+    def run_estimate() -> dict:
+        return estimate(
+            df=df,
+            survival_curves=survival_curves,
+            vintage_profiles=vintage_profiles,
+            economy=economy,
+            scenario=scenario,
+            plot=plot,
+            esto_energy_path=esto_energy_path,
+            **estimate_kwargs,
+        )
+
+    if plot:
+        # Figures are not cached, so plotting runs always recompute.
+        return run_estimate()
+    batch_entry = _BATCH_SALES_RESULTS.pop((transport_type, str(economy), str(scenario)), None)
+    if batch_entry is None and not SALES_RESULT_CACHE_DIR:
+        return run_estimate()
+
+    cache_key = _sales_inputs_fingerprint(
+        transport_type,
+        df=df,
+        economy=economy,
+        scenario=scenario,
+        survival_curves=survival_curves,
+        vintage_profiles=vintage_profiles,
+        esto_energy_path=esto_energy_path,
+        estimate_kwargs=estimate_kwargs,
+    )
+    if batch_entry is not None and cache_key is not None and batch_entry[0] == cache_key:
+        print(f"[INFO] Used batch {transport_type} sales result for {economy} | {scenario}.")
+        _BATCH_SALES_USED.add((transport_type, str(economy), str(scenario)))
+        result = batch_entry[1]
+        if SALES_RESULT_CACHE_DIR:
+            save_sales_result(
+                result,
+                resolve_str(f"{SALES_RESULT_CACHE_DIR}/{transport_type}_sales_{economy}_{scenario}_{cache_key}.pkl"),
+            )
+        return result
+    if not SALES_RESULT_CACHE_DIR or cache_key is None:
+        return run_estimate()
+
+    cache_path = resolve_str(
+        f"{SALES_RESULT_CACHE_DIR}/{transport_type}_sales_{economy}_{scenario}_{cache_key}.pkl"
+    )
+    cached = load_cached_sales_result(cache_path)
+    if cached is not None:
+        print(f"[INFO] Reused cached {transport_type} sales result: {cache_path}")
+        return cached
+    result = run_estimate()
+    save_sales_result(result, cache_path)
+    return result
 
 
+@timed_stage("passenger_sales")
 def run_passenger_sales_workflow(
     df: pd.DataFrame,
     economy: str,
@@ -558,6 +909,7 @@ def run_passenger_sales_workflow(
         survival_path=survival_path,
         vintage_path=vintage_path,
         vehicle_keys=("LPV", "MC", "Bus"),
+        economy=economy,
     )
     estimate_kwargs = dict(kwargs)
     estimate_kwargs.update(
@@ -566,17 +918,18 @@ def run_passenger_sales_workflow(
             context=f"Passenger sales policy ({economy} | {scenario})",
         )
     )
-    result = estimate_passenger_sales_from_dataframe(
+    estimate_kwargs.update(base_year=base_year, final_year=final_year)
+    result = _estimate_sales_with_cache(
+        "passenger",
+        estimate_passenger_sales_from_dataframe,
         df=df,
-        survival_curves=survival_curves,
-        vintage_profiles=vintage_profiles,
         economy=economy,
         scenario=scenario,
-        base_year=base_year,
-        final_year=final_year,
-        plot=plot,
+        survival_curves=survival_curves,
+        vintage_profiles=vintage_profiles,
         esto_energy_path=esto_energy_path,
-        **estimate_kwargs,
+        plot=plot,
+        estimate_kwargs=estimate_kwargs,
     )
 
     sales_table = result.get("sales_table")
@@ -586,12 +939,13 @@ def run_passenger_sales_workflow(
             archived_output = _archive_existing_output_file(output_path, date_id=DATE_ID)
             if archived_output:
                 print(f"[INFO] Archived previous passenger sales table to {archived_output}")
-        sales_table.to_csv(output_path, index=False)
+        write_csv_atomic(sales_table, output_path, index=False)
         print(f"[INFO] Saved passenger sales table to {output_path}")
 
     return result
 
 
+@timed_stage("freight_sales")
 def run_freight_sales_workflow(
     df: pd.DataFrame,
     economy: str,
@@ -623,6 +977,7 @@ def run_freight_sales_workflow(
         survival_path=survival_path,
         vintage_path=vintage_path,
         vehicle_keys=("Trucks", "LCVs"),
+        economy=economy,
     )
     estimate_kwargs = dict(kwargs)
     estimate_kwargs.update(
@@ -631,17 +986,18 @@ def run_freight_sales_workflow(
             context=f"Freight sales policy ({economy} | {scenario})",
         )
     )
-    result = estimate_freight_sales_from_dataframe(
+    estimate_kwargs.update(base_year=base_year, final_year=final_year)
+    result = _estimate_sales_with_cache(
+        "freight",
+        estimate_freight_sales_from_dataframe,
         df=df,
-        survival_curves=survival_curves,
-        vintage_profiles=vintage_profiles,
         economy=economy,
         scenario=scenario,
-        base_year=base_year,
-        final_year=final_year,
-        plot=plot,
+        survival_curves=survival_curves,
+        vintage_profiles=vintage_profiles,
         esto_energy_path=esto_energy_path,
-        **estimate_kwargs,
+        plot=plot,
+        estimate_kwargs=estimate_kwargs,
     )
 
     sales_table = result.get("sales_table")
@@ -651,7 +1007,7 @@ def run_freight_sales_workflow(
             archived_output = _archive_existing_output_file(output_path, date_id=DATE_ID)
             if archived_output:
                 print(f"[INFO] Archived previous freight sales table to {archived_output}")
-        sales_table.to_csv(output_path, index=False)
+        write_csv_atomic(sales_table, output_path, index=False)
         print(f"[INFO] Saved freight sales table to {output_path}")
 
     return result
@@ -710,7 +1066,7 @@ def _report_template_alignment_changes(
         report_name = f"template_alignment_dropped_{safe_label}.csv"
     report_path = resolve_str(f"results/checkpoint_audit/{report_name}")
     os.makedirs(Path(report_path).parent, exist_ok=True)
-    dropped.sort_values(key_cols).to_csv(report_path, index=False)
+    write_csv_atomic(dropped.sort_values(key_cols), report_path, index=False)
     print(f"[INFO] Wrote template-drop report ({dataset_label}) to: {report_path}")
 
 
@@ -1015,6 +1371,7 @@ def write_measures_to_transport_export_df_for_current_branch(
             
     return leap_export_df
 
+@timed_stage("convert_values_to_expressions")
 def convert_values_to_expressions(leap_export_df):
     
     print("\n=== Building LEAP expressions from export rows ===")
@@ -1314,6 +1671,7 @@ def process_single_leap_transport_mapping(
 # Transport Reconciliation
 #------------------------------------------------------------
 
+@timed_stage("reconciliation")
 def run_transport_reconciliation(
     apply_adjustments_to_future_years,
     report_adjustment_changes,
@@ -1336,6 +1694,7 @@ def run_transport_reconciliation(
     subtotal_column='subtotal_layout',
     scale_factor_tolerance: float = 1e-4,
     raise_on_non_convergence: bool = False,
+    share_current_accounts: bool = False,
 ):
     if set_vars_in_leap_using_com:
         _raise_leap_api_disabled(
@@ -1560,8 +1919,8 @@ def run_transport_reconciliation(
 
         original_keyed = original_df.copy()
         adjusted_keyed = adjusted_df.copy()
-        original_keyed["_row_ordinal"] = original_keyed.groupby(key_cols, dropna=False).cumcount()
-        adjusted_keyed["_row_ordinal"] = adjusted_keyed.groupby(key_cols, dropna=False).cumcount()
+        original_keyed["_row_ordinal"] = original_keyed.groupby(key_cols, dropna=False, observed=True).cumcount()
+        adjusted_keyed["_row_ordinal"] = adjusted_keyed.groupby(key_cols, dropna=False, observed=True).cumcount()
         id_cols = [*key_cols, "_row_ordinal"]
 
         before_long = original_keyed.melt(
@@ -1718,7 +2077,7 @@ def run_transport_reconciliation(
         duplicate_ca = ca_source.duplicated(subset=key_cols, keep=False)
         if duplicate_ca.any():
             grouped = (
-                ca_source.groupby(key_cols, dropna=False)[base_year]
+                ca_source.groupby(key_cols, dropna=False, observed=True)[base_year]
                 .agg(["first", "nunique"])
                 .reset_index()
             )
@@ -1814,159 +2173,198 @@ def run_transport_reconciliation(
     # esto_energy_totals = pd.read_pickle('../data/temp/transport_esto_energy_totals.pkl').to_dict()
     # branch_rules = pd.read_pickle('../data/temp/transport_branch_rules.pkl').to_dict()
 
-    max_reconcile_iterations = 8
-    energy_abs_tolerance = 1e-3
-    working_df = export_df.copy()
-    summary_df = pd.DataFrame()
-    summary_df_check = pd.DataFrame()
-    reconciliation_converged = False
-    cumulative_scale_factors: dict[tuple[str, ...], float] = {}
-
-    for iteration in range(1, max_reconcile_iterations + 1):
-        working_df, summary_df = reconcile_energy_use(
-            export_df=working_df,
-            base_year=base_year,
-            branch_mapping_rules=branch_rules,
-            esto_energy_totals=esto_energy_totals,
-            energy_fn=transport_energy_fn,
-            adjustment_fn=transport_adjustment_fn,
-            apply_adjustments_to_future_years=apply_adjustments_to_future_years,
-        )
-        if {"ESTO Key", "Scale Factor"}.issubset(summary_df.columns):
-            for key_text, sf_raw in zip(
-                summary_df["ESTO Key"].astype(str),
-                pd.to_numeric(summary_df["Scale Factor"], errors="coerce"),
-            ):
-                if pd.isna(sf_raw):
-                    continue
-                sf = float(sf_raw)
-                if sf in (float("inf"), float("-inf")):
-                    continue
-                key_tuple = tuple(part.strip() for part in key_text.split(" | "))
-                if not key_tuple:
+    def _reconcile_current_accounts_block() -> dict:
+        """Fit the Current Accounts (base-year) block to the ESTO totals."""
+        max_reconcile_iterations = 8
+        energy_abs_tolerance = 1e-3
+        working_df = export_df.copy()
+        summary_df = pd.DataFrame()
+        summary_df_check = pd.DataFrame()
+        reconciliation_converged = False
+        cumulative_scale_factors: dict[tuple[str, ...], float] = {}
+
+        for iteration in range(1, max_reconcile_iterations + 1):
+            working_df, summary_df = reconcile_energy_use(
+                export_df=working_df,
+                base_year=base_year,
+                branch_mapping_rules=branch_rules,
+                esto_energy_totals=esto_energy_totals,
+                energy_fn=transport_energy_fn,
+                adjustment_fn=transport_adjustment_fn,
+                apply_adjustments_to_future_years=apply_adjustments_to_future_years,
+            )
+            if {"ESTO Key", "Scale Factor"}.issubset(summary_df.columns):
+                for key_text, sf_raw in zip(
+                    summary_df["ESTO Key"].astype(str),
+                    pd.to_numeric(summary_df["Scale Factor"], errors="coerce"),
+                ):
+                    if pd.isna(sf_raw):
+                        continue
+                    sf = float(sf_raw)
+                    if sf in (float("inf"), float("-inf")):
+                        continue
+                    key_tuple = tuple(part.strip() for part in key_text.split(" | "))
+                    if not key_tuple:
+                        continue
+                    cumulative_scale_factors[key_tuple] = (
+                        cumulative_scale_factors.get(key_tuple, 1.0) * sf
+                    )
+
+            # Run a check pass on the updated dataframe.
+            _, summary_df_check = reconcile_energy_use(
+                export_df=working_df,
+                base_year=base_year,
+                branch_mapping_rules=branch_rules,
+                esto_energy_totals=esto_energy_totals,
+                energy_fn=transport_energy_fn,
+                adjustment_fn=transport_adjustment_fn,
+                apply_adjustments_to_future_years=apply_adjustments_to_future_years,
+            )
+
+            scale_check_series = pd.to_numeric(summary_df_check["Scale Factor"], errors="coerce")
+            non_finite_scale_mask = scale_check_series.isna() | scale_check_series.isin([float("inf"), float("-inf")])
+            scale_check_off_tol = scale_check_series.notna() & (
+                scale_check_series.sub(1.0).abs() >= scale_factor_tolerance
+            )
+
+            if "LEAP Energy Use" in summary_df_check.columns:
+                leap_check = pd.to_numeric(summary_df_check["LEAP Energy Use"], errors="coerce")
+            else:
+                leap_check = pd.Series(pd.NA, index=summary_df_check.index, dtype="float64")
+            if "ESTO Energy Use" in summary_df_check.columns:
+                esto_check = pd.to_numeric(summary_df_check["ESTO Energy Use"], errors="coerce")
+            else:
+                esto_check = pd.Series(pd.NA, index=summary_df_check.index, dtype="float64")
+            both_near_zero_mask = (
+                leap_check.abs().fillna(0.0) <= energy_abs_tolerance
+            ) & (
+                esto_check.abs().fillna(0.0) <= energy_abs_tolerance
+            )
+            non_finite_scale_mask = non_finite_scale_mask & ~both_near_zero_mask
+            scale_check_off_tol = scale_check_off_tol & ~both_near_zero_mask
+            energy_abs_diff = (leap_check - esto_check).abs()
+            esto_abs = esto_check.abs()
+            energy_rel_diff = energy_abs_diff / esto_abs.replace(0, pd.NA)
+            energy_mismatch_mask = (
+                (esto_abs <= energy_abs_tolerance) & (energy_abs_diff > energy_abs_tolerance)
+            ) | (
+                (esto_abs > energy_abs_tolerance) & (energy_rel_diff > scale_factor_tolerance)
+            )
+            energy_mismatch_mask = energy_mismatch_mask.fillna(False)
+
+            working_df, fallback_injection_count = _apply_zero_energy_fallbacks_from_summary(
+                working_df,
+                summary_df_check=summary_df_check,
+                base_year=base_year,
+                economy=economy,
+                scenario=scenario,
+                energy_abs_tolerance=energy_abs_tolerance,
+            )
+            if fallback_injection_count:
+                if iteration < max_reconcile_iterations:
+                    print(
+                        f"[WARN] Applied {fallback_injection_count} fallback injection(s) "
+                        f"for zero-energy mismatch keys on pass {iteration}; running another pass."
+                    )
                     continue
-                cumulative_scale_factors[key_tuple] = (
-                    cumulative_scale_factors.get(key_tuple, 1.0) * sf
+                print(
+                    f"[WARN] Applied {fallback_injection_count} fallback injection(s) on the final pass "
+                    f"({iteration}/{max_reconcile_iterations}); no additional pass remains."
                 )
 
-        # Run a check pass on the updated dataframe.
-        _, summary_df_check = reconcile_energy_use(
-            export_df=working_df,
-            base_year=base_year,
-            branch_mapping_rules=branch_rules,
-            esto_energy_totals=esto_energy_totals,
-            energy_fn=transport_energy_fn,
-            adjustment_fn=transport_adjustment_fn,
-            apply_adjustments_to_future_years=apply_adjustments_to_future_years,
-        )
+            if not non_finite_scale_mask.any() and not scale_check_off_tol.any() and not energy_mismatch_mask.any():
+                reconciliation_converged = True
+                break
 
-        scale_check_series = pd.to_numeric(summary_df_check["Scale Factor"], errors="coerce")
-        non_finite_scale_mask = scale_check_series.isna() | scale_check_series.isin([float("inf"), float("-inf")])
-        scale_check_off_tol = scale_check_series.notna() & (
-            scale_check_series.sub(1.0).abs() >= scale_factor_tolerance
-        )
+            ignored_near_zero_count = int(both_near_zero_mask.sum())
+            if ignored_near_zero_count:
+                print(
+                    "[INFO] Ignoring scale-factor checks for "
+                    f"{ignored_near_zero_count} key(s) with both LEAP and ESTO near zero "
+                    f"(abs <= {energy_abs_tolerance:g})."
+                )
 
-        if "LEAP Energy Use" in summary_df_check.columns:
-            leap_check = pd.to_numeric(summary_df_check["LEAP Energy Use"], errors="coerce")
-        else:
-            leap_check = pd.Series(pd.NA, index=summary_df_check.index, dtype="float64")
-        if "ESTO Energy Use" in summary_df_check.columns:
-            esto_check = pd.to_numeric(summary_df_check["ESTO Energy Use"], errors="coerce")
-        else:
-            esto_check = pd.Series(pd.NA, index=summary_df_check.index, dtype="float64")
-        both_near_zero_mask = (
-            leap_check.abs().fillna(0.0) <= energy_abs_tolerance
-        ) & (
-            esto_check.abs().fillna(0.0) <= energy_abs_tolerance
-        )
-        non_finite_scale_mask = non_finite_scale_mask & ~both_near_zero_mask
-        scale_check_off_tol = scale_check_off_tol & ~both_near_zero_mask
-        energy_abs_diff = (leap_check - esto_check).abs()
-        esto_abs = esto_check.abs()
-        energy_rel_diff = energy_abs_diff / esto_abs.replace(0, pd.NA)
-        energy_mismatch_mask = (
-            (esto_abs <= energy_abs_tolerance) & (energy_abs_diff > energy_abs_tolerance)
-        ) | (
-            (esto_abs > energy_abs_tolerance) & (energy_rel_diff > scale_factor_tolerance)
-        )
-        energy_mismatch_mask = energy_mismatch_mask.fillna(False)
-
-        working_df, fallback_injection_count = _apply_zero_energy_fallbacks_from_summary(
-            working_df,
-            summary_df_check=summary_df_check,
-            base_year=base_year,
-            economy=economy,
-            scenario=scenario,
-            energy_abs_tolerance=energy_abs_tolerance,
-        )
-        if fallback_injection_count:
             if iteration < max_reconcile_iterations:
                 print(
-                    f"[WARN] Applied {fallback_injection_count} fallback injection(s) "
-                    f"for zero-energy mismatch keys on pass {iteration}; running another pass."
+                    f"[WARN] Reconciliation not converged after pass {iteration}/{max_reconcile_iterations}; "
+                    "running another pass."
                 )
-                continue
-            print(
-                f"[WARN] Applied {fallback_injection_count} fallback injection(s) on the final pass "
-                f"({iteration}/{max_reconcile_iterations}); no additional pass remains."
-            )
-
-        if not non_finite_scale_mask.any() and not scale_check_off_tol.any() and not energy_mismatch_mask.any():
-            reconciliation_converged = True
-            break
 
-        ignored_near_zero_count = int(both_near_zero_mask.sum())
-        if ignored_near_zero_count:
-            print(
-                "[INFO] Ignoring scale-factor checks for "
-                f"{ignored_near_zero_count} key(s) with both LEAP and ESTO near zero "
-                f"(abs <= {energy_abs_tolerance:g})."
-            )
-
-        if iteration < max_reconcile_iterations:
-            print(
-                f"[WARN] Reconciliation not converged after pass {iteration}/{max_reconcile_iterations}; "
-                "running another pass."
+        non_convergence_warning = ""
+        if not reconciliation_converged:
+            error_parts = []
+            if non_finite_scale_mask.any():
+                failed_non_finite = summary_df_check.loc[non_finite_scale_mask]
+                key_col = "ESTO Key" if "ESTO Key" in failed_non_finite.columns else failed_non_finite.columns[0]
+                preview = "\n".join(f"  - {key}" for key in failed_non_finite[key_col].astype(str).head(10))
+                error_parts.append(
+                    "Non-finite scale factors were produced.\n"
+                    f"Affected keys: {int(non_finite_scale_mask.sum())}\n"
+                    f"First keys:\n{preview}"
+                )
+            if scale_check_off_tol.any():
+                failed = summary_df_check.loc[scale_check_off_tol]
+                error_parts.append(
+                    "Some adjustment multipliers remain outside tolerance "
+                    f"({scale_factor_tolerance:g}).\n{failed.to_string()}"
+                )
+            if energy_mismatch_mask.any():
+                mismatch = summary_df_check.loc[energy_mismatch_mask].copy()
+                if "LEAP Energy Use" in mismatch.columns and "ESTO Energy Use" in mismatch.columns:
+                    mismatch["Abs Diff"] = (
+                        pd.to_numeric(mismatch["LEAP Energy Use"], errors="coerce")
+                        - pd.to_numeric(mismatch["ESTO Energy Use"], errors="coerce")
+                    ).abs()
+                    mismatch["Rel Diff"] = mismatch["Abs Diff"] / pd.to_numeric(
+                        mismatch["ESTO Energy Use"], errors="coerce"
+                    ).abs().replace(0, pd.NA)
+                mismatch_preview = mismatch.head(20).to_string(index=False)
+                error_parts.append(
+                    "LEAP vs ESTO energy mismatches remain above tolerance after reconciliation.\n"
+                    f"Relative tolerance={scale_factor_tolerance:g}, absolute tolerance={energy_abs_tolerance:g}\n"
+                    f"First mismatches:\n{mismatch_preview}"
+                )
+            non_convergence_warning = (
+                "Reconciliation failed to converge after "
+                f"{max_reconcile_iterations} passes.\n" + "\n\n".join(error_parts)
             )
+        return {
+            "working_df": working_df,
+            "cumulative_scale_factors": cumulative_scale_factors,
+            "non_convergence_warning": non_convergence_warning,
+        }
 
-    non_convergence_warning = ""
-    if not reconciliation_converged:
-        error_parts = []
-        if non_finite_scale_mask.any():
-            failed_non_finite = summary_df_check.loc[non_finite_scale_mask]
-            key_col = "ESTO Key" if "ESTO Key" in failed_non_finite.columns else failed_non_finite.columns[0]
-            preview = "\n".join(f"  - {key}" for key in failed_non_finite[key_col].astype(str).head(10))
-            error_parts.append(
-                "Non-finite scale factors were produced.\n"
-                f"Affected keys: {int(non_finite_scale_mask.sum())}\n"
-                f"First keys:\n{preview}"
-            )
-        if scale_check_off_tol.any():
-            failed = summary_df_check.loc[scale_check_off_tol]
-            error_parts.append(
-                "Some adjustment multipliers remain outside tolerance "
-                f"({scale_factor_tolerance:g}).\n{failed.to_string()}"
-            )
-        if energy_mismatch_mask.any():
-            mismatch = summary_df_check.loc[energy_mismatch_mask].copy()
-            if "LEAP Energy Use" in mismatch.columns and "ESTO Energy Use" in mismatch.columns:
-                mismatch["Abs Diff"] = (
-                    pd.to_numeric(mismatch["LEAP Energy Use"], errors="coerce")
-                    - pd.to_numeric(mismatch["ESTO Energy Use"], errors="coerce")
-                ).abs()
-                mismatch["Rel Diff"] = mismatch["Abs Diff"] / pd.to_numeric(
-                    mismatch["ESTO Energy Use"], errors="coerce"
-                ).abs().replace(0, pd.NA)
-            mismatch_preview = mismatch.head(20).to_string(index=False)
-            error_parts.append(
-                "LEAP vs ESTO energy mismatches remain above tolerance after reconciliation.\n"
-                f"Relative tolerance={scale_factor_tolerance:g}, absolute tolerance={energy_abs_tolerance:g}\n"
-                f"First mismatches:\n{mismatch_preview}"
-            )
-        non_convergence_warning = (
-            "Reconciliation failed to converge after "
-            f"{max_reconcile_iterations} passes.\n" + "\n\n".join(error_parts)
+    if share_current_accounts:
+        # Scenarios of one economy share the Current Accounts block, so the
+        # iterative fit runs once and the other scenarios load its result.
+        cache_key = current_accounts_cache_key(
+            export_df,
+            esto_energy_totals=esto_energy_totals,
+            settings={
+                "economy": economy,
+                "base_year": base_year,
+                "branch_rules": branch_rules,
+                "apply_adjustments_to_future_years": apply_adjustments_to_future_years,
+                "scale_factor_tolerance": scale_factor_tolerance,
+                "fallback_rules": ESTO_ZERO_ENERGY_FALLBACK_RULES,
+            },
         )
+        current_accounts_result, reused = load_or_build_current_accounts(
+            resolve_str(f"intermediate_data/current_accounts_reconciliation_{economy}_{cache_key}.pkl"),
+            _reconcile_current_accounts_block,
+        )
+        if reused and len(current_accounts_result["working_df"]) == len(export_df):
+            print(f"[INFO] Reused the shared Current Accounts reconciliation for {economy} ({scenario}).")
+            current_accounts_result = dict(current_accounts_result)
+            current_accounts_result["working_df"] = current_accounts_result["working_df"].set_axis(export_df.index)
+        elif reused:
+            current_accounts_result = _reconcile_current_accounts_block()
+    else:
+        current_accounts_result = _reconcile_current_accounts_block()
+    working_df = current_accounts_result["working_df"]
+    cumulative_scale_factors = current_accounts_result["cumulative_scale_factors"]
+    non_convergence_warning = current_accounts_result["non_convergence_warning"]
+    if non_convergence_warning:
         if raise_on_non_convergence:
             raise ValueError(non_convergence_warning)
         print(f"[WARN] {non_convergence_warning}")
@@ -2029,9 +2427,7 @@ def run_transport_reconciliation(
 
     if report_adjustment_changes:
         reconciliation_dir = resolve_str("results/reconciliation")
-        recon_archive_dir = os.path.join(reconciliation_dir, "archive")
         os.makedirs(reconciliation_dir, exist_ok=True)
-        os.makedirs(recon_archive_dir, exist_ok=True)
         base_changes, future_changes = build_adjustment_change_tables(
             original_df=export_df,
             adjusted_df=working_df,
@@ -2054,50 +2450,33 @@ def run_transport_reconciliation(
         )
         suffix = f"{economy}_{scenario}".replace(" ", "_")
         input_snapshot_path = os.path.join(reconciliation_dir, f"transport_reconciliation_input_for_viewing_{suffix}.csv")
-        if os.path.exists(input_snapshot_path):
-            input_archive_path = os.path.join(
-                recon_archive_dir, f"transport_reconciliation_input_for_viewing_{suffix}_{date_id}.csv"
-            )
-            shutil.move(input_snapshot_path, input_archive_path)
-        export_df_all.to_csv(input_snapshot_path, index=False)
+        _archive_existing_output_file(input_snapshot_path, date_id=date_id)
+        write_csv_atomic(export_df_all, input_snapshot_path, index=False)
         if non_convergence_warning:
             warning_path = os.path.join(
                 reconciliation_dir,
                 f"transport_reconciliation_warning_{suffix}.txt",
             )
-            with open(warning_path, "w", encoding="utf-8") as handle:
-                handle.write(non_convergence_warning)
+            write_text_atomic(warning_path, non_convergence_warning)
         print(f"Saved pre-reconciliation input snapshot to {input_snapshot_path} ({len(export_df_all)} rows).")
 
         energy_change_path = os.path.join(reconciliation_dir, f"transport_reconciliation_energy_change_{suffix}.csv")
-        if os.path.exists(energy_change_path):
-            energy_change_archive_path = os.path.join(
-                recon_archive_dir, f"transport_reconciliation_energy_change_{suffix}_{date_id}.csv"
-            )
-            shutil.move(energy_change_path, energy_change_archive_path)
-        reconciliation_energy_change_df.to_csv(energy_change_path, index=False)
+        _archive_existing_output_file(energy_change_path, date_id=date_id)
+        write_csv_atomic(reconciliation_energy_change_df, energy_change_path, index=False)
         print(
             f"Saved reconciliation energy change summary to {energy_change_path} "
             f"({len(reconciliation_energy_change_df)} ESTO keys)."
         )
 
         base_changes_path = os.path.join(reconciliation_dir, f"transport_adjustment_changes_base_year_{suffix}.csv")
-        if os.path.exists(base_changes_path):
-            base_archive_path = os.path.join(
-                recon_archive_dir, f"transport_adjustment_changes_base_year_{suffix}_{date_id}.csv"
-            )
-            shutil.move(base_changes_path, base_archive_path)
-        base_changes.to_csv(base_changes_path, index=False)
+        _archive_existing_output_file(base_changes_path, date_id=date_id)
+        write_csv_atomic(base_changes, base_changes_path, index=False)
         print(f"Saved base-year adjustment details to {base_changes_path} ({len(base_changes)} rows).")
 
         if future_changes is not None and not future_changes.empty:
             future_changes_path = os.path.join(reconciliation_dir, f"transport_adjustment_changes_future_years_{suffix}.csv")
-            if os.path.exists(future_changes_path):
-                future_archive_path = os.path.join(
-                    recon_archive_dir, f"transport_adjustment_changes_future_years_{suffix}_{date_id}.csv"
-                )
-                shutil.move(future_changes_path, future_archive_path)
-            future_changes.to_csv(future_changes_path, index=False)
+            _archive_existing_output_file(future_changes_path, date_id=date_id)
+            write_csv_atomic(future_changes, future_changes_path, index=False)
             print(f"Saved future-year adjustment details to {future_changes_path} ({len(future_changes)} rows).")
         elif future_changes is not None:
             print("No future-year adjustments detected.")
@@ -2115,7 +2494,7 @@ def run_transport_reconciliation(
     # Apply adjustments within each scenario/region slice to avoid cross-scenario coupling.
     group_cols = [col for col in ("Scenario", "Region") if col in adjusted_export_df_all.columns]
     if group_cols:
-        grouped_indexes = adjusted_export_df_all.groupby(group_cols, dropna=False, sort=False).groups
+        grouped_indexes = adjusted_export_df_all.groupby(group_cols, dropna=False, sort=False, observed=True).groups
         grouped_items = list(grouped_indexes.items())
     else:
         grouped_items = [(None, adjusted_export_df_all.index)]
@@ -2165,20 +2544,14 @@ def run_transport_reconciliation(
 
     if report_adjustment_changes:
         reconciliation_dir = resolve_str("results/reconciliation")
-        recon_archive_dir = os.path.join(reconciliation_dir, "archive")
         os.makedirs(reconciliation_dir, exist_ok=True)
-        os.makedirs(recon_archive_dir, exist_ok=True)
         suffix = f"{economy}_{scenario}".replace(" ", "_")
 
         adjusted_snapshot_path = os.path.join(
             reconciliation_dir, f"transport_reconciliation_adjusted_for_viewing_{suffix}.csv"
         )
-        if os.path.exists(adjusted_snapshot_path):
-            adjusted_archive_path = os.path.join(
-                recon_archive_dir, f"transport_reconciliation_adjusted_for_viewing_{suffix}_{date_id}.csv"
-            )
-            shutil.move(adjusted_snapshot_path, adjusted_archive_path)
-        adjusted_export_df_all.to_csv(adjusted_snapshot_path, index=False)
+        _archive_existing_output_file(adjusted_snapshot_path, date_id=date_id)
+        write_csv_atomic(adjusted_export_df_all, adjusted_snapshot_path, index=False)
         print(
             f"Saved post-reconciliation adjusted snapshot to {adjusted_snapshot_path} "
             f"({len(adjusted_export_df_all)} rows)."
@@ -2188,12 +2561,8 @@ def run_transport_reconciliation(
         before_after_path = os.path.join(
             reconciliation_dir, f"transport_reconciliation_before_after_long_{suffix}.csv"
         )
-        if os.path.exists(before_after_path):
-            before_after_archive_path = os.path.join(
-                recon_archive_dir, f"transport_reconciliation_before_after_long_{suffix}_{date_id}.csv"
-            )
-            shutil.move(before_after_path, before_after_archive_path)
-        before_after_long.to_csv(before_after_path, index=False)
+        _archive_existing_output_file(before_after_path, date_id=date_id)
+        write_csv_atomic(before_after_long, before_after_path, index=False)
         print(
             f"Saved per-year before/after reconciliation table to {before_after_path} "
             f"({len(before_after_long)} rows)."
@@ -2346,32 +2715,34 @@ def load_transport_into_leap(
     
     first_branch_diagnosed = False
     first_of_each_length_diagnosed = set()
-    for leap_tuple, src_tuple in LEAP_BRANCH_TO_SOURCE_MAP.items():
-        if LOAD_EXPORT_DF_CHECKPOINT or LOAD_HALFWAY_CHECKPOINT:
-            break
-        leap_export_df = process_single_leap_transport_mapping(
-            L=L,
-            df=df,
-            leap_tuple=leap_tuple,
-            src_tuple=src_tuple,
-            diagnose_method=diagnose_method,
-            first_branch_diagnosed=first_branch_diagnosed,
-            first_of_each_length_diagnosed=first_of_each_length_diagnosed,
-            SHORTNAME_TO_LEAP_BRANCHES=SHORTNAME_TO_LEAP_BRANCHES,
-            LEAP_MEASURE_CONFIG=LEAP_MEASURE_CONFIG,
-            leap_export_df=leap_export_df,
-            TRANSPORT_ROOT=TRANSPORT_ROOT,
-            CHECK_BRANCHES_IN_LEAP_USING_COM=CHECK_BRANCHES_IN_LEAP_USING_COM,
-            AUTO_SET_MISSING_BRANCHES=AUTO_SET_MISSING_BRANCHES,
-            passenger_sales_result=passenger_sales_result,
-            freight_sales_result=freight_sales_result,
-        )
-        continue
+    with track_stage("branch_mapping") as branch_stage:
+        for leap_tuple, src_tuple in LEAP_BRANCH_TO_SOURCE_MAP.items():
+            if LOAD_EXPORT_DF_CHECKPOINT or LOAD_HALFWAY_CHECKPOINT:
+                break
+            leap_export_df = process_single_leap_transport_mapping(
+                L=L,
+                df=df,
+                leap_tuple=leap_tuple,
+                src_tuple=src_tuple,
+                diagnose_method=diagnose_method,
+                first_branch_diagnosed=first_branch_diagnosed,
+                first_of_each_length_diagnosed=first_of_each_length_diagnosed,
+                SHORTNAME_TO_LEAP_BRANCHES=SHORTNAME_TO_LEAP_BRANCHES,
+                LEAP_MEASURE_CONFIG=LEAP_MEASURE_CONFIG,
+                leap_export_df=leap_export_df,
+                TRANSPORT_ROOT=TRANSPORT_ROOT,
+                CHECK_BRANCHES_IN_LEAP_USING_COM=CHECK_BRANCHES_IN_LEAP_USING_COM,
+                AUTO_SET_MISSING_BRANCHES=AUTO_SET_MISSING_BRANCHES,
+                passenger_sales_result=passenger_sales_result,
+                freight_sales_result=freight_sales_result,
+            )
+            continue
+        branch_stage["rows"] = len(leap_export_df)
     #save temporary export df checkpoint
     if LOAD_HALFWAY_CHECKPOINT or LOAD_EXPORT_DF_CHECKPOINT or LOAD_THREEQUART_WAY_CHECKPOINT:
         leap_export_df = pd.read_pickle(halfway_checkpoint_path)
     else:
-        leap_export_df.to_pickle(halfway_checkpoint_path)
+        write_pickle_atomic(leap_export_df, halfway_checkpoint_path)
     
     rebuild_expressions_from_viewing = False
     if LOAD_THREEQUART_WAY_CHECKPOINT or LOAD_EXPORT_DF_CHECKPOINT:
@@ -2404,13 +2775,13 @@ def load_transport_into_leap(
         
         leap_export_df, export_df_for_viewing = convert_values_to_expressions(leap_export_df)
         
-        leap_export_df.to_pickle(three_quarter_checkpoint_path)
-        export_df_for_viewing.to_pickle(viewing_checkpoint_path)
+        write_pickle_atomic(leap_export_df, three_quarter_checkpoint_path)
+        write_pickle_atomic(export_df_for_viewing, viewing_checkpoint_path)
     
     
     if LOAD_EXPORT_DF_CHECKPOINT and not rebuild_expressions_from_viewing:
         # breakpoint()
-        leap_export_df = pd.read_excel(export_filename, sheet_name='LEAP', header=2)
+        leap_export_df, _ = read_export_sheets(export_filename)
         print(f"Loaded leap_export_df from checkpoint: {export_filename}")
     else:
         # def create_current_accounts_scenario(export_df):
@@ -2654,6 +3025,10 @@ FREIGHT_SALES_POLICY_SETTINGS: dict[str, Any] | None = None
 # RECONCILIATION VARS
 APPLY_ADJUSTMENTS_TO_FUTURE_YEARS = True
 REPORT_ADJUSTMENT_CHANGES = True
+# Reuse one Current Accounts (base-year) fit for every scenario of an economy
+# whose Current Accounts block and ESTO totals are identical (see
+# functions/current_accounts_cache.py).
+SHARE_CURRENT_ACCOUNTS_ACROSS_SCENARIOS = False
 # Optional convergence-time fallback injections keyed by ESTO energy key.
 # Example:
 # {
@@ -2698,8 +3073,99 @@ CHECKPOINT_LOAD_STAGE = "none"
 ) = resolve_export_checkpoint_flags(CHECKPOINT_LOAD_STAGE)
 MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE = True
 
+# In all-mode "both" (or "apec" with PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC),
+# build 00_APEC from the economy inputs prepared earlier in the same run
+# instead of preparing every economy again.
+REUSE_PREPARED_INPUTS_FOR_APEC = True
+
+# Parallel execution for all-mode economy runs ("separate"/"both" and the
+# 00_APEC input pre-pass). 1 keeps the sequential loop; >1 runs each
+# economy/scenario target in its own worker process.
+PARALLEL_ECONOMY_WORKERS = 1
+# Console filtering applied inside each worker process ("full" or "stage_economy").
+RUN_OUTPUT_MODE = "full"
+# Opt-in profiling of timed stages (see functions/stage_telemetry.py). None
+# disables it; "all" or a list of stage names writes profiles and top-N
+# summaries to results/profiling/<economy>_<scenario>/.
+PROFILE_STAGES: list[str] | str | None = None
+PROFILER = "cprofile"  # "cprofile", "sampling" (pyinstrument), "auto"
+PROFILE_TOP_N = 30
+# Run manifest (see functions/run_manifest.py): every economy/scenario target
+# records its stage inputs and outputs here. None disables the manifest.
+RUN_MANIFEST_PATH: str | None = "results/run_summaries/transport_run_manifest.json"
+# Skip economy targets whose stages are up to date in the run manifest, so a
+# failed batch restarts at its first failed (or changed) target.
+RESUME_BATCH_RUNS = False
+# Passenger/freight sales results are stored here, keyed by a fingerprint of
+# their inputs and policy settings (see functions/sales_result_cache.py), and
+# reused when nothing they depend on changed. None disables the cache.
+SALES_RESULT_CACHE_DIR: str | None = None
+# With plotting on, store the sales dashboard inputs in SALES_PLOT_QUEUE_DIR
+# instead of plotting inline; functions/sales_dashboard_queue.py renders them
+# later in worker processes. False keeps inline plotting.
+DEFER_SALES_PLOTS = False
+SALES_PLOT_QUEUE_DIR = "intermediate_data/sales_plot_queue"
+# Batch runs: prepare every economy's inputs first and estimate passenger and
+# freight sales for all of them in one pass (sales_workflow.estimate_sales_for_economies)
+# before the per-economy runs, which then reuse those results.
+BATCH_SALES_ENGINE = False
+
 DATE_ID = datetime.now().strftime("%Y%m%d")
 
+# Module-level settings copied into worker processes so each target runs with
+# the same configuration as the parent. This is the single list of runtime
+# settings: apply_runtime_settings (used by transport_workflow) sets exactly
+# these names and _snapshot_runtime_settings copies exactly these names.
+_RUNTIME_SETTING_NAMES = (
+    "TRANSPORT_ECONOMY_SELECTION",
+    "TRANSPORT_SCENARIO_SELECTION",
+    "ALL_RUN_MODE",
+    "APEC_REGION",
+    "APEC_LEAP_REGION_OVERRIDE",
+    "APEC_MAPPING_WORKBOOK_PATH",
+    "APEC_ESTO_BALANCES_PATH",
+    "APEC_BASE_YEAR",
+    "APEC_FINAL_YEAR",
+    "RUN_PROFILE",
+    "RUN_INPUT_CREATION",
+    "RUN_RECONCILIATION",
+    "PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC",
+    "REUSE_PREPARED_INPUTS_FOR_APEC",
+    "SALES_MODE",
+    "RUN_PASSENGER_SALES",
+    "RUN_FREIGHT_SALES",
+    "PASSENGER_PLOT",
+    "PASSENGER_SALES_POLICY_SETTINGS",
+    "FREIGHT_SALES_POLICY_SETTINGS",
+    "APPLY_ADJUSTMENTS_TO_FUTURE_YEARS",
+    "REPORT_ADJUSTMENT_CHANGES",
+    "SHARE_CURRENT_ACCOUNTS_ACROSS_SCENARIOS",
+    "ESTO_ZERO_ENERGY_FALLBACK_RULES",
+    "CHECK_BRANCHES_IN_LEAP_USING_COM",
+    "SET_VARS_IN_LEAP_USING_COM",
+    "AUTO_SET_MISSING_BRANCHES",
+    "ENSURE_FUELS_IN_LEAP",
+    "INPUT_DATA_SOURCE",
+    "LOAD_INPUT_CHECKPOINT",
+    "CHECKPOINT_LOAD_STAGE",
+    "LOAD_HALFWAY_CHECKPOINT",
+    "LOAD_THREEQUART_WAY_CHECKPOINT",
+    "LOAD_EXPORT_DF_CHECKPOINT",
+    "MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE",
+    "PARALLEL_ECONOMY_WORKERS",
+    "RUN_OUTPUT_MODE",
+    "PROFILE_STAGES",
+    "PROFILER",
+    "PROFILE_TOP_N",
+    "RUN_MANIFEST_PATH",
+    "RESUME_BATCH_RUNS",
+    "SALES_RESULT_CACHE_DIR",
+    "DEFER_SALES_PLOTS",
+    "SALES_PLOT_QUEUE_DIR",
+    "BATCH_SALES_ENGINE",
+    "DATE_ID",
+)
+
 
 def _normalise_esto_key(value: str) -> str:
     key = " | ".join(part.strip() for part in str(value).split("|"))
@@ -3057,7 +3523,11 @@ def resolve_transport_run_mode(transport_economy_selection: str, all_run_mode: s
 
 
 def aggregate_batch_sales_outputs(run_records, scenario, date_id):
-    """Concatenate per-economy sales CSVs into single files for quick cross-economy analysis."""
+    """
+    Concatenate per-economy sales tables into single files for quick cross-economy
+    analysis. Tables of runs that used the batch sales engine come from memory;
+    the rest are read back from their CSVs.
+    """
     passenger_frames = []
     freight_frames = []
     for record in run_records:
@@ -3066,13 +3536,25 @@ def aggregate_batch_sales_outputs(run_records, scenario, date_id):
         passenger_path = record.get("passenger_sales_output")
         freight_path = record.get("freight_sales_output")
         economy = record["economy"]
-        if passenger_path and os.path.exists(passenger_path):
+        batch_used = record.get("batch_sales_used") or ()
+        passenger_key = ("passenger", str(economy), str(scenario))
+        freight_key = ("freight", str(economy), str(scenario))
+        passenger_df = None
+        freight_df = None
+        # Runs that used the batch sales engine wrote exactly its sales tables.
+        if "passenger" in batch_used and passenger_key in _BATCH_SALES_TABLES:
+            passenger_df = _BATCH_SALES_TABLES[passenger_key].copy()
+        elif passenger_path and os.path.exists(passenger_path):
             passenger_df = pd.read_csv(passenger_path)
+        if "freight" in batch_used and freight_key in _BATCH_SALES_TABLES:
+            freight_df = _BATCH_SALES_TABLES[freight_key].copy()
+        elif freight_path and os.path.exists(freight_path):
+            freight_df = pd.read_csv(freight_path)
+        if passenger_df is not None:
             passenger_df["Economy"] = economy
             passenger_df["Scenario"] = scenario
             passenger_frames.append(passenger_df)
-        if freight_path and os.path.exists(freight_path):
-            freight_df = pd.read_csv(freight_path)
+        if freight_df is not None:
             freight_df["Economy"] = economy
             freight_df["Scenario"] = scenario
             freight_frames.append(freight_df)
@@ -3084,7 +3566,7 @@ def aggregate_batch_sales_outputs(run_records, scenario, date_id):
         archived_output = _archive_existing_output_file(passenger_all_path, date_id=date_id)
         if archived_output:
             print(f"[INFO] Archived previous combined passenger sales to {archived_output}")
-        passenger_all.to_csv(passenger_all_path, index=False)
+        write_csv_atomic(passenger_all, passenger_all_path, index=False)
         print(f"[INFO] Wrote combined passenger sales: {passenger_all_path}")
     if freight_frames:
         freight_all = pd.concat(freight_frames, ignore_index=True)
@@ -3093,7 +3575,7 @@ def aggregate_batch_sales_outputs(run_records, scenario, date_id):
         archived_output = _archive_existing_output_file(freight_all_path, date_id=date_id)
         if archived_output:
             print(f"[INFO] Archived previous combined freight sales to {archived_output}")
-        freight_all.to_csv(freight_all_path, index=False)
+        write_csv_atomic(freight_all, freight_all_path, index=False)
         print(f"[INFO] Wrote combined freight sales: {freight_all_path}")
 
 
@@ -3152,6 +3634,100 @@ def build_apec_run_config(scenario: str):
     )
 
 
+def _resolve_target_sales_policy_settings(transport_cfg) -> tuple[Any, Any]:
+    """Return (passenger, freight) sales policy settings, preferring per-target overrides."""
+    passenger_sales_policy_settings = getattr(transport_cfg, "passenger_sales_policy_settings", None)
+    if passenger_sales_policy_settings is None:
+        passenger_sales_policy_settings = PASSENGER_SALES_POLICY_SETTINGS
+    freight_sales_policy_settings = getattr(transport_cfg, "freight_sales_policy_settings", None)
+    if freight_sales_policy_settings is None:
+        freight_sales_policy_settings = FREIGHT_SALES_POLICY_SETTINGS
+    return passenger_sales_policy_settings, freight_sales_policy_settings
+
+
+def reconciliation_input_checkpoint_path(economy: str, scenario: str) -> str:
+    """Return the export-for-viewing checkpoint that reconciliation reads for one target."""
+    checkpoint_tag = f"{economy}_{scenario}".replace(" ", "_")
+    return resolve_str(f"intermediate_data/export_df_for_viewing_checkpoint2_{checkpoint_tag}.pkl")
+
+
+def requested_target_stages() -> tuple[str, ...]:
+    """Stages each economy target runs under the current RUN_PROFILE, in run order."""
+    enabled = {STAGE_INPUT_CREATION: RUN_INPUT_CREATION, STAGE_RECONCILIATION: RUN_RECONCILIATION}
+    return tuple(stage for stage in STAGE_ORDER if enabled[stage])
+
+
+def build_target_stage_specs(transport_economy: str, transport_scenario: str, transport_cfg) -> dict[str, StageSpec]:
+    """Describe the inputs, outputs and output-shaping settings of each stage of one target."""
+    passenger_policy, freight_policy = _resolve_target_sales_policy_settings(transport_cfg)
+    input_checkpoint = input_checkpoint_path(
+        transport_economy,
+        transport_scenario,
+        transport_cfg.transport_base_year,
+        transport_cfg.transport_final_year,
+    )
+    reconciliation_input_path = reconciliation_input_checkpoint_path(transport_economy, transport_scenario)
+    year_settings = {
+        "base_year": transport_cfg.transport_base_year,
+        "final_year": transport_cfg.transport_final_year,
+        "model_name": transport_cfg.transport_model_name,
+        "set_vars_in_leap_using_com": SET_VARS_IN_LEAP_USING_COM,
+    }
+
+    input_files = {
+        "transport_model": transport_cfg.transport_model_path,
+        "esto_balances": transport_cfg.transport_esto_balances_path,
+        "fuels": transport_cfg.transport_fuels_path,
+        "import_template": transport_cfg.transport_import_path,
+        "survival_profile": transport_cfg.survival_profile_path,
+        "vintage_profile": transport_cfg.vintage_profile_path,
+    }
+    output_files = {
+        "transport_export": transport_cfg.transport_export_path,
+        "reconciliation_input": reconciliation_input_path,
+        "passenger_sales": transport_cfg.passenger_sales_output if RUN_PASSENGER_SALES else None,
+        "freight_sales": transport_cfg.freight_sales_output if RUN_FREIGHT_SALES else None,
+    }
+    # A loaded input checkpoint is read, not rewritten, so it counts as an input.
+    if LOAD_INPUT_CHECKPOINT:
+        input_files["input_checkpoint"] = input_checkpoint
+    else:
+        output_files["input_checkpoint"] = input_checkpoint
+
+    input_stage = StageSpec(
+        stage=STAGE_INPUT_CREATION,
+        inputs=input_files,
+        outputs=output_files,
+        settings={
+            **year_settings,
+            "region": transport_cfg.transport_region,
+            "leap_region_override": getattr(transport_cfg, "transport_leap_region_override", None),
+            "run_passenger_sales": RUN_PASSENGER_SALES,
+            "run_freight_sales": RUN_FREIGHT_SALES,
+            "passenger_sales_policy_settings": passenger_policy,
+            "freight_sales_policy_settings": freight_policy,
+            "checkpoint_load_stage": CHECKPOINT_LOAD_STAGE,
+            "merge_import_export_and_check_structure": MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE,
+        },
+    )
+    reconciliation_stage = StageSpec(
+        stage=STAGE_RECONCILIATION,
+        inputs={
+            "esto_balances": transport_cfg.transport_esto_balances_path,
+            "reconciliation_input": reconciliation_input_path,
+            "mapping_workbook": getattr(transport_cfg, "transport_mapping_workbook_path", None),
+            "mapping_esto": getattr(transport_cfg, "transport_mapping_esto_path", None),
+        },
+        outputs={"transport_export": transport_cfg.transport_export_path},
+        settings={
+            **year_settings,
+            "apply_adjustments_to_future_years": APPLY_ADJUSTMENTS_TO_FUTURE_YEARS,
+            "esto_zero_energy_fallback_rules": ESTO_ZERO_ENERGY_FALLBACK_RULES,
+        },
+    )
+    return {STAGE_INPUT_CREATION: input_stage, STAGE_RECONCILIATION: reconciliation_stage}
+
+
 def run_configured_transport_workflow(
     *,
     transport_economy: str,
@@ -3159,15 +3735,20 @@ def run_configured_transport_workflow(
     transport_cfg,
     run_type: str,
     prepared_input_df: pd.DataFrame | None = None,
+    skip_stages: tuple[str, ...] = (),
 ):
-    """Run input creation + optional reconciliation for one configured workflow target."""
+    """
+    Run input creation + optional reconciliation for one configured workflow target.
+
+    `skip_stages` names stages that are already up to date (see
+    `resolve_resumable_stages`); they are not run again.
+    """
     print(f"\n=== Running {run_type} workflow for {transport_economy} | scenario {transport_scenario} ===")
-    passenger_sales_policy_settings = getattr(transport_cfg, "passenger_sales_policy_settings", None)
-    if passenger_sales_policy_settings is None:
-        passenger_sales_policy_settings = PASSENGER_SALES_POLICY_SETTINGS
-    freight_sales_policy_settings = getattr(transport_cfg, "freight_sales_policy_settings", None)
-    if freight_sales_policy_settings is None:
-        freight_sales_policy_settings = FREIGHT_SALES_POLICY_SETTINGS
+    run_input_creation = RUN_INPUT_CREATION and STAGE_INPUT_CREATION not in skip_stages
+    run_reconciliation = RUN_RECONCILIATION and STAGE_RECONCILIATION not in skip_stages
+    passenger_sales_policy_settings, freight_sales_policy_settings = _resolve_target_sales_policy_settings(
+        transport_cfg
+    )
 
     mapping_workbook_path = getattr(transport_cfg, "transport_mapping_workbook_path", None)
     mapping_esto_path = (
@@ -3199,21 +3780,36 @@ def run_configured_transport_workflow(
         "freight_sales_output": transport_cfg.freight_sales_output,
         "status": "success",
         "error": "",
+        "completed_stages": [],
+        "resumed_stages": list(skip_stages),
     }
     checkpoint_tag = f"{transport_economy}_{transport_scenario}".replace(" ", "_")
-    reconciliation_input_path = resolve_str(
-        f"intermediate_data/export_df_for_viewing_checkpoint2_{checkpoint_tag}.pkl"
-    )
-    if RUN_RECONCILIATION and (not RUN_INPUT_CREATION) and not os.path.exists(reconciliation_input_path):
+    reconciliation_input_path = reconciliation_input_checkpoint_path(transport_economy, transport_scenario)
+    if run_reconciliation and (not run_input_creation) and not os.path.exists(reconciliation_input_path):
         raise FileNotFoundError(
             "Reconciliation input checkpoint was not found. Reconciliation now reads input from "
             f"intermediate_data, not from the export workbook.\nMissing file: {reconciliation_input_path}\n"
             "Run input creation first (RUN_PROFILE='input_only' or 'full')."
         )
 
+    if RUN_INPUT_CREATION and prepared_input_df is None:
+        record["input_checkpoint_path"] = input_checkpoint_path(
+            transport_economy,
+            transport_scenario,
+            transport_cfg.transport_base_year,
+            transport_cfg.transport_final_year,
+        )
+
+    telemetry_token = begin_stage_telemetry(
+        profile_dir=resolve_str(f"results/profiling/{transport_economy}_{transport_scenario}".replace(" ", "_")),
+        profile_stages=PROFILE_STAGES,
+        profiler=PROFILER,
+        top_n=PROFILE_TOP_N,
+    )
     _t0 = time.perf_counter()
+    _cpu0 = time.process_time()
     try:
-        if RUN_INPUT_CREATION:
+        if run_input_creation:
             load_transport_into_leap(
                 transport_model_excel_path=transport_cfg.transport_model_path,
                 economy=transport_economy,
@@ -3251,8 +3847,9 @@ def run_configured_transport_workflow(
                 PREPARED_INPUT_DF=prepared_input_df,
                 LEAP_REGION_NAME_OVERRIDE=getattr(transport_cfg, "transport_leap_region_override", None),
             )
+            record["completed_stages"].append(STAGE_INPUT_CREATION)
 
-        if RUN_RECONCILIATION:
+        if run_reconciliation:
             run_transport_reconciliation(
                 apply_adjustments_to_future_years=APPLY_ADJUSTMENTS_TO_FUTURE_YEARS,
                 report_adjustment_changes=REPORT_ADJUSTMENT_CHANGES,
@@ -3273,23 +3870,491 @@ def run_configured_transport_workflow(
                 transport_mapping_workbook_path=getattr(transport_cfg, "transport_mapping_workbook_path", None),
                 transport_mapping_esto_path=getattr(transport_cfg, "transport_mapping_esto_path", None),
                 scale_factor_tolerance=1e-4,
+                share_current_accounts=SHARE_CURRENT_ACCOUNTS_ACROSS_SCENARIOS,
             )
+            record["completed_stages"].append(STAGE_RECONCILIATION)
     except Exception as exc:
         record["status"] = "failed"
         record["error"] = str(exc)
         print(f"[ERROR] {transport_economy} failed: {exc}")
 
+    record["batch_sales_used"] = [
+        transport_type
+        for transport_type in ("passenger", "freight")
+        if (transport_type, str(transport_economy), str(transport_scenario)) in _BATCH_SALES_USED
+    ]
+
     _dur = time.perf_counter() - _t0
     _h = int(_dur // 3600)
     _m = int((_dur % 3600) // 60)
     _s = _dur % 60
     record["duration_seconds"] = _dur
     record["duration_formatted"] = f"{_h}h {_m}m {_s:.1f}s"
+    record["cpu_seconds"] = round(time.process_time() - _cpu0, 3)
+    record["peak_rss_mb"] = peak_rss_mb()
+    record["stages"] = end_stage_telemetry(telemetry_token)
     print(f"[TIMING] {transport_economy} | {transport_scenario} | {run_type} — {_h}h {_m}m {_s:.1f}s")
 
     return record
 
 
+def resolve_parallel_economy_workers(workers: int | str | None, target_count: int) -> int:
+    """Return the number of worker processes to use for `target_count` runs."""
+    if workers is None or str(workers).strip() == "":
+        return 1
+    key = str(workers).strip().lower()
+    if key == "auto":
+        resolved = os.cpu_count() or 1
+    else:
+        try:
+            resolved = int(key)
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid PARALLEL_ECONOMY_WORKERS '{workers}'. Use a positive integer or 'auto'."
+            ) from exc
+        if resolved < 1:
+            raise ValueError(
+                f"Invalid PARALLEL_ECONOMY_WORKERS '{workers}'. Use a positive integer or 'auto'."
+            )
+    return max(1, min(resolved, target_count))
+
+
+def apply_runtime_settings(settings: Mapping[str, Any]) -> None:
+    """Set the module-level runtime settings; `settings` must give exactly `_RUNTIME_SETTING_NAMES`."""
+    missing = [name for name in _RUNTIME_SETTING_NAMES if name not in settings]
+    unknown = [name for name in settings if name not in _RUNTIME_SETTING_NAMES]
+    if missing or unknown:
+        raise ValueError(
+            f"Runtime settings do not match _RUNTIME_SETTING_NAMES (missing: {missing}, unknown: {unknown})."
+        )
+    globals().update(settings)
+
+
+def _snapshot_runtime_settings() -> dict[str, Any]:
+    module_globals = globals()
+    return {name: module_globals[name] for name in _RUNTIME_SETTING_NAMES if name in module_globals}
+
+
+def _run_configured_target_in_worker(
+    runtime_settings: dict[str, Any],
+    transport_economy: str,
+    transport_scenario: str,
+    run_type: str,
+    skip_stages: tuple[str, ...] = (),
+    prepared_input_path: str | None = None,
+    batch_sales_results: Mapping[tuple[str, str, str], tuple[str, dict]] | None = None,
+) -> dict:
+    """
+    Worker entry point: apply parent settings and run one economy/scenario target,
+    with the input data (read from its checkpoint) and batch sales results of
+    the parent's pre-pass, if any.
+    """
+    from functions.workflow_utilities import output_filter_context
+
+    globals().update(runtime_settings)
+    _BATCH_SALES_RESULTS.update(batch_sales_results or {})
+    with output_filter_context(RUN_OUTPUT_MODE):
+        _, _, transport_cfg = load_transport_run_config(transport_economy, transport_scenario)
+        return run_configured_transport_workflow(
+            transport_economy=transport_economy,
+            transport_scenario=transport_scenario,
+            transport_cfg=transport_cfg,
+            run_type=run_type,
+            prepared_input_df=pd.read_pickle(prepared_input_path) if prepared_input_path else None,
+            skip_stages=skip_stages,
+        )
+
+
+def run_transport_workflow_in_worker(runtime_settings: dict[str, Any]) -> list[dict]:
+    """Worker entry point: apply one scenario's settings and run `run_transport_workflow`."""
+    from functions.workflow_utilities import output_filter_context
+
+    globals().update(runtime_settings)
+    with output_filter_context(RUN_OUTPUT_MODE):
+        return run_transport_workflow()
+
+
+def open_run_manifest() -> RunManifest | None:
+    """Return the run manifest at RUN_MANIFEST_PATH, or None when the manifest is disabled."""
+    if not RUN_MANIFEST_PATH:
+        return None
+    return RunManifest(resolve_str(RUN_MANIFEST_PATH))
+
+
+def resolve_resumable_stages(
+    manifest: RunManifest,
+    transport_economy: str,
+    transport_scenario: str,
+    transport_cfg,
+) -> tuple[str, ...]:
+    """
+    Return the leading requested stages of one target that are up to date.
+
+    Stages run in order and each feeds the next, so once one stage is stale
+    every later stage runs again as well.
+    """
+    specs = build_target_stage_specs(transport_economy, transport_scenario, transport_cfg)
+    up_to_date: list[str] = []
+    for stage in requested_target_stages():
+        reason = manifest.stale_reason(transport_economy, transport_scenario, specs[stage])
+        if reason is not None:
+            print(f"[INFO] Resume: {transport_economy} | {transport_scenario} runs from {stage} ({reason}).")
+            break
+        up_to_date.append(stage)
+    return tuple(up_to_date)
+
+
+def build_resumed_record(
+    manifest: RunManifest,
+    *,
+    transport_economy: str,
+    transport_scenario: str,
+    transport_cfg,
+    run_type: str,
+    skip_stages: tuple[str, ...],
+) -> dict:
+    """Run record for a target whose requested stages were all up to date."""
+    record = {
+        "economy": transport_economy,
+        "scenario": transport_scenario,
+        "run_type": run_type,
+        "transport_export_path": transport_cfg.transport_export_path,
+        "passenger_sales_output": transport_cfg.passenger_sales_output,
+        "freight_sales_output": transport_cfg.freight_sales_output,
+        "status": "success",
+        "error": "",
+        "completed_stages": [],
+        "resumed_stages": list(skip_stages),
+        "duration_seconds": 0.0,
+        "duration_formatted": "up to date",
+        "cpu_seconds": 0.0,
+        "peak_rss_mb": None,
+        "stages": [],
+    }
+    input_entry = manifest.get(transport_economy, transport_scenario, STAGE_INPUT_CREATION) or {}
+    checkpoint = (input_entry.get("outputs") or {}).get("input_checkpoint")
+    if STAGE_INPUT_CREATION in skip_stages and checkpoint:
+        record["input_checkpoint_path"] = checkpoint
+    print(
+        f"[INFO] Resume: {transport_economy} | {transport_scenario} is up to date "
+        f"({', '.join(skip_stages)}); skipping."
+    )
+    return record
+
+
+def record_target_in_manifest(manifest: RunManifest, record: dict, transport_cfg) -> None:
+    """Record the stages one finished target ran (and whether they succeeded), then save."""
+    economy = record["economy"]
+    scenario = record["scenario"]
+    specs = build_target_stage_specs(economy, scenario, transport_cfg)
+    completed = set(record.get("completed_stages") or [])
+    resumed = set(record.get("resumed_stages") or [])
+    for stage in requested_target_stages():
+        if stage in resumed:
+            continue
+        if stage in completed:
+            manifest.record_stage(economy, scenario, specs[stage], status="success")
+        else:
+            manifest.record_stage(
+                economy,
+                scenario,
+                specs[stage],
+                status="failed",
+                error=str(record.get("error", "")),
+            )
+    manifest.save()
+
+
+def _prepare_target_input(transport_economy: str, transport_scenario: str, transport_cfg) -> pd.DataFrame:
+    """Run `prepare_input_data` for one configured target (this also writes its input checkpoint)."""
+    return prepare_input_data(
+        transport_cfg.transport_model_path,
+        transport_economy,
+        transport_scenario,
+        transport_cfg.transport_base_year,
+        transport_cfg.transport_final_year,
+        TRANSPORT_ESTO_BALANCES_PATH=transport_cfg.transport_esto_balances_path,
+        LOAD_CHECKPOINT=LOAD_INPUT_CHECKPOINT,
+        TRANSPORT_FUELS_DATA_FILE_PATH=transport_cfg.transport_fuels_path,
+    )
+
+
+def _prepare_target_input_in_worker(
+    runtime_settings: dict[str, Any],
+    transport_economy: str,
+    transport_scenario: str,
+) -> pd.DataFrame:
+    """Worker entry point: apply parent settings and prepare one target's input data."""
+    from functions.workflow_utilities import output_filter_context
+
+    globals().update(runtime_settings)
+    with output_filter_context(RUN_OUTPUT_MODE):
+        _, _, transport_cfg = load_transport_run_config(transport_economy, transport_scenario)
+        return _prepare_target_input(transport_economy, transport_scenario, transport_cfg)
+
+
+def run_batch_sales_prepass(
+    run_targets: list[tuple[str, str]],
+    target_cfgs: list[Any],
+    pending: list[tuple[int, tuple[str, ...]]],
+    *,
+    workers: int = 1,
+) -> dict[int, str]:
+    """
+    Batch sales engine pre-pass (BATCH_SALES_ENGINE): prepare the input data of
+    every pending target that runs input creation (across `workers` worker
+    processes), then estimate passenger and freight sales for all of them in
+    one `estimate_sales_for_economies` call per transport type.
+
+    The results go to `_BATCH_SALES_RESULTS` for the per-economy runs to reuse.
+    The prepared frames are only held for the batch estimates; the pre-pass
+    returns the input checkpoint path of each prepared target (by target
+    index), from which its run reloads the frame. A target whose preparation
+    or batch estimate fails is left to its own run, which reports the error
+    as usual.
+    """
+    _BATCH_SALES_RESULTS.clear()
+    _BATCH_SALES_USED.clear()
+    _BATCH_SALES_TABLES.clear()
+    targets = [idx for idx, skip_stages in pending if STAGE_INPUT_CREATION not in skip_stages]
+    if not (RUN_INPUT_CREATION and (RUN_PASSENGER_SALES or RUN_FREIGHT_SALES)) or len(targets) < 2:
+        return {}
+
+    print(f"[INFO] Batch sales engine: preparing inputs for {len(targets)} target(s).")
+    prepared: dict[int, pd.DataFrame] = {}
+    if workers <= 1:
+        for idx in targets:
+            try:
+                prepared[idx] = _prepare_target_input(*run_targets[idx], target_cfgs[idx])
+            except Exception as exc:
+                print(f"[WARN] Batch sales engine: could not prepare {run_targets[idx][0]}: {exc}")
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        runtime_settings = _snapshot_runtime_settings()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(targets)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(_prepare_target_input_in_worker, runtime_settings, *run_targets[idx]): idx
+                for idx in targets
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    prepared[idx] = future.result()
+                except Exception as exc:
+                    print(f"[WARN] Batch sales engine: could not prepare {run_targets[idx][0]}: {exc}")
+
+    sales_runs = []
+    # Inline plotting runs always recompute, so passenger sales are only
+    # batched when plotting is off or deferred.
+    if RUN_PASSENGER_SALES and (not PASSENGER_PLOT or DEFER_SALES_PLOTS):
+        sales_runs.append(("passenger", ("LPV", "MC", "Bus"), 0, "Passenger"))
+    if RUN_FREIGHT_SALES:
+        sales_runs.append(("freight", ("Trucks", "LCVs"), 1, "Freight"))
+    for transport_type, vehicle_keys, policy_index, label in sales_runs:
+        requests: dict[int, dict[str, Any]] = {}
+        fingerprints: dict[int, str] = {}
+        for idx, df in prepared.items():
+            transport_economy, transport_scenario = run_targets[idx]
+            transport_cfg = target_cfgs[idx]
+            try:
+                survival_curves, vintage_profiles = load_survival_and_vintage_profiles(
+                    survival_path=resolve_str(transport_cfg.survival_profile_path),
+                    vintage_path=resolve_str(transport_cfg.vintage_profile_path),
+                    vehicle_keys=vehicle_keys,
+                    economy=transport_economy,
+                )
+                estimate_kwargs = _normalise_sales_policy_settings(
+                    _resolve_target_sales_policy_settings(transport_cfg)[policy_index],
+                    context=f"{label} sales policy ({transport_economy} | {transport_scenario})",
+                )
+            except Exception as exc:
+                print(f"[WARN] Batch sales engine: skipping {transport_type} sales for {transport_economy}: {exc}")
+                continue
+            estimate_kwargs.update(
+                base_year=transport_cfg.transport_base_year,
+                final_year=transport_cfg.transport_final_year,
+            )
+            request = {
+                "df": df,
+                "survival_curves": survival_curves,
+                "vintage_profiles": vintage_profiles,
+                "economy": transport_economy,
+                "scenario": transport_scenario,
+                "esto_energy_path": resolve_str(transport_cfg.transport_esto_balances_path),
+            }
+            fingerprint = _sales_inputs_fingerprint(
+                transport_type,
+                **request,
+                estimate_kwargs=estimate_kwargs,
+            )
+            if fingerprint is None:
+                continue
+            requests[idx] = {**request, **estimate_kwargs}
+            fingerprints[idx] = fingerprint
+
+        errors: dict[int, Exception] = {}
+        results = estimate_sales_for_economies(transport_type, requests, errors=errors)
+        for idx, exc in errors.items():
+            print(f"[WARN] Batch sales engine: {transport_type} sales for {run_targets[idx][0]} left to its run: {exc}")
+        for idx, result in results.items():
+            key = (transport_type, *map(str, run_targets[idx]))
+            _BATCH_SALES_RESULTS[key] = (fingerprints[idx], result)
+            if result.get("sales_table") is not None:
+                _BATCH_SALES_TABLES[key] = result["sales_table"]
+        print(
+            f"[INFO] Batch sales engine: estimated {transport_type} sales for "
+            f"{len(results)}/{len(prepared)} target(s) in one pass."
+        )
+        del requests, results
+
+    # prepare_input_data wrote each prepared frame to its input checkpoint.
+    return {
+        idx: input_checkpoint_path(
+            *run_targets[idx],
+            target_cfgs[idx].transport_base_year,
+            target_cfgs[idx].transport_final_year,
+        )
+        for idx in prepared
+    }
+
+
+def run_configured_targets(
+    run_targets: list[tuple[str, str]],
+    *,
+    run_type: str,
+) -> list[dict]:
+    """
+    Run `run_configured_transport_workflow` for each (economy, scenario) target.
+
+    Targets run one after another unless PARALLEL_ECONOMY_WORKERS > 1, in which
+    case each target runs in its own worker process. Records are returned in
+    target order either way.
+
+    Each finished target is recorded in the run manifest straight away, so a
+    batch that stops part-way keeps its progress. With RESUME_BATCH_RUNS,
+    targets whose stages are up to date are not run again; they still get a
+    successful record pointing at their existing outputs.
+    """
+    run_targets = list(run_targets)
+    manifest = open_run_manifest()
+    if RESUME_BATCH_RUNS and manifest is None:
+        print("[WARN] RESUME_BATCH_RUNS needs RUN_MANIFEST_PATH; running every target.")
+
+    records: list[dict | None] = [None] * len(run_targets)
+    target_cfgs: list[Any] = []
+    pending: list[tuple[int, tuple[str, ...]]] = []
+    for idx, (transport_economy, transport_scenario) in enumerate(run_targets):
+        _, _, transport_cfg = load_transport_run_config(transport_economy, transport_scenario)
+        target_cfgs.append(transport_cfg)
+        skip_stages: tuple[str, ...] = ()
+        if RESUME_BATCH_RUNS and manifest is not None:
+            skip_stages = resolve_resumable_stages(manifest, transport_economy, transport_scenario, transport_cfg)
+        if skip_stages and len(skip_stages) == len(requested_target_stages()):
+            records[idx] = build_resumed_record(
+                manifest,
+                transport_economy=transport_economy,
+                transport_scenario=transport_scenario,
+                transport_cfg=transport_cfg,
+                run_type=run_type,
+                skip_stages=skip_stages,
+            )
+            continue
+        pending.append((idx, skip_stages))
+    if RESUME_BATCH_RUNS and manifest is not None:
+        print(
+            f"[INFO] Resume: {len(run_targets) - len(pending)}/{len(run_targets)} {run_type} "
+            "target(s) up to date."
+        )
+
+    workers = resolve_parallel_economy_workers(PARALLEL_ECONOMY_WORKERS, len(pending))
+    if workers > 1 and (CHECK_BRANCHES_IN_LEAP_USING_COM or SET_VARS_IN_LEAP_USING_COM):
+        print("[WARN] LEAP COM access is enabled; running economy targets sequentially.")
+        workers = 1
+
+    prepared_input_paths: dict[int, str] = {}
+    if BATCH_SALES_ENGINE:
+        prepared_input_paths = run_batch_sales_prepass(run_targets, target_cfgs, pending, workers=workers)
+
+    def finish(idx: int, record: dict) -> None:
+        if idx in prepared_input_paths:
+            record.setdefault("input_checkpoint_path", prepared_input_paths[idx])
+        records[idx] = record
+        if manifest is not None:
+            record_target_in_manifest(manifest, record, target_cfgs[idx])
+
+    if workers <= 1:
+        for idx, skip_stages in pending:
+            transport_economy, transport_scenario = run_targets[idx]
+            # Reload the pre-pass input here so only one target's frame is held at a time.
+            prepared = (
+                {"prepared_input_df": pd.read_pickle(prepared_input_paths[idx])}
+                if idx in prepared_input_paths
+                else {}
+            )
+            finish(
+                idx,
+                run_configured_transport_workflow(
+                    transport_economy=transport_economy,
+                    transport_scenario=transport_scenario,
+                    transport_cfg=target_cfgs[idx],
+                    run_type=run_type,
+                    skip_stages=skip_stages,
+                    **prepared,
+                ),
+            )
+            del prepared
+        return [record for record in records if record is not None]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    print(f"[INFO] Running {len(pending)} {run_type} target(s) across {workers} worker processes.")
+    runtime_settings = _snapshot_runtime_settings()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _run_configured_target_in_worker,
+                runtime_settings,
+                *run_targets[idx],
+                run_type,
+                skip_stages,
+                prepared_input_paths.get(idx),
+                {
+                    key: entry
+                    for key, entry in _BATCH_SALES_RESULTS.items()
+                    if key[1:] == tuple(map(str, run_targets[idx]))
+                },
+            ): idx
+            for idx, skip_stages in pending
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            transport_economy, transport_scenario = run_targets[idx]
+            try:
+                record = future.result()
+            except Exception as exc:
+                # Errors raised outside the run's own try block, or a worker that died
+                # (e.g. out of memory), are recorded like any other failed run.
+                print(f"[ERROR] {transport_economy} worker failed: {exc}")
+                record = {
+                    "economy": transport_economy,
+                    "scenario": transport_scenario,
+                    "run_type": run_type,
+                    "status": "failed",
+                    "error": str(exc),
+                }
+            finish(idx, record)
+    return [record for record in records if record is not None]
+
+
 def run_input_only_separate_prep_for_all_economies(
     *,
     scenario: str,
@@ -3306,15 +4371,10 @@ def run_input_only_separate_prep_for_all_economies(
     prepass_records: list[dict] = []
     try:
         RUN_RECONCILIATION = False
-        for transport_economy, transport_scenario in list_transport_run_configs(scenario):
-            _, _, transport_cfg = load_transport_run_config(transport_economy, transport_scenario)
-            record = run_configured_transport_workflow(
-                transport_economy=transport_economy,
-                transport_scenario=transport_scenario,
-                transport_cfg=transport_cfg,
-                run_type="separate_input_prep",
-            )
-            prepass_records.append(record)
+        prepass_records = run_configured_targets(
+            list_transport_run_configs(scenario),
+            run_type="separate_input_prep",
+        )
     finally:
         RUN_RECONCILIATION = prior_run_reconciliation
 
@@ -3387,25 +4447,27 @@ def run_transport_workflow() -> list[dict]:
             if is_all_mode
             else [(TRANSPORT_ECONOMY_SELECTION, TRANSPORT_SCENARIO_SELECTION)]
         )
-        for transport_economy, transport_scenario in run_targets:
-            _, _, transport_cfg = load_transport_run_config(transport_economy, transport_scenario)
-            record = run_configured_transport_workflow(
-                transport_economy=transport_economy,
-                transport_scenario=transport_scenario,
-                transport_cfg=transport_cfg,
-                run_type="separate",
-            )
-            run_records.append(record)
+        run_records.extend(run_configured_targets(run_targets, run_type="separate"))
 
+    # The synthetic 00_APEC run starts only after every separate target above
+    # has finished, so its per-economy inputs are in place.
     if run_apec:
         apec_cfg = build_apec_run_config(TRANSPORT_SCENARIO_SELECTION)
         apec_input_df = None
         if RUN_INPUT_CREATION:
+            prepared_input_paths = {}
+            if REUSE_PREPARED_INPUTS_FOR_APEC:
+                prepared_input_paths = {
+                    (record["economy"], record["scenario"]): record["input_checkpoint_path"]
+                    for record in run_records
+                    if record.get("status") == "success" and record.get("input_checkpoint_path")
+                }
             apec_input_df = prepare_apec_input_data(
                 scenario=TRANSPORT_SCENARIO_SELECTION,
                 base_year=APEC_BASE_YEAR,
                 final_year=APEC_FINAL_YEAR,
                 load_checkpoint=LOAD_INPUT_CHECKPOINT,
+                prepared_input_paths=prepared_input_paths,
             )
         apec_record = run_configured_transport_workflow(
             transport_economy="00_APEC",
@@ -3424,7 +4486,7 @@ def run_transport_workflow() -> list[dict]:
         archived_output = _archive_existing_output_file(summary_path, date_id=DATE_ID)
         if archived_output:
             print(f"[INFO] Archived previous all-run summary to {archived_output}")
-        pd.DataFrame(run_records).to_csv(summary_path, index=False)
+        write_csv_atomic(pd.DataFrame(run_records), summary_path, index=False)
         print(f"[INFO] Wrote run summary: {summary_path}")
 
         separate_records = [record for record in run_records if record.get("run_type") == "separate"]
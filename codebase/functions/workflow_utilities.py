@@ -17,6 +17,8 @@ import pandas as pd
 
 from configurations.transport_economy_config import COMBINED_EXPORT_DIR, ECONOMY_METADATA
 from functions import transport_workflow_pipeline as pipeline
+from functions.atomic_io import create_unique_directory, write_json_atomic
+from functions.leap_utilities_functions import read_export_sheets
 
 CONFIG_ARCHIVE_MANIFEST_FILENAME = "_config_file_size_manifest.json"
 
@@ -263,16 +265,6 @@ def resolve_sales_policy_settings_for_scenario(
     )
 
 
-def _build_unique_directory_path(path: Path) -> Path:
-    """Return a non-existing directory path by suffixing an increment if needed."""
-    candidate = path
-    counter = 1
-    while candidate.exists():
-        candidate = path.with_name(f"{path.name}_{counter:02d}")
-        counter += 1
-    return candidate
-
-
 def _iter_archivable_config_files(config_dir: Path, archive_dir: Path) -> Iterator[Path]:
     archive_dir = archive_dir.resolve()
     for path in sorted(config_dir.rglob("*")):
@@ -397,8 +389,7 @@ def archive_config_folder_if_size_changed(
         if stamp is not None and str(stamp).strip()
         else datetime.now().strftime("%Y%m%d_%H%M%S")
     )
-    snapshot_dir = _build_unique_directory_path(resolved_archive_dir / f"config_{safe_stamp}")
-    snapshot_dir.mkdir(parents=True)
+    snapshot_dir = create_unique_directory(resolved_archive_dir / f"config_{safe_stamp}")
 
     for path in _iter_archivable_config_files(resolved_config_dir, resolved_archive_dir):
         relative_path = path.relative_to(resolved_config_dir)
@@ -413,12 +404,8 @@ def archive_config_folder_if_size_changed(
         "changes": changes,
         "files": current_snapshot,
     }
-    with (snapshot_dir / CONFIG_ARCHIVE_MANIFEST_FILENAME).open("w", encoding="utf-8") as handle:
-        json.dump(snapshot_payload, handle, indent=2, sort_keys=True)
-        handle.write("\n")
-    with manifest_path.open("w", encoding="utf-8") as handle:
-        json.dump(snapshot_payload, handle, indent=2, sort_keys=True)
-        handle.write("\n")
+    write_json_atomic(snapshot_dir / CONFIG_ARCHIVE_MANIFEST_FILENAME, snapshot_payload, indent=2, sort_keys=True)
+    write_json_atomic(manifest_path, snapshot_payload, indent=2, sort_keys=True)
 
     return snapshot_dir
 
@@ -448,7 +435,12 @@ def raise_for_critical_failures(
     records: Sequence[dict],
     scenario: str,
     critical_failure_patterns: Sequence[str],
+    manifest_path: str | None = None,
 ) -> None:
+    """
+    Raise when any record is a critical failure. With `manifest_path` the
+    message also says how to rerun only the failed (and not yet run) targets.
+    """
     critical_records = [
         record
         for record in records
@@ -465,10 +457,17 @@ def raise_for_critical_failures(
         details.append(f"- {economy} ({run_type}): {error}")
 
     details_block = "\n".join(details)
+    resume_hint = ""
+    if manifest_path:
+        resume_hint = (
+            f"\nFinished targets are recorded in {manifest_path}; set RESUME_BATCH_RUNS = True "
+            "to restart at the first failed target."
+        )
     raise RuntimeError(
         "Critical transport workflow failure detected; aborting run so partial combined exports are not produced.\n"
         f"Scenario: {scenario}\n"
         f"Failures:\n{details_block}"
+        f"{resume_hint}"
     )
 
 
@@ -624,8 +623,8 @@ def save_combined_scenario_workbook(
     leap_frames: list[pd.DataFrame] = []
     viewing_frames: list[pd.DataFrame] = []
     for workbook_path in successful_paths:
-        leap_df = pd.read_excel(workbook_path, sheet_name="LEAP", header=2)
-        viewing_df = pd.read_excel(workbook_path, sheet_name="FOR_VIEWING", header=2)
+        # Prefers the Parquet sidecars written by save_export_files.
+        leap_df, viewing_df = read_export_sheets(workbook_path)
         leap_frames.append(drop_empty_unnamed_columns(leap_df))
         viewing_frames.append(drop_empty_unnamed_columns(viewing_df))
 
@@ -9,8 +9,11 @@ methods.
 
 from __future__ import annotations
 
+import inspect
+import itertools
 from pathlib import Path
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
@@ -32,7 +35,9 @@ DEFAULT_ESTO_ENERGY_PATH = (
 ).resolve()
 
 from functions.sales_curve_estimate import (
+    _collect_sales_inputs,
     _validate_and_align_age_profiles,
+    build_target_stocks_for_economies,
     build_freight_sales_for_economy as _legacy_build_freight_sales_for_economy,
     build_passenger_sales_for_economy as _legacy_build_passenger_sales_for_economy,
     compute_sales_from_stock_targets as _legacy_compute_sales_from_stock_targets,
@@ -41,6 +46,7 @@ from functions.sales_curve_estimate import (
     DEFAULT_PASSENGER_VEHICLE_TYPE_MAP,
     load_survival_and_vintage_profiles,
     estimate_freight_sales_from_dataframe as _legacy_estimate_freight_sales_from_dataframe,
+    extract_energy_use_for_economies,
     estimate_freight_sales_from_files as _legacy_estimate_freight_sales_from_files,
     estimate_passenger_sales_from_dataframe as _legacy_estimate_passenger_sales_from_dataframe,
     estimate_passenger_sales_from_files as _legacy_estimate_passenger_sales_from_files,
@@ -55,11 +61,16 @@ __all__ = [
     "derive_vehicle_turnover_policies_from_checkpoint",
     "derive_initial_fleet_age_shift_vintage_profiles",
     "run_passenger_policy_from_checkpoint",
+    "CompiledTurnoverPolicy",
+    "compile_turnover_policy",
     "compute_sales_from_stock_targets",
     "build_passenger_sales_for_economy",
     "build_freight_sales_for_economy",
+    "build_turnover_policy_grid",
+    "run_turnover_policy_sweep",
     "estimate_passenger_sales_from_dataframe",
     "estimate_freight_sales_from_dataframe",
+    "estimate_sales_for_economies",
     "estimate_passenger_sales_from_files",
     "estimate_freight_sales_from_files",
 ]
@@ -220,6 +231,129 @@ def _coerce_age_profile(
     return profile.reindex(ages).fillna(float(default)).astype(float)
 
 
+_TURNOVER_POLICY_KEYS = (
+    "additional_retirement_rate",
+    "age_multipliers",
+    "survival_multiplier",
+    "survival_multipliers_by_age",
+)
+# Compiled policies are shared between vehicles, economies and scenarios that
+# use the same policy on the same year/age grid.
+_COMPILED_TURNOVER_POLICIES: dict[tuple, "CompiledTurnoverPolicy"] = {}
+_COMPILED_TURNOVER_POLICY_CACHE_SIZE = 512
+
+
+def _read_only_array(values: pd.Series | np.ndarray) -> np.ndarray:
+    array = np.array(values, dtype=float)
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledTurnoverPolicy:
+    """
+    A `turnover_policy` resolved onto one (years x ages) grid.
+
+    Schedules are resolved with `_coerce_year_schedule`/`_coerce_age_profile`
+    and clipped exactly as the cohort kernel expects, so the kernel reads
+    plain arrays instead of pandas lookups. Arrays are read-only because
+    compiled policies are cached and shared.
+    """
+
+    years: pd.Index
+    ages: pd.Index
+    survival_year_multiplier: np.ndarray
+    survival_age_multiplier: np.ndarray
+    extra_retirement_rate: np.ndarray
+    extra_retirement_matrix: np.ndarray
+
+    def survival_matrix(self, survival_curve: np.ndarray) -> np.ndarray:
+        """(years x ages) annual survival for one base survival curve."""
+        return np.clip(
+            np.asarray(survival_curve, dtype=float)[None, :]
+            * self.survival_year_multiplier[:, None]
+            * self.survival_age_multiplier[None, :],
+            0.0,
+            1.0,
+        )
+
+
+def _freeze_policy_value(value: Any) -> Any:
+    """Hashable form of one policy value (scalar, Series, mapping or sequence)."""
+    if value is None or np.isscalar(value):
+        return value
+    if isinstance(value, pd.Series):
+        return ("series", tuple(value.items()))
+    if isinstance(value, Mapping):
+        return ("mapping", tuple((key, _freeze_policy_value(item)) for key, item in value.items()))
+    return ("sequence", tuple(_freeze_policy_value(item) for item in value))
+
+
+def compile_turnover_policy(
+    turnover_policy: Mapping[str, Any] | None,
+    years: pd.Index,
+    ages: pd.Index,
+) -> CompiledTurnoverPolicy:
+    """
+    Compile `turnover_policy` into dense year/age arrays for the cohort kernel.
+
+    Results are cached per (policy values, years, ages); only the keys the
+    kernel reads take part in the cache key.
+    """
+    turnover_policy = turnover_policy or {}
+    years = pd.Index(years)
+    ages = pd.Index(ages, dtype=int)
+    try:
+        cache_key = (
+            tuple((key, _freeze_policy_value(turnover_policy.get(key))) for key in _TURNOVER_POLICY_KEYS),
+            tuple(years.tolist()),
+            tuple(ages.tolist()),
+        )
+        cached = _COMPILED_TURNOVER_POLICIES.get(cache_key)
+    except TypeError:
+        cache_key, cached = None, None
+    if cached is not None:
+        return cached
+
+    extra_ret_rate = _coerce_year_schedule(
+        turnover_policy.get("additional_retirement_rate"),
+        years,
+        default=0.0,
+    ).clip(lower=0.0, upper=1.0)
+    extra_ret_age_mult = _coerce_age_profile(
+        turnover_policy.get("age_multipliers"),
+        ages,
+        default=1.0,
+    ).clip(lower=0.0)
+    survival_year_mult = _coerce_year_schedule(
+        turnover_policy.get("survival_multiplier"),
+        years,
+        default=1.0,
+    ).clip(lower=0.0)
+    survival_age_mult = _coerce_age_profile(
+        turnover_policy.get("survival_multipliers_by_age"),
+        ages,
+        default=1.0,
+    ).clip(lower=0.0)
+
+    extra_rate_arr = extra_ret_rate.to_numpy(dtype=float)
+    compiled = CompiledTurnoverPolicy(
+        years=years,
+        ages=ages,
+        survival_year_multiplier=_read_only_array(survival_year_mult),
+        survival_age_multiplier=_read_only_array(survival_age_mult),
+        extra_retirement_rate=_read_only_array(extra_rate_arr),
+        extra_retirement_matrix=_read_only_array(
+            np.clip(extra_rate_arr[:, None] * extra_ret_age_mult.to_numpy(dtype=float)[None, :], 0.0, 1.0)
+        ),
+    )
+    if cache_key is not None:
+        if len(_COMPILED_TURNOVER_POLICIES) >= _COMPILED_TURNOVER_POLICY_CACHE_SIZE:
+            _COMPILED_TURNOVER_POLICIES.pop(next(iter(_COMPILED_TURNOVER_POLICIES)))
+        _COMPILED_TURNOVER_POLICIES[cache_key] = compiled
+    return compiled
+
+
 def _resolve_vehicle_level_scalar(
     values: float | Mapping[str, Any] | None,
     vehicle_key: str,
@@ -457,6 +591,43 @@ def _multiply_age_profile_values(
     return (base_profile * extra_profile).clip(lower=0.0).astype(float)
 
 
+def _column_equals(column: pd.Series, value: Any, *, lower: bool = False) -> np.ndarray:
+    """
+    Row mask for `column.astype(str) == str(value)` (optionally lower-cased),
+    comparing each distinct value once instead of every row.
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    labels = pd.Index(uniques).astype(str)
+    target = str(value)
+    if lower:
+        labels = labels.str.lower()
+        target = target.lower()
+    return np.asarray(labels == target, dtype=bool)[codes]
+
+
+def _normalised_label_codes(
+    column: pd.Series,
+    mapping: Mapping[str, str] | None = None,
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Codes of `column.astype(str).str.lower().str.strip()` (then `.map(mapping)`)
+    against the sorted distinct labels, normalising each distinct value once.
+    Missing or unmapped values get code -1.
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    labels = pd.Series(pd.Index(uniques).astype(str).str.lower().str.strip(), dtype=object)
+    if mapping is not None:
+        labels = labels.map(mapping)
+    label_codes, names = pd.factorize(labels, sort=True)
+    return label_codes[codes], [str(name) for name in names]
+
+
+def _present_label_codes(codes: np.ndarray, names: list[str]) -> tuple[np.ndarray, list[str]]:
+    """Drop labels that no code refers to and renumber the codes to match."""
+    present = np.bincount(codes, minlength=len(names)) > 0
+    return (np.cumsum(present) - 1)[codes], [name for name, used in zip(names, present) if used]
+
+
 def derive_vehicle_turnover_policies_from_drive_policy(
     df: pd.DataFrame,
     years: pd.Index,
@@ -498,173 +669,139 @@ def derive_vehicle_turnover_policies_from_drive_policy(
     if missing:
         raise KeyError(f"Missing required columns for drive policy derivation: {missing}")
 
-    df_use = df.copy()
-    if economy is not None and "Economy" in df_use.columns:
-        df_use = df_use[df_use["Economy"].astype(str) == str(economy)]
-    if scenario is not None and "Scenario" in df_use.columns:
-        df_use = df_use[df_use["Scenario"].astype(str) == str(scenario)]
-    if "Transport Type" in df_use.columns:
-        df_use = df_use[df_use["Transport Type"].astype(str).str.lower() == str(transport_type).lower()]
-    if "Medium" in df_use.columns:
-        df_use = df_use[df_use["Medium"].astype(str).str.lower() == str(medium).lower()]
-
-    if df_use.empty:
-        return {}, {
-            "effective_rates": pd.DataFrame(index=years),
-            "drive_rates": pd.DataFrame(index=years),
-            "contributions_long": pd.DataFrame(),
-            "all_drive_stock_shares_long": pd.DataFrame(),
-            "unused_policy_drives": sorted(_resolve_drive_policy_rates(drive_turnover_policy, years).keys()),
-        }
+    row_filters = [("Transport Type", transport_type, True), ("Medium", medium, True)]
+    if scenario is not None:
+        row_filters.insert(0, ("Scenario", scenario, False))
+    if economy is not None:
+        row_filters.insert(0, ("Economy", economy, False))
+    row_filters = [spec for spec in row_filters if spec[0] in df.columns]
+    df_use = df[[spec[0] for spec in row_filters] + ["Date", "Vehicle Type", "Drive", stocks_col]]
+    for column, value, lower in row_filters:
+        matches = _column_equals(df_use[column], value, lower=lower)
+        if not matches.all():
+            df_use = df_use[matches]
 
-    df_use["_year"] = pd.to_numeric(df_use["Date"], errors="coerce")
-    df_use = df_use[df_use["_year"].notna()].copy()
-    df_use["_year"] = df_use["_year"].astype(int)
-    df_use = df_use[df_use["_year"].isin(set(years))].copy()
-
-    df_use["_vehicle_bucket"] = (
-        df_use["Vehicle Type"].astype(str).str.lower().str.strip().map(vehicle_type_map_norm)
+    drive_rates = _resolve_drive_policy_rates(drive_turnover_policy, years)
+    drive_rates_df = (
+        pd.DataFrame({k: v.reindex(years).astype(float) for k, v in drive_rates.items()}, index=years)
+        if drive_rates
+        else pd.DataFrame(index=years)
     )
-    df_use["_drive_key"] = df_use["Drive"].astype(str).str.lower().str.strip()
-    df_use["_stocks"] = pd.to_numeric(df_use[stocks_col], errors="coerce").fillna(0.0).clip(lower=0.0)
-    df_use = df_use.dropna(subset=["_vehicle_bucket"])
 
-    if df_use.empty:
+    # Map every row to (year, vehicle bucket, drive) codes; rows outside the
+    # requested years or without a mapped vehicle bucket are dropped.
+    date_codes, dates = pd.factorize(df_use["Date"], use_na_sentinel=False)
+    date_years = np.trunc(pd.to_numeric(pd.Series(dates), errors="coerce").to_numpy(dtype=float))
+    year_codes = years.get_indexer(date_years)[date_codes]
+    bucket_codes, buckets = _normalised_label_codes(df_use["Vehicle Type"], vehicle_type_map_norm)
+    drive_codes, drives = _normalised_label_codes(df_use["Drive"])
+    keep = (year_codes >= 0) & (bucket_codes >= 0) & (drive_codes >= 0)
+
+    if not keep.any():
         return {}, {
             "effective_rates": pd.DataFrame(index=years),
             "drive_rates": pd.DataFrame(index=years),
             "contributions_long": pd.DataFrame(),
             "all_drive_stock_shares_long": pd.DataFrame(),
-            "unused_policy_drives": sorted(_resolve_drive_policy_rates(drive_turnover_policy, years).keys()),
+            "unused_policy_drives": sorted(drive_rates.keys()),
         }
 
-    grouped = (
-        df_use.groupby(["_year", "_vehicle_bucket", "_drive_key"], as_index=False)["_stocks"]
-        .sum()
+    year_codes = year_codes[keep]
+    bucket_codes, buckets = _present_label_codes(bucket_codes[keep], buckets)
+    drive_codes, drives = _present_label_codes(drive_codes[keep], drives)
+    row_stocks = pd.to_numeric(df_use[stocks_col], errors="coerce").to_numpy(dtype=float)[keep]
+    row_stocks = np.clip(np.where(np.isnan(row_stocks), 0.0, row_stocks), 0.0, None)
+
+    # Pivot once to a (year x vehicle bucket x drive) stock array.
+    n_years, n_buckets, n_drives = len(years), len(buckets), len(drives)
+    cell_codes = (year_codes * n_buckets + bucket_codes) * n_drives + drive_codes
+    cell_count = n_years * n_buckets * n_drives
+    stocks = np.bincount(cell_codes, weights=row_stocks, minlength=cell_count).reshape(
+        n_years, n_buckets, n_drives
     )
-    all_drive_stock_shares_long = grouped.rename(
-        columns={
-            "_year": "Date",
-            "_vehicle_bucket": "vehicle_bucket",
-            "_drive_key": "drive",
-            "_stocks": "drive_stock",
+    observed = np.bincount(cell_codes, minlength=cell_count).reshape(n_years, n_buckets, n_drives) > 0
+    bucket_totals = stocks.sum(axis=2)
+    shares = np.zeros_like(stocks)
+    np.divide(stocks, bucket_totals[:, :, None], out=shares, where=bucket_totals[:, :, None] != 0.0)
+
+    # Every (year, bucket, drive) combination present in the input, in year/bucket/drive order.
+    year_order = np.argsort(years.to_numpy(), kind="stable")
+    obs_year, obs_bucket, obs_drive = np.nonzero(observed[year_order])
+    obs_year = year_order[obs_year]
+    all_drive_stock_shares_long = pd.DataFrame(
+        {
+            "Date": years.to_numpy()[obs_year],
+            "vehicle_bucket": np.asarray(buckets, dtype=object)[obs_bucket],
+            "drive": np.asarray(drives, dtype=object)[obs_drive],
+            "drive_stock": stocks[obs_year, obs_bucket, obs_drive],
+            "vehicle_type_total_stock": bucket_totals[obs_year, obs_bucket],
+            "drive_stock_share": shares[obs_year, obs_bucket, obs_drive],
         }
-    ).copy()
-    if all_drive_stock_shares_long.empty:
-        all_drive_stock_shares_long = pd.DataFrame(
-            columns=[
-                "Date",
-                "vehicle_bucket",
-                "drive",
-                "drive_stock",
-                "vehicle_type_total_stock",
-                "drive_stock_share",
-            ]
-        )
-    else:
-        vehicle_totals = (
-            all_drive_stock_shares_long.groupby(["Date", "vehicle_bucket"], as_index=False)["drive_stock"]
-            .sum()
-            .rename(columns={"drive_stock": "vehicle_type_total_stock"})
-        )
-        all_drive_stock_shares_long = all_drive_stock_shares_long.merge(
-            vehicle_totals,
-            on=["Date", "vehicle_bucket"],
-            how="left",
-        )
-        denom = all_drive_stock_shares_long["vehicle_type_total_stock"].replace(0.0, np.nan)
-        all_drive_stock_shares_long["drive_stock_share"] = (
-            all_drive_stock_shares_long["drive_stock"] / denom
-        ).fillna(0.0)
-
-    buckets = sorted(grouped["_vehicle_bucket"].dropna().astype(str).unique().tolist())
-    full_index = pd.MultiIndex.from_product(
-        [years, buckets],
-        names=["Date", "vehicle_bucket"],
     )
-    stocks_panel = grouped.pivot_table(
-        index=["_year", "_vehicle_bucket"],
-        columns="_drive_key",
-        values="_stocks",
-        aggfunc="sum",
-        fill_value=0.0,
-    ).reindex(full_index, fill_value=0.0)
 
-    drive_rates = _resolve_drive_policy_rates(drive_turnover_policy, years)
-    drive_rates_df = (
-        pd.DataFrame({k: v.reindex(years).astype(float) for k, v in drive_rates.items()}, index=years)
-        if drive_rates
-        else pd.DataFrame(index=years)
+    # Effective bucket rate = sum over policy drives of drive stock share x
+    # drive rate: one contraction of the share array against the
+    # (policy drive x year) rate matrix. Policy drives missing from the input
+    # contribute zero.
+    policy_drives = list(drive_rates.keys())
+    drive_position = {drive: idx for idx, drive in enumerate(drives)}
+    policy_shares = np.zeros((len(policy_drives), n_years, n_buckets), dtype=float)
+    policy_stocks = np.zeros_like(policy_shares)
+    for idx, drive_key in enumerate(policy_drives):
+        if drive_key in drive_position:
+            policy_shares[idx] = shares[:, :, drive_position[drive_key]]
+            policy_stocks[idx] = stocks[:, :, drive_position[drive_key]]
+    rate_matrix = np.array(
+        [drive_rates[drive_key].reindex(years).to_numpy(dtype=float) for drive_key in policy_drives],
+        dtype=float,
+    ).reshape(len(policy_drives), n_years)
+    contributions = policy_shares * np.nan_to_num(rate_matrix, nan=0.0)[:, :, None]
+    effective = contributions.sum(axis=0)
+
+    effective_rates_df = pd.DataFrame(
+        np.clip(effective, 0.0, 1.0),
+        index=years,
+        columns=buckets,
+        dtype=float,
     )
 
-    effective_rates_df = pd.DataFrame(0.0, index=years, columns=buckets, dtype=float)
-    contribution_frames: list[pd.DataFrame] = []
-
-    for bucket in buckets:
-        bucket_panel = stocks_panel.xs(bucket, level="vehicle_bucket")
-        total_stock = bucket_panel.sum(axis=1).astype(float)
-        total_safe = total_stock.replace(0.0, np.nan)
-
-        effective = pd.Series(0.0, index=years, dtype=float)
-        for drive_key, rate_series in drive_rates.items():
-            drive_stock = (
-                bucket_panel[drive_key].astype(float)
-                if drive_key in bucket_panel.columns
-                else pd.Series(0.0, index=years, dtype=float)
-            )
-            stock_share = (drive_stock / total_safe).fillna(0.0)
-            contribution = (stock_share * rate_series.reindex(years).fillna(0.0)).astype(float)
-            effective = effective.add(contribution, fill_value=0.0)
-
-            contribution_frames.append(
-                pd.DataFrame(
-                    {
-                        "Date": years,
-                        "vehicle_bucket": bucket,
-                        "drive": drive_key,
-                        "drive_stock": drive_stock.to_numpy(dtype=float),
-                        "bucket_total_stock": total_stock.to_numpy(dtype=float),
-                        "drive_stock_share": stock_share.to_numpy(dtype=float),
-                        "drive_policy_rate": rate_series.reindex(years).to_numpy(dtype=float),
-                        "rate_contribution": contribution.to_numpy(dtype=float),
-                    }
-                )
-            )
-
-        effective_rates_df[bucket] = effective.clip(lower=0.0, upper=1.0)
-
     turnover_policies: dict[str, dict[str, pd.Series]] = {}
     for bucket in effective_rates_df.columns:
         rate = effective_rates_df[bucket].astype(float)
         if float(rate.max()) > 0.0:
             turnover_policies[str(bucket)] = {"additional_retirement_rate": rate}
 
-    contributions_long = (
-        pd.concat(contribution_frames, ignore_index=True)
-        if contribution_frames
-        else pd.DataFrame(
-            columns=[
-                "Date",
-                "vehicle_bucket",
-                "drive",
-                "drive_stock",
-                "bucket_total_stock",
-                "drive_stock_share",
-                "drive_policy_rate",
-                "rate_contribution",
-            ]
-        )
+    contributions_long = pd.DataFrame(
+        columns=[
+            "Date",
+            "vehicle_bucket",
+            "drive",
+            "drive_stock",
+            "bucket_total_stock",
+            "drive_stock_share",
+            "drive_policy_rate",
+            "rate_contribution",
+        ]
     )
-    if not contributions_long.empty:
-        bucket_rates = (
-            contributions_long.groupby(["Date", "vehicle_bucket"], as_index=False)["rate_contribution"]
-            .sum()
-            .rename(columns={"rate_contribution": "effective_bucket_rate"})
-        )
-        contributions_long = contributions_long.merge(
-            bucket_rates,
-            on=["Date", "vehicle_bucket"],
-            how="left",
+    if policy_drives:
+        # Rows in bucket/drive/year order; every array is laid out (bucket, drive, year).
+        n_policy = len(policy_drives)
+        contributions_long = pd.DataFrame(
+            {
+                "Date": np.tile(years.to_numpy(), n_buckets * n_policy),
+                "vehicle_bucket": np.repeat(np.asarray(buckets, dtype=object), n_policy * n_years),
+                "drive": np.tile(np.repeat(np.asarray(policy_drives, dtype=object), n_years), n_buckets),
+                "drive_stock": policy_stocks.transpose(2, 0, 1).ravel(),
+                "bucket_total_stock": np.broadcast_to(
+                    bucket_totals.T[:, None, :], (n_buckets, n_policy, n_years)
+                ).ravel(),
+                "drive_stock_share": policy_shares.transpose(2, 0, 1).ravel(),
+                "drive_policy_rate": np.broadcast_to(rate_matrix, (n_buckets, n_policy, n_years)).ravel(),
+                "rate_contribution": contributions.transpose(2, 0, 1).ravel(),
+                "effective_bucket_rate": np.broadcast_to(
+                    effective.T[:, None, :], (n_buckets, n_policy, n_years)
+                ).ravel(),
+            }
         )
 
     diagnostics = {
@@ -672,7 +809,7 @@ def derive_vehicle_turnover_policies_from_drive_policy(
         "drive_rates": drive_rates_df,
         "contributions_long": contributions_long,
         "all_drive_stock_shares_long": all_drive_stock_shares_long,
-        "unused_policy_drives": sorted(set(drive_rates.keys()) - set(stocks_panel.columns.astype(str))),
+        "unused_policy_drives": sorted(set(drive_rates.keys()) - set(drives)),
     }
     return turnover_policies, diagnostics
 
@@ -880,6 +1017,7 @@ def run_passenger_policy_from_checkpoint(
         vintage_path=vintage_path,
         vehicle_keys=("LPV", "MC", "Bus"),
         survival_is_cumulative=survival_is_cumulative,
+        economy=economy,
     )
 
     result = estimate_passenger_sales_from_dataframe(
@@ -925,13 +1063,15 @@ def compute_sales_from_stock_targets(
     survival_curve: pd.Series,
     vintage_profile: pd.Series,
     *,
-    turnover_policy: Mapping[str, Any] | None = None,
+    turnover_policy: Mapping[str, Any] | CompiledTurnoverPolicy | None = None,
     return_retirements: bool = False,
 ) -> tuple:
     """
     Policy-aware version of stock-target -> sales turnover.
 
     Legacy behavior is preserved when `turnover_policy` is None or empty.
+    Mappings are compiled (and cached) with `compile_turnover_policy`; a
+    `CompiledTurnoverPolicy` built for the same years/ages is used directly.
 
     Supported policy keys
     ---------------------
@@ -960,69 +1100,45 @@ def compute_sales_from_stock_targets(
     years = pd.Index(target_stock.index)
 
     cohorts = initialise_cohorts(target_stock, vintage_profile)
-    sales = pd.Series(0.0, index=years, dtype=float)
-    retirements = pd.Series(0.0, index=years, dtype=float) if return_retirements else None
-
     ages = pd.Index(vintage_profile.index, dtype=int)
-    base_survival = survival_curve.to_numpy(dtype=float)
 
-    extra_ret_rate = _coerce_year_schedule(
-        turnover_policy.get("additional_retirement_rate"),
-        years,
-        default=0.0,
-    ).clip(lower=0.0, upper=1.0)
-    extra_ret_age_mult = _coerce_age_profile(
-        turnover_policy.get("age_multipliers"),
-        ages,
-        default=1.0,
-    ).clip(lower=0.0)
-    survival_year_mult = _coerce_year_schedule(
-        turnover_policy.get("survival_multiplier"),
-        years,
-        default=1.0,
-    ).clip(lower=0.0)
-    survival_age_mult = _coerce_age_profile(
-        turnover_policy.get("survival_multipliers_by_age"),
-        ages,
-        default=1.0,
-    ).clip(lower=0.0)
+    if isinstance(turnover_policy, CompiledTurnoverPolicy):
+        compiled = turnover_policy
+        if not (compiled.years.equals(years) and compiled.ages.equals(ages)):
+            raise ValueError("Compiled turnover policy was built for a different year/age grid.")
+    else:
+        compiled = compile_turnover_policy(turnover_policy, years, ages)
 
-    extra_ret_age_mult_arr = extra_ret_age_mult.to_numpy(dtype=float)
-    survival_age_mult_arr = survival_age_mult.to_numpy(dtype=float)
+    # Same array layout as the legacy kernel: cohorts are a preallocated
+    # (years x ages) array, aged with a shifted multiply, wrapped at the end.
+    cohort_values = cohorts.to_numpy(dtype=float, copy=True)
+    target_values = target_stock.to_numpy(dtype=float)
+    sales_values = np.zeros(len(years), dtype=float)
+    retirement_values = np.zeros(len(years), dtype=float)
 
-    for i in range(1, len(years)):
-        year_prev = years[i - 1]
-        year = years[i]
+    ageing_survival = compiled.survival_matrix(survival_curve.to_numpy(dtype=float))[:, : max_age - 1]
+    extra_rate_arr = compiled.extra_retirement_rate
+    extra_rate_matrix = compiled.extra_retirement_matrix
 
-        prev_cohorts = cohorts.loc[year_prev].to_numpy(dtype=float)
-        new_cohorts = np.zeros_like(prev_cohorts, dtype=float)
+    for i in range(1, len(years)):
+        prev_cohorts = cohort_values[i - 1]
+        new_cohorts = cohort_values[i]
 
         # 1) Natural survival + aging (optionally adjusted by policy multipliers)
-        year_survival_multiplier = float(survival_year_mult.loc[year])
-        for age in range(1, max_age):
-            base_prob = float(base_survival[age - 1])
-            age_survival_multiplier = float(survival_age_mult_arr[age - 1])
-            survive_prob = np.clip(
-                base_prob * year_survival_multiplier * age_survival_multiplier,
-                0.0,
-                1.0,
-            )
-            new_cohorts[age] = prev_cohorts[age - 1] * survive_prob
+        np.multiply(prev_cohorts[:-1], ageing_survival[i], out=new_cohorts[1:])
 
         natural_survivors = float(new_cohorts.sum())
         natural_retirements = max(0.0, float(prev_cohorts.sum()) - natural_survivors)
 
         # 2) Extra policy retirements (e.g., scrappage) from surviving cohorts
         extra_retirements = 0.0
-        extra_rate_year = float(extra_ret_rate.loc[year])
-        if extra_rate_year > 0.0:
-            extra_rate_by_age = np.clip(extra_rate_year * extra_ret_age_mult_arr, 0.0, 1.0)
-            retired_by_policy = new_cohorts * extra_rate_by_age
-            new_cohorts = np.clip(new_cohorts - retired_by_policy, 0.0, None)
+        if extra_rate_arr[i] > 0.0:
+            retired_by_policy = new_cohorts * extra_rate_matrix[i]
+            np.clip(new_cohorts - retired_by_policy, 0.0, None, out=new_cohorts)
             extra_retirements = float(retired_by_policy.sum())
 
         survivors_total = float(new_cohorts.sum())
-        target_total = float(target_stock.loc[year])
+        target_total = float(target_values[i])
 
         # 3) Close stock balance with sales (or downscale if survivors exceed target)
         if survivors_total <= target_total:
@@ -1033,13 +1149,13 @@ def compute_sales_from_stock_targets(
             new_cohorts *= scale
             required_sales = 0.0
 
-        if retirements is not None:
-            retirements.loc[year] = natural_retirements + extra_retirements
-
-        cohorts.loc[year, :] = new_cohorts
-        sales.loc[year] = required_sales
+        retirement_values[i] = natural_retirements + extra_retirements
+        sales_values[i] = required_sales
 
+    sales = pd.Series(sales_values, index=years, dtype=float)
+    cohorts = pd.DataFrame(cohort_values, index=cohorts.index, columns=cohorts.columns)
     if return_retirements:
+        retirements = pd.Series(retirement_values, index=years, dtype=float)
         return sales, cohorts, retirements
     return sales, cohorts
 
@@ -1074,6 +1190,25 @@ def _update_result_with_policy_sales(
         sales_by_type[vehicle_key] = sales_v
         retirements_by_type[vehicle_key] = retirements_v
 
+    return _store_policy_sales(
+        result,
+        sales_by_type,
+        retirements_by_type,
+        turnover_policies=turnover_policies,
+        transport_type=transport_type,
+    )
+
+
+def _store_policy_sales(
+    result: dict,
+    sales_by_type: dict[str, pd.Series],
+    retirements_by_type: dict[str, pd.Series],
+    *,
+    turnover_policies: Mapping[str, Mapping[str, Any]],
+    transport_type: str,
+) -> dict:
+    """Write policy sales/retirements, totals, shares and tables into a result dict."""
+    target_stocks = result["target_stocks"]
     vehicle_keys = list(target_stocks.keys())
     total_sales = sum(sales_by_type[k] for k in vehicle_keys)
     total_retirements = sum(retirements_by_type[k] for k in vehicle_keys)
@@ -1256,34 +1391,322 @@ def build_freight_sales_for_economy(
     return result
 
 
-def estimate_passenger_sales_from_dataframe(
-    *args,
-    turnover_policies: Mapping[str, Mapping[str, Any]] | None = None,
-    drive_turnover_policy: Mapping[str, Any] | None = None,
+_TURNOVER_SWEEP_COLUMNS = ["variant", "vehicle_type", "Date", "sales", "retirements", "stock"]
+
+
+def build_turnover_policy_grid(
+    parameters: Mapping[str, Sequence[Any]],
+    vehicle_types: Sequence[str],
+    *,
+    base_turnover_policies: Mapping[str, Mapping[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Expand a parameter grid into named sweep variants.
+
+    `parameters` maps a turnover-policy key (for example
+    `"survival_multiplier": [1.0, 1.2, 1.4]`) to the values to try. Every
+    combination becomes one variant whose `turnover_policies` block applies
+    those values to each of `vehicle_types` on top of `base_turnover_policies`.
+    `analysis_initial_fleet_age_shift_years` may also be swept; it is set on
+    the variant block instead of the vehicle policies.
+    """
+    keys = list(parameters)
+    base = {str(k): dict(v) for k, v in (base_turnover_policies or {}).items()}
+    variants: dict[str, dict[str, Any]] = {}
+    for values in itertools.product(*(parameters[key] for key in keys)):
+        name = "|".join(f"{key}={value}" for key, value in zip(keys, values)) or "base"
+        block: dict[str, Any] = {"turnover_policies": {}}
+        for vehicle in vehicle_types:
+            block["turnover_policies"][str(vehicle)] = dict(base.get(str(vehicle), {}))
+        for key, value in zip(keys, values):
+            if key == "analysis_initial_fleet_age_shift_years":
+                block[key] = value
+                continue
+            for vehicle_policy in block["turnover_policies"].values():
+                vehicle_policy[key] = value
+        variants[name] = block
+    return variants
+
+
+def _resolve_sweep_variant(
+    block: Mapping[str, Any],
+    years: pd.Index,
+    vintage_profiles: Mapping[str, pd.Series],
+    *,
+    transport_type: str,
+    drive_policy_dataframe: pd.DataFrame | None,
+    drive_policy_stocks_col: str,
+    drive_policy_vehicle_type_map: Mapping[str, str] | None,
+    economy: str | None,
+    scenario: str | None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, pd.Series]]:
+    """Turn one policy settings block into (vehicle policies, vintage profiles)."""
+    years_int = pd.Index(years, dtype=int)
+    derived_policies: dict[str, dict[str, pd.Series]] = {}
+    drive_turnover_policy = block.get("drive_turnover_policy")
+    if drive_turnover_policy:
+        if drive_policy_dataframe is None:
+            raise ValueError("A sweep variant sets drive_turnover_policy, but no drive_policy_dataframe was given.")
+        derived_policies, _ = derive_vehicle_turnover_policies_from_drive_policy(
+            df=drive_policy_dataframe,
+            years=years_int,
+            drive_turnover_policy=drive_turnover_policy,
+            vehicle_type_map=block.get("drive_policy_vehicle_type_map") or drive_policy_vehicle_type_map,
+            transport_type=transport_type,
+            medium="road",
+            economy=economy,
+            scenario=scenario,
+            stocks_col=block.get("drive_policy_stocks_col") or drive_policy_stocks_col,
+        )
+    policies = _merge_turnover_policies(block.get("turnover_policies"), derived_policies, years_int)
+
+    shifted, _ = derive_initial_fleet_age_shift_vintage_profiles(
+        vintage_profiles,
+        block.get("analysis_initial_fleet_age_shift_years"),
+    )
+    return policies, {**vintage_profiles, **shifted}
+
+
+def _simulate_cohort_turnover(
+    state: np.ndarray,
+    targets: np.ndarray,
+    survival: np.ndarray,
+    extra_rate: np.ndarray,
+    extra_matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Policy-aware cohort turnover for a stack of fleets advanced together.
+
+    `state` is the (... x age) base-year cohort stock, `targets` the
+    (... x year) target stocks (broadcast against the leading axes), and the
+    per-year arrays carry a leading year axis: `survival` (year x ... x age-1),
+    `extra_rate` (year x ...) and `extra_matrix` (year x ... x age). Each fleet
+    gets the same values as `compute_sales_from_stock_targets`. Returns
+    (sales, retirements, stock), each (... x year).
+    """
+    n_years = targets.shape[-1]
+    shape = state.shape[:-1] + (n_years,)
+    sales_values = np.zeros(shape, dtype=float)
+    retirement_values = np.zeros(shape, dtype=float)
+    stock_values = np.zeros(shape, dtype=float)
+    stock_values[..., 0] = state.sum(axis=-1)
+
+    for i in range(1, n_years):
+        prev_state = state
+        state = np.zeros_like(prev_state)
+        np.multiply(prev_state[..., :-1], survival[i], out=state[..., 1:])
+
+        natural_survivors = state.sum(axis=-1)
+        natural_retirements = prev_state.sum(axis=-1) - natural_survivors
+        natural_retirements = np.where(natural_retirements > 0.0, natural_retirements, 0.0)
+
+        applies = (extra_rate[i] > 0.0)[..., None]
+        retired_by_policy = np.where(applies, state * extra_matrix[i], 0.0)
+        state = np.where(applies, np.clip(state - retired_by_policy, 0.0, None), state)
+        extra_retirements = retired_by_policy.sum(axis=-1)
+
+        survivors_total = state.sum(axis=-1)
+        target_total = targets[..., i]
+        grows = survivors_total <= target_total
+        sales = np.where(grows, target_total - survivors_total, 0.0)
+        state[..., 0] = np.where(grows, sales, state[..., 0])
+        scale = np.divide(
+            target_total,
+            survivors_total,
+            out=np.zeros_like(survivors_total),
+            where=survivors_total > 0,
+        )
+        state = np.where(grows[..., None], state, state * scale[..., None])
+
+        sales_values[..., i] = sales
+        retirement_values[..., i] = natural_retirements + extra_retirements
+        stock_values[..., i] = state.sum(axis=-1)
+
+    return sales_values, retirement_values, stock_values
+
+
+def _run_turnover_policy_sweep_chunk(
+    target_stocks: pd.DataFrame,
+    survival_curves: Mapping[str, pd.Series],
+    vintage_profiles: Mapping[str, pd.Series],
+    variants: Mapping[str, Mapping[str, Any]],
+    resolve_kwargs: Mapping[str, Any],
+) -> pd.DataFrame:
+    """Simulate every variant x vehicle of one chunk in a single tensor loop."""
+    vehicles = [str(v) for v in target_stocks.index]
+    years = pd.Index(target_stocks.columns)
+    variant_names = list(variants)
+    target_values = target_stocks.to_numpy(dtype=float)
+    shape = (len(variant_names), len(vehicles), len(years))
+    sales_values = np.zeros(shape, dtype=float)
+    retirement_values = np.zeros(shape, dtype=float)
+    stock_values = np.zeros(shape, dtype=float)
+
+    resolved = [
+        _resolve_sweep_variant(variants[name], years, vintage_profiles, **resolve_kwargs)
+        for name in variant_names
+    ]
+
+    rows_by_age_count: dict[int, list[int]] = {}
+    survival_by_vehicle: dict[int, pd.Series] = {}
+    for row, vehicle in enumerate(vehicles):
+        surv, _ = _validate_and_align_age_profiles(survival_curves[vehicle], vintage_profiles[vehicle])
+        survival_by_vehicle[row] = surv
+        rows_by_age_count.setdefault(len(surv), []).append(row)
+
+    for max_age, rows in rows_by_age_count.items():
+        # Tensors are (policy x vehicle x age); per-year policy arrays get a leading year axis.
+        n_years = len(years)
+        state = np.zeros((len(variant_names), len(rows), max_age), dtype=float)
+        survival = np.zeros((n_years, len(variant_names), len(rows), max_age - 1), dtype=float)
+        extra_rate = np.zeros((n_years, len(variant_names), len(rows)), dtype=float)
+        extra_matrix = np.zeros((n_years, len(variant_names), len(rows), max_age), dtype=float)
+        targets = target_values[rows]
+
+        for p, (policies, variant_vintages) in enumerate(resolved):
+            for k, row in enumerate(rows):
+                vehicle = vehicles[row]
+                surv, vint = _validate_and_align_age_profiles(
+                    survival_by_vehicle[row],
+                    variant_vintages[vehicle],
+                )
+                total_vintage = float(vint.sum())
+                if total_vintage <= 0:
+                    raise ValueError("vintage_profile must sum to a positive value.")
+                state[p, k] = targets[k, 0] * (vint / total_vintage).to_numpy()
+
+                compiled = compile_turnover_policy(policies.get(vehicle), years, vint.index)
+                survival[:, p, k] = compiled.survival_matrix(surv.to_numpy(dtype=float))[:, : max_age - 1]
+                extra_rate[:, p, k] = compiled.extra_retirement_rate
+                extra_matrix[:, p, k] = compiled.extra_retirement_matrix
+
+        group_sales, group_retirements, group_stock = _simulate_cohort_turnover(
+            state,
+            targets[None],
+            survival,
+            extra_rate,
+            extra_matrix,
+        )
+
+        sales_values[:, rows] = group_sales
+        retirement_values[:, rows] = group_retirements
+        stock_values[:, rows] = group_stock
+
+    index = pd.MultiIndex.from_product(
+        [variant_names, vehicles, years],
+        names=["variant", "vehicle_type", "Date"],
+    )
+    return pd.DataFrame(
+        {
+            "sales": sales_values.ravel(),
+            "retirements": retirement_values.ravel(),
+            "stock": stock_values.ravel(),
+        },
+        index=index,
+    ).reset_index()[_TURNOVER_SWEEP_COLUMNS]
+
+
+def run_turnover_policy_sweep(
+    result: Mapping[str, Any],
+    variants: Mapping[str, Mapping[str, Any]],
+    *,
+    transport_type: str = "passenger",
     drive_policy_dataframe: pd.DataFrame | None = None,
     drive_policy_stocks_col: str = "Stocks",
     drive_policy_vehicle_type_map: Mapping[str, str] | None = None,
-    analysis_initial_fleet_age_shift_years: float | Mapping[str, Any] | None = None,
-    plot: bool = True,
-    **kwargs,
-) -> dict:
+    economy: str | None = None,
+    scenario: str | None = None,
+    max_workers: int = 1,
+) -> pd.DataFrame:
     """
-    Policy-aware wrapper for `estimate_passenger_sales_from_dataframe`.
-
-    Accepts all legacy arguments and adds `turnover_policies`.
+    Evaluate many turnover-policy variants against one economy's target stocks.
+
+    `result` is a passenger or freight sales result (it must carry
+    `target_stocks`, `survival_curves` and `vintage_profiles`; build it without
+    `analysis_initial_fleet_age_shift_years` so variants shift from the base
+    vintage). `variants` maps a variant name to a policy block in the
+    `SCENARIO_SALES_POLICY_SETTINGS` mode-block schema: `turnover_policies`,
+    `drive_turnover_policy` (derived with
+    `derive_vehicle_turnover_policies_from_drive_policy`, so
+    `drive_policy_dataframe` is required) and
+    `analysis_initial_fleet_age_shift_years`. `build_turnover_policy_grid`
+    builds variants from a parameter grid.
+
+    All variants are simulated together in (policy x vehicle x age) arrays;
+    with `max_workers > 1` the variants are split across worker processes.
+    Returns a tidy frame with one row per variant, vehicle type and year.
     """
-    kwargs = dict(kwargs)
-    kwargs["plot"] = False
+    target_stocks = result.get("target_stocks")
+    survival_curves = result.get("survival_curves")
+    vintage_profiles = result.get("vintage_profiles")
+    if not isinstance(target_stocks, Mapping) or not isinstance(survival_curves, Mapping) or not isinstance(vintage_profiles, Mapping):
+        raise ValueError("Result is missing target_stocks/survival_curves/vintage_profiles required for a policy sweep.")
+    if not variants:
+        return pd.DataFrame(columns=_TURNOVER_SWEEP_COLUMNS)
+
+    target_matrix = pd.DataFrame({str(k): pd.Series(v, dtype=float) for k, v in target_stocks.items()}).T
+    survival_curves = {str(k): pd.Series(v, dtype=float) for k, v in survival_curves.items()}
+    vintage_profiles = {str(k): pd.Series(v, dtype=float) for k, v in vintage_profiles.items()}
+    resolve_kwargs = {
+        "transport_type": transport_type,
+        "drive_policy_dataframe": drive_policy_dataframe,
+        "drive_policy_stocks_col": drive_policy_stocks_col,
+        "drive_policy_vehicle_type_map": drive_policy_vehicle_type_map,
+        "economy": economy,
+        "scenario": scenario,
+    }
 
-    df_for_drive_policy = drive_policy_dataframe
-    if df_for_drive_policy is None:
-        if "df" in kwargs and isinstance(kwargs["df"], pd.DataFrame):
-            df_for_drive_policy = kwargs["df"]
-        elif args and isinstance(args[0], pd.DataFrame):
-            df_for_drive_policy = args[0]
+    names = list(variants)
+    workers = max(1, min(int(max_workers), len(names)))
+    if workers <= 1:
+        return _run_turnover_policy_sweep_chunk(
+            target_matrix, survival_curves, vintage_profiles, variants, resolve_kwargs
+        )
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [list(chunk) for chunk in np.array_split(np.array(names, dtype=object), workers) if len(chunk)]
+    print(f"[INFO] Running {len(names)} turnover-policy variant(s) across {workers} worker processes.")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _run_turnover_policy_sweep_chunk,
+                target_matrix,
+                survival_curves,
+                vintage_profiles,
+                {name: variants[name] for name in chunk},
+                resolve_kwargs,
+            )
+            for chunk in chunks
+        ]
+        frames = [future.result() for future in futures]
+    return pd.concat(frames, ignore_index=True)
 
-    result = _legacy_estimate_passenger_sales_from_dataframe(*args, **kwargs)
 
+def _prepare_policy_turnover(
+    result: dict,
+    *,
+    transport_type: str,
+    df_for_drive_policy: pd.DataFrame | None,
+    turnover_policies: Mapping[str, Mapping[str, Any]] | None,
+    drive_turnover_policy: Mapping[str, Any] | None,
+    drive_policy_stocks_col: str,
+    vehicle_type_map: Mapping[str, str],
+    analysis_initial_fleet_age_shift_years: float | Mapping[str, Any] | None,
+    economy: str | None,
+    scenario: str | None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    """
+    Resolve the policy settings of one dataframe-workflow result before its
+    policy turnover: derive drive-based policies, merge them with
+    `turnover_policies` and apply the initial fleet-age shift to the result's
+    vintage profiles. Returns (combined policies, payload for
+    `_record_policy_inputs`).
+    """
     years = pd.Index(result.get("years", result.get("M_envelope", pd.Series(dtype=float)).index), dtype=int)
     derived_policies: dict[str, dict[str, pd.Series]] = {}
     drive_policy_diagnostics: dict[str, Any] | None = None
@@ -1297,11 +1720,11 @@ def estimate_passenger_sales_from_dataframe(
             df=df_for_drive_policy,
             years=years,
             drive_turnover_policy=drive_turnover_policy,
-            vehicle_type_map=drive_policy_vehicle_type_map or kwargs.get("vehicle_type_map") or DEFAULT_PASSENGER_VEHICLE_TYPE_MAP,
-            transport_type="passenger",
+            vehicle_type_map=vehicle_type_map,
+            transport_type=transport_type,
             medium="road",
-            economy=kwargs.get("economy"),
-            scenario=kwargs.get("scenario"),
+            economy=economy,
+            scenario=scenario,
             stocks_col=drive_policy_stocks_col,
         )
 
@@ -1311,26 +1734,84 @@ def estimate_passenger_sales_from_dataframe(
         analysis_initial_fleet_age_shift_years,
     )
     _apply_shifted_vintage_profiles(result, shifted_vintage_profiles)
-    drive_counterfactual_policies = _subtract_turnover_policies(
-        combined_policies,
-        derived_policies,
-        years,
+    payload = {
+        "drive_turnover_policy": drive_turnover_policy,
+        "derived_policies": derived_policies,
+        "drive_policy_diagnostics": drive_policy_diagnostics,
+        "drive_counterfactual_policies": _subtract_turnover_policies(
+            combined_policies,
+            derived_policies,
+            years,
+        ),
+        "analysis_initial_fleet_age_shift_years": analysis_initial_fleet_age_shift_years,
+        "shifted_vintage_profiles": shifted_vintage_profiles,
+        "initial_age_shift_diagnostics": initial_age_shift_diagnostics,
+    }
+    return combined_policies, payload
+
+
+def _record_policy_inputs(result: dict, payload: Mapping[str, Any]) -> None:
+    """Store the drive-policy and age-shift inputs/diagnostics on a policy result."""
+    drive_turnover_policy = payload["drive_turnover_policy"]
+    if drive_turnover_policy:
+        result["drive_turnover_policy_input"] = dict(drive_turnover_policy)
+        result["derived_turnover_policies_from_drive"] = payload["derived_policies"]
+        result["drive_policy_diagnostics"] = payload["drive_policy_diagnostics"]
+        result["drive_policy_counterfactual_turnover_policies"] = payload["drive_counterfactual_policies"]
+    if payload["analysis_initial_fleet_age_shift_years"] is not None:
+        shifted_vintage_profiles = payload["shifted_vintage_profiles"]
+        result["analysis_initial_fleet_age_shift_years_input"] = payload["analysis_initial_fleet_age_shift_years"]
+        result["shifted_vintage_profiles_from_initial_age_shift"] = shifted_vintage_profiles
+        result["analysis_initial_fleet_age_shift_diagnostics"] = payload["initial_age_shift_diagnostics"]
+        result["policy_enabled"] = bool(result.get("policy_enabled")) or bool(shifted_vintage_profiles)
+
+
+def estimate_passenger_sales_from_dataframe(
+    *args,
+    turnover_policies: Mapping[str, Mapping[str, Any]] | None = None,
+    drive_turnover_policy: Mapping[str, Any] | None = None,
+    drive_policy_dataframe: pd.DataFrame | None = None,
+    drive_policy_stocks_col: str = "Stocks",
+    drive_policy_vehicle_type_map: Mapping[str, str] | None = None,
+    analysis_initial_fleet_age_shift_years: float | Mapping[str, Any] | None = None,
+    plot: bool = True,
+    **kwargs,
+) -> dict:
+    """
+    Policy-aware wrapper for `estimate_passenger_sales_from_dataframe`.
+
+    Accepts all legacy arguments and adds `turnover_policies`.
+    """
+    kwargs = dict(kwargs)
+    kwargs["plot"] = False
+
+    df_for_drive_policy = drive_policy_dataframe
+    if df_for_drive_policy is None:
+        if "df" in kwargs and isinstance(kwargs["df"], pd.DataFrame):
+            df_for_drive_policy = kwargs["df"]
+        elif args and isinstance(args[0], pd.DataFrame):
+            df_for_drive_policy = args[0]
+
+    result = _legacy_estimate_passenger_sales_from_dataframe(*args, **kwargs)
+
+    combined_policies, policy_payload = _prepare_policy_turnover(
+        result,
+        transport_type="passenger",
+        df_for_drive_policy=df_for_drive_policy,
+        turnover_policies=turnover_policies,
+        drive_turnover_policy=drive_turnover_policy,
+        drive_policy_stocks_col=drive_policy_stocks_col,
+        vehicle_type_map=drive_policy_vehicle_type_map or kwargs.get("vehicle_type_map") or DEFAULT_PASSENGER_VEHICLE_TYPE_MAP,
+        analysis_initial_fleet_age_shift_years=analysis_initial_fleet_age_shift_years,
+        economy=kwargs.get("economy"),
+        scenario=kwargs.get("scenario"),
     )
     result = _update_result_with_policy_sales(
         result,
         turnover_policies=combined_policies,
         transport_type="passenger",
     )
-    if drive_turnover_policy:
-        result["drive_turnover_policy_input"] = dict(drive_turnover_policy)
-        result["derived_turnover_policies_from_drive"] = derived_policies
-        result["drive_policy_diagnostics"] = drive_policy_diagnostics
-        result["drive_policy_counterfactual_turnover_policies"] = drive_counterfactual_policies
-    if analysis_initial_fleet_age_shift_years is not None:
-        result["analysis_initial_fleet_age_shift_years_input"] = analysis_initial_fleet_age_shift_years
-        result["shifted_vintage_profiles_from_initial_age_shift"] = shifted_vintage_profiles
-        result["analysis_initial_fleet_age_shift_diagnostics"] = initial_age_shift_diagnostics
-        result["policy_enabled"] = bool(result.get("policy_enabled")) or bool(shifted_vintage_profiles)
+    _record_policy_inputs(result, policy_payload)
 
     if plot:
         try:
@@ -1374,53 +1855,24 @@ def estimate_freight_sales_from_dataframe(
 
     result = _legacy_estimate_freight_sales_from_dataframe(*args, **kwargs)
 
-    years = pd.Index(result.get("years", result.get("M_envelope", pd.Series(dtype=float)).index), dtype=int)
-    derived_policies: dict[str, dict[str, pd.Series]] = {}
-    drive_policy_diagnostics: dict[str, Any] | None = None
-    if drive_turnover_policy:
-        if df_for_drive_policy is None:
-            raise ValueError(
-                "drive_turnover_policy was provided, but no dataframe is available. "
-                "Pass `drive_policy_dataframe` (or provide `df` in args/kwargs)."
-            )
-        derived_policies, drive_policy_diagnostics = derive_vehicle_turnover_policies_from_drive_policy(
-            df=df_for_drive_policy,
-            years=years,
-            drive_turnover_policy=drive_turnover_policy,
-            vehicle_type_map=drive_policy_vehicle_type_map or kwargs.get("vehicle_type_map") or DEFAULT_FREIGHT_VEHICLE_TYPE_MAP,
-            transport_type="freight",
-            medium="road",
-            economy=kwargs.get("economy"),
-            scenario=kwargs.get("scenario"),
-            stocks_col=drive_policy_stocks_col,
-        )
-
-    combined_policies = _merge_turnover_policies(turnover_policies, derived_policies, years)
-    shifted_vintage_profiles, initial_age_shift_diagnostics = _derive_analysis_initial_age_shift_payload(
+    combined_policies, policy_payload = _prepare_policy_turnover(
         result,
-        analysis_initial_fleet_age_shift_years,
-    )
-    _apply_shifted_vintage_profiles(result, shifted_vintage_profiles)
-    drive_counterfactual_policies = _subtract_turnover_policies(
-        combined_policies,
-        derived_policies,
-        years,
+        transport_type="freight",
+        df_for_drive_policy=df_for_drive_policy,
+        turnover_policies=turnover_policies,
+        drive_turnover_policy=drive_turnover_policy,
+        drive_policy_stocks_col=drive_policy_stocks_col,
+        vehicle_type_map=drive_policy_vehicle_type_map or kwargs.get("vehicle_type_map") or DEFAULT_FREIGHT_VEHICLE_TYPE_MAP,
+        analysis_initial_fleet_age_shift_years=analysis_initial_fleet_age_shift_years,
+        economy=kwargs.get("economy"),
+        scenario=kwargs.get("scenario"),
     )
     result = _update_result_with_policy_sales(
         result,
         turnover_policies=combined_policies,
         transport_type="freight",
     )
-    if drive_turnover_policy:
-        result["drive_turnover_policy_input"] = dict(drive_turnover_policy)
-        result["derived_turnover_policies_from_drive"] = derived_policies
-        result["drive_policy_diagnostics"] = drive_policy_diagnostics
-        result["drive_policy_counterfactual_turnover_policies"] = drive_counterfactual_policies
-    if analysis_initial_fleet_age_shift_years is not None:
-        result["analysis_initial_fleet_age_shift_years_input"] = analysis_initial_fleet_age_shift_years
-        result["shifted_vintage_profiles_from_initial_age_shift"] = shifted_vintage_profiles
-        result["analysis_initial_fleet_age_shift_diagnostics"] = initial_age_shift_diagnostics
-        result["policy_enabled"] = bool(result.get("policy_enabled")) or bool(shifted_vintage_profiles)
+    _record_policy_inputs(result, policy_payload)
 
     if plot:
         try:
@@ -1436,6 +1888,287 @@ def estimate_freight_sales_from_dataframe(
     return result
 
 
+_BATCH_POLICY_SETTING_KEYS = (
+    "turnover_policies",
+    "drive_turnover_policy",
+    "drive_policy_dataframe",
+    "drive_policy_stocks_col",
+    "drive_policy_vehicle_type_map",
+    "analysis_initial_fleet_age_shift_years",
+)
+
+
+def _split_shared_source_frames(call_args: Mapping[Any, Mapping[str, Any]]) -> dict[Any, pd.DataFrame]:
+    """
+    Split a source dataframe shared by several requests into its
+    (economy, scenario) slices once, instead of copying and filtering the
+    whole frame for every economy.
+    """
+    sharing: dict[int, list[Any]] = {}
+    for key, args in call_args.items():
+        df = args["df"]
+        if (
+            isinstance(df, pd.DataFrame)
+            and {"Economy", "Scenario"}.issubset(df.columns)
+            and args["economy"] is not None
+            and args["scenario"] is not None
+        ):
+            sharing.setdefault(id(df), []).append(key)
+
+    frames: dict[Any, pd.DataFrame] = {}
+    for keys in sharing.values():
+        if len(keys) < 2:
+            continue
+        df = call_args[keys[0]]["df"]
+        slices = dict(iter(df.groupby(["Economy", "Scenario"], sort=False, observed=True)))
+        for key in keys:
+            target = (call_args[key]["economy"], call_args[key]["scenario"])
+            frames[key] = slices.get(target, df.iloc[0:0])
+    return frames
+
+
+def _extract_energy_for_requests(call_args: Mapping[Any, Mapping[str, Any]]) -> dict[Any, pd.Series]:
+    """
+    ESTO energy use for every request that reads the same balances file,
+    scenario and years, loaded with one `extract_energy_use_for_economies`
+    call per group. A group that fails is left to the per-economy extraction,
+    which then reports the error for its own request.
+    """
+    groups: dict[tuple, list[Any]] = {}
+    for key, args in call_args.items():
+        if not args["esto_energy_path"] or None in (
+            args["economy"],
+            args["scenario"],
+            args["base_year"],
+            args["final_year"],
+        ):
+            continue
+        group = (
+            str(args["esto_energy_path"]),
+            args["scenario"],
+            int(args["base_year"]),
+            int(args["final_year"]),
+            args["esto_sector"],
+            args["esto_sheet"],
+        )
+        groups.setdefault(group, []).append(key)
+
+    energy: dict[Any, pd.Series] = {}
+    for (esto_path, scenario, base_year, final_year, sector, sheet), keys in groups.items():
+        try:
+            by_economy = extract_energy_use_for_economies(
+                esto_path,
+                [call_args[key]["economy"] for key in keys],
+                scenario,
+                base_year,
+                final_year,
+                sector=sector,
+                sheet_name=sheet,
+            )
+        except (KeyError, TypeError, ValueError, OSError):
+            continue
+        for key in keys:
+            energy[key] = by_economy[call_args[key]["economy"]].copy()
+    return energy
+
+
+def estimate_sales_for_economies(
+    transport_type: str,
+    requests: Mapping[Any, Mapping[str, Any]],
+    *,
+    errors: dict | None = None,
+) -> dict[Any, dict]:
+    """
+    Batch engine for `estimate_passenger_sales_from_dataframe` /
+    `estimate_freight_sales_from_dataframe` over many economies.
+
+    `requests` maps a key (for example the economy code) to the keyword
+    arguments of one dataframe-workflow call: `df`, `survival_curves`,
+    `vintage_profiles`, `economy`, `scenario`, `base_year`, ... plus the
+    policy settings. Inputs (base stocks, population, energy trends, lifecycle
+    profiles) are collected for every request first. Envelopes, k values and
+    target stocks are then built for all economies together with
+    `build_target_stocks_for_economies`, and the policy cohort turnover runs
+    once for every (economy x vehicle) fleet in (fleet x age) arrays.
+
+    Returns, per key, the same result as the single-economy call with
+    `plot=False`. With `errors`, a request that fails is recorded there and
+    left out instead of raising.
+    """
+    if transport_type not in {"passenger", "freight"}:
+        raise ValueError(f"Unknown transport_type '{transport_type}'. Use 'passenger' or 'freight'.")
+    freight = transport_type == "freight"
+    legacy_estimate = (
+        _legacy_estimate_freight_sales_from_dataframe if freight else _legacy_estimate_passenger_sales_from_dataframe
+    )
+    legacy_signature = inspect.signature(legacy_estimate)
+    default_vehicle_type_map = DEFAULT_FREIGHT_VEHICLE_TYPE_MAP if freight else DEFAULT_PASSENGER_VEHICLE_TYPE_MAP
+
+    # 1) Collect every economy's inputs.
+    call_args: dict[Any, dict[str, Any]] = {}
+    policy_settings: dict[Any, dict[str, Any]] = {}
+    for key, request in requests.items():
+        kwargs = dict(request)
+        kwargs.pop("plot", None)
+        policy_settings[key] = {name: kwargs.pop(name) for name in _BATCH_POLICY_SETTING_KEYS if name in kwargs}
+        try:
+            bound = legacy_signature.bind(**kwargs)
+        except TypeError as exc:
+            if errors is None:
+                raise
+            errors[key] = exc
+            continue
+        bound.apply_defaults()
+        call_args[key] = dict(bound.arguments)
+
+    source_frames = _split_shared_source_frames(call_args)
+    energy_by_key = _extract_energy_for_requests(call_args)
+
+    build_inputs: dict[Any, dict[str, Any]] = {}
+    for key in list(call_args):
+        args = call_args[key]
+        try:
+            inputs = _collect_sales_inputs(
+                transport_type,
+                source_frames.get(key, args["df"]),
+                economy=args["economy"],
+                scenario=args["scenario"],
+                base_year=args["base_year"],
+                final_year=args["final_year"],
+                vehicle_type_map=args["vehicle_type_map"],
+                population_col=args["population_col"],
+                stocks_col=args["stocks_col"],
+                base_stocks_df=args["base_stocks_df"],
+                esto_energy_path=args["esto_energy_path"],
+                esto_sector=args["esto_sector"],
+                esto_sheet=args["esto_sheet"],
+                vehicle_shares=args["vehicle_shares"],
+                use_9th_vehicle_type_sales_shares=args["use_9th_vehicle_type_sales_shares"],
+                energy_use=energy_by_key.get(key),
+            )
+        except (KeyError, TypeError, ValueError, NotImplementedError, OSError) as exc:
+            if errors is None:
+                raise
+            errors[key] = exc
+            del call_args[key]
+            continue
+        build_inputs[key] = {
+            **inputs,
+            "survival_curves": args["survival_curves"],
+            "vintage_profiles": args["vintage_profiles"],
+            "weights": args["weights"],
+            "M_sat": args["M_sat"],
+            "saturated": args.get("saturated", False),
+            "window_years": args["window_years"],
+            "k_min": args["k_min"],
+            "k_max": args["k_max"],
+            "economy": args["economy"],
+            "scenario": args["scenario"],
+        }
+
+    # 2) Envelopes, k and target stocks for all economies at once.
+    results = build_target_stocks_for_economies(transport_type, build_inputs, errors=errors)
+
+    # 3) Resolve each economy's policies and lay out its fleets.
+    fleets: list[tuple[Any, str, pd.Series, pd.Series, pd.Series, Mapping[str, Any] | None]] = []
+    combined_policies: dict[Any, dict[str, dict[str, Any]]] = {}
+    policy_payloads: dict[Any, dict[str, Any]] = {}
+    for key in list(results):
+        result = results[key]
+        args = call_args[key]
+        settings = policy_settings[key]
+        result["figures"] = None
+        result["years"] = build_inputs[key]["years"]
+        result["base_stocks"] = build_inputs[key]["base_stocks"]
+        result[f"energy_use_{transport_type}"] = build_inputs[key]["energy_use"]
+        df_for_drive_policy = settings.get("drive_policy_dataframe")
+        if df_for_drive_policy is None and isinstance(args["df"], pd.DataFrame):
+            df_for_drive_policy = args["df"]
+        try:
+            combined, payload = _prepare_policy_turnover(
+                result,
+                transport_type=transport_type,
+                df_for_drive_policy=df_for_drive_policy,
+                turnover_policies=settings.get("turnover_policies"),
+                drive_turnover_policy=settings.get("drive_turnover_policy"),
+                drive_policy_stocks_col=settings.get("drive_policy_stocks_col", "Stocks"),
+                vehicle_type_map=(
+                    settings.get("drive_policy_vehicle_type_map")
+                    or args["vehicle_type_map"]
+                    or default_vehicle_type_map
+                ),
+                analysis_initial_fleet_age_shift_years=settings.get("analysis_initial_fleet_age_shift_years"),
+                economy=args["economy"],
+                scenario=args["scenario"],
+            )
+            key_fleets = []
+            for vehicle, target_stock in result["target_stocks"].items():
+                surv, vint = _validate_and_align_age_profiles(
+                    pd.Series(result["survival_curves"][vehicle]),
+                    pd.Series(result["vintage_profiles"][vehicle]),
+                )
+                if float(vint.sum()) <= 0:
+                    raise ValueError("vintage_profile must sum to a positive value.")
+                key_fleets.append((key, vehicle, pd.Series(target_stock), surv, vint, combined.get(vehicle)))
+        except (KeyError, TypeError, ValueError) as exc:
+            if errors is None:
+                raise
+            errors[key] = exc
+            del results[key]
+            continue
+        combined_policies[key] = combined or {}
+        policy_payloads[key] = payload
+        fleets.extend(key_fleets)
+
+    # 4) One cohort turnover for every (economy x vehicle) fleet per year/age grid.
+    fleet_groups: dict[tuple, list[int]] = {}
+    for idx, (_, _, target_stock, _, vint, _) in enumerate(fleets):
+        fleet_groups.setdefault((tuple(target_stock.index.tolist()), len(vint)), []).append(idx)
+
+    sales_by_key: dict[Any, dict[str, pd.Series]] = {key: {} for key in results}
+    retirements_by_key: dict[Any, dict[str, pd.Series]] = {key: {} for key in results}
+    for (_, max_age), members in fleet_groups.items():
+        years = pd.Index(fleets[members[0]][2].index)
+        n_years = len(years)
+        state = np.zeros((len(members), max_age), dtype=float)
+        targets = np.zeros((len(members), n_years), dtype=float)
+        survival = np.zeros((n_years, len(members), max_age - 1), dtype=float)
+        extra_rate = np.zeros((n_years, len(members)), dtype=float)
+        extra_matrix = np.zeros((n_years, len(members), max_age), dtype=float)
+        for row, idx in enumerate(members):
+            _, _, target_stock, surv, vint, policy = fleets[idx]
+            targets[row] = target_stock.to_numpy(dtype=float)
+            state[row] = targets[row, 0] * (vint / float(vint.sum())).to_numpy()
+            if policy:
+                compiled = compile_turnover_policy(policy, years, vint.index)
+                survival[:, row] = compiled.survival_matrix(surv.to_numpy(dtype=float))[:, : max_age - 1]
+                extra_rate[:, row] = compiled.extra_retirement_rate
+                extra_matrix[:, row] = compiled.extra_retirement_matrix
+            else:
+                # No policy: the legacy kernel ages with the raw survival curve.
+                survival[:, row] = surv.to_numpy(dtype=float)[: max_age - 1]
+
+        sales, retirements, _ = _simulate_cohort_turnover(state, targets, survival, extra_rate, extra_matrix)
+        for row, idx in enumerate(members):
+            key, vehicle, target_stock, _, _, _ = fleets[idx]
+            sales_by_key[key][vehicle] = pd.Series(sales[row], index=target_stock.index, dtype=float)
+            retirements_by_key[key][vehicle] = pd.Series(retirements[row], index=target_stock.index, dtype=float)
+
+    # 5) Per-economy totals, shares, tables and policy diagnostics.
+    for key, result in results.items():
+        vehicles = list(result["target_stocks"])
+        result = _store_policy_sales(
+            result,
+            {vehicle: sales_by_key[key][vehicle] for vehicle in vehicles},
+            {vehicle: retirements_by_key[key][vehicle] for vehicle in vehicles},
+            turnover_policies=combined_policies[key],
+            transport_type=transport_type,
+        )
+        _record_policy_inputs(result, policy_payloads[key])
+        results[key] = result
+    return {key: results[key] for key in requests if key in results}
+
+
 def estimate_passenger_sales_from_files(
     *args,
     turnover_policies: Mapping[str, Mapping[str, Any]] | None = None,
@@ -6,6 +6,7 @@ Keep run-time settings here and delegate heavy logic to
 """
 from __future__ import annotations
 
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -13,10 +14,18 @@ from pathlib import Path
 import pandas as pd
 
 from functions import transport_workflow_pipeline as pipeline
+from functions.atomic_io import atomic_output_path, locked_file, write_csv_atomic
 from functions.international_transport_pipeline import (
     InternationalExportConfig,
     run_international_export_workflow,
 )
+from functions.sales_dashboard_queue import clear_sales_dashboards, render_queued_sales_dashboards
+from functions.stage_scheduler import (
+    Stage,
+    StageScheduler,
+    load_stage_results,
+    save_stage_results,
+)
 from functions.workflow_utilities import (
     annotate_domestic_records,
     archive_config_folder_if_size_changed,
@@ -43,6 +52,16 @@ TRANSPORT_SCENARIO_SELECTION: str | list[str] = ["Reference", "Target"]#"Referen
 # - "separate" or "both": reconciliation can run for all configured economies.
 # - "apec": reconciliation runs for 00_APEC only (separate economies are input-prep only, if enabled).
 ALL_RUN_MODE = "both"  # "separate", "apec", "both"
+# Worker processes for all-mode economy runs. 1 runs economies one after
+# another; >1 (or "auto" for one per CPU) runs each economy/scenario target in
+# its own process. Ignored while LEAP COM access is enabled.
+PARALLEL_ECONOMY_WORKERS: int | str = 1
+# Every economy target records its stage input fingerprints and output paths
+# in this run manifest (None disables it). With RESUME_BATCH_RUNS = True,
+# targets whose outputs are newer than, and consistent with, their inputs and
+# settings are skipped, so a failed batch restarts at its first failed target.
+RUN_MANIFEST_PATH: str | None = "results/run_summaries/transport_run_manifest.json"
+RESUME_BATCH_RUNS = False
 
 # #### Synthetic 00_APEC run settings ####
 # These settings are only used when TRANSPORT_ECONOMY_SELECTION == "all" and
@@ -50,6 +69,10 @@ ALL_RUN_MODE = "both"  # "separate", "apec", "both"
 # If True, the workflow also performs per-economy input setup before building
 # the synthetic 00_APEC run.
 PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC = True
+# If True, 00_APEC is aggregated from the economy inputs prepared by the
+# separate runs earlier in the same run (reloaded one at a time from their
+# input checkpoints) rather than preparing them again.
+REUSE_PREPARED_INPUTS_FOR_APEC = True
 # Synthetic region label for the aggregated 00_APEC run configuration.
 APEC_REGION = "APEC"
 # Optional region name written into the synthetic 00_APEC LEAP export/template
@@ -73,6 +96,37 @@ RUN_RESULTS_DASHBOARD = True
 # - "full": keep all print output (default legacy behavior)
 # - "stage_economy": keep high-level stage/economy progress + errors only
 RUN_OUTPUT_MODE = "stage_economy"
+# Opt-in profiler hooks for timed pipeline stages, e.g. ["passenger_sales",
+# "branch_mapping"] or "all". Stage names: prepare_input_data, passenger_sales,
+# freight_sales, sales_dashboard, branch_mapping, finalise_export_df,
+# convert_values_to_expressions, save_export_files, reconciliation.
+# Profiles and top-N text summaries go to results/profiling/<economy>_<scenario>/.
+PROFILE_STAGES: list[str] | str | None = None
+# "cprofile" (.prof files), "sampling" (pyinstrument, if installed) or "auto".
+PROFILER = "cprofile"
+PROFILE_TOP_N = 30
+# Stage scheduling (see build_workflow_stages). Stages: "domestic",
+# "international", "combined_workbook", "results_dashboard" and, with
+# deferred sales plots, "sales_dashboards".
+# None runs every stage. A list reruns only those stages plus their downstream
+# dependents, reusing the other stages' results from STAGE_RESULTS_PATH,
+# e.g. ["international"] re-exports international and rebuilds the combined
+# workbook and dashboard without rerunning the domestic economies.
+RUN_STAGES: list[str] | None = None
+# Worker threads for independent stages (e.g. international export alongside
+# MULTI_SCENARIO_MODE domestic runs, or dashboards alongside later stages).
+# Stages that use pipeline module state in this process still take turns (see
+# _RUNTIME_SETTINGS_LOCK). 1 keeps the original one-after-another order; use
+# >1 only with a non-interactive matplotlib backend if sales plots are enabled.
+STAGE_WORKERS = 1
+# Multi-scenario mode for TRANSPORT_SCENARIO_SELECTION lists. When True, each
+# scenario's domestic stage runs concurrently in its own worker process
+# (instead of one scenario after another), and the scenarios of an economy
+# share one Current Accounts (base-year) reconciliation fit rather than each
+# refitting the same block. Ignored while LEAP COM access is enabled.
+MULTI_SCENARIO_MODE = False
+# Stage results saved after each run so targeted reruns can reuse them.
+STAGE_RESULTS_PATH = "results/run_summaries/transport_stage_results.json"
 
 # #### Config archiving ####
 # Archive codebase/configurations into codebase/configurations/archive when tracked config file
@@ -93,6 +147,25 @@ MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE = True
 SALES_MODE = "both"
 # Enables passenger sales diagnostic plotting.
 PASSENGER_PLOT = False
+# With PASSENGER_PLOT, queue the dashboard inputs instead of plotting inline,
+# and render the queued dashboards in SALES_PLOT_RENDER_WORKERS worker
+# processes once each scenario's domestic stage has finished (a
+# "sales_dashboards" stage; alongside the combined workbook when
+# STAGE_WORKERS > 1). Figures go to plotting_output/<economy>_<scenario>/.
+# Each scenario's queued jobs are cleared when its domestic stage starts.
+# False keeps inline plotting.
+DEFER_SALES_PLOTS = False
+SALES_PLOT_QUEUE_DIR = "intermediate_data/sales_plot_queue"
+SALES_PLOT_RENDER_WORKERS = 2
+# Reuse passenger/freight sales results from this folder when the input slice,
+# lifecycle profiles, ESTO file, weights and policy settings are unchanged
+# (e.g. when only export or reconciliation settings changed). None disables it.
+# Code changes are not tracked, so clear the folder after editing the sales code.
+SALES_RESULT_CACHE_DIR: str | None = None  # e.g. "intermediate_data/sales_results"
+# In "all" runs, prepare every economy's inputs first and estimate passenger
+# and freight sales for all economies in one pass; each economy's run and the
+# combined sales CSVs then use those results.
+BATCH_SALES_ENGINE = False
 # Optional scenario-specific policy settings passed to
 # sales_workflow wrappers through functions.transport_workflow_pipeline.
 # Keys should match the scenario names in TRANSPORT_SCENARIO_SELECTION
@@ -256,13 +329,26 @@ CRITICAL_FAILURE_PATTERNS: tuple[str, ...] = (
 
 
 _OUTPUTS_DIR = Path(__file__).parent / "outputs"
+# Held by any stage that reads or writes pipeline module state in this
+# process: the in-process domestic stage (settings + run), the international
+# stage (it reuses pipeline helpers that patch leap_excel_io globals) and the
+# apply-and-snapshot step of worker-process domestic stages. With
+# STAGE_WORKERS > 1 those stages therefore run one at a time; stages that only
+# read their inputs (combined workbook, dashboards) and the worker processes
+# themselves still overlap.
+_RUNTIME_SETTINGS_LOCK = threading.Lock()
 _TIMING_CSV = _OUTPUTS_DIR / "run_timing_log.csv"
+_TIMING_LOCK = _OUTPUTS_DIR / "run_timing_log.csv.lock"
+_TIMING_LOCK_STALE_SECONDS = 60.0
 _TIMING_COLS = [
     "timestamp", "scenario", "economy", "run_type",
     "run_profile", "sales_mode", "all_run_mode", "input_data_source", "checkpoint_load_stage",
     "status", "instance_number", "duration_hours", "duration_minutes", "duration_seconds",
-    "duration_formatted",
+    "duration_formatted", "stage", "wall_seconds", "cpu_seconds", "peak_rss_mb", "rows",
 ]
+# Each run logs one "total" row followed by one row per timed pipeline stage
+# (see functions/stage_telemetry.py); older logs without a stage are totals.
+_TOTAL_STAGE = "total"
 
 
 def _fmt_duration(seconds: float) -> tuple[int, int, float, str]:
@@ -273,70 +359,99 @@ def _fmt_duration(seconds: float) -> tuple[int, int, float, str]:
 
 
 def _record_run_timings(records: list[dict], settings_meta: dict) -> str:
-    """Append timed records to run_timing_log.csv, incrementing instance_number per (economy, scenario, run_type)."""
-    _OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
-
-    existing = pd.read_csv(_TIMING_CSV) if _TIMING_CSV.exists() else pd.DataFrame()
-
-    if not existing.empty and {"economy", "scenario", "run_type", "instance_number"}.issubset(existing.columns):
-        max_instances: dict[tuple, int] = (
-            existing.groupby(["economy", "scenario", "run_type"])["instance_number"]
-            .max()
-            .to_dict()
-        )
-    else:
-        max_instances = {}
-
-    batch_counts: dict[tuple, int] = {}
-    new_rows = []
-    for rec in records:
-        economy = str(rec.get("economy", ""))
-        scenario = str(rec.get("scenario", ""))
-        run_type = str(rec.get("run_type", ""))
-        _dur_raw = rec.get("duration_seconds")
-        try:
-            dur: float | None = float(_dur_raw) if _dur_raw is not None else None
-        except (TypeError, ValueError):
-            dur = None
-
-        key = (economy, scenario, run_type)
-        prior_max = max_instances.get(key, 0)
-        instance_number = prior_max + batch_counts.get(key, 0) + 1
-        batch_counts[key] = batch_counts.get(key, 0) + 1
-
-        if dur is not None:
-            h, m, s, fmt = _fmt_duration(dur)
+    """
+    Append timed records to run_timing_log.csv, incrementing instance_number per (economy, scenario, run_type).
+
+    Stage telemetry in `rec["stages"]` is written as extra rows sharing the
+    run's instance_number. The read/append/write runs under a lock file so
+    concurrent runs cannot drop each other's rows.
+    """
+    with locked_file(_TIMING_LOCK, stale_seconds=_TIMING_LOCK_STALE_SECONDS, description="run timing log"):
+        existing = pd.read_csv(_TIMING_CSV) if _TIMING_CSV.exists() else pd.DataFrame()
+
+        if not existing.empty and {"economy", "scenario", "run_type", "instance_number"}.issubset(existing.columns):
+            max_instances: dict[tuple, int] = (
+                existing.groupby(["economy", "scenario", "run_type"])["instance_number"]
+                .max()
+                .to_dict()
+            )
         else:
-            h = m = s = None
-            fmt = rec.get("duration_formatted", "")
-
-        new_rows.append({
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "scenario": scenario,
-            "economy": economy,
-            "run_type": run_type,
-            "run_profile": settings_meta.get("run_profile", ""),
-            "sales_mode": settings_meta.get("sales_mode", ""),
-            "all_run_mode": settings_meta.get("all_run_mode", ""),
-            "input_data_source": settings_meta.get("input_data_source", ""),
-            "checkpoint_load_stage": settings_meta.get("checkpoint_load_stage", ""),
-            "status": rec.get("status", ""),
-            "instance_number": instance_number,
-            "duration_hours": h,
-            "duration_minutes": m,
-            "duration_seconds": round(s, 1) if s is not None else None,
-            "duration_formatted": fmt,
-        })
-
-    new_df = pd.DataFrame(new_rows, columns=_TIMING_COLS)
-    combined = pd.concat([existing.reindex(columns=_TIMING_COLS), new_df], ignore_index=True) if not existing.empty else new_df
-    combined.to_csv(_TIMING_CSV, index=False)
+            max_instances = {}
+
+        batch_counts: dict[tuple, int] = {}
+        new_rows = []
+        for rec in records:
+            economy = str(rec.get("economy", ""))
+            scenario = str(rec.get("scenario", ""))
+            run_type = str(rec.get("run_type", ""))
+            _dur_raw = rec.get("duration_seconds")
+            try:
+                dur: float | None = float(_dur_raw) if _dur_raw is not None else None
+            except (TypeError, ValueError):
+                dur = None
+
+            key = (economy, scenario, run_type)
+            prior_max = max_instances.get(key, 0)
+            instance_number = prior_max + batch_counts.get(key, 0) + 1
+            batch_counts[key] = batch_counts.get(key, 0) + 1
+
+            if dur is not None:
+                h, m, s, fmt = _fmt_duration(dur)
+            else:
+                h = m = s = None
+                fmt = rec.get("duration_formatted", "")
+
+            run_row = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "scenario": scenario,
+                "economy": economy,
+                "run_type": run_type,
+                "run_profile": settings_meta.get("run_profile", ""),
+                "sales_mode": settings_meta.get("sales_mode", ""),
+                "all_run_mode": settings_meta.get("all_run_mode", ""),
+                "input_data_source": settings_meta.get("input_data_source", ""),
+                "checkpoint_load_stage": settings_meta.get("checkpoint_load_stage", ""),
+                "status": rec.get("status", ""),
+                "instance_number": instance_number,
+                "duration_hours": h,
+                "duration_minutes": m,
+                "duration_seconds": round(s, 1) if s is not None else None,
+                "duration_formatted": fmt,
+                "stage": _TOTAL_STAGE,
+                "wall_seconds": round(dur, 3) if dur is not None else None,
+                "cpu_seconds": rec.get("cpu_seconds"),
+                "peak_rss_mb": rec.get("peak_rss_mb"),
+                "rows": None,
+            }
+            new_rows.append(run_row)
+            for stage in rec.get("stages") or []:
+                stage_row = dict(run_row)
+                stage_row.update({
+                    "duration_hours": None,
+                    "duration_minutes": None,
+                    "duration_seconds": None,
+                    "duration_formatted": _fmt_duration(float(stage.get("wall_seconds") or 0.0))[3],
+                    "stage": stage.get("stage", ""),
+                    "wall_seconds": stage.get("wall_seconds"),
+                    "cpu_seconds": stage.get("cpu_seconds"),
+                    "peak_rss_mb": stage.get("peak_rss_mb"),
+                    "rows": stage.get("rows"),
+                })
+                new_rows.append(stage_row)
+
+        new_df = pd.DataFrame(new_rows, columns=_TIMING_COLS)
+        combined = pd.concat([existing.reindex(columns=_TIMING_COLS), new_df], ignore_index=True) if not existing.empty else new_df
+        write_csv_atomic(combined, _TIMING_CSV, index=False)
     print(f"[TIMING] Run log updated: {_TIMING_CSV}")
     return str(_TIMING_CSV)
 
 
 def _plot_run_times() -> None:
-    """Bar chart of average run duration per run_type from the full timing log."""
+    """
+    Chart average run duration per run_type, and average wall time per pipeline
+    stage (labelled with mean rows and the highest peak RSS seen), from the full
+    timing log.
+    """
     try:
         import matplotlib
         matplotlib.use("Agg")
@@ -352,6 +467,10 @@ def _plot_run_times() -> None:
     if df.empty:
         return
 
+    stage_names = df["stage"].fillna(_TOTAL_STAGE) if "stage" in df.columns else pd.Series(_TOTAL_STAGE, index=df.index)
+    stage_df = df[stage_names != _TOTAL_STAGE].copy()
+    df = df[stage_names == _TOTAL_STAGE].copy()
+
     df["total_seconds"] = (
         pd.to_numeric(df["duration_hours"], errors="coerce").fillna(0) * 3600
         + pd.to_numeric(df["duration_minutes"], errors="coerce").fillna(0) * 60
@@ -367,7 +486,28 @@ def _plot_run_times() -> None:
         .reset_index()
     )
 
-    fig, ax = plt.subplots(figsize=(max(6, len(grouped) * 2), 5))
+    stage_grouped = pd.DataFrame()
+    if not stage_df.empty:
+        for col in ("wall_seconds", "peak_rss_mb", "rows"):
+            stage_df[col] = pd.to_numeric(stage_df[col], errors="coerce")
+        stage_grouped = (
+            stage_df.groupby("stage")
+            .agg(
+                mean=("wall_seconds", "mean"),
+                peak_rss_mb=("peak_rss_mb", "max"),
+                rows=("rows", "mean"),
+            )
+            .reset_index()
+            .sort_values("mean")
+        )
+
+    if stage_grouped.empty:
+        fig, ax = plt.subplots(figsize=(max(6, len(grouped) * 2), 5))
+        stage_ax = None
+    else:
+        fig, (ax, stage_ax) = plt.subplots(
+            1, 2, figsize=(max(6, len(grouped) * 2) + 8, max(5, len(stage_grouped) * 0.5))
+        )
     bars = ax.bar(grouped["run_type"], grouped["mean"] / 60, color="steelblue", alpha=0.8)
     for bar, (_, row) in zip(bars, grouped.iterrows()):
         _, _m, _s, label = _fmt_duration(row["mean"])
@@ -380,185 +520,348 @@ def _plot_run_times() -> None:
     ax.set_xlabel("Run Type")
     ax.set_ylabel("Average Duration (minutes)")
     ax.set_title("Average Run Duration by Type (all logged runs)")
-    plt.xticks(rotation=15, ha="right")
+    ax.tick_params(axis="x", labelrotation=15)
+
+    if stage_ax is not None:
+        stage_bars = stage_ax.barh(stage_grouped["stage"], stage_grouped["mean"], color="darkorange", alpha=0.8)
+        for bar, (_, row) in zip(stage_bars, stage_grouped.iterrows()):
+            details = [f"{row['mean']:.2f}s"]
+            if pd.notna(row["rows"]):
+                details.append(f"{row['rows']:,.0f} rows")
+            if pd.notna(row["peak_rss_mb"]):
+                details.append(f"peak {row['peak_rss_mb']:,.0f} MB")
+            stage_ax.text(
+                bar.get_width(),
+                bar.get_y() + bar.get_height() / 2,
+                " " + " | ".join(details),
+                ha="left", va="center", fontsize=8,
+            )
+        stage_ax.margins(x=0.4)
+        stage_ax.set_xlabel("Average Wall Time (seconds)")
+        stage_ax.set_title("Average Stage Wall Time (all logged runs)")
     plt.tight_layout()
 
     chart_path = _OUTPUTS_DIR / "run_timing_chart.png"
-    plt.savefig(chart_path, dpi=120)
+    with atomic_output_path(chart_path) as tmp_path:
+        plt.savefig(tmp_path, dpi=120)
     plt.close(fig)
     print(f"[TIMING] Run time chart saved: {chart_path}")
 
 
 def _apply_runtime_settings(*, scenario: str, date_id: str) -> None:
     """Push local settings into the pipeline module before execution."""
-    pipeline.TRANSPORT_ECONOMY_SELECTION = TRANSPORT_ECONOMY_SELECTION
-    pipeline.TRANSPORT_SCENARIO_SELECTION = scenario
-    pipeline.ALL_RUN_MODE = ALL_RUN_MODE
-    pipeline.APEC_REGION = APEC_REGION
-    pipeline.APEC_LEAP_REGION_OVERRIDE = APEC_LEAP_REGION_OVERRIDE
-    pipeline.APEC_MAPPING_WORKBOOK_PATH = APEC_MAPPING_WORKBOOK_PATH
-    pipeline.APEC_ESTO_BALANCES_PATH = APEC_ESTO_BALANCES_PATH
-    pipeline.APEC_BASE_YEAR = APEC_BASE_YEAR
-    pipeline.APEC_FINAL_YEAR = APEC_FINAL_YEAR
-
-    pipeline.RUN_PROFILE = RUN_PROFILE
-    pipeline.RUN_INPUT_CREATION, pipeline.RUN_RECONCILIATION = pipeline.resolve_run_profile(RUN_PROFILE)
-    pipeline.PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC = PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC
-    pipeline.SALES_MODE = SALES_MODE
-    pipeline.RUN_PASSENGER_SALES, pipeline.RUN_FREIGHT_SALES = pipeline.resolve_sales_mode(SALES_MODE)
-    pipeline.PASSENGER_PLOT = PASSENGER_PLOT
-    (
-        pipeline.PASSENGER_SALES_POLICY_SETTINGS,
-        pipeline.FREIGHT_SALES_POLICY_SETTINGS,
-    ) = resolve_sales_policy_settings_for_scenario(
+    run_input_creation, run_reconciliation = pipeline.resolve_run_profile(RUN_PROFILE)
+    run_passenger_sales, run_freight_sales = pipeline.resolve_sales_mode(SALES_MODE)
+    passenger_policy_settings, freight_policy_settings = resolve_sales_policy_settings_for_scenario(
         SCENARIO_SALES_POLICY_SETTINGS,
         scenario,
     )
+    (
+        load_halfway_checkpoint,
+        load_threequart_way_checkpoint,
+        load_export_df_checkpoint,
+    ) = pipeline.resolve_export_checkpoint_flags(CHECKPOINT_LOAD_STAGE)
 
-    pipeline.APPLY_ADJUSTMENTS_TO_FUTURE_YEARS = APPLY_ADJUSTMENTS_TO_FUTURE_YEARS
-    pipeline.REPORT_ADJUSTMENT_CHANGES = REPORT_ADJUSTMENT_CHANGES
-    pipeline.ESTO_ZERO_ENERGY_FALLBACK_RULES = ESTO_ZERO_ENERGY_FALLBACK_RULES
+    # The keys must match pipeline._RUNTIME_SETTING_NAMES, the same list used
+    # to copy these settings into worker processes.
+    pipeline.apply_runtime_settings({
+        "TRANSPORT_ECONOMY_SELECTION": TRANSPORT_ECONOMY_SELECTION,
+        "TRANSPORT_SCENARIO_SELECTION": scenario,
+        "ALL_RUN_MODE": ALL_RUN_MODE,
+        "APEC_REGION": APEC_REGION,
+        "APEC_LEAP_REGION_OVERRIDE": APEC_LEAP_REGION_OVERRIDE,
+        "APEC_MAPPING_WORKBOOK_PATH": APEC_MAPPING_WORKBOOK_PATH,
+        "APEC_ESTO_BALANCES_PATH": APEC_ESTO_BALANCES_PATH,
+        "APEC_BASE_YEAR": APEC_BASE_YEAR,
+        "APEC_FINAL_YEAR": APEC_FINAL_YEAR,
+
+        "RUN_PROFILE": RUN_PROFILE,
+        "RUN_INPUT_CREATION": run_input_creation,
+        "RUN_RECONCILIATION": run_reconciliation,
+        "PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC": PREPARE_SEPARATE_INPUTS_WHEN_RUNNING_APEC,
+        "REUSE_PREPARED_INPUTS_FOR_APEC": REUSE_PREPARED_INPUTS_FOR_APEC,
+        "SALES_MODE": SALES_MODE,
+        "RUN_PASSENGER_SALES": run_passenger_sales,
+        "RUN_FREIGHT_SALES": run_freight_sales,
+        "PASSENGER_PLOT": PASSENGER_PLOT,
+        "DEFER_SALES_PLOTS": DEFER_SALES_PLOTS,
+        "SALES_PLOT_QUEUE_DIR": SALES_PLOT_QUEUE_DIR,
+        "SALES_RESULT_CACHE_DIR": SALES_RESULT_CACHE_DIR,
+        "BATCH_SALES_ENGINE": BATCH_SALES_ENGINE,
+        "PASSENGER_SALES_POLICY_SETTINGS": passenger_policy_settings,
+        "FREIGHT_SALES_POLICY_SETTINGS": freight_policy_settings,
+
+        "APPLY_ADJUSTMENTS_TO_FUTURE_YEARS": APPLY_ADJUSTMENTS_TO_FUTURE_YEARS,
+        "REPORT_ADJUSTMENT_CHANGES": REPORT_ADJUSTMENT_CHANGES,
+        "SHARE_CURRENT_ACCOUNTS_ACROSS_SCENARIOS": MULTI_SCENARIO_MODE,
+        "ESTO_ZERO_ENERGY_FALLBACK_RULES": ESTO_ZERO_ENERGY_FALLBACK_RULES,
+
+        "CHECK_BRANCHES_IN_LEAP_USING_COM": CHECK_BRANCHES_IN_LEAP_USING_COM,
+        "SET_VARS_IN_LEAP_USING_COM": SET_VARS_IN_LEAP_USING_COM,
+        "AUTO_SET_MISSING_BRANCHES": AUTO_SET_MISSING_BRANCHES,
+        "ENSURE_FUELS_IN_LEAP": ENSURE_FUELS_IN_LEAP,
+
+        "INPUT_DATA_SOURCE": INPUT_DATA_SOURCE,
+        "LOAD_INPUT_CHECKPOINT": pipeline.resolve_input_checkpoint(INPUT_DATA_SOURCE),
+
+        "CHECKPOINT_LOAD_STAGE": CHECKPOINT_LOAD_STAGE,
+        "LOAD_HALFWAY_CHECKPOINT": load_halfway_checkpoint,
+        "LOAD_THREEQUART_WAY_CHECKPOINT": load_threequart_way_checkpoint,
+        "LOAD_EXPORT_DF_CHECKPOINT": load_export_df_checkpoint,
+
+        "MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE": MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE,
+        "PARALLEL_ECONOMY_WORKERS": PARALLEL_ECONOMY_WORKERS,
+        "RUN_OUTPUT_MODE": RUN_OUTPUT_MODE,
+        "PROFILE_STAGES": PROFILE_STAGES,
+        "PROFILER": PROFILER,
+        "PROFILE_TOP_N": PROFILE_TOP_N,
+        "RUN_MANIFEST_PATH": RUN_MANIFEST_PATH,
+        "RESUME_BATCH_RUNS": RESUME_BATCH_RUNS,
+        "DATE_ID": date_id,
+    })
+
+
+def _clear_queued_sales_dashboards(scenario: str) -> None:
+    """Drop dashboard jobs an earlier run left queued for this scenario."""
+    if not (PASSENGER_PLOT and DEFER_SALES_PLOTS):
+        return
+    cleared = clear_sales_dashboards(pipeline.resolve_str(SALES_PLOT_QUEUE_DIR), scenario=scenario)
+    if cleared:
+        print(f"[INFO] Cleared {cleared} sales dashboard job(s) left queued by an earlier run for '{scenario}'.")
+
+
+def _run_domestic_stage(scenario: str, date_id: str) -> list[dict]:
+    """Domestic input/sales/export/reconciliation for one scenario."""
+    print(f"\n=== Starting workflow for scenario '{scenario}' ===")
+    _clear_queued_sales_dashboards(scenario)
+    with _RUNTIME_SETTINGS_LOCK:
+        _apply_runtime_settings(scenario=scenario, date_id=date_id)
+        records = pipeline.run_transport_workflow()
+    return _check_domestic_records(records, scenario)
+
+
+def _run_domestic_stage_in_worker(scenario: str, date_id: str) -> list[dict]:
+    """
+    Domestic stage for one scenario in its own worker process, so several
+    scenarios can run at once (MULTI_SCENARIO_MODE).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"\n=== Starting workflow for scenario '{scenario}' (worker process) ===")
+    _clear_queued_sales_dashboards(scenario)
+    # Pipeline settings are module-level; apply and snapshot them as one step so
+    # concurrently starting scenarios each capture their own settings.
+    with _RUNTIME_SETTINGS_LOCK:
+        _apply_runtime_settings(scenario=scenario, date_id=date_id)
+        runtime_settings = pipeline._snapshot_runtime_settings()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        records = executor.submit(pipeline.run_transport_workflow_in_worker, runtime_settings).result()
+    return _check_domestic_records(records, scenario)
+
+
+def _check_domestic_records(records: list[dict], scenario: str) -> list[dict]:
+    domestic_records = annotate_domestic_records(records)
+    raise_for_critical_failures(
+        records=domestic_records,
+        scenario=scenario,
+        critical_failure_patterns=CRITICAL_FAILURE_PATTERNS,
+        manifest_path=RUN_MANIFEST_PATH,
+    )
+    return domestic_records
 
-    pipeline.CHECK_BRANCHES_IN_LEAP_USING_COM = CHECK_BRANCHES_IN_LEAP_USING_COM
-    pipeline.SET_VARS_IN_LEAP_USING_COM = SET_VARS_IN_LEAP_USING_COM
-    pipeline.AUTO_SET_MISSING_BRANCHES = AUTO_SET_MISSING_BRANCHES
-    pipeline.ENSURE_FUELS_IN_LEAP = ENSURE_FUELS_IN_LEAP
 
-    pipeline.INPUT_DATA_SOURCE = INPUT_DATA_SOURCE
-    pipeline.LOAD_INPUT_CHECKPOINT = pipeline.resolve_input_checkpoint(INPUT_DATA_SOURCE)
+def _resolve_international_scopes(scenario: str) -> list[str]:
+    economy_selection = str(TRANSPORT_ECONOMY_SELECTION).strip()
+    is_all_mode, _, run_separate, run_apec = pipeline.resolve_transport_run_mode(
+        economy_selection,
+        ALL_RUN_MODE,
+    )
+    if is_all_mode:
+        scopes: list[str] = []
+        seen: set[str] = set()
+        if run_separate:
+            for economy, _ in pipeline.list_transport_run_configs(scenario):
+                economy_token = str(economy).strip()
+                if not economy_token or economy_token in seen:
+                    continue
+                scopes.append(economy_token)
+                seen.add(economy_token)
+        if run_apec and "00_APEC" not in seen:
+            scopes.append("00_APEC")
+    else:
+        scopes = [economy_selection]
 
-    pipeline.CHECKPOINT_LOAD_STAGE = CHECKPOINT_LOAD_STAGE
-    (
-        pipeline.LOAD_HALFWAY_CHECKPOINT,
-        pipeline.LOAD_THREEQUART_WAY_CHECKPOINT,
-        pipeline.LOAD_EXPORT_DF_CHECKPOINT,
-    ) = pipeline.resolve_export_checkpoint_flags(CHECKPOINT_LOAD_STAGE)
+    if not scopes:
+        raise RuntimeError(
+            "International workflow requested but no scopes were resolved "
+            f"for scenario '{scenario}'."
+        )
+    return scopes
 
-    pipeline.MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE = MERGE_IMPORT_EXPORT_AND_CHECK_STRUCTURE
-    pipeline.DATE_ID = date_id
 
+def _run_international_stage(scenario: str) -> list[dict]:
+    """International export for every resolved scope of one scenario."""
+    with _RUNTIME_SETTINGS_LOCK:
+        return _run_international_scopes(scenario)
 
-def run_with_config() -> list[dict]:
-    """Run transport workflow using constants defined in this file."""
-    scenario_list = resolve_scenario_selection(TRANSPORT_SCENARIO_SELECTION)
-    date_id = datetime.now().strftime("%Y%m%d")
-    if ARCHIVE_CONFIG_ON_SIZE_CHANGE:
-        archived_config_dir = archive_config_folder_if_size_changed(
-            stamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
-        )
-        if archived_config_dir:
-            print(f"[INFO] Archived config snapshot to {archived_config_dir}")
 
+def _run_international_scopes(scenario: str) -> list[dict]:
     records: list[dict] = []
-    with output_filter_context(RUN_OUTPUT_MODE):
-        for scenario in scenario_list:
-            print(f"\n=== Starting workflow for scenario '{scenario}' ===")
-            _apply_runtime_settings(scenario=scenario, date_id=date_id)
-            domestic_records = annotate_domestic_records(pipeline.run_transport_workflow())
-            records.extend(domestic_records)
-            raise_for_critical_failures(
-                records=domestic_records,
-                scenario=scenario,
-                critical_failure_patterns=CRITICAL_FAILURE_PATTERNS,
+    for scope in _resolve_international_scopes(scenario):
+        scope_key = str(scope).strip()
+        run_type = "international_apec" if scope_key.upper() == "00_APEC" else "international_separate"
+        international_record: dict[str, str] = {
+            "domain": "international",
+            "economy": scope_key,
+            "scope": scope_key,
+            "scenario": str(scenario).strip(),
+            "run_type": run_type,
+            "status": "success",
+            "error": "",
+            "international_workbook": "",
+            "international_medium_summary": "",
+            "international_quality": "",
+            "international_esto_reconciliation": "",
+        }
+
+        config = InternationalExportConfig(
+            input_path=INTERNATIONAL_INPUT_PATH,
+            output_dir=INTERNATIONAL_OUTPUT_DIR,
+            scenario=[str(scenario).strip()],
+            scope=scope_key,
+            base_year=APEC_BASE_YEAR,
+            final_year=APEC_FINAL_YEAR,
+            emit_quality_report=INTERNATIONAL_EMIT_QUALITY_REPORT,
+            emit_medium_summary=INTERNATIONAL_EMIT_MEDIUM_SUMMARY,
+            check_branches_in_leap_using_com=INTERNATIONAL_CHECK_BRANCHES_IN_LEAP_USING_COM,
+            set_vars_in_leap_using_com=INTERNATIONAL_SET_VARS_IN_LEAP_USING_COM,
+            auto_set_missing_branches=INTERNATIONAL_AUTO_SET_MISSING_BRANCHES,
+            ensure_fuels_in_leap=INTERNATIONAL_ENSURE_FUELS_IN_LEAP,
+            reconcile_to_esto=INTERNATIONAL_RECONCILE_TO_ESTO,
+            mapping_workbook_path=INTERNATIONAL_MAPPING_WORKBOOK_PATH,
+            mapping_esto_path=INTERNATIONAL_MAPPING_ESTO_PATH,
+            emit_reconciliation_report=INTERNATIONAL_EMIT_RECONCILIATION_REPORT,
+        )
+        _intl_t0 = time.perf_counter()
+        try:
+            output_paths = run_international_export_workflow(config)
+            international_record["international_workbook"] = str(
+                output_paths.get("workbook", "")
+            ).strip()
+            international_record["international_medium_summary"] = str(
+                output_paths.get("medium_summary", "")
+            ).strip()
+            international_record["international_quality"] = str(
+                output_paths.get("quality", "")
+            ).strip()
+            international_record["international_esto_reconciliation"] = str(
+                output_paths.get("esto_reconciliation", "")
+            ).strip()
+        except Exception as exc:
+            international_record["status"] = "failed"
+            international_record["error"] = str(exc)
+            print(
+                "[ERROR] International workflow failed for "
+                f"scope={international_record['scope']} scenario={international_record['scenario']}: {exc}"
             )
+        _intl_dur = time.perf_counter() - _intl_t0
+        _, _, _, _ifmt = _fmt_duration(_intl_dur)
+        international_record["duration_seconds"] = str(round(_intl_dur, 3))
+        international_record["duration_formatted"] = _ifmt
+        print(f"[TIMING] International {scope_key} | {scenario} — {_ifmt}")
+        records.append(international_record)
+        raise_for_critical_failures(
+            records=[international_record],
+            scenario=scenario,
+            critical_failure_patterns=CRITICAL_FAILURE_PATTERNS,
+        )
+    return records
+
+
+def _run_results_dashboard_stage(scenario_list: list[str]) -> None:
+    from results_analysis.results_dashboard_workflow import run_dashboard_workflow
+
+    include_economies: tuple[str, ...] | None
+    if str(TRANSPORT_ECONOMY_SELECTION).strip().lower() == "all":
+        include_economies = None
+    else:
+        include_economies = (str(TRANSPORT_ECONOMY_SELECTION).strip(),)
+
+    print(
+        "[INFO] Running results dashboard workflow "
+        f"(scenarios={tuple(scenario_list)}, include_economies={include_economies})"
+    )
+    run_dashboard_workflow(
+        scenarios=tuple(str(s).strip() for s in scenario_list),
+        include_economies=include_economies,
+    )
+
+
+def _run_sales_dashboard_stage(scenario: str) -> list[str]:
+    """Render the sales dashboards the domestic stage queued for one scenario."""
+    return render_queued_sales_dashboards(
+        pipeline.resolve_str(SALES_PLOT_QUEUE_DIR),
+        scenario=scenario,
+        max_workers=SALES_PLOT_RENDER_WORKERS,
+    )
+
 
-            if RUN_INTERNATIONAL_WORKFLOW:
-                economy_selection = str(TRANSPORT_ECONOMY_SELECTION).strip()
-                is_all_mode, _, run_separate, run_apec = pipeline.resolve_transport_run_mode(
-                    economy_selection,
-                    ALL_RUN_MODE,
+def _use_concurrent_scenarios(scenario_list: list[str], *, warn: bool = False) -> bool:
+    if not MULTI_SCENARIO_MODE or len(scenario_list) < 2:
+        return False
+    if CHECK_BRANCHES_IN_LEAP_USING_COM or SET_VARS_IN_LEAP_USING_COM:
+        if warn:
+            print("[WARN] LEAP COM access is enabled; running scenarios one after another.")
+        return False
+    return True
+
+
+def build_workflow_stages(scenario_list: list[str], date_id: str) -> list[Stage]:
+    """
+    Declare the workflow stages and their data dependencies.
+
+    Domestic stages run input preparation, sales, export build and
+    reconciliation for one scenario; those steps hand one in-memory frame to
+    each other and stay in order inside `pipeline.run_transport_workflow`.
+    Domestic scenarios are chained because the pipeline settings are
+    module-level, unless MULTI_SCENARIO_MODE runs each scenario in its own
+    worker process. International exports only need their own input, but they
+    share pipeline module state with in-process domestic runs, so both hold
+    _RUNTIME_SETTINGS_LOCK and only overlap with worker-process domestic runs.
+    Deferred sales dashboards only need their scenario's domestic stage.
+    """
+    concurrent_scenarios = _use_concurrent_scenarios(scenario_list, warn=True)
+    run_domestic = _run_domestic_stage_in_worker if concurrent_scenarios else _run_domestic_stage
+    stages: list[Stage] = []
+    scenario_stage_names: list[str] = []
+    previous_domestic: str | None = None
+    for scenario in scenario_list:
+        domestic_name = f"domestic:{scenario}"
+        stages.append(
+            Stage(
+                name=domestic_name,
+                run=lambda _deps, scenario=scenario: run_domestic(scenario, date_id),
+                depends_on=(previous_domestic,) if previous_domestic else (),
+            )
+        )
+        if not concurrent_scenarios:
+            previous_domestic = domestic_name
+        scenario_stage_names.append(domestic_name)
+        if RUN_INTERNATIONAL_WORKFLOW:
+            international_name = f"international:{scenario}"
+            stages.append(
+                Stage(
+                    name=international_name,
+                    run=lambda _deps, scenario=scenario: _run_international_stage(scenario),
                 )
-                if is_all_mode:
-                    scopes: list[str] = []
-                    seen: set[str] = set()
-                    if run_separate:
-                        for economy, _ in pipeline.list_transport_run_configs(scenario):
-                            economy_token = str(economy).strip()
-                            if not economy_token or economy_token in seen:
-                                continue
-                            scopes.append(economy_token)
-                            seen.add(economy_token)
-                    if run_apec and "00_APEC" not in seen:
-                        scopes.append("00_APEC")
-                else:
-                    scopes = [economy_selection]
-
-                if not scopes:
-                    raise RuntimeError(
-                        "International workflow requested but no scopes were resolved "
-                        f"for scenario '{scenario}'."
-                    )
-                for scope in scopes:
-                    scope_key = str(scope).strip()
-                    run_type = "international_apec" if scope_key.upper() == "00_APEC" else "international_separate"
-                    international_record: dict[str, str] = {
-                        "domain": "international",
-                        "economy": scope_key,
-                        "scope": scope_key,
-                        "scenario": str(scenario).strip(),
-                        "run_type": run_type,
-                        "status": "success",
-                        "error": "",
-                        "international_workbook": "",
-                        "international_medium_summary": "",
-                        "international_quality": "",
-                        "international_esto_reconciliation": "",
-                    }
-
-                    config = InternationalExportConfig(
-                        input_path=INTERNATIONAL_INPUT_PATH,
-                        output_dir=INTERNATIONAL_OUTPUT_DIR,
-                        scenario=[str(scenario).strip()],
-                        scope=scope_key,
-                        base_year=APEC_BASE_YEAR,
-                        final_year=APEC_FINAL_YEAR,
-                        emit_quality_report=INTERNATIONAL_EMIT_QUALITY_REPORT,
-                        emit_medium_summary=INTERNATIONAL_EMIT_MEDIUM_SUMMARY,
-                        check_branches_in_leap_using_com=INTERNATIONAL_CHECK_BRANCHES_IN_LEAP_USING_COM,
-                        set_vars_in_leap_using_com=INTERNATIONAL_SET_VARS_IN_LEAP_USING_COM,
-                        auto_set_missing_branches=INTERNATIONAL_AUTO_SET_MISSING_BRANCHES,
-                        ensure_fuels_in_leap=INTERNATIONAL_ENSURE_FUELS_IN_LEAP,
-                        reconcile_to_esto=INTERNATIONAL_RECONCILE_TO_ESTO,
-                        mapping_workbook_path=INTERNATIONAL_MAPPING_WORKBOOK_PATH,
-                        mapping_esto_path=INTERNATIONAL_MAPPING_ESTO_PATH,
-                        emit_reconciliation_report=INTERNATIONAL_EMIT_RECONCILIATION_REPORT,
-                    )
-                    _intl_t0 = time.perf_counter()
-                    try:
-                        output_paths = run_international_export_workflow(config)
-                        international_record["international_workbook"] = str(
-                            output_paths.get("workbook", "")
-                        ).strip()
-                        international_record["international_medium_summary"] = str(
-                            output_paths.get("medium_summary", "")
-                        ).strip()
-                        international_record["international_quality"] = str(
-                            output_paths.get("quality", "")
-                        ).strip()
-                        international_record["international_esto_reconciliation"] = str(
-                            output_paths.get("esto_reconciliation", "")
-                        ).strip()
-                    except Exception as exc:
-                        international_record["status"] = "failed"
-                        international_record["error"] = str(exc)
-                        print(
-                            "[ERROR] International workflow failed for "
-                            f"scope={international_record['scope']} scenario={international_record['scenario']}: {exc}"
-                        )
-                    _intl_dur = time.perf_counter() - _intl_t0
-                    _, _, _, _ifmt = _fmt_duration(_intl_dur)
-                    international_record["duration_seconds"] = str(round(_intl_dur, 3))
-                    international_record["duration_formatted"] = _ifmt
-                    print(f"[TIMING] International {scope_key} | {scenario} — {_ifmt}")
-                    records.append(international_record)
-                    raise_for_critical_failures(
-                        records=[international_record],
-                        scenario=scenario,
-                        critical_failure_patterns=CRITICAL_FAILURE_PATTERNS,
-                    )
+            )
+            scenario_stage_names.append(international_name)
 
+    def run_combined_workbook(deps) -> str:
+        combined_records = [record for name in scenario_stage_names for record in deps[name]]
         combined_output = save_combined_scenario_workbook(
-            records=records,
+            records=combined_records,
             scenario_list=scenario_list,
             date_id=date_id,
             include_international=RUN_INTERNATIONAL_WORKFLOW,
@@ -569,23 +872,71 @@ def run_with_config() -> list[dict]:
             raise RuntimeError(
                 "Combined workbook generation did not produce an output path."
             )
-        if RUN_RESULTS_DASHBOARD:
-            from results_analysis.results_dashboard_workflow import run_dashboard_workflow
+        return combined_output
+
+    stages.append(
+        Stage(
+            name="combined_workbook",
+            run=run_combined_workbook,
+            depends_on=tuple(scenario_stage_names),
+        )
+    )
+    if RUN_RESULTS_DASHBOARD:
+        stages.append(
+            Stage(
+                name="results_dashboard",
+                run=lambda _deps: _run_results_dashboard_stage(scenario_list),
+                depends_on=("combined_workbook",),
+            )
+        )
+    if PASSENGER_PLOT and DEFER_SALES_PLOTS:
+        # Declared last so a one-worker run renders after everything else;
+        # nothing depends on the figures.
+        for scenario in scenario_list:
+            stages.append(
+                Stage(
+                    name=f"sales_dashboards:{scenario}",
+                    run=lambda _deps, scenario=scenario: _run_sales_dashboard_stage(scenario),
+                    depends_on=(f"domestic:{scenario}",),
+                )
+            )
+    return stages
 
-            include_economies: tuple[str, ...] | None
-            if str(TRANSPORT_ECONOMY_SELECTION).strip().lower() == "all":
-                include_economies = None
-            else:
-                include_economies = (str(TRANSPORT_ECONOMY_SELECTION).strip(),)
 
+def run_with_config() -> list[dict]:
+    """Run transport workflow using constants defined in this file."""
+    scenario_list = resolve_scenario_selection(TRANSPORT_SCENARIO_SELECTION)
+    date_id = datetime.now().strftime("%Y%m%d")
+    if ARCHIVE_CONFIG_ON_SIZE_CHANGE:
+        archived_config_dir = archive_config_folder_if_size_changed(
+            stamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
+        )
+        if archived_config_dir:
+            print(f"[INFO] Archived config snapshot to {archived_config_dir}")
+
+    records: list[dict] = []
+    with output_filter_context(RUN_OUTPUT_MODE):
+        scheduler = StageScheduler(build_workflow_stages(scenario_list, date_id))
+        results_path = pipeline.resolve_str(STAGE_RESULTS_PATH)
+        previous_results = load_stage_results(results_path) if RUN_STAGES else {}
+        if RUN_STAGES:
             print(
-                "[INFO] Running results dashboard workflow "
-                f"(scenarios={tuple(scenario_list)}, include_economies={include_economies})"
-            )
-            run_dashboard_workflow(
-                scenarios=tuple(str(s).strip() for s in scenario_list),
-                include_economies=include_economies,
+                "[INFO] Targeted rerun: "
+                + ", ".join(scheduler.downstream_of(RUN_STAGES))
             )
+        stage_workers = STAGE_WORKERS
+        if _use_concurrent_scenarios(scenario_list):
+            stage_workers = max(STAGE_WORKERS, len(scenario_list))
+        stage_results = scheduler.run(
+            only=RUN_STAGES,
+            max_workers=stage_workers,
+            results=previous_results,
+        )
+        save_stage_results(results_path, stage_results)
+        rerun_stages = set(scheduler.downstream_of(RUN_STAGES) if RUN_STAGES else scheduler.order)
+        for name in scheduler.order:
+            if name.split(":", 1)[0] in {"domestic", "international"} and name in rerun_stages:
+                records.extend(stage_results[name])
 
         settings_meta = {
             "run_profile": RUN_PROFILE,
@@ -0,0 +1,173 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.transport_workflow_pipeline as pipeline
+from configurations.basic_mappings import EXPECTED_COLS_IN_SOURCE
+from functions.preprocessing import apply_source_dtypes, read_transport_source_data
+
+
+class IncrementalApecAggregationTests(unittest.TestCase):
+    @staticmethod
+    def _economy_frame(economy: str, seed: int) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        rows = [
+            {
+                "Economy": economy,
+                "Scenario": "Reference",
+                "Date": date,
+                "Transport Type": "passenger",
+                "Medium": "road",
+                "Vehicle Type": vehicle_type,
+                "Drive": drive,
+                "Fuel": f"fuel_{drive}",
+            }
+            for date in (2022, 2023)
+            for vehicle_type in ("car", "bus")
+            for drive in ("ice", "bev")
+        ]
+        df = pd.DataFrame(rows)
+        for col in ("Stocks", "Activity", "Energy", "Efficiency", "Mileage"):
+            values = rng.lognormal(2.0, 3.0, len(df))
+            values[rng.random(len(df)) < 0.2] = np.nan
+            df[col] = values
+        df["Age_distribution"] = pd.Series(
+            np.where(rng.random(len(df)) < 0.5, None, f"profile_{economy}"), dtype="str"
+        )
+        return apply_source_dtypes(df)
+
+    def test_folding_economies_matches_aggregating_the_concatenated_frame(self):
+        frames = [self._economy_frame(f"{idx:02d}_ECON", idx) for idx in range(4)]
+        expected = pipeline.aggregate_economies_to_apec(
+            pd.concat(frames, ignore_index=True), scenario="Reference"
+        )
+
+        aggregator = pipeline.IncrementalApecAggregator(scenario="Reference")
+        for frame in frames:
+            aggregator.add(frame)
+        result = aggregator.finalize()
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+        self.assertTrue((result["Economy"] == "00_APEC").all())
+
+    def test_object_key_columns_come_back_with_groupby_dtypes(self):
+        key_cols = ["Scenario", "Transport Type", "Medium", "Vehicle Type", "Drive", "Fuel"]
+        frames = [
+            self._economy_frame(f"{idx:02d}_ECON", idx).astype({col: object for col in key_cols})
+            for idx in range(2)
+        ]
+        expected = (
+            pd.concat(frames, ignore_index=True)
+            .groupby(pipeline._APEC_GROUP_COLS, dropna=False)
+            .size()
+            .reset_index()[pipeline._APEC_GROUP_COLS]
+            .dtypes.to_dict()
+        )
+
+        aggregator = pipeline.IncrementalApecAggregator(scenario="Reference")
+        for frame in frames:
+            aggregator.add(frame)
+        result = aggregator.finalize()
+
+        self.assertEqual(result[pipeline._APEC_GROUP_COLS].dtypes.to_dict(), expected)
+        self.assertEqual(str(result["Fuel"].dtype), "str")
+
+    def test_weighted_columns_use_weight_and_fall_back_to_mean(self):
+        frames = [self._economy_frame("01_A", 1), self._economy_frame("02_B", 2)]
+        frames[0]["Activity"] = 1.0
+        frames[1]["Activity"] = 3.0
+        frames[0]["Efficiency"] = 2.0
+        frames[1]["Efficiency"] = 6.0
+        frames[1].loc[0, "Activity"] = 0.0
+        frames[0].loc[0, "Activity"] = 0.0
+
+        aggregator = pipeline.IncrementalApecAggregator(scenario="Reference")
+        for frame in frames:
+            aggregator.add(frame)
+        result = aggregator.finalize()
+
+        efficiency = result["Efficiency"].to_numpy()
+        # Zero total weight falls back to the unweighted mean.
+        self.assertEqual(sorted(set(efficiency.tolist())), [4.0, 5.0])
+        self.assertEqual((efficiency == 4.0).sum(), 1)
+
+    def test_empty_scenario_raises(self):
+        aggregator = pipeline.IncrementalApecAggregator(scenario="Target")
+        aggregator.add(self._economy_frame("01_A", 1))
+        with self.assertRaisesRegex(ValueError, "No rows found"):
+            aggregator.finalize()
+
+    def test_apec_input_is_folded_from_the_published_input_checkpoints(self):
+        frames = {economy: self._economy_frame(economy, idx) for idx, economy in enumerate(("01_A", "02_B"))}
+        cfg = SimpleNamespace(transport_base_year=2022)
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.multiple(
+            pipeline,
+            resolve_str=lambda path: str(Path(tmpdir) / Path(path).name),
+            list_transport_run_configs=lambda scenario: [(economy, scenario) for economy in frames],
+            load_transport_run_config=lambda economy, scenario: (None, None, cfg),
+            prepare_input_data=mock.Mock(side_effect=AssertionError("economy prepared again")),
+        ):
+            paths = {}
+            for economy, frame in frames.items():
+                paths[(economy, "Reference")] = pipeline.input_checkpoint_path(economy, "Reference", 2022, 2023)
+                frame.to_pickle(paths[(economy, "Reference")])
+
+            result = pipeline.prepare_apec_input_data(
+                scenario="Reference",
+                base_year=2022,
+                final_year=2023,
+                load_checkpoint=False,
+                prepared_input_paths=paths,
+            )
+
+        expected = pipeline.aggregate_economies_to_apec(
+            pd.concat(frames.values(), ignore_index=True), scenario="Reference"
+        )
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+class ReadTransportSourceDataTests(unittest.TestCase):
+    def test_non_numeric_measure_cells_are_read_as_nan(self):
+        rows = []
+        for date in (2021, 2022, 2023):
+            row = {col: "" for col in EXPECTED_COLS_IN_SOURCE}
+            row.update({
+                "Economy": "01_AUS",
+                "Scenario": "Reference",
+                "Date": date,
+                "Transport Type": "passenger",
+                "Medium": "road",
+                "Vehicle Type": "car",
+                "Drive": "ice",
+                "Stocks": str(date - 2000),
+                "Energy": "1.5",
+            })
+            rows.append(row)
+        rows[1]["Stocks"] = "n/a"
+        rows[2]["Energy"] = "-"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "source.csv"
+            pd.DataFrame(rows).to_csv(path, index=False)
+            df = read_transport_source_data(path, "01_AUS", "Reference", 2022, 2023)
+
+        self.assertEqual(df["Date"].tolist(), [2022, 2023])
+        self.assertEqual(df["Stocks"].dtype, "float64")
+        self.assertTrue(np.isnan(df["Stocks"].iloc[0]))
+        self.assertEqual(df["Stocks"].iloc[1], 23.0)
+        self.assertEqual(df["Energy"].iloc[0], 1.5)
+        self.assertTrue(np.isnan(df["Energy"].iloc[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.apec_mapping_workbook as amw
+
+
+class MappingWorkbookCacheTests(unittest.TestCase):
+    @staticmethod
+    def _write_workbook(path: Path) -> None:
+        esto = pd.DataFrame(
+            {
+                "esto_flow": ["15.01 Domestic air", "15.02 Road", "15.02 Road"],
+                "esto_product": ["07.01 Jet", "07.02 Gasoline", "07.07 Diesel"],
+                "leap_sector_name_full_path": [
+                    "Passenger non road/Air",
+                    "Passenger road/LPV",
+                    "Passenger road/LPV",
+                ],
+                "raw_leap_fuel_name": ["Jet fuel", "Gasoline", "Diesel"],
+                "remove_row": [False, False, True],
+            }
+        )
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name in amw.MAPPING_WORKBOOK_SHEETS:
+                frame = esto if sheet_name == "leap_combined_esto" else pd.DataFrame({"a": [1]})
+                frame.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    def setUp(self):
+        amw.clear_mapping_workbook_cache()
+        self.addCleanup(amw.clear_mapping_workbook_cache)
+
+    def test_workbook_parsed_once_and_reused_from_disk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            workbook_path = tmp / "mapping.xlsx"
+            self._write_workbook(workbook_path)
+            branches = [
+                ("Passenger non road", "Air", "Jet fuel"),
+                ("Passenger road", "LPV", "Gasoline"),
+            ]
+
+            with mock.patch.object(amw, "MAPPING_WORKBOOK_CACHE_DIR", tmp / "cache"), mock.patch.object(
+                amw, "_parse_mapping_workbook", wraps=amw._parse_mapping_workbook
+            ) as parse:
+                first = amw.build_workbook_esto_to_leap_mapping(workbook_path, branches)
+                first[("15.02 Road", "07.02 Gasoline")].clear()
+                second = amw.build_workbook_esto_to_leap_mapping(workbook_path, branches)
+                sheets = amw.load_mapping_workbook(workbook_path)
+                self.assertEqual(parse.call_count, 1)
+
+                amw.clear_mapping_workbook_cache()
+                from_disk = amw.load_mapping_workbook(workbook_path)
+                self.assertEqual(parse.call_count, 1)
+
+        self.assertEqual(
+            second,
+            {
+                ("15.01 Domestic air", "07.01 Jet"): [("Passenger non road", "Air", "Jet fuel")],
+                ("15.02 Road", "07.02 Gasoline"): [("Passenger road", "LPV", "Gasoline")],
+            },
+        )
+        self.assertEqual(len(sheets["leap_combined_esto"]), 2)
+        pd.testing.assert_frame_equal(from_disk["leap_combined_esto"], sheets["leap_combined_esto"])
+
+    def test_unmatched_rows_warning_repeats_for_cached_mapping(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            workbook_path = tmp / "mapping.xlsx"
+            self._write_workbook(workbook_path)
+            branches = [("Passenger road", "LPV", "Gasoline")]
+
+            with mock.patch.object(amw, "MAPPING_WORKBOOK_CACHE_DIR", tmp / "cache"):
+                outputs = []
+                for _ in range(2):
+                    buffer = io.StringIO()
+                    with redirect_stdout(buffer):
+                        amw.build_workbook_esto_to_leap_mapping(workbook_path, branches)
+                    outputs.append(buffer.getvalue())
+
+        for output in outputs:
+            self.assertIn("matched_keys=1, unmatched_rows=1", output)
+            self.assertIn("Passenger non road/Air", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
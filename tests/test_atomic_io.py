@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.atomic_io as atomic_io
+import functions.transport_workflow_pipeline as pipeline
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_failed_write_keeps_previous_file_and_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "sales.csv"
+            atomic_io.write_csv_atomic(pd.DataFrame({"a": [1]}), path, index=False)
+
+            with self.assertRaises(RuntimeError):
+                with atomic_io.atomic_output_path(path) as tmp_path:
+                    self.assertTrue(tmp_path.endswith(".csv"))
+                    Path(tmp_path).write_text("partial", encoding="utf-8")
+                    raise RuntimeError("writer failed")
+
+            self.assertEqual(pd.read_csv(path)["a"].tolist(), [1])
+            self.assertEqual(os.listdir(tmpdir), ["sales.csv"])
+
+    def test_pickle_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / "checkpoint.pkl"
+            frame = pd.DataFrame({"x": [1.5, 2.5]})
+            atomic_io.write_pickle_atomic(frame, path)
+            pd.testing.assert_frame_equal(pd.read_pickle(path), frame)
+
+
+class ArchiveNamingTests(unittest.TestCase):
+    def test_concurrent_reservations_get_distinct_names(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = Path(tmpdir) / "export_20250101.xlsx"
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                paths = list(executor.map(lambda _: atomic_io.reserve_unique_path(target), range(24)))
+
+            self.assertEqual(len(set(paths)), 24)
+            self.assertIn(target, paths)
+            self.assertIn(target.with_name("export_20250101_01.xlsx"), paths)
+
+    def test_archive_existing_output_file_moves_into_archive_with_unique_names(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "summary.csv"
+            archived = []
+            for content in ("first", "second"):
+                output.write_text(content, encoding="utf-8")
+                archived.append(pipeline._archive_existing_output_file(str(output), date_id="run1"))
+
+            self.assertFalse(output.exists())
+            self.assertEqual(
+                [Path(path).name for path in archived], ["summary_run1.csv", "summary_run1_01.csv"]
+            )
+            self.assertEqual(Path(archived[1]).read_text(encoding="utf-8"), "second")
+            self.assertIsNone(pipeline._archive_existing_output_file(str(output), date_id="run1"))
+
+    def test_move_returns_none_and_releases_name_when_source_is_gone(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            destination = Path(tmpdir) / "archive" / "report.csv"
+            destination.parent.mkdir()
+            self.assertIsNone(atomic_io.move_to_unique_path(Path(tmpdir) / "missing.csv", destination))
+            self.assertFalse(destination.exists())
+
+    def test_create_unique_directory_suffixes_existing_names(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = atomic_io.create_unique_directory(Path(tmpdir) / "config_x")
+            second = atomic_io.create_unique_directory(Path(tmpdir) / "config_x")
+            self.assertEqual((first.name, second.name), ("config_x", "config_x_01"))
+
+
+if __name__ == "__main__":
+    unittest.main()
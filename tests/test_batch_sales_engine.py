@@ -0,0 +1,274 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.sales_curve_estimate as sce
+import functions.transport_workflow_pipeline as pipeline
+import sales_workflow as sw
+
+ECONOMIES = ("01_AUS", "02_BD", "03_CDA")
+YEARS = list(range(2022, 2031))
+VEHICLE_ROWS = (
+    ("passenger", "car"),
+    ("passenger", "suv"),
+    ("passenger", "2w"),
+    ("passenger", "bus"),
+    ("freight", "ht"),
+    ("freight", "lcv"),
+)
+
+
+def _source_frame() -> pd.DataFrame:
+    rows = []
+    for scale, economy in enumerate(ECONOMIES, start=1):
+        for year in YEARS:
+            for position, (transport_type, vehicle_type) in enumerate(VEHICLE_ROWS, start=1):
+                rows.append(
+                    {
+                        "Economy": economy,
+                        "Scenario": "Reference",
+                        "Date": year,
+                        "Transport Type": transport_type,
+                        "Medium": "road",
+                        "Vehicle Type": vehicle_type,
+                        "Population": 1000.0 * scale + 10.0 * (year - YEARS[0]),
+                        "Stocks": 5.0 * scale * position,
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def _esto_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    rows = []
+    for economy in ECONOMIES:
+        for sub1sector in ("15_02_road", "15_03_rail"):
+            rows.append(
+                {
+                    "scenarios": "reference",
+                    "economy": economy,
+                    "sectors": "15_transport_sector",
+                    "sub1sectors": sub1sector,
+                    "fuels": "07_petroleum_products",
+                    "subfuels": "x",
+                    "subtotal_layout": False,
+                    "subtotal_results": False,
+                    **{str(year): value for year, value in zip(YEARS, rng.uniform(50.0, 150.0, len(YEARS)))},
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _profiles(vehicles) -> tuple[dict, dict]:
+    ages = pd.Index(range(6))
+    survival = {vehicle: pd.Series([1.0, 0.95, 0.85, 0.6, 0.3, 0.0], index=ages) for vehicle in vehicles}
+    vintage = {vehicle: pd.Series([0.3, 0.25, 0.2, 0.15, 0.1, 0.0], index=ages) for vehicle in vehicles}
+    return survival, vintage
+
+
+class BatchSalesEngineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.esto_path = str(Path(self._tmpdir.name) / "esto.csv")
+        _esto_frame().to_csv(self.esto_path, index=False)
+        self.df = _source_frame()
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _requests(self, vehicles, **extra) -> dict:
+        survival, vintage = _profiles(vehicles)
+        return {
+            economy: {
+                "df": self.df,
+                "survival_curves": survival,
+                "vintage_profiles": vintage,
+                "economy": economy,
+                "scenario": "Reference",
+                "base_year": YEARS[0],
+                "final_year": YEARS[-1],
+                "esto_energy_path": self.esto_path,
+                "use_9th_vehicle_type_sales_shares": False,
+                **extra,
+            }
+            for economy in ECONOMIES
+        }
+
+    def _assert_matches_single_economy_runs(self, transport_type, estimate, requests):
+        batch = sw.estimate_sales_for_economies(transport_type, requests)
+        self.assertEqual(list(batch), list(ECONOMIES))
+        for economy, request in requests.items():
+            single = estimate(plot=False, **request)
+            pd.testing.assert_frame_equal(batch[economy]["sales_table"], single["sales_table"], check_exact=True)
+            pd.testing.assert_series_equal(batch[economy]["M_envelope"], single["M_envelope"], check_exact=True)
+            for vehicle, sales in single["sales"].items():
+                pd.testing.assert_series_equal(batch[economy]["sales"][vehicle], sales, check_exact=True)
+                pd.testing.assert_series_equal(
+                    batch[economy]["retirements"][vehicle], single["retirements"][vehicle], check_exact=True
+                )
+
+    def test_passenger_batch_matches_single_economy_runs(self):
+        requests = self._requests(("LPV", "MC", "Bus"))
+        requests["02_BD"]["turnover_policies"] = {"LPV": {"additional_retirement_rate": 0.05}}
+        self._assert_matches_single_economy_runs(
+            "passenger", sw.estimate_passenger_sales_from_dataframe, requests
+        )
+
+    def test_freight_batch_matches_single_economy_runs(self):
+        requests = self._requests(("Trucks", "LCVs"), analysis_initial_fleet_age_shift_years=1.0)
+        self._assert_matches_single_economy_runs(
+            "freight", sw.estimate_freight_sales_from_dataframe, requests
+        )
+
+    def test_rising_energy_trend_matches_single_economy_runs(self):
+        # Energy is read from the base year on, so the recent growth is derived
+        # from each economy's own energy level to take the logistic (k > 0)
+        # branch in both engines.
+        def recent_growth(energy_use, base_year, window_years=10):
+            return float(energy_use.iloc[0]) / 2500.0
+
+        requests = self._requests(("LPV", "MC", "Bus"))
+        with mock.patch.object(sce, "estimate_recent_energy_growth", side_effect=recent_growth):
+            self._assert_matches_single_economy_runs(
+                "passenger", sw.estimate_passenger_sales_from_dataframe, requests
+            )
+            batch = sw.estimate_sales_for_economies("passenger", requests)
+
+        for economy in ECONOMIES:
+            self.assertGreater(batch[economy]["k_used"], 0.0)
+            envelope = batch[economy]["M_envelope"]
+            self.assertGreater(envelope.iloc[-1], envelope.iloc[0])
+
+    def test_failed_economy_is_recorded_and_others_still_estimated(self):
+        requests = self._requests(("LPV", "MC", "Bus"))
+        requests["03_CDA"]["df"] = self.df[self.df["Economy"] != "03_CDA"]
+
+        errors = {}
+        batch = sw.estimate_sales_for_economies("passenger", requests, errors=errors)
+
+        self.assertEqual(list(batch), ["01_AUS", "02_BD"])
+        self.assertEqual(list(errors), ["03_CDA"])
+        with self.assertRaises(ValueError):
+            sw.estimate_sales_for_economies("passenger", {"03_CDA": requests["03_CDA"]})
+
+    def test_pipeline_runs_reuse_matching_batch_results_only(self):
+        survival, vintage = _profiles(("LPV", "MC", "Bus"))
+        calls = []
+
+        def fake_estimate(**kwargs):
+            calls.append(kwargs["economy"])
+            return {"sales_table": pd.DataFrame({"Date": [2022], "LPV": [1.0]})}
+
+        def run(economy, df):
+            return pipeline._estimate_sales_with_cache(
+                "passenger",
+                fake_estimate,
+                df=df,
+                economy=economy,
+                scenario="Reference",
+                survival_curves=survival,
+                vintage_profiles=vintage,
+                esto_energy_path=self.esto_path,
+                plot=False,
+                estimate_kwargs={"base_year": YEARS[0], "final_year": YEARS[-1]},
+            )
+
+        batch_result = {"sales_table": pd.DataFrame({"Date": [2022], "LPV": [2.0]})}
+        with mock.patch.multiple(
+            pipeline,
+            SALES_RESULT_CACHE_DIR=None,
+            _BATCH_SALES_RESULTS={},
+            _BATCH_SALES_USED=set(),
+        ):
+            for economy in ("01_AUS", "02_BD"):
+                fingerprint = pipeline._sales_inputs_fingerprint(
+                    "passenger",
+                    df=self.df,
+                    economy=economy,
+                    scenario="Reference",
+                    survival_curves=survival,
+                    vintage_profiles=vintage,
+                    esto_energy_path=self.esto_path,
+                    estimate_kwargs={"base_year": YEARS[0], "final_year": YEARS[-1]},
+                )
+                pipeline._BATCH_SALES_RESULTS[("passenger", economy, "Reference")] = (fingerprint, batch_result)
+
+            self.assertIs(run("01_AUS", self.df), batch_result)
+            changed = self.df.assign(Stocks=self.df["Stocks"] * 2.0)
+            self.assertIsNot(run("02_BD", changed), batch_result)
+
+            self.assertEqual(calls, ["02_BD"])
+            self.assertEqual(pipeline._BATCH_SALES_USED, {("passenger", "01_AUS", "Reference")})
+            self.assertEqual(pipeline._BATCH_SALES_RESULTS, {})
+
+    def test_prepass_hands_runs_their_input_through_the_checkpoint(self):
+        root = Path(self._tmpdir.name)
+        cfg = SimpleNamespace(
+            transport_model_path="model.xlsx",
+            transport_esto_balances_path=self.esto_path,
+            transport_fuels_path=None,
+            survival_profile_path="survival.xlsx",
+            vintage_profile_path="vintage.xlsx",
+            transport_base_year=YEARS[0],
+            transport_final_year=YEARS[-1],
+        )
+        frames = {economy: self.df[self.df["Economy"] == economy] for economy in ECONOMIES}
+
+        def prepare(economy, scenario, transport_cfg):
+            frames[economy].to_pickle(pipeline.input_checkpoint_path(economy, scenario, YEARS[0], YEARS[-1]))
+            return frames[economy]
+
+        batch_requests = []
+        received = {}
+
+        def fake_run(*, transport_economy, transport_scenario, transport_cfg, run_type, skip_stages=(), **prepared):
+            received[transport_economy] = prepared.get("prepared_input_df")
+            return {"economy": transport_economy, "scenario": transport_scenario, "status": "success"}
+
+        with mock.patch.multiple(
+            pipeline,
+            BATCH_SALES_ENGINE=True,
+            RUN_INPUT_CREATION=True,
+            RUN_PASSENGER_SALES=False,
+            RUN_FREIGHT_SALES=True,
+            RUN_MANIFEST_PATH=None,
+            RESUME_BATCH_RUNS=False,
+            PARALLEL_ECONOMY_WORKERS=1,
+            resolve_str=lambda path: str(root / Path(path).name),
+            load_transport_run_config=lambda economy, scenario: (economy, scenario, cfg),
+            _prepare_target_input=prepare,
+            load_survival_and_vintage_profiles=lambda **_: _profiles(("Trucks", "LCVs")),
+            _resolve_target_sales_policy_settings=lambda _cfg: ({}, {}),
+            estimate_sales_for_economies=lambda transport_type, requests, errors=None: (
+                batch_requests.append(sorted(request["economy"] for request in requests.values())) or {}
+            ),
+            run_configured_transport_workflow=fake_run,
+        ):
+            records = pipeline.run_configured_targets(
+                [(economy, "Reference") for economy in ECONOMIES], run_type="separate"
+            )
+
+        self.assertEqual(batch_requests, [list(ECONOMIES)])
+        for record in records:
+            economy = record["economy"]
+            self.assertEqual(
+                record["input_checkpoint_path"],
+                str(root / f"transport_data_{economy}_Reference_{YEARS[0]}_{YEARS[-1]}.pkl"),
+            )
+            pd.testing.assert_frame_equal(received[economy], frames[economy])
+            self.assertIsNot(received[economy], frames[economy])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BENCHMARK_DIR = REPO_ROOT / "benchmarks"
+if str(BENCHMARK_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARK_DIR))
+
+import synthetic_data as sd
+from config.basic_mappings import EXPECTED_COLS_IN_SOURCE
+from configurations.branch_mappings import NINTH_SOURCE_TO_LEAP_BRANCH_MAP
+
+
+class SyntheticDataTests(unittest.TestCase):
+    def test_source_frame_has_source_layout_and_requested_size(self):
+        config = sd.SyntheticConfig(
+            economies=("01_AUS", "02_BD"),
+            base_year=2022,
+            final_year=2025,
+            drive_breadth="narrow",
+        )
+        df = sd.build_source_frame(config)
+
+        self.assertEqual(list(df.columns), list(EXPECTED_COLS_IN_SOURCE))
+        leaves = len(sd._tree_leaves("narrow"))
+        self.assertEqual(len(df), 2 * 4 * leaves)
+        self.assertLess(leaves, len(sd._tree_leaves("full")))
+        road_drives = set(df.loc[df["Medium"] == "road", "Drive"])
+        self.assertTrue(road_drives <= set(sd.ROAD_DRIVES_BY_BREADTH["narrow"]))
+        self.assertTrue((df.loc[df["Medium"] != "road", "Stocks"] == 0).all())
+
+    def test_esto_balances_cover_every_mapped_key(self):
+        config = sd.SyntheticConfig(final_year=2025)
+        esto = sd.build_esto_balances(config)
+
+        keys = set(zip(esto["sub1sectors"], esto["fuels"], esto["subfuels"]))
+        expected = {(key[0], key[-2], key[-1]) for key in NINTH_SOURCE_TO_LEAP_BRANCH_MAP}
+        self.assertEqual(keys, expected)
+        self.assertIn(2025, esto.columns)
+
+    def test_stock_series_are_valid_turnover_inputs(self):
+        series = sd.build_stock_series(sd.SyntheticConfig(final_year=2030), count=3, max_age=20)
+
+        self.assertEqual(len(series), 3)
+        for target_stock, survival, vintage in series:
+            self.assertEqual(list(target_stock.index), list(range(2022, 2031)))
+            self.assertAlmostEqual(float(vintage.sum()), 1.0)
+            self.assertEqual(float(survival.iloc[-1]), 0.0)
+            self.assertTrue(np.all((survival >= 0) & (survival <= 1)))
+
+    def test_unknown_drive_breadth_raises(self):
+        with self.assertRaisesRegex(ValueError, "drive_breadth"):
+            sd.build_source_frame(sd.SyntheticConfig(drive_breadth="everything"))
+
+
+if __name__ == "__main__":
+    unittest.main()
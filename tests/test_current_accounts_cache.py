@@ -0,0 +1,106 @@
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+from functions.current_accounts_cache import (
+    current_accounts_cache_key,
+    load_or_build_current_accounts,
+)
+
+
+def _current_accounts_block(stock: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Branch Path": [r"Demand\Passenger road\LPVs", r"Demand\Freight road\Trucks"],
+            "Variable": ["Stock", "Stock"],
+            "Scenario": ["Current Accounts", "Current Accounts"],
+            2022: [stock, 50.0],
+        }
+    )
+
+
+class CurrentAccountsCacheTests(unittest.TestCase):
+    def test_key_depends_on_block_values_totals_and_settings(self):
+        totals = {("15_02_road", "07_petroleum_products"): 10.0}
+        settings = {"economy": "01_AUS", "base_year": 2022}
+        key = current_accounts_cache_key(_current_accounts_block(100.0), esto_energy_totals=totals, settings=settings)
+
+        self.assertEqual(
+            key,
+            current_accounts_cache_key(
+                _current_accounts_block(100.0).set_axis([7, 8]),
+                esto_energy_totals=dict(totals),
+                settings=dict(settings),
+            ),
+        )
+        self.assertNotEqual(
+            key,
+            current_accounts_cache_key(_current_accounts_block(101.0), esto_energy_totals=totals, settings=settings),
+        )
+        self.assertNotEqual(
+            key,
+            current_accounts_cache_key(
+                _current_accounts_block(100.0),
+                esto_energy_totals={("15_02_road", "07_petroleum_products"): 11.0},
+                settings=settings,
+            ),
+        )
+        self.assertNotEqual(
+            key,
+            current_accounts_cache_key(
+                _current_accounts_block(100.0),
+                esto_energy_totals=totals,
+                settings={**settings, "base_year": 2023},
+            ),
+        )
+
+    def test_concurrent_scenarios_fit_the_block_once(self):
+        build_calls = []
+        release = threading.Event()
+
+        def build():
+            build_calls.append(threading.get_ident())
+            release.wait(5)
+            return {"working_df": _current_accounts_block(90.0), "cumulative_scale_factors": {("a",): 0.9}}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "current_accounts_01_AUS_abc.pkl"
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = [
+                    pool.submit(load_or_build_current_accounts, cache_path, build, poll_seconds=0.01)
+                    for _ in range(3)
+                ]
+                release.set()
+                results = [future.result() for future in futures]
+
+            self.assertEqual(len(build_calls), 1)
+            self.assertEqual(sorted(reused for _, reused in results), [False, True, True])
+            for result, _ in results:
+                self.assertEqual(result["cumulative_scale_factors"], {("a",): 0.9})
+            self.assertEqual(sorted(path.name for path in Path(tmpdir).iterdir()), [cache_path.name])
+
+    def test_failed_fit_releases_the_lock(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "current_accounts.pkl"
+
+            def failing_build():
+                raise ValueError("fit failed")
+
+            with self.assertRaises(ValueError):
+                load_or_build_current_accounts(cache_path, failing_build)
+            result, reused = load_or_build_current_accounts(cache_path, lambda: {"ok": True})
+            self.assertEqual((result, reused), ({"ok": True}, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import sys
 import tempfile
 import unittest
@@ -11,7 +12,12 @@ if str(CODE_DIR) not in sys.path:
     sys.path.insert(0, str(CODE_DIR))
 
 from functions.leap_utilities_functions import (
+    _frame_from_parquet,
+    export_sidecar_paths,
     join_and_check_import_structure_matches_export_structure,
+    read_export_sheets,
+    save_export_files,
+    write_export_sidecars,
 )
 
 
@@ -86,6 +92,110 @@ class LeapUtilitiesFunctionsTests(unittest.TestCase):
         self.assertEqual(set(leap_df["Level 1"]), {"Demand"})
         self.assertEqual(set(viewing_df["BranchID"]), {10})
 
+    @staticmethod
+    def _sample_export_df() -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "BranchID": pd.array([10, 11], dtype="Int64"),
+                "VariableID": pd.array([20, pd.NA], dtype="Int64"),
+                "ScenarioID": pd.array([4, 4], dtype="Int64"),
+                "RegionID": pd.array([1, 1], dtype="Int64"),
+                "Branch Path": [r"Demand\Transport", r"Demand\Transport\Road"],
+                "Variable": ["Total Activity", "Stock"],
+                "Scenario": ["Reference", "Reference"],
+                "Region": ["United States of America"] * 2,
+                "Scale": ["Million", pd.NA],
+                "Units": ["Vehicle-km", "Vehicle"],
+                "Per...": [pd.NA, pd.NA],
+                "Expression": ["Interp(2022, 1, 2023, 2)", "3"],
+                2022: [1.0, 3.0],
+                2023: [2.0, float("nan")],
+                "Level 1": ["Demand", "Demand"],
+                "Level 2": ["Transport", "Transport"],
+            }
+        )
+
+    def test_streaming_export_matches_pandas_writer(self):
+        export_df = self._sample_export_df()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sheets = {}
+            for mode in ("pandas", "streaming"):
+                path = Path(tmp) / f"export_{mode}.xlsx"
+                save_export_files(
+                    export_df,
+                    export_df,
+                    str(path),
+                    2022,
+                    2023,
+                    "Transport",
+                    writer_mode=mode,
+                )
+                sheets[mode] = pd.read_excel(path, sheet_name=None, header=None)
+
+        self.assertEqual(list(sheets["streaming"]), ["FOR_VIEWING", "LEAP"])
+        for sheet_name, expected in sheets["pandas"].items():
+            pd.testing.assert_frame_equal(
+                sheets["streaming"][sheet_name],
+                expected,
+                check_dtype=False,
+            )
+
+    def test_read_export_sheets_prefers_fresh_sidecars(self):
+        export_df = self._sample_export_df()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "export.xlsx"
+            save_export_files(export_df, export_df, str(path), 2022, 2023, "Transport")
+            sidecars = export_sidecar_paths(path)
+            self.assertTrue(all(p.exists() for p in sidecars.values()))
+
+            from_sidecar_leap, from_sidecar_view = read_export_sheets(path)
+            workbook_leap = pd.read_excel(path, sheet_name="LEAP", header=2)
+            workbook_view = pd.read_excel(path, sheet_name="FOR_VIEWING", header=2)
+            self.assertEqual(list(from_sidecar_leap.columns), list(workbook_leap.columns))
+            self.assertEqual(list(from_sidecar_view.columns), list(workbook_view.columns))
+            self.assertEqual(from_sidecar_view[2022].tolist(), workbook_view[2022].tolist())
+
+            # A workbook edited after the sidecars were written wins.
+            stale = path.stat().st_mtime - 10
+            for sidecar in sidecars.values():
+                os.utime(sidecar, (stale, stale))
+            sidecars["LEAP"].write_bytes(b"not parquet")
+            os.utime(sidecars["LEAP"], (stale, stale))
+            fallback_leap, _ = read_export_sheets(path)
+            self.assertEqual(fallback_leap["Expression"].tolist(), workbook_leap["Expression"].tolist())
+
+    def test_sidecars_round_trip_missing_and_mixed_values(self):
+        frame = pd.DataFrame(
+            {
+                "Branch Path": ["Demand\\Road", None, "Demand\\Rail", "Demand\\Air"],
+                2022: pd.Series([1.5, "Interp(2030, 5)", None, 3], dtype=object),
+                2023: pd.Series([float("nan"), 7, "Growth(2%)", 2.25], dtype=object),
+                "Scale": pd.Series([None, None, None, None], dtype=object),
+                "Units": ["PJ", "PJ", float("nan"), "PJ"],
+            }
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "export.xlsx"
+            sidecars = write_export_sidecars(path, [("LEAP", frame)])
+            restored = _frame_from_parquet(pd.read_parquet(sidecars["LEAP"]))
+
+        self.assertEqual(list(restored.columns), list(frame.columns))
+        for col in (2022, 2023):
+            self.assertEqual(
+                [None if pd.isna(value) else value for value in restored[col]],
+                [None if pd.isna(value) else value for value in frame[col]],
+            )
+            self.assertEqual(
+                [type(value) for value in restored[col].dropna()],
+                [type(value) for value in frame[col].dropna()],
+            )
+        self.assertTrue(restored["Scale"].isna().all())
+        self.assertEqual(restored["Branch Path"].isna().tolist(), frame["Branch Path"].isna().tolist())
+        self.assertEqual(restored["Units"].isna().tolist(), [False, False, True, False])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,145 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.atomic_io as atomic_io
+import functions.lifecycle_profile_editor as lpe
+
+
+def _write_profile_workbook(path: Path, values: dict[int, float]) -> None:
+    rows = [["Area:", "Transport"], ["Profile:", "test"], [None, None], ["Year", "Value"]]
+    rows.extend([[age, value] for age, value in values.items()])
+    pd.DataFrame(rows).to_excel(path, sheet_name="Lifecycle Profiles", header=False, index=False)
+
+
+class EconomyLifecycleProfileGenerationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.original = self.root / "vehicle_survival_original.xlsx"
+        survival = 100.0 * np.power(0.97, np.arange(26) ** 1.5)
+        _write_profile_workbook(self.original, dict(enumerate(survival.tolist())))
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_outputs_match_the_per_economy_vintage_derivation(self):
+        results = lpe.generate_economy_specific_lifecycle_profiles(
+            economy_selection=["01_AUS", "02_BD"],
+            original_survival_path=str(self.original),
+            survival_output_template=str(self.root / "vehicle_survival_modified.xlsx"),
+            vintage_output_template=str(self.root / "vintage_modelled_from_survival.xlsx"),
+            scale_age_band_factor=1.1,
+            smoothing_dict={5: 3},
+            verbose_explanations=False,
+            plot_profiles=False,
+        )
+
+        self.assertEqual([result["economy"] for result in results], ["01_AUS", "02_BD"])
+        for result in results:
+            self.assertEqual(
+                set(result), {"economy", "survival_output", "vintage_output", "constant_sales"}
+            )
+            self.assertTrue(Path(result["survival_output"]).exists())
+            self.assertTrue(result["survival_output"].endswith(f"_{result['economy']}.xlsx"))
+
+            _, profile_name, vintage = lpe.load_lifecycle_profile_excel(result["vintage_output"])
+            self.assertEqual(profile_name, "test (modified) (steady-state vintage from survival)")
+
+            # The pre-batch workflow derived the vintage from the saved survival workbook.
+            expected_path, expected_sales = lpe.build_vintage_from_survival_excel(
+                result["survival_output"],
+                str(self.root / f"expected_{result['economy']}.xlsx"),
+                run_simulation=False,
+                turnover_rate_bounds=(0.03, 0.07),
+                verbose_explanations=False,
+                plot_profiles=False,
+            )
+            _, _, expected = lpe.load_lifecycle_profile_excel(str(expected_path))
+            self.assertEqual(list(vintage), list(expected))
+            np.testing.assert_allclose(list(vintage.values()), list(expected.values()), rtol=1e-12)
+            self.assertAlmostEqual(result["constant_sales"], expected_sales, places=9)
+
+    def test_batch_save_leaves_targets_untouched_when_a_write_fails(self):
+        target = self.root / "existing.xlsx"
+        _write_profile_workbook(target, {0: 100.0, 1: 50.0})
+        before = target.read_bytes()
+
+        profile = {0: 100.0, 1: 80.0}
+        with mock.patch.object(
+            lpe, "_write_lifecycle_profile_frame", side_effect=[None, OSError("disk full")]
+        ):
+            with self.assertRaises(OSError):
+                lpe.save_lifecycle_profile_excels(
+                    [
+                        (str(target), "Transport", "a", profile),
+                        (str(self.root / "new.xlsx"), "Transport", "b", profile),
+                    ]
+                )
+
+        self.assertEqual(target.read_bytes(), before)
+        self.assertEqual(
+            sorted(path.name for path in self.root.iterdir()),
+            ["existing.xlsx", "vehicle_survival_original.xlsx"],
+        )
+
+    def test_batch_save_restores_targets_when_one_cannot_be_replaced(self):
+        first = self.root / "first.xlsx"
+        second = self.root / "second.xlsx"
+        _write_profile_workbook(first, {0: 100.0, 1: 50.0})
+        _write_profile_workbook(second, {0: 100.0, 1: 40.0})
+        before = {path: path.read_bytes() for path in (first, second)}
+
+        replace = os.replace
+
+        def replace_unless_locked(src, dst):
+            # Simulates `second` being open in Excel on Windows.
+            if Path(src) == second:
+                raise PermissionError(f"file is open: {src}")
+            return replace(src, dst)
+
+        profile = {0: 100.0, 1: 80.0}
+        with mock.patch.object(atomic_io.os, "replace", side_effect=replace_unless_locked):
+            with self.assertRaises(PermissionError):
+                lpe.save_lifecycle_profile_excels(
+                    [
+                        (str(first), "Transport", "a", profile),
+                        (str(second), "Transport", "b", profile),
+                    ]
+                )
+
+        self.assertEqual({path: path.read_bytes() for path in (first, second)}, before)
+        self.assertFalse((self.root / "archive").exists())
+        self.assertEqual(
+            sorted(path.name for path in self.root.glob("*.xlsx")),
+            ["first.xlsx", "second.xlsx", "vehicle_survival_original.xlsx"],
+        )
+        self.assertEqual(list(self.root.glob(".*")), [])
+
+    def test_batch_save_archives_replaced_targets(self):
+        target = self.root / "existing.xlsx"
+        _write_profile_workbook(target, {0: 100.0, 1: 50.0})
+        before = target.read_bytes()
+
+        lpe.save_lifecycle_profile_excels([(str(target), "Transport", "a", {0: 100.0, 1: 80.0})])
+
+        archived = list((self.root / "archive").iterdir())
+        self.assertEqual(len(archived), 1)
+        self.assertTrue(archived[0].name.startswith("existing_"))
+        self.assertEqual(archived[0].read_bytes(), before)
+        self.assertNotEqual(target.read_bytes(), before)
+        self.assertEqual(list(self.root.glob(".*")), [])
+
+if __name__ == "__main__":
+    unittest.main()
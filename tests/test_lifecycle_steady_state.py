@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.lifecycle_profile_editor as lpe
+
+
+def _survival(ages: int, decay: float) -> dict[int, float]:
+    values = 100.0 * np.power(decay, np.arange(ages) ** 1.5)
+    return {age: float(value) for age, value in enumerate(values)}
+
+
+class SteadyStateTurnoverTests(unittest.TestCase):
+    def test_simulation_ages_survivors_and_replaces_retirements(self):
+        survival = {0: 100.0, 1: 50.0, 2: 25.0}
+        vintage = {0: 50.0, 1: 30.0, 2: 20.0}
+
+        result = lpe.simulate_steady_state_turnover(survival, vintage, total_stock=100.0, n_years=1)
+
+        # Half of each age survives; the 20 vehicles at the maximum age all retire.
+        self.assertEqual(result["sales"], [25.0 + 15.0 + 20.0])
+        self.assertEqual(result["total_stock"], [100.0])
+        self.assertEqual(result["vintage_end"], {0: 60.0, 1: 25.0, 2: 15.0})
+
+    def test_analytic_vintage_is_the_dynamic_steady_state(self):
+        survival = _survival(25, 0.97)
+
+        analytic, analytic_sales = lpe.solve_steady_state_vintage_profile(survival, total_stock=1000.0)
+        dynamic, dynamic_sales = lpe.survival_profile_to_vintage_profile_dynamic(survival, total_stock=1000.0)
+
+        self.assertEqual(list(analytic), list(dynamic))
+        np.testing.assert_allclose(list(analytic.values()), list(dynamic.values()), rtol=1e-9)
+        self.assertAlmostEqual(analytic_sales, dynamic_sales, places=9)
+        self.assertAlmostEqual(sum(analytic.values()), 100.0, places=9)
+
+        simulated = lpe.simulate_steady_state_turnover(survival, analytic, total_stock=1000.0, n_years=60)
+        np.testing.assert_allclose(simulated["sales"], analytic_sales, rtol=1e-9)
+        np.testing.assert_allclose(list(simulated["vintage_end"].values()), list(analytic.values()), rtol=1e-9)
+
+    def test_batch_simulation_matches_single_profile_runs(self):
+        profiles = {}
+        for key, (ages, decay) in {"01_AUS": (25, 0.97), "02_BD": (18, 0.95), "03_CDA": (31, 0.98)}.items():
+            survival = _survival(ages, decay)
+            vintage, _ = lpe.solve_steady_state_vintage_profile(survival)
+            profiles[key] = (survival, vintage)
+        profiles["04_CHL"] = ({age + 1: value for age, value in _survival(12, 0.9).items()},) * 2
+
+        batch = lpe.simulate_steady_state_turnover_for_profiles(profiles, total_stock=500.0, n_years=40)
+
+        self.assertEqual(list(batch), list(profiles))
+        for key, (survival, vintage) in profiles.items():
+            self.assertEqual(
+                batch[key],
+                lpe.simulate_steady_state_turnover(survival, vintage, total_stock=500.0, n_years=40),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.transport_workflow_pipeline as pipeline
+from functions.run_manifest import RunManifest, StageSpec
+
+
+def _touch(path: Path, text: str = "x", mtime_ns: int | None = None) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+class RunManifestTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.source = _touch(self.root / "source.csv", mtime_ns=1_000_000_000)
+        self.output = _touch(self.root / "export.xlsx", mtime_ns=2_000_000_000)
+        self.spec = StageSpec(
+            stage="input_creation",
+            inputs={"source": str(self.source)},
+            outputs={"export": str(self.output)},
+            settings={"base_year": 2022, "policy": {("LPV", "BEV"): 0.5}},
+        )
+        self.manifest_path = self.root / "manifest.json"
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _recorded_manifest(self) -> RunManifest:
+        manifest = RunManifest(self.manifest_path)
+        manifest.record_stage("01_AUS", "Reference", self.spec, status="success")
+        manifest.save()
+        return RunManifest(self.manifest_path)
+
+    def test_recorded_stage_is_up_to_date_after_reload(self):
+        manifest = self._recorded_manifest()
+        self.assertIsNone(manifest.stale_reason("01_AUS", "Reference", self.spec))
+        self.assertEqual(
+            manifest.stale_reason("02_BD", "Reference", self.spec),
+            "no previous run recorded",
+        )
+
+    def test_changed_inputs_settings_and_outputs_are_stale(self):
+        manifest = self._recorded_manifest()
+
+        _touch(self.source, text="changed", mtime_ns=1_500_000_000)
+        self.assertEqual(manifest.stale_reason("01_AUS", "Reference", self.spec), "input changed: source")
+
+        manifest = self._recorded_manifest()
+        changed_settings = StageSpec(
+            stage=self.spec.stage,
+            inputs=self.spec.inputs,
+            outputs=self.spec.outputs,
+            settings={**self.spec.settings, "base_year": 2023},
+        )
+        self.assertEqual(manifest.stale_reason("01_AUS", "Reference", changed_settings), "settings changed")
+
+        os.utime(self.output, ns=(500_000_000, 500_000_000))
+        self.assertEqual(
+            manifest.stale_reason("01_AUS", "Reference", self.spec),
+            "output older than inputs: export",
+        )
+        self.output.unlink()
+        self.assertEqual(manifest.stale_reason("01_AUS", "Reference", self.spec), "output missing: export")
+
+    def test_failed_stage_is_stale(self):
+        manifest = RunManifest(self.manifest_path)
+        manifest.record_stage("01_AUS", "Reference", self.spec, status="failed", error="boom")
+        self.assertEqual(manifest.stale_reason("01_AUS", "Reference", self.spec), "previous run failed")
+
+    def test_save_keeps_entries_written_by_another_run(self):
+        first = RunManifest(self.manifest_path)
+        second = RunManifest(self.manifest_path)
+        first.record_stage("01_AUS", "Reference", self.spec, status="success")
+        first.save()
+        second.record_stage("02_BD", "Reference", self.spec, status="success")
+        second.save()
+
+        reloaded = RunManifest(self.manifest_path)
+        self.assertIsNotNone(reloaded.get("01_AUS", "Reference", "input_creation"))
+        self.assertIsNotNone(reloaded.get("02_BD", "Reference", "input_creation"))
+
+    def test_concurrent_saves_keep_every_writers_entries(self):
+        def write(scenario: str) -> None:
+            manifest = RunManifest(self.manifest_path)
+            for idx in range(30):
+                manifest.record_stage(f"{idx:02d}_ECON", scenario, self.spec, status="success")
+                manifest.save()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(write, ("Reference", "Target")))
+
+        reloaded = RunManifest(self.manifest_path)
+        self.assertEqual(len(reloaded.entries), 60)
+        self.assertFalse(Path(str(self.manifest_path) + ".lock").exists())
+
+
+class ResumableBatchRunTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.source = _touch(self.root / "model.xlsx")
+        self.failing = {"02_BD"}
+        self.calls: list[tuple[str, tuple[str, ...]]] = []
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _cfg(self, economy: str, scenario: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            transport_model_path=str(self.source),
+            transport_esto_balances_path=str(self.source),
+            transport_fuels_path=None,
+            transport_import_path=None,
+            survival_profile_path=None,
+            vintage_profile_path=None,
+            transport_export_path=str(self.root / f"{economy}_export.xlsx"),
+            passenger_sales_output=str(self.root / f"{economy}_passenger.csv"),
+            freight_sales_output=str(self.root / f"{economy}_freight.csv"),
+            transport_base_year=2022,
+            transport_final_year=2060,
+            transport_region=economy,
+            transport_model_name="model",
+        )
+
+    def _fake_run(self, *, transport_economy, transport_scenario, transport_cfg, run_type, skip_stages=()):
+        self.calls.append((transport_economy, tuple(skip_stages)))
+        record = {
+            "economy": transport_economy,
+            "scenario": transport_scenario,
+            "run_type": run_type,
+            "status": "success",
+            "error": "",
+            "completed_stages": [],
+            "resumed_stages": list(skip_stages),
+        }
+        if transport_economy in self.failing:
+            record.update(status="failed", error="boom")
+            return record
+        _touch(Path(transport_cfg.transport_export_path))
+        _touch(Path(pipeline.input_checkpoint_path(transport_economy, transport_scenario, 2022, 2060)))
+        _touch(Path(pipeline.reconciliation_input_checkpoint_path(transport_economy, transport_scenario)))
+        record["completed_stages"].append("input_creation")
+        return record
+
+    def _run_batch(self, targets):
+        with mock.patch.multiple(
+            pipeline,
+            RUN_MANIFEST_PATH=str(self.root / "manifest.json"),
+            RESUME_BATCH_RUNS=True,
+            RUN_INPUT_CREATION=True,
+            RUN_RECONCILIATION=False,
+            RUN_PASSENGER_SALES=False,
+            RUN_FREIGHT_SALES=False,
+            LOAD_INPUT_CHECKPOINT=False,
+            PARALLEL_ECONOMY_WORKERS=1,
+            load_transport_run_config=lambda economy, scenario: (economy, scenario, self._cfg(economy, scenario)),
+            run_configured_transport_workflow=self._fake_run,
+            resolve_str=lambda path: str(self.root / path),
+        ):
+            return pipeline.run_configured_targets(targets, run_type="separate")
+
+    def test_failed_batch_restarts_at_first_failed_target(self):
+        targets = [("01_AUS", "Reference"), ("02_BD", "Reference"), ("03_CDA", "Reference")]
+        first = self._run_batch(targets)
+        self.assertEqual([record["status"] for record in first], ["success", "failed", "success"])
+
+        self.failing.clear()
+        self.calls.clear()
+        second = self._run_batch(targets)
+
+        self.assertEqual([economy for economy, _ in self.calls], ["02_BD"])
+        self.assertEqual([record["status"] for record in second], ["success"] * 3)
+        self.assertEqual(second[0]["resumed_stages"], ["input_creation"])
+        self.assertTrue(second[0]["input_checkpoint_path"].endswith("transport_data_01_AUS_Reference_2022_2060.pkl"))
+
+        self.calls.clear()
+        _touch(self.source, text="new source data")
+        self._run_batch(targets)
+        self.assertEqual([economy for economy, _ in self.calls], ["01_AUS", "02_BD", "03_CDA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import sales_curve_estimate as sce
+import sales_workflow as sce_policy
+
+
+def _reference_turnover(target_stock, survival, vintage, policy=None):
+    """Per-age, per-year loop the array kernels must reproduce exactly."""
+    policy = policy or {}
+    years = list(target_stock.index)
+    max_age = len(vintage)
+    surv = survival.to_numpy(dtype=float)
+    survival_year_mult = policy.get("survival_multiplier", {})
+    extra_rate = policy.get("additional_retirement_rate", {})
+
+    cohorts = np.zeros((len(years), max_age))
+    cohorts[0] = target_stock.iloc[0] * (vintage / vintage.sum()).to_numpy()
+    sales = np.zeros(len(years))
+    retirements = np.zeros(len(years))
+    for i in range(1, len(years)):
+        prev = cohorts[i - 1]
+        new = np.zeros(max_age)
+        year_mult = float(survival_year_mult.get(years[i], 1.0))
+        for age in range(1, max_age):
+            new[age] = prev[age - 1] * np.clip(float(surv[age - 1]) * year_mult, 0.0, 1.0)
+        natural_survivors = float(new.sum())
+        retired = max(0.0, float(prev.sum()) - natural_survivors)
+        rate = float(extra_rate.get(years[i], 0.0))
+        if rate > 0.0:
+            removed = new * np.clip(rate * np.ones(max_age), 0.0, 1.0)
+            new = np.clip(new - removed, 0.0, None)
+            retired += float(removed.sum())
+        survivors = float(new.sum())
+        target = float(target_stock.iloc[i])
+        if survivors <= target:
+            new[0] = target - survivors
+            sales[i] = target - survivors
+        else:
+            new *= target / survivors if survivors > 0 else 0.0
+        cohorts[i] = new
+        retirements[i] = retired
+    return sales, cohorts, retirements
+
+
+class SalesCohortKernelTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.years = pd.Index(range(2022, 2040), dtype=int)
+        ages = pd.Index(range(12), dtype=int)
+        # Growth, then a sharp drop so survivors exceed the target and get scaled down.
+        stock = np.concatenate([np.linspace(100.0, 160.0, 12), np.linspace(120.0, 60.0, 6)])
+        self.target_stock = pd.Series(stock, index=self.years)
+        self.survival = pd.Series(np.append(rng.uniform(0.7, 0.99, 11), 0.0), index=ages)
+        self.vintage = pd.Series(rng.uniform(0.0, 1.0, 12), index=ages)
+
+    def _assert_matches_reference(self, result, policy=None):
+        sales, cohorts, retirements = result
+        ref_sales, ref_cohorts, ref_retirements = _reference_turnover(
+            self.target_stock, self.survival, self.vintage, policy
+        )
+        np.testing.assert_array_equal(sales.to_numpy(), ref_sales)
+        np.testing.assert_array_equal(cohorts.to_numpy(), ref_cohorts)
+        np.testing.assert_array_equal(retirements.to_numpy(), ref_retirements)
+        self.assertTrue(sales.index.equals(self.years))
+        self.assertTrue(cohorts.index.equals(self.years))
+        self.assertEqual(list(cohorts.columns), list(range(12)))
+
+    def test_legacy_kernel_matches_reference_loop(self):
+        self._assert_matches_reference(
+            sce.compute_sales_from_stock_targets(
+                self.target_stock,
+                self.survival,
+                self.vintage,
+                return_retirements=True,
+            )
+        )
+
+    def test_policy_kernel_matches_reference_loop(self):
+        policy = {
+            "survival_multiplier": {2026: 1.1, 2027: 0.9},
+            "additional_retirement_rate": {2025: 0.05, 2026: 0.0, 2031: 0.2},
+        }
+        schedule_policy = {
+            # Year schedules are forward-filled inside the policy kernel.
+            "survival_multiplier": {year: (1.1 if year == 2026 else 0.9 if year >= 2027 else 1.0) for year in self.years},
+            "additional_retirement_rate": {
+                year: (0.05 if year == 2025 else 0.2 if year >= 2031 else 0.0) for year in self.years
+            },
+        }
+        self._assert_matches_reference(
+            sce_policy.compute_sales_from_stock_targets(
+                self.target_stock,
+                self.survival,
+                self.vintage,
+                turnover_policy=policy,
+                return_retirements=True,
+            ),
+            schedule_policy,
+        )
+
+    def test_matrix_kernel_matches_per_vehicle_calls(self):
+        short_ages = pd.Index(range(5), dtype=int)
+        target_stocks = {
+            "LPV": self.target_stock,
+            "MC": self.target_stock * 0.3,
+            "Bus": pd.Series(0.0, index=self.years),
+        }
+        survival_curves = {
+            "LPV": self.survival,
+            "MC": pd.Series([0.9, 0.8, 0.6, 0.4, 0.0], index=short_ages),
+            "Bus": self.survival,
+        }
+        vintage_profiles = {
+            "LPV": self.vintage,
+            "MC": pd.Series([0.0, 0.4, 0.3, 0.2, 0.1], index=short_ages),
+            "Bus": self.vintage,
+        }
+
+        sales, cohorts, retirements = sce.compute_sales_from_stock_target_matrix(
+            pd.DataFrame(target_stocks).T,
+            survival_curves,
+            vintage_profiles,
+        )
+
+        self.assertEqual(list(sales.index), ["LPV", "MC", "Bus"])
+        for vehicle, target in target_stocks.items():
+            expected_sales, expected_cohorts, expected_retirements = sce.compute_sales_from_stock_targets(
+                target,
+                survival_curves[vehicle],
+                vintage_profiles[vehicle],
+                return_retirements=True,
+            )
+            np.testing.assert_array_equal(sales.loc[vehicle].to_numpy(), expected_sales.to_numpy())
+            np.testing.assert_array_equal(retirements.loc[vehicle].to_numpy(), expected_retirements.to_numpy())
+            pd.testing.assert_frame_equal(cohorts[vehicle], expected_cohorts, check_exact=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.transport_workflow_pipeline as pipeline
+from functions.sales_dashboard_queue import (
+    clear_sales_dashboards,
+    pending_sales_dashboards,
+    queue_sales_dashboard,
+    render_queued_sales_dashboards,
+    render_sales_dashboard_job,
+)
+
+
+def _plot_inputs() -> dict:
+    years = pd.Index([2022, 2023, 2024], name="Date")
+    return {
+        "M_envelope": pd.Series([0.5, 0.6, 0.7], index=years),
+        "target_stocks": {"LPV": pd.Series([100.0, 110.0, 120.0], index=years)},
+        "sales": {"LPV": pd.Series([0.0, 15.0, 16.0], index=years)},
+        "retirements": {"LPV": pd.Series([0.0, 5.0, 6.0], index=years)},
+        "figures": None,
+    }
+
+
+class SalesDashboardQueueTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.queue_dir = self.root / "queue"
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_deferred_plotting_run_estimates_without_plotting_and_queues_inputs(self):
+        plot_flags = []
+
+        def fake_estimate(*, df, economy, scenario, plot, **kwargs):
+            plot_flags.append(plot)
+            return {**_plot_inputs(), "sales_table": pd.DataFrame({"Date": [2022], "LPV": [0.0]})}
+
+        profiles = {"LPV": pd.Series([0.9, 0.0], index=[0, 1])}
+        with mock.patch.multiple(
+            pipeline,
+            DEFER_SALES_PLOTS=True,
+            SALES_PLOT_QUEUE_DIR=str(self.queue_dir),
+            SALES_RESULT_CACHE_DIR=None,
+            estimate_passenger_sales_from_dataframe=fake_estimate,
+            load_survival_and_vintage_profiles=lambda **_: (profiles, profiles),
+        ):
+            result = pipeline.run_passenger_sales_workflow(
+                df=pd.DataFrame({"Economy": ["01_AUS"], "Scenario": ["Reference"]}),
+                economy="01_AUS",
+                scenario="Reference",
+                base_year=2022,
+                final_year=2024,
+                esto_energy_path=str(self.root / "esto.csv"),
+                plot=True,
+            )
+
+        self.assertEqual(plot_flags, [False])
+        self.assertIsNone(result["figures"])
+        jobs = pending_sales_dashboards(self.queue_dir, scenario="Reference")
+        self.assertEqual([job.name for job in jobs], ["passenger__01_AUS.pkl"])
+        job = pd.read_pickle(jobs[0])
+        self.assertEqual((job["transport_type"], job["economy"]), ("passenger", "01_AUS"))
+        self.assertNotIn("figures", job["result"])
+        self.assertEqual(pending_sales_dashboards(self.queue_dir, scenario="Target"), [])
+
+    def test_render_saves_figures_and_keeps_failed_jobs_queued(self):
+        queue_sales_dashboard(
+            _plot_inputs(),
+            transport_type="passenger",
+            economy="01_AUS",
+            scenario="Reference",
+            queue_dir=self.queue_dir,
+        )
+        broken = queue_sales_dashboard(
+            {"sales": {}},
+            transport_type="freight",
+            economy="02_BD",
+            scenario="Reference",
+            queue_dir=self.queue_dir,
+        )
+
+        saved = render_queued_sales_dashboards(
+            self.queue_dir,
+            scenario="Reference",
+            max_workers=2,
+            output_dir=self.root / "figures",
+        )
+
+        self.assertTrue(saved)
+        for path in saved:
+            self.assertTrue(Path(path).exists())
+            self.assertEqual(Path(path).parent, self.root / "figures" / "01_AUS_Reference")
+        self.assertEqual(pending_sales_dashboards(self.queue_dir), [broken])
+
+    def test_in_process_render_leaves_backend_and_breakpoint_hook_alone(self):
+        import matplotlib
+
+        job_path = queue_sales_dashboard(
+            _plot_inputs(),
+            transport_type="passenger",
+            economy="01_AUS",
+            scenario="Reference",
+            queue_dir=self.queue_dir,
+        )
+        backend = matplotlib.get_backend()
+        breakpoint_setting = os.environ.get("PYTHONBREAKPOINT")
+        # The dashboard code has a breakpoint() of its own; only workers disable it.
+        with mock.patch.object(sys, "breakpointhook", lambda *args, **kwargs: None):
+            saved = render_sales_dashboard_job(job_path, output_dir=self.root / "figures")
+
+        self.assertEqual(os.environ.get("PYTHONBREAKPOINT"), breakpoint_setting)
+
+        self.assertTrue(saved)
+        self.assertEqual(matplotlib.get_backend(), backend)
+        self.assertFalse(job_path.exists())
+
+    def test_clear_removes_only_the_given_scenario(self):
+        for scenario in ("Reference", "Target"):
+            queue_sales_dashboard(
+                _plot_inputs(),
+                transport_type="passenger",
+                economy="01_AUS",
+                scenario=scenario,
+                queue_dir=self.queue_dir,
+            )
+
+        self.assertEqual(clear_sales_dashboards(self.queue_dir, scenario="Reference"), 1)
+        self.assertEqual(pending_sales_dashboards(self.queue_dir, scenario="Reference"), [])
+        self.assertEqual(len(pending_sales_dashboards(self.queue_dir, scenario="Target")), 1)
+        self.assertEqual(clear_sales_dashboards(self.root / "missing"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
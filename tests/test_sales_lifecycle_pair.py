@@ -1,6 +1,9 @@
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import numpy as np
 import pandas as pd
@@ -82,6 +85,68 @@ class SalesLifecyclePairTests(unittest.TestCase):
                 vintage_profile=vintage,
             )
 
+    @staticmethod
+    def _write_profile_workbook(path: Path, values: dict[int, float]) -> None:
+        rows = [["Area:", "Transport"], ["Profile:", "test"], [None, None], ["Year", "Value"]]
+        rows.extend([[age, value] for age, value in values.items()])
+        pd.DataFrame(rows).to_excel(
+            path, sheet_name="Lifecycle Profiles", header=False, index=False
+        )
+
+    def test_lifecycle_profile_registry_shares_read_only_profiles(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            survival_path = tmp / "survival.xlsx"
+            vintage_path = tmp / "vintage.xlsx"
+            self._write_profile_workbook(survival_path, {0: 100.0, 1: 90.0, 2: 81.0})
+            self._write_profile_workbook(vintage_path, {0: 5.0, 1: 3.0, 2: 2.0})
+
+            registry = sce.LifecycleProfileRegistry(bundle_dir=tmp / "bundles")
+            survival, vintage = registry.get_pair(survival_path, vintage_path)
+            again_survival, again_vintage = registry.get_pair(survival_path, vintage_path)
+
+            self.assertIs(survival, again_survival)
+            self.assertIs(vintage, again_vintage)
+            self.assertTrue(survival.index.equals(vintage.index))
+            self.assertFalse(survival.to_numpy().flags.writeable)
+            np.testing.assert_allclose(vintage.to_numpy(), np.array([0.0, 0.6, 0.4]))
+            self.assertEqual(len(list((tmp / "bundles").glob("*.npz"))), 1)
+
+            # A fresh registry reads the persisted bundle instead of the workbooks.
+            bundled_survival, _ = sce.LifecycleProfileRegistry(
+                bundle_dir=tmp / "bundles"
+            ).get_pair(survival_path, vintage_path)
+            np.testing.assert_allclose(bundled_survival.to_numpy(), survival.to_numpy())
+
+            # Editing the workbook invalidates the cached pair.
+            self._write_profile_workbook(vintage_path, {0: 5.0, 1: 1.0, 2: 3.0})
+            stat = vintage_path.stat()
+            os.utime(vintage_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            _, updated_vintage = registry.get_pair(survival_path, vintage_path)
+            np.testing.assert_allclose(updated_vintage.to_numpy(), np.array([0.0, 0.25, 0.75]))
+
+    def test_unaligned_profiles_warn_with_the_economy_and_vehicle_types(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            survival_path = tmp / "survival.xlsx"
+            vintage_path = tmp / "vintage.xlsx"
+            self._write_profile_workbook(survival_path, {0: 100.0, 1: 90.0, 2: 81.0})
+            self._write_profile_workbook(vintage_path, {0: 5.0, 1: 3.0})
+            registry = sce.LifecycleProfileRegistry()
+            patcher = mock.patch.object(sce, "LIFECYCLE_PROFILE_REGISTRY", registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+            for economy in ("01_AUS", "02_BD"):
+                with self.assertWarnsRegex(UserWarning, f"economy {economy}, vehicle types Trucks, LCVs"):
+                    survival_curves, _ = sce.load_survival_and_vintage_profiles(
+                        survival_path,
+                        vintage_path,
+                        vehicle_keys=("Trucks", "LCVs"),
+                        economy=economy,
+                    )
+            self.assertEqual(survival_curves["Trucks"].index.tolist(), [0, 1, 2])
+
     def test_drive_family_aggregation_groups_expected_types(self):
         years = pd.Index([2030, 2031], dtype=int)
         per_drive = pd.DataFrame(
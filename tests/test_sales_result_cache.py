@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.transport_workflow_pipeline as pipeline
+
+
+def _input_frame(stock_2023: float = 110.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Economy": ["01_AUS", "01_AUS", "02_BD"],
+            "Scenario": ["Reference", "Reference", "Reference"],
+            "Date": [2022, 2023, 2022],
+            "Stocks": [100.0, stock_2023, 50.0],
+        }
+    )
+
+
+class SalesResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.esto_path = self.root / "esto.csv"
+        self.esto_path.write_text("energy", encoding="utf-8")
+        self.calls = []
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _fake_estimate(self, *, df, economy, scenario, **kwargs):
+        self.calls.append(kwargs.get("turnover_policies"))
+        sales_table = pd.DataFrame({"Date": [2022, 2023], "LPV": [0.0, float(len(self.calls))]})
+        return {"sales_table": sales_table, "economy": economy}
+
+    def _run(self, df: pd.DataFrame, policy_settings=None) -> dict:
+        profiles = {"LPV": pd.Series([0.9, 0.0], index=[0, 1])}
+        with mock.patch.multiple(
+            pipeline,
+            SALES_RESULT_CACHE_DIR=str(self.root / "sales_cache"),
+            estimate_passenger_sales_from_dataframe=self._fake_estimate,
+            load_survival_and_vintage_profiles=lambda **_: (profiles, profiles),
+        ):
+            return pipeline.run_passenger_sales_workflow(
+                df=df,
+                economy="01_AUS",
+                scenario="Reference",
+                base_year=2022,
+                final_year=2023,
+                esto_energy_path=str(self.esto_path),
+                output_path=str(self.root / "passenger_sales.csv"),
+                policy_settings=policy_settings,
+                archive_existing_output=False,
+            )
+
+    def test_unchanged_inputs_reuse_the_stored_result(self):
+        first = self._run(_input_frame())
+        (self.root / "passenger_sales.csv").unlink()
+        second = self._run(_input_frame())
+
+        self.assertEqual(len(self.calls), 1)
+        pd.testing.assert_frame_equal(first["sales_table"], second["sales_table"])
+        # The CSV is written from the cached result as well.
+        self.assertTrue((self.root / "passenger_sales.csv").exists())
+
+        # Rows of other economies are not part of the fingerprint.
+        other_economy_changed = _input_frame()
+        other_economy_changed.loc[2, "Stocks"] = 75.0
+        self._run(other_economy_changed)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_changed_inputs_or_policy_recompute(self):
+        self._run(_input_frame())
+        self._run(_input_frame(stock_2023=120.0))
+        self.assertEqual(len(self.calls), 2)
+
+        policy = {"turnover_policies": {"LPV": {"survival_multiplier": pd.Series({2023: 1.2})}}}
+        self._run(_input_frame(), policy_settings=policy)
+        self._run(_input_frame(), policy_settings=policy)
+        self.assertEqual(len(self.calls), 3)
+
+        policy["turnover_policies"]["LPV"]["survival_multiplier"] = pd.Series({2023: 1.3})
+        self._run(_input_frame(), policy_settings=policy)
+        self.assertEqual(len(self.calls), 4)
+
+        self.esto_path.write_text("energy, revised", encoding="utf-8")
+        self._run(_input_frame())
+        self.assertEqual(len(self.calls), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -160,6 +160,64 @@ class SalesTurnoverPolicyTests(unittest.TestCase):
         self.assertFalse(all_drive_diag.empty)
         self.assertIn("bev", set(all_drive_diag["drive"].astype(str)))
 
+    def test_drive_policy_diagnostics_cover_every_bucket_drive_and_year(self):
+        years = pd.Index([2022, 2023], dtype=int)
+        df = pd.DataFrame(
+            {
+                "Economy": ["01_AUS"] * 6 + ["02_BD"],
+                "Date": [2022, 2022, 2022, 2023, 2023, 2023, 2022],
+                "Transport Type": ["Passenger"] * 7,
+                "Medium": ["road"] * 7,
+                "Vehicle Type": ["car", " Car", "bus", "car", "bus", "bus", "car"],
+                "Drive": ["ICE_G", "bev", "ice_d", "ice_g", "bev", "ice_d", "ice_g"],
+                "Stocks": [30.0, 10.0, 5.0, 0.0, 0.0, 0.0, 99.0],
+            }
+        )
+
+        policies, diagnostics = sce_policy.derive_vehicle_turnover_policies_from_drive_policy(
+            df=df,
+            years=years,
+            drive_turnover_policy={"ice_g": {2022: 0.2, 2023: 0.4}, "fcev": 0.1},
+            vehicle_type_map={"car": "LPV", "bus": "Bus"},
+            economy="01_AUS",
+        )
+
+        effective = diagnostics["effective_rates"]
+        self.assertEqual(list(effective.columns), ["Bus", "LPV"])
+        # LPV 2022: 30 of 40 vehicles are ice_g; 2023 has no LPV stock.
+        np.testing.assert_allclose(effective["LPV"].to_numpy(), [0.15, 0.0], atol=1e-12)
+        np.testing.assert_allclose(effective["Bus"].to_numpy(), [0.0, 0.0], atol=1e-12)
+        self.assertEqual(list(policies), ["LPV"])
+        self.assertEqual(diagnostics["unused_policy_drives"], ["fcev"])
+
+        contributions = diagnostics["contributions_long"]
+        self.assertEqual(len(contributions), 2 * 2 * 2)
+        self.assertEqual(
+            list(contributions[["vehicle_bucket", "drive", "Date"]].itertuples(index=False, name=None))[:4],
+            [("Bus", "ice_g", 2022), ("Bus", "ice_g", 2023), ("Bus", "fcev", 2022), ("Bus", "fcev", 2023)],
+        )
+        lpv_ice = contributions[(contributions["vehicle_bucket"] == "LPV") & (contributions["drive"] == "ice_g")]
+        np.testing.assert_allclose(lpv_ice["bucket_total_stock"].to_numpy(), [40.0, 0.0])
+        np.testing.assert_allclose(lpv_ice["rate_contribution"].to_numpy(), [0.15, 0.0], atol=1e-12)
+        np.testing.assert_allclose(
+            contributions.groupby(["Date", "vehicle_bucket"])["rate_contribution"].sum().to_numpy(),
+            contributions.groupby(["Date", "vehicle_bucket"])["effective_bucket_rate"].first().to_numpy(),
+        )
+
+        shares = diagnostics["all_drive_stock_shares_long"]
+        self.assertEqual(
+            list(shares[["Date", "vehicle_bucket", "drive"]].itertuples(index=False, name=None)),
+            [
+                (2022, "Bus", "ice_d"),
+                (2022, "LPV", "bev"),
+                (2022, "LPV", "ice_g"),
+                (2023, "Bus", "bev"),
+                (2023, "Bus", "ice_d"),
+                (2023, "LPV", "ice_g"),
+            ],
+        )
+        np.testing.assert_allclose(shares["drive_stock_share"].to_numpy(), [1.0, 0.25, 0.75, 0.0, 0.0, 0.0])
+
     def test_initial_fleet_age_shift_vintage_derivation_reports_average_age_change(self):
         vintage_profiles = {
             "LPV": pd.Series([0.10, 0.25, 0.30, 0.20, 0.15], index=pd.Index([0, 1, 2, 3, 4], dtype=int)),
@@ -250,6 +308,93 @@ class SalesTurnoverPolicyTests(unittest.TestCase):
         remaining = pd.Series(out["LPV"]["additional_retirement_rate"]).reindex(years).astype(float)
         np.testing.assert_allclose(remaining.values, np.array([0.10, 0.11]), atol=1e-12)
 
+    def test_compiled_turnover_policy_is_cached_and_reused(self):
+        years = pd.Index([2022, 2023, 2024, 2025], dtype=int)
+        ages = pd.Index([0, 1, 2], dtype=int)
+        target_stock = pd.Series([100.0, 101.0, 99.0, 103.0], index=years)
+        survival = pd.Series([0.95, 0.90, 0.0], index=ages)
+        vintage = pd.Series([0.0, 0.6, 0.4], index=ages)
+        policy = {
+            "additional_retirement_rate": {2024: 0.1},
+            "age_multipliers": {2: 1.5},
+            "survival_multiplier": pd.Series({2023: 1.1}),
+        }
+
+        compiled = sce_policy.compile_turnover_policy(policy, years, ages)
+        self.assertIs(compiled, sce_policy.compile_turnover_policy(dict(policy), years, ages))
+        self.assertEqual(compiled.extra_retirement_matrix.shape, (4, 3))
+        np.testing.assert_allclose(compiled.extra_retirement_matrix[2], [0.1, 0.1, 0.15])
+        np.testing.assert_allclose(compiled.extra_retirement_matrix[3], [0.1, 0.1, 0.15])
+
+        from_mapping = sce_policy.compute_sales_from_stock_targets(
+            target_stock, survival, vintage, turnover_policy=policy, return_retirements=True
+        )
+        from_compiled = sce_policy.compute_sales_from_stock_targets(
+            target_stock, survival, vintage, turnover_policy=compiled, return_retirements=True
+        )
+        for left, right in zip(from_mapping, from_compiled):
+            np.testing.assert_array_equal(left.to_numpy(), right.to_numpy())
+
+        with self.assertRaises(ValueError):
+            sce_policy.compute_sales_from_stock_targets(
+                target_stock.iloc[:3], survival, vintage, turnover_policy=compiled
+            )
+
+    def test_policy_sweep_matches_per_variant_runs(self):
+        years = pd.Index(range(2022, 2032), dtype=int)
+        ages = pd.Index(range(5), dtype=int)
+        inputs = dict(
+            years=years,
+            population=pd.Series(np.linspace(1000.0, 1200.0, len(years)), index=years),
+            energy_use_passenger=pd.Series(np.linspace(10.0, 14.0, len(years)), index=years),
+            base_stocks={"LPV": 100.0, "MC": 40.0},
+            survival_curves={
+                "LPV": pd.Series([0.95, 0.90, 0.80, 0.70, 0.0], index=ages),
+                "MC": pd.Series([0.90, 0.85, 0.70, 0.50, 0.0], index=ages),
+            },
+            vintage_profiles={
+                "LPV": pd.Series([0.0, 0.35, 0.25, 0.20, 0.20], index=ages),
+                "MC": pd.Series([0.0, 0.40, 0.30, 0.20, 0.10], index=ages),
+            },
+            weights={"LPV": 1.0, "MC": 0.3},
+            plot=False,
+        )
+        baseline = sce_policy.build_passenger_sales_for_economy(**inputs)
+        variants = sce_policy.build_turnover_policy_grid(
+            {
+                "survival_multiplier": [1.0, 1.4],
+                "analysis_initial_fleet_age_shift_years": [None, 1.5],
+            },
+            ["LPV", "MC"],
+            base_turnover_policies={"LPV": {"additional_retirement_rate": {2026: 0.1}}},
+        )
+        self.assertEqual(len(variants), 4)
+        self.assertIn("survival_multiplier=1.4|analysis_initial_fleet_age_shift_years=1.5", variants)
+
+        sweep = sce_policy.run_turnover_policy_sweep(baseline, variants)
+
+        self.assertEqual(list(sweep.columns), ["variant", "vehicle_type", "Date", "sales", "retirements", "stock"])
+        self.assertEqual(len(sweep), 4 * 2 * len(years))
+        for name, block in variants.items():
+            expected = sce_policy.build_passenger_sales_for_economy(
+                **inputs,
+                turnover_policies=block["turnover_policies"],
+                analysis_initial_fleet_age_shift_years=block.get("analysis_initial_fleet_age_shift_years"),
+            )
+            for vehicle in ("LPV", "MC"):
+                rows = sweep[(sweep["variant"] == name) & (sweep["vehicle_type"] == vehicle)]
+                np.testing.assert_array_equal(rows["Date"].to_numpy(), years.to_numpy())
+                np.testing.assert_array_equal(rows["sales"].to_numpy(), expected["sales"][vehicle].to_numpy())
+                np.testing.assert_array_equal(
+                    rows["retirements"].to_numpy(),
+                    expected["retirements"][vehicle].to_numpy(),
+                )
+                np.testing.assert_allclose(
+                    rows["stock"].to_numpy(),
+                    expected["target_stocks"][vehicle].to_numpy(),
+                    rtol=1e-12,
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
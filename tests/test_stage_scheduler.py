@@ -0,0 +1,92 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+from functions.stage_scheduler import Stage, StageScheduler
+
+
+class StageSchedulerTests(unittest.TestCase):
+    def _stages(self, calls):
+        def record(name, value):
+            def run(deps):
+                calls.append(name)
+                return value + sum(deps.values())
+            return run
+
+        return [
+            Stage("domestic:A", record("domestic:A", 1)),
+            Stage("international:A", record("international:A", 10)),
+            Stage("domestic:B", record("domestic:B", 2), depends_on=("domestic:A",)),
+            Stage(
+                "combined_workbook",
+                record("combined_workbook", 100),
+                depends_on=("domestic:A", "international:A", "domestic:B"),
+            ),
+        ]
+
+    def test_runs_in_declaration_order_and_passes_dependency_results(self):
+        calls = []
+        results = StageScheduler(self._stages(calls)).run()
+
+        self.assertEqual(calls, ["domestic:A", "international:A", "domestic:B", "combined_workbook"])
+        self.assertEqual(results["domestic:B"], 3)
+        self.assertEqual(results["combined_workbook"], 100 + 1 + 10 + 3)
+
+    def test_targeted_rerun_runs_stage_and_downstream_only(self):
+        calls = []
+        scheduler = StageScheduler(self._stages(calls))
+        previous = {"domestic:A": 1, "domestic:B": 3, "international:A": 0}
+
+        results = scheduler.run(only=["international"], results=previous)
+
+        self.assertEqual(calls, ["international:A", "combined_workbook"])
+        self.assertEqual(results["combined_workbook"], 100 + 1 + 10 + 3)
+        with self.assertRaisesRegex(ValueError, "without results"):
+            scheduler.run(only=["domestic:B"], results={})
+
+    def test_independent_stages_run_concurrently(self):
+        both_started = threading.Barrier(2, timeout=5)
+
+        def wait_for_peer(_deps):
+            both_started.wait()
+            return 1
+
+        scheduler = StageScheduler(
+            [
+                Stage("domestic:A", wait_for_peer),
+                Stage("international:A", wait_for_peer),
+                Stage("combined_workbook", lambda deps: sum(deps.values()), ("domestic:A", "international:A")),
+            ]
+        )
+        results = scheduler.run(max_workers=2)
+        self.assertEqual(results["combined_workbook"], 2)
+
+    def test_failure_stops_downstream_and_is_reraised(self):
+        calls = []
+
+        def fail(_deps):
+            raise RuntimeError("boom")
+
+        scheduler = StageScheduler(
+            [
+                Stage("domestic:A", fail),
+                Stage("combined_workbook", lambda deps: calls.append("combined"), ("domestic:A",)),
+            ]
+        )
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            scheduler.run(max_workers=2)
+        self.assertEqual(calls, [])
+
+    def test_rejects_cycles(self):
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            StageScheduler([Stage("a", lambda _: 0, ("b",)), Stage("b", lambda _: 0, ("a",))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+from functions.stage_telemetry import collect_stage_telemetry, timed_stage, track_stage
+
+
+@timed_stage("double")
+def _double(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.concat([df, df], ignore_index=True)
+
+
+@timed_stage("write")
+def _write(df: pd.DataFrame, path: str) -> None:
+    return None
+
+
+class StageTelemetryTests(unittest.TestCase):
+    def test_stages_recorded_only_while_collecting(self):
+        df = pd.DataFrame({"value": range(3)})
+        _double(df)
+        with collect_stage_telemetry() as stages:
+            _double(df)
+            _write(df, "unused.csv")
+            with track_stage("loop") as entry:
+                entry["rows"] = 7
+
+        self.assertEqual([stage["stage"] for stage in stages], ["double", "write", "loop"])
+        self.assertEqual([stage["rows"] for stage in stages], [6, 3, 7])
+        for stage in stages:
+            self.assertGreaterEqual(stage["wall_seconds"], 0.0)
+            self.assertGreaterEqual(stage["cpu_seconds"], 0.0)
+
+    def test_failed_stage_is_still_recorded(self):
+        with collect_stage_telemetry() as stages:
+            with self.assertRaises(RuntimeError):
+                with track_stage("broken"):
+                    raise RuntimeError("boom")
+        self.assertEqual(stages[0]["stage"], "broken")
+        self.assertIsNone(stages[0]["rows"])
+
+    def test_selected_stages_write_separate_profiles(self):
+        df = pd.DataFrame({"value": range(3)})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profile_dir = Path(tmpdir) / "01_AUS_Reference"
+            with collect_stage_telemetry(profile_dir=profile_dir, profile_stages=["double"], top_n=5):
+                _double(df)
+                _double(df)
+                _write(df, "unused.csv")
+            names = sorted(path.name for path in profile_dir.iterdir())
+
+        self.assertEqual(len(names), 4)
+        self.assertTrue(all(name.startswith("double_") for name in names))
+        self.assertEqual(sum(name.endswith(".prof") for name in names), 2)
+        self.assertEqual(sum(name.endswith(".txt") for name in names), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = REPO_ROOT / "codebase"
+if str(CODE_DIR) not in sys.path:
+    sys.path.insert(0, str(CODE_DIR))
+
+import functions.transport_workflow_pipeline as pipeline
+import transport_workflow as workflow
+from functions.stage_scheduler import StageScheduler
+
+
+class RunTimingLogTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        timing_csv = self.root / "run_timing_log.csv"
+        patches = [
+            mock.patch.object(workflow, "_TIMING_CSV", timing_csv),
+            mock.patch.object(workflow, "_TIMING_LOCK", self.root / "run_timing_log.csv.lock"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.timing_csv = timing_csv
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_concurrent_runs_keep_every_row_and_number_instances_in_turn(self):
+        def record(_: int) -> None:
+            workflow._record_run_timings(
+                [{"economy": "01_AUS", "scenario": "Reference", "run_type": "full", "duration_seconds": 1.0}],
+                {},
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(record, range(12)))
+
+        log = pd.read_csv(self.timing_csv)
+        self.assertEqual(sorted(log["instance_number"].tolist()), list(range(1, 13)))
+        self.assertFalse((self.root / "run_timing_log.csv.lock").exists())
+        self.assertEqual(sorted(path.name for path in self.root.iterdir()), ["run_timing_log.csv"])
+
+
+class RuntimeSettingsTests(unittest.TestCase):
+    def setUp(self):
+        saved = pipeline._snapshot_runtime_settings()
+        self.addCleanup(vars(pipeline).update, saved)
+
+    def test_applied_settings_are_exactly_the_ones_copied_to_workers(self):
+        workflow._apply_runtime_settings(scenario="Target", date_id="20990101")
+
+        snapshot = pipeline._snapshot_runtime_settings()
+        self.assertEqual(set(snapshot), set(pipeline._RUNTIME_SETTING_NAMES))
+        self.assertEqual(snapshot["TRANSPORT_SCENARIO_SELECTION"], "Target")
+        self.assertEqual(snapshot["DATE_ID"], "20990101")
+
+    def test_settings_outside_the_shared_list_are_rejected(self):
+        settings = pipeline._snapshot_runtime_settings()
+        settings["NOT_A_SETTING"] = True
+        with self.assertRaises(ValueError):
+            pipeline.apply_runtime_settings(settings)
+        del settings["NOT_A_SETTING"]
+        del settings["DATE_ID"]
+        with self.assertRaises(ValueError):
+            pipeline.apply_runtime_settings(settings)
+
+
+class StageConcurrencyTests(unittest.TestCase):
+    def setUp(self):
+        saved = pipeline._snapshot_runtime_settings()
+        self.addCleanup(vars(pipeline).update, saved)
+
+    def test_stages_using_pipeline_state_do_not_overlap_on_threads(self):
+        active: list[str] = []
+        overlaps: list[tuple[str, ...]] = []
+        guard = threading.Lock()
+
+        def busy(name: str) -> list[dict]:
+            with guard:
+                active.append(name)
+                if len(active) > 1:
+                    overlaps.append(tuple(active))
+            time.sleep(0.05)
+            with guard:
+                active.remove(name)
+            return []
+
+        with (
+            mock.patch.object(workflow, "RUN_INTERNATIONAL_WORKFLOW", True),
+            mock.patch.object(workflow, "MULTI_SCENARIO_MODE", False),
+            mock.patch.object(pipeline, "run_transport_workflow", side_effect=lambda: busy("domestic")),
+            mock.patch.object(workflow, "_run_international_scopes", side_effect=lambda scenario: busy("international")),
+        ):
+            stages = [
+                stage
+                for stage in workflow.build_workflow_stages(["Reference", "Target"], "20990101")
+                if stage.base_name in {"domestic", "international"}
+            ]
+            results = StageScheduler(stages).run(max_workers=3)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(overlaps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()